@@ -6,6 +6,7 @@ import logging
 
 from neo4j import exceptions as neo4j_exceptions
 
+from app.db import queries
 from app.models.schemas import (
     AICompletionRequest,
     AICompletionResponse,
@@ -274,7 +275,7 @@ async def process_online_query(query: str, include_graph: bool, request: Request
     """Process query using OLLAMA AI and optionally Neo4j graph data."""
     
     ollama_service = request.app.state.ollama_service
-    neo4j_client = getattr(request.app.state, "neo4j_client", None)
+    neo4j_client = getattr(request.app.state, "async_neo4j_client", None)
     retrieval_service = getattr(request.app.state, "graphrag_retrieval_service", None)
     
     if not ollama_service:
@@ -325,7 +326,8 @@ async def process_online_query(query: str, include_graph: bool, request: Request
             cypher_query = await ollama_service.generate_cypher_query(query)
             logger.info(f"Generated Cypher: {cypher_query}")
             
-            records = neo4j_client.execute_query(cypher_query)
+            # Generated Cypher is untrusted; a READ transaction refuses any writes it contains.
+            records = await neo4j_client.execute_read(cypher_query)
             
             nodes_dict = {}
             relationships = []
@@ -482,14 +484,15 @@ async def nutrition_query(
     
     Returns formulation details with calculated nutrition facts.
     """
-    from app.services.nutrition_service import NutritionCalculationService
-    from app.db.neo4j_client import get_neo4j_client
+    from app.api.endpoints.nutrition import get_nutrition_service
+    from app.db.neo4j_client import get_async_neo4j_client
     
-    neo4j_client = get_neo4j_client(request)
+    neo4j_client = get_async_neo4j_client(request)
+    nutrition_service = get_nutrition_service(request)
     graphrag_service = getattr(request.app.state, "graphrag_retrieval_service", None)
     ollama = getattr(request.app.state, "ollama_service", None)
     
-    if not neo4j_client:
+    if not neo4j_client or nutrition_service is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Neo4j not connected"
@@ -504,7 +507,8 @@ async def nutrition_query(
         
         if graphrag_service:
             try:
-                retrieval_result = graphrag_service.retrieve(
+                retrieval_result = await asyncio.to_thread(
+                    graphrag_service.retrieve,
                     query_text,
                     limit=3,
                     structured_limit=10
@@ -532,14 +536,7 @@ async def nutrition_query(
         
         # Step 2: If no formulations found via GraphRAG, search by keyword
         if not formulation_ids:
-            search_query = """
-            MATCH (f:Formulation)
-            WHERE toLower(f.name) CONTAINS toLower($query) 
-               OR toLower(f.description) CONTAINS toLower($query)
-            RETURN f.id as id
-            LIMIT 5
-            """
-            results = neo4j_client.execute_query(search_query, {"query": query_text})
+            results = await neo4j_client.execute_read(queries.FORMULATION_KEYWORD_IDS, {"query": query_text})
             formulation_ids = [r.get("id") for r in results if r.get("id")]
         
         if not formulation_ids:
@@ -551,15 +548,15 @@ async def nutrition_query(
             }
         
         # Step 3: Generate nutrition labels for found formulations
-        nutrition_service = NutritionCalculationService(neo4j_client)
-        nutrition_labels = []
+        nutrition_labels: List[Dict[str, Any]] = []
         
         for formulation_id in formulation_ids[:3]:  # Limit to 3 results
             try:
                 nutrition_facts = await nutrition_service.calculate_nutrition_label(
                     formulation_id=formulation_id,
                     serving_size=100.0,
-                    serving_size_unit="g"
+                    serving_size_unit="g",
+                    servings_per_container=None,
                 )
 
                 nutrition_labels.append({
@@ -3,6 +3,8 @@ from neo4j import exceptions as neo4j_exceptions
 from datetime import datetime
 import logging
 
+from app.db import queries
+from app.db.neo4j_client import get_async_neo4j_client
 from app.models.schemas import (
     CalculationRequest,
     CalculationResponse,
@@ -55,7 +57,7 @@ async def calculate_scale(calc_request: CalculationRequest, request: Request):
     Converts units, calculates ingredient quantities, and computes costs.
     """
     
-    neo4j_client = request.app.state.neo4j_client
+    neo4j_client = get_async_neo4j_client(request)
     
     if not neo4j_client:
         raise HTTPException(
@@ -64,17 +66,7 @@ async def calculate_scale(calc_request: CalculationRequest, request: Request):
         )
     
     try:
-        query = """
-        MATCH (f:Formulation {id: $id})
-        OPTIONAL MATCH (f)-[c:CONTAINS]->(i:Food)
-        RETURN f.name as name, collect({
-            name: i.name,
-            percentage: c.percentage,
-            cost_per_kg: c.cost_per_kg
-        }) as ingredients
-        """
-        
-        records = neo4j_client.execute_query(query, {"id": calc_request.formulation_id})
+        records = await neo4j_client.execute_read(queries.FORMULATION_COST_INPUTS, {"id": calc_request.formulation_id})
         
         if not records:
             raise HTTPException(
@@ -7,14 +7,16 @@ from typing import Any, Callable, Dict, Optional
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from aiohttp import ClientError
-from neo4j.exceptions import Neo4jError
+from neo4j.exceptions import DriverError, Neo4jError
 
 from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.db.neo4j_client import Neo4jClient
+from app.db.neo4j_client import AsyncNeo4jClient, Neo4jClient, neo4j_client_options
+from app.services.nutrient_registry import registry as nutrient_registry
 from app.services.ollama_service import OllamaService
 
 logger = logging.getLogger(__name__)
@@ -164,6 +166,66 @@ def _log_updates(changes: Dict[str, Any], request: Request) -> None:
     logger.info("Environment overrides updated", extra={"changes": redacted, "client": client_host})
 
 
+async def _refresh_neo4j_clients(state: Any) -> None:
+    """Replace both Neo4j clients after a settings change and close the old ones.
+
+    The pool controllers and every service holding a client are pointed at
+    the replacement before the old driver is closed. An old client is only
+    closed once a new one has replaced it; if the async reconnect fails, the
+    existing async client stays in place.
+    """
+    options = neo4j_client_options(settings)
+    try:
+        refreshed_client = Neo4jClient(**options)
+        await run_in_threadpool(refreshed_client.connect)
+    except (Neo4jError, OSError) as exc:  # pragma: no cover - best effort
+        logger.warning("Neo4j client refresh failed after settings update: %s", exc)
+        return
+
+    async_client = AsyncNeo4jClient(**options)
+    refreshed_async_client: Optional[AsyncNeo4jClient] = None
+    try:
+        await async_client.connect()
+        refreshed_async_client = async_client
+    except (Neo4jError, DriverError, OSError) as exc:  # pragma: no cover - best effort
+        logger.warning("Async Neo4j client refresh failed after settings update: %s", exc)
+
+    controllers = getattr(state, "neo4j_pool_controllers", None) or {}
+
+    existing_client = getattr(state, "neo4j_client", None)
+    state.neo4j_client = refreshed_client
+    if "neo4j" in controllers:
+        controllers["neo4j"].monitor = refreshed_client.pool_monitor
+    for holder in (
+        getattr(state, "formulation_pipeline", None),
+        getattr(state, "graph_schema_service", None),
+        getattr(state, "graphrag_retrieval_service", None),
+    ):
+        if holder is not None:
+            holder.neo4j_client = refreshed_client
+    if existing_client is not None:
+        with suppress(Neo4jError, OSError):  # pragma: no cover - best effort
+            await run_in_threadpool(existing_client.close)
+
+    if refreshed_async_client is None:
+        return
+
+    existing_async_client = getattr(state, "async_neo4j_client", None)
+    state.async_neo4j_client = refreshed_async_client
+    if "neo4j_async" in controllers:
+        controllers["neo4j_async"].monitor = refreshed_async_client.pool_monitor
+    for holder in (
+        getattr(state, "nutrient_profile_store", None),
+        getattr(state, "food_resolver", None),
+        nutrient_registry,
+    ):
+        if holder is not None:
+            holder.neo4j_client = refreshed_async_client
+    if existing_async_client is not None:
+        with suppress(Neo4jError, DriverError, OSError):  # pragma: no cover - best effort
+            await existing_async_client.close()
+
+
 @router.get("", response_model=EnvSettingsResponse)
 async def read_env_settings() -> EnvSettingsResponse:
     """Return environment overrides that can be edited from the frontend."""
@@ -225,27 +287,7 @@ async def update_env_settings(payload: EnvSettingsPayload, request: Request) ->
     neo4j_password = settings.NEO4J_PASSWORD
 
     if neo4j_uri and neo4j_user and neo4j_password:
-        try:
-            refreshed_client = Neo4jClient(
-                uri=neo4j_uri,
-                user=neo4j_user,
-                password=neo4j_password,
-                database=settings.NEO4J_DATABASE,
-                max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
-                max_connection_lifetime_seconds=settings.NEO4J_MAX_CONNECTION_LIFETIME_SECONDS,
-                connection_acquisition_timeout_seconds=settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
-                encrypted=settings.NEO4J_ENCRYPTED,
-            )
-            refreshed_client.connect()
-
-            existing_client = getattr(request.app.state, "neo4j_client", None)
-            if existing_client is not None:
-                with suppress(Neo4jError, OSError):  # pragma: no cover - best effort
-                    existing_client.close()
-
-            request.app.state.neo4j_client = refreshed_client
-        except (Neo4jError, OSError) as exc:  # pragma: no cover - best effort
-            logger.warning("Neo4j client refresh failed after settings update: %s", exc)
+        await _refresh_neo4j_clients(request.app.state)
 
     ollama_base_url = settings.OLLAMA_BASE_URL
     ollama_model = settings.OLLAMA_MODEL
@@ -1,8 +1,9 @@
 import logging
 import time
-from typing import List, TYPE_CHECKING
+from typing import Any, List, TYPE_CHECKING
 
 from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from neo4j import exceptions as neo4j_exceptions
 
 from app.core.config import settings
@@ -17,6 +18,7 @@ from app.models.schemas import (
     FDCSearchRequest,
 )
 from app.services.fdc_service import FDCService, FDCServiceError
+from app.services.nutrient_profiles import FOODS_INGESTED_EVENT
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.db.neo4j_client import Neo4jClient
@@ -110,7 +112,9 @@ async def ingest_foods(payload: FDCIngestRequest, request: Request) -> FDCIngest
     api_key = _resolve_api_key(payload.api_key)
     fdc_service, neo4j_client = _get_services(request)
 
-    return await _perform_ingestion(api_key, payload.fdc_ids, fdc_service, neo4j_client)
+    return await _perform_ingestion(
+        api_key, payload.fdc_ids, fdc_service, neo4j_client, getattr(request.app.state, "formulation_event_bus", None)
+    )
 
 
 @router.post("/quick-ingest", response_model=FDCIngestResponse, summary="Search and ingest foods from a term")
@@ -149,7 +153,9 @@ async def quick_ingest(payload: FDCQuickIngestRequest, request: Request) -> FDCI
             duration_ms=0,
         )
 
-    return await _perform_ingestion(api_key, fdc_ids, fdc_service, neo4j_client)
+    return await _perform_ingestion(
+        api_key, fdc_ids, fdc_service, neo4j_client, getattr(request.app.state, "formulation_event_bus", None)
+    )
 
 
 @router.get("/foods", summary="List foods ingested into Neo4j from FDC")
@@ -167,7 +173,8 @@ async def list_ingested_foods(
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="FDC service unavailable")
 
     try:
-        return fdc_service.list_ingested_foods(
+        return await run_in_threadpool(
+            fdc_service.list_ingested_foods,
             neo4j_client,
             search=search,
             page=page,
@@ -187,24 +194,27 @@ async def _perform_ingestion(
     fdc_ids: List[int],
     fdc_service: FDCService,
     neo4j_client: "Neo4jClient",
+    event_bus: Any = None,
 ) -> FDCIngestResponse:
     start_time = time.perf_counter()
     failures: List[FDCIngestFailure] = []
     success_count = 0
+    ingested_ids: List[int] = []
 
     nodes_created = 0
     relationships_created = 0
     properties_set = 0
     nutrients_linked = 0
 
-    fdc_service.ensure_schema(neo4j_client)
+    await run_in_threadpool(fdc_service.ensure_schema, neo4j_client)
 
     for fdc_id in fdc_ids:
         try:
             food_data = await fdc_service.get_food_details(api_key, fdc_id)
-            ingest_stats = fdc_service.ingest_food(neo4j_client, food_data)
+            ingest_stats = await run_in_threadpool(fdc_service.ingest_food, neo4j_client, food_data)
 
             success_count += 1
+            ingested_ids.append(fdc_id)
             nodes_created += ingest_stats.get("nodes_created", 0)
             relationships_created += ingest_stats.get("relationships_created", 0)
             properties_set += ingest_stats.get("properties_set", 0)
@@ -219,6 +229,10 @@ async def _perform_ingestion(
             failures.append(FDCIngestFailure(fdc_id=fdc_id, message=message))
             logger.exception("Failed to ingest FDC food %s", fdc_id)
 
+    if ingested_ids and event_bus is not None:
+        # Re-ingested foods change the nutrient profiles of formulations derived from them
+        await event_bus.publish(FOODS_INGESTED_EVENT, {"fdc_ids": ingested_ids})
+
     duration_ms = int((time.perf_counter() - start_time) * 1000)
 
     summary = FDCIngestSummary(
@@ -1,24 +1,77 @@
 import logging
+import math
+from dataclasses import asdict
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from app.core.config import settings
 from app.core.rate_limit import limiter
+from app.db.causal import BOOKMARK_HEADER, CausalContext, InvalidBookmarkError
 from app.models.schemas import (
+    BulkImportResponse,
     FormulationCreate,
     FormulationUpdate,
     FormulationResponse,
     FormulationListResponse,
 )
+from app.services.formulation_import import import_formulations
 from app.services.formulation_pipeline import (
     FormulationDependencyError,
     FormulationPipelineError,
+    FormulationPipelineSaturatedError,
     get_formulation_pipeline,
 )
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+def _causal_context(request: Request) -> CausalContext:
+    """Build the causal context from the client's ``X-Neo4j-Bookmark`` header, if any."""
+    try:
+        return CausalContext.from_token(request.headers.get(BOOKMARK_HEADER))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {BOOKMARK_HEADER} header",
+        ) from exc
+
+
+def _invalid_bookmark(exc: InvalidBookmarkError) -> HTTPException:
+    """Report a bookmark the server does not recognise as the client's mistake, not an outage."""
+    logger.info("Rejected %s header: %s", BOOKMARK_HEADER, exc)
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Invalid {BOOKMARK_HEADER} header",
+    )
+
+
+def _saturated(exc: FormulationPipelineSaturatedError) -> HTTPException:
+    """Shed load with a 503 and a Retry-After hint instead of queueing without bound."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Formulation pipeline is busy, retry shortly",
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` already names ``etag`` (weak comparison, per RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _expose_bookmark(response: Response, causal: CausalContext) -> None:
+    token = causal.token()
+    if token:
+        response.headers[BOOKMARK_HEADER] = token
+
+
 @router.post(
     "",
     response_model=FormulationResponse,
@@ -26,10 +79,12 @@ logger = logging.getLogger(__name__)
     summary="Create Formulation",
 )
 @limiter.limit(settings.RATE_LIMIT_FORMULATION_WRITE)
-async def create_formulation(formulation: FormulationCreate, request: Request):
+async def create_formulation(formulation: FormulationCreate, request: Request, response: Response):
     """
     Create a new formulation with ingredients.
     Validates that ingredient percentages sum to 100% (with 0.1% tolerance).
+    The response carries an X-Neo4j-Bookmark token; send it back on follow-up
+    reads to be guaranteed to see this write.
     """
     pipeline = get_formulation_pipeline(request)
     if not pipeline:
@@ -38,10 +93,15 @@ async def create_formulation(formulation: FormulationCreate, request: Request):
             detail="Formulation pipeline not initialized"
         )
 
+    causal = _causal_context(request)
     try:
-        return await pipeline.create(formulation)
+        created = await pipeline.create(formulation, causal=causal)
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except FormulationPipelineSaturatedError as exc:
+        raise _saturated(exc) from exc
     except FormulationDependencyError as exc:
         logger.warning("Formulation create blocked by dependency", exc_info=True)
         raise HTTPException(
@@ -55,19 +115,93 @@ async def create_formulation(formulation: FormulationCreate, request: Request):
             detail="Failed to create formulation",
         ) from exc
 
+    _expose_bookmark(response, causal)
+    return created
+
+
+_BULK_CONTENT_TYPES = {
+    "application/x-ndjson": "jsonl",
+    "application/ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+    "text/csv": "csv",
+}
+
+
+@router.post("/bulk", response_model=BulkImportResponse, summary="Bulk Import Formulations")
+@limiter.limit(settings.RATE_LIMIT_FORMULATION_WRITE)
+async def bulk_import_formulations(request: Request, response: Response):
+    """
+    Import many formulations from a JSON Lines or CSV request body.
+    Rows are validated as the body streams in and written in batches of
+    FORMULATION_BULK_BATCH_SIZE. Invalid rows are reported by line number
+    without failing the rest of the import.
+    """
+    pipeline = get_formulation_pipeline(request)
+    if not pipeline:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Formulation pipeline not initialized"
+        )
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = _BULK_CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv",
+        )
+
+    causal = _causal_context(request)
+    try:
+        summary = await import_formulations(
+            pipeline,
+            request.stream(),
+            fmt=fmt,
+            batch_size=settings.FORMULATION_BULK_BATCH_SIZE,
+            max_rows=settings.FORMULATION_BULK_MAX_ROWS,
+            causal=causal,
+        )
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
+    logger.info(
+        "Bulk import: %d created, %d failed in %d batches (%.0f rows/s)",
+        summary.created,
+        summary.failed,
+        summary.batches,
+        summary.rows_per_second,
+    )
+    _expose_bookmark(response, causal)
+    return BulkImportResponse(**asdict(summary), rows_per_second=summary.rows_per_second)
+
 
 @router.get("", response_model=FormulationListResponse, summary="List Formulations")
-async def list_formulations(request: Request, limit: int = 50, skip: int = 0):
+async def list_formulations(
+    request: Request, response: Response, limit: int = 50, skip: int = 0, cursor: Optional[str] = None
+):
     """
-    List all formulations from Neo4j database.
+    List all formulations from Neo4j database, most recently changed first.
+    Pass the ``next_cursor`` of a page as ``cursor`` to fetch the next one;
+    unlike ``skip``, cursor pages cost the same at any depth.
+    Send a page's ETag back as ``If-None-Match`` to get 304 when it is unchanged.
     Returns empty list if Neo4j is not connected.
     """
     pipeline = get_formulation_pipeline(request)
     if not pipeline:
         return FormulationListResponse(formulations=[], total_count=0)
 
+    if cursor and skip:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either cursor or skip, not both")
+
+    causal = _causal_context(request)
     try:
-        return await pipeline.list(skip=skip, limit=limit)
+        page = await pipeline.list(skip=skip, limit=limit, cursor=cursor, causal=causal)
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except FormulationPipelineSaturatedError as exc:
+        raise _saturated(exc) from exc
     except FormulationDependencyError as exc:
         logger.warning("Formulation list blocked by dependency", exc_info=True)
         raise HTTPException(
@@ -81,11 +215,18 @@ async def list_formulations(request: Request, limit: int = 50, skip: int = 0):
             detail="Failed to fetch formulations",
         ) from exc
 
+    etag = pipeline.list_etag(page)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return page
+
 
 @router.get("/{formulation_id}", response_model=FormulationResponse, summary="Get Formulation")
 async def get_formulation(formulation_id: str, request: Request):
     """
     Get a specific formulation by ID.
+    Send its ETag back as ``If-None-Match`` to get 304 when it is unchanged.
     """
     pipeline = get_formulation_pipeline(request)
     if not pipeline:
@@ -94,8 +235,13 @@ async def get_formulation(formulation_id: str, request: Request):
             detail="Formulation pipeline not initialized"
         )
 
+    causal = _causal_context(request)
     try:
-        formulation = await pipeline.get(formulation_id)
+        entry = await pipeline.get_entry(formulation_id, causal=causal)
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
+    except FormulationPipelineSaturatedError as exc:
+        raise _saturated(exc) from exc
     except FormulationDependencyError as exc:
         logger.warning("Formulation fetch blocked by dependency", exc_info=True)
         raise HTTPException(
@@ -109,13 +255,16 @@ async def get_formulation(formulation_id: str, request: Request):
             detail="Failed to fetch formulation",
         ) from exc
 
-    if not formulation:
+    if entry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Formulation {formulation_id} not found"
         )
 
-    return formulation
+    if _not_modified(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+    # The cached payload is the response body already; skip re-serializing it
+    return Response(content=entry.payload, media_type="application/json", headers={"ETag": entry.etag})
 
 
 @router.put(
@@ -124,7 +273,7 @@ async def get_formulation(formulation_id: str, request: Request):
     summary="Update Formulation",
 )
 @limiter.limit(settings.RATE_LIMIT_FORMULATION_WRITE)
-async def update_formulation(formulation_id: str, update: FormulationUpdate, request: Request):
+async def update_formulation(formulation_id: str, update: FormulationUpdate, request: Request, response: Response):
     """Update formulation metadata and, optionally, ingredient composition."""
     pipeline = get_formulation_pipeline(request)
     if not pipeline:
@@ -133,14 +282,19 @@ async def update_formulation(formulation_id: str, update: FormulationUpdate, req
             detail="Formulation pipeline not initialized"
         )
 
+    causal = _causal_context(request)
     try:
-        return await pipeline.update(formulation_id, update)
+        updated = await pipeline.update(formulation_id, update, causal=causal)
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except LookupError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    except FormulationPipelineSaturatedError as exc:
+        raise _saturated(exc) from exc
     except FormulationDependencyError as exc:
         logger.warning("Formulation update blocked by dependency", exc_info=True)
         raise HTTPException(
@@ -154,13 +308,16 @@ async def update_formulation(formulation_id: str, update: FormulationUpdate, req
             detail="Failed to update formulation",
         ) from exc
 
+    _expose_bookmark(response, causal)
+    return updated
+
 
 @router.delete(
     "/{formulation_id}",
     summary="Delete Formulation",
 )
 @limiter.limit(settings.RATE_LIMIT_FORMULATION_WRITE)
-async def delete_formulation(formulation_id: str, request: Request):
+async def delete_formulation(formulation_id: str, request: Request, response: Response):
     """Delete a formulation and its ingredient relationships."""
     pipeline = get_formulation_pipeline(request)
     if not pipeline:
@@ -169,12 +326,17 @@ async def delete_formulation(formulation_id: str, request: Request):
             detail="Formulation pipeline not initialized"
         )
 
+    causal = _causal_context(request)
     try:
-        await pipeline.delete(formulation_id)
+        await pipeline.delete(formulation_id, causal=causal)
+    except InvalidBookmarkError as exc:
+        raise _invalid_bookmark(exc) from exc
     except LookupError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    except FormulationPipelineSaturatedError as exc:
+        raise _saturated(exc) from exc
     except FormulationDependencyError as exc:
         logger.warning("Formulation delete blocked by dependency", exc_info=True)
         raise HTTPException(
@@ -188,4 +350,5 @@ async def delete_formulation(formulation_id: str, request: Request):
             detail="Failed to delete formulation",
         ) from exc
 
+    _expose_bookmark(response, causal)
     return {"detail": f"Formulation {formulation_id} deleted"}
@@ -1,15 +1,18 @@
+import json
 import logging
-from typing import Annotated
+from typing import Annotated, Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query, Request, status
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from neo4j.exceptions import AuthError, Neo4jError, ServiceUnavailable
 
 from app.core.config import settings
 from app.core.rate_limit import limiter
+from app.db.neo4j_client import MAX_EXPORT_PAGE_SIZE, get_async_neo4j_client
 from app.models.schemas import (
     GraphDataResponse,
+    GraphExportResponse,
     GraphSchemaResetRequest,
     GraphSchemaResponse,
     GraphSchemaUpsertRequest,
@@ -34,7 +37,7 @@ async def get_graph_data(
     Returns nodes and relationships for rendering in graph visualization tools.
     """
     
-    neo4j_client = request.app.state.neo4j_client
+    neo4j_client = get_async_neo4j_client(request)
     
     if not neo4j_client:
         raise HTTPException(
@@ -43,7 +46,7 @@ async def get_graph_data(
         )
     
     try:
-        graph_data = neo4j_client.get_graph_data(limit=limit)
+        graph_data = await neo4j_client.get_graph_data(limit=limit)
         
         return GraphDataResponse(
             nodes=graph_data.get('nodes', []),
@@ -65,6 +68,156 @@ async def get_graph_data(
         ) from exc
 
 
+@router.get("/export", response_model=GraphExportResponse, summary="Export the graph page by page")
+@limiter.limit(settings.RATE_LIMIT_GRAPH_READ)
+async def export_graph(
+    request: Request,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_EXPORT_PAGE_SIZE, description="Maximum number of start nodes per page")
+    ] = 200,
+    cursor: Annotated[Optional[str], Query(description="next_cursor from the previous page")] = None,
+    labels: Annotated[
+        Optional[List[str]], Query(alias="label", description="Only include nodes with one of these labels")
+    ] = None,
+    degree_cap: Annotated[
+        Optional[int], Query(ge=1, le=1000, description="Maximum outgoing relationships returned per node")
+    ] = None,
+):
+    """
+    Walk the graph in stable pages keyed on node element ids.
+
+    Nodes come in element id order, so following ``next_cursor`` visits every
+    node exactly once even while other pages are being rendered. Hub nodes
+    contribute at most ``degree_cap`` relationships and are listed in
+    ``truncated_nodes`` with their full degree.
+
+    Each page costs O(N) in the number of nodes, not O(page). Neo4j has no
+    index on element ids, so every page scans all nodes (or all nodes
+    carrying ``labels``) and sorts the ones past the cursor. Only the
+    response size is bounded by ``limit``.
+    """
+
+    neo4j_client = get_async_neo4j_client(request)
+
+    if not neo4j_client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Neo4j database not connected"
+        )
+
+    try:
+        page = await neo4j_client.export_subgraph(
+            limit=limit,
+            cursor=cursor,
+            labels=labels,
+            degree_cap=degree_cap or settings.GRAPH_EXPORT_DEGREE_CAP,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except NEO4J_UNAVAILABLE_EXCEPTIONS as exc:
+        logger.warning("Neo4j unavailable while exporting graph data", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Neo4j database unavailable",
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+    return GraphExportResponse(
+        nodes=page["nodes"],
+        edges=page["edges"],
+        node_count=len(page["nodes"]),
+        edge_count=len(page["edges"]),
+        next_cursor=page["next_cursor"],
+        truncated_nodes=page["truncated_nodes"],
+    )
+
+
+@router.get(
+    "/data/stream",
+    summary="Stream graph data as NDJSON",
+    response_class=StreamingResponse,
+)
+@limiter.limit(settings.RATE_LIMIT_GRAPH_READ)
+async def stream_graph_data(
+    request: Request,
+    limit: Annotated[int, Query(ge=1, description="Maximum number of node rows to fetch")] = 10_000,
+):
+    """
+    Stream nodes and edges as newline-delimited JSON for progressive rendering.
+
+    Each line is a node (``{"kind": "node", ...}``) or an edge
+    (``{"kind": "edge", ...}``) in the same shape as ``/data``; every node is
+    emitted once, before any edge that references it. A final
+    ``{"kind": "summary", ...}`` line marks a complete stream.
+    """
+
+    neo4j_client = get_async_neo4j_client(request)
+
+    if not neo4j_client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Neo4j database not connected"
+        )
+
+    max_rows = settings.GRAPH_STREAM_MAX_ROWS
+    elements = neo4j_client.stream_graph_data(min(limit, max_rows), max_limit=max_rows)
+
+    # Pull the first element before responding so connection failures still
+    # surface as a 503 rather than as a truncated 200 stream.
+    try:
+        first = await anext(elements, None)
+    except NEO4J_UNAVAILABLE_EXCEPTIONS as exc:
+        logger.warning("Neo4j unavailable while streaming graph data", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Neo4j database unavailable",
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+    return StreamingResponse(
+        _graph_ndjson(first, elements),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _graph_ndjson(
+    first: Tuple[str, Dict[str, Any]] | None,
+    elements: AsyncGenerator[Tuple[str, Dict[str, Any]], None],
+) -> AsyncIterator[str]:
+    counts = {"node": 0, "edge": 0}
+
+    def _line(kind: str, entry: Dict[str, Any]) -> str:
+        counts[kind] += 1
+        return json.dumps({"kind": kind, **entry}, default=str) + "\n"
+
+    if first is None:
+        yield json.dumps({"kind": "summary", "node_count": 0, "edge_count": 0}) + "\n"
+        return
+
+    try:
+        yield _line(*first)
+        async for kind, entry in elements:
+            yield _line(kind, entry)
+    except NEO4J_UNAVAILABLE_EXCEPTIONS as exc:
+        # Headers are already sent; report the failure in-band instead.
+        logger.warning("Neo4j graph stream interrupted", exc_info=True)
+        yield json.dumps({"kind": "error", "detail": str(exc)}) + "\n"
+        return
+    finally:
+        # Release the Neo4j session promptly when the client disconnects early.
+        await elements.aclose()
+
+    yield json.dumps({"kind": "summary", "node_count": counts["node"], "edge_count": counts["edge"]}) + "\n"
+
+
 @router.get("/schema", response_model=GraphSchemaResponse, summary="Get graph schema metadata")
 @limiter.limit(settings.RATE_LIMIT_GRAPH_READ)
 async def get_graph_schema(request: Request):
@@ -259,7 +412,8 @@ async def search_graph(payload: GraphSearchRequest, request: Request):
     search_service = GraphSearchService(neo4j_client, graphrag_service)
 
     try:
-        result = search_service.search(
+        result = await run_in_threadpool(
+            search_service.search,
             payload.query,
             mode=payload.mode,
             limit=payload.limit,
@@ -3,6 +3,7 @@ import asyncio
 import logging
 
 from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
 from neo4j import GraphDatabase
 from neo4j.exceptions import Neo4jError, ServiceUnavailable, AuthError
 
@@ -39,7 +40,7 @@ async def check_service_health(request: Request):
     
     if hasattr(request.app.state, 'neo4j_client') and request.app.state.neo4j_client:
         try:
-            neo4j_available = request.app.state.neo4j_client.check_health()
+            neo4j_available = await run_in_threadpool(request.app.state.neo4j_client.check_health)
         except (Neo4jError, ServiceUnavailable, AuthError, OSError) as exc:
             logger.debug("Neo4j health probe failed: %s", exc)
     
@@ -77,6 +78,10 @@ async def test_neo4j_connection(payload: Neo4jConnectionTest) -> Neo4jConnection
     if password == "********":
         password = settings.NEO4J_PASSWORD
 
+    return await run_in_threadpool(_probe_neo4j_connection, payload, password)
+
+
+def _probe_neo4j_connection(payload: Neo4jConnectionTest, password: str) -> Neo4jConnectionTestResponse:
     driver = None
     try:
         driver = GraphDatabase.driver(payload.uri, auth=(payload.username, password))
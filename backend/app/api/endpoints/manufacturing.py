@@ -5,6 +5,9 @@ from typing import Any, Dict
 
 from fastapi import APIRouter, HTTPException, Request, status
 
+from app.db import queries
+from app.db.neo4j_client import get_async_neo4j_client
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
@@ -12,7 +15,7 @@ router = APIRouter()
 @router.get("/unit-operations", summary="Get all unit operations from Neo4j")
 async def get_unit_operations(request: Request) -> Dict[str, Any]:
     """Retrieve all UnitOperation nodes from Neo4j graph."""
-    neo4j_client = getattr(request.app.state, "neo4j_client", None)
+    neo4j_client = get_async_neo4j_client(request)
     
     if neo4j_client is None:
         raise HTTPException(
@@ -21,22 +24,7 @@ async def get_unit_operations(request: Request) -> Dict[str, Any]:
         )
     
     try:
-        query = """
-        MATCH (op:UnitOperation)
-        RETURN op {
-            .operation_id,
-            .operation_type,
-            .equipment_type,
-            .typical_time_min,
-            .typical_temperature_c,
-            .cost_per_hour,
-            .parameters,
-            .equipment_types
-        } as operation
-        ORDER BY op.operation_type
-        """
-        
-        result = neo4j_client.execute_read(query)
+        result = await neo4j_client.execute_read(queries.MANUFACTURING_UNIT_OPERATIONS)
         operations = {}
         
         for record in result:
@@ -56,7 +44,7 @@ async def get_unit_operations(request: Request) -> Dict[str, Any]:
 @router.get("/equipment", summary="Get all equipment from Neo4j")
 async def get_equipment(request: Request) -> Dict[str, Any]:
     """Retrieve all Equipment nodes from Neo4j graph."""
-    neo4j_client = getattr(request.app.state, "neo4j_client", None)
+    neo4j_client = get_async_neo4j_client(request)
     
     if neo4j_client is None:
         raise HTTPException(
@@ -65,20 +53,7 @@ async def get_equipment(request: Request) -> Dict[str, Any]:
         )
     
     try:
-        query = """
-        MATCH (eq:Equipment)
-        RETURN eq {
-            .equipment_id,
-            .equipment_type,
-            .batch_size_category,
-            .min_batch_size_l,
-            .max_batch_size_l,
-            .cost_per_batch
-        } as equipment
-        ORDER BY eq.equipment_type
-        """
-        
-        result = neo4j_client.execute_read(query)
+        result = await neo4j_client.execute_read(queries.MANUFACTURING_EQUIPMENT)
         equipment_list = [record["equipment"] for record in result]
         
         return {"equipment": equipment_list}
@@ -93,7 +68,7 @@ async def get_equipment(request: Request) -> Dict[str, Any]:
 @router.get("/material-grades", summary="Get all material grades from Neo4j")
 async def get_material_grades(request: Request) -> Dict[str, Any]:
     """Retrieve all MaterialGrade nodes from Neo4j graph."""
-    neo4j_client = getattr(request.app.state, "neo4j_client", None)
+    neo4j_client = get_async_neo4j_client(request)
     
     if neo4j_client is None:
         raise HTTPException(
@@ -102,19 +77,7 @@ async def get_material_grades(request: Request) -> Dict[str, Any]:
         )
     
     try:
-        query = """
-        MATCH (mg:MaterialGrade)
-        RETURN mg {
-            .grade_id,
-            .name,
-            .certifications,
-            .cost_multiplier,
-            .description
-        } as grade
-        ORDER BY mg.grade_id
-        """
-        
-        result = neo4j_client.execute_read(query)
+        result = await neo4j_client.execute_read(queries.MANUFACTURING_MATERIAL_GRADES)
         grades = {}
         
         for record in result:
@@ -1,22 +1,71 @@
 """Nutrition label API endpoints."""
 
 from fastapi import APIRouter, Request, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from neo4j import exceptions as neo4j_exceptions
-from typing import Optional
+from dataclasses import asdict
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
+import json
 import logging
 
-from app.services.nutrition_service import NutritionCalculationService
+from app.core.config import settings
+from app.core.rate_limit import limiter
+from app.db.neo4j_client import get_async_neo4j_client
+from app.models.schemas import NutritionLabelBatchRequest
+from app.services.nutrient_profiles import get_nutrient_profile_store
+from app.services.nutrition_service import (
+    NutritionCalculationService,
+    NutritionFacts,
+    NutritionLabelRequest,
+    NutritionLabelResult,
+)
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Keys of the "nutrients" object in a label response, in display order
+_LABEL_NUTRIENTS = (
+    "total_fat",
+    "saturated_fat",
+    "trans_fat",
+    "cholesterol",
+    "sodium",
+    "total_carbohydrate",
+    "dietary_fiber",
+    "total_sugars",
+    "added_sugars",
+    "protein",
+    "vitamin_d",
+    "calcium",
+    "iron",
+    "potassium",
+)
+
+
+def _nutrition_facts_payload(nutrition_facts: NutritionFacts) -> Dict[str, Any]:
+    """Convert nutrition facts to the JSON shape the label endpoints return."""
+    return {
+        "formulation_id": nutrition_facts.formulation_id,
+        "formulation_name": nutrition_facts.formulation_name,
+        "serving_size": nutrition_facts.serving_size,
+        "serving_size_unit": nutrition_facts.serving_size_unit,
+        "servings_per_container": nutrition_facts.servings_per_container,
+        "calories": nutrition_facts.calories,
+        "nutrients": {field: asdict(getattr(nutrition_facts, field)) for field in _LABEL_NUTRIENTS},
+        "additional_nutrients": [asdict(nutrient) for nutrient in nutrition_facts.additional_nutrients],
+    }
+
 
 def get_nutrition_service(request: Request) -> Optional[NutritionCalculationService]:
     """Get nutrition calculation service from app state."""
-    neo4j_client = getattr(request.app.state, 'neo4j_client', None)  # type: ignore
+    neo4j_client = get_async_neo4j_client(request)
     if not neo4j_client:
         return None
-    return NutritionCalculationService(neo4j_client)
+    return NutritionCalculationService(
+        neo4j_client,
+        get_nutrient_profile_store(request),
+        getattr(request.app.state, "food_resolver", None),
+    )
 
 
 @router.post("/{formulation_id}/nutrition-label", summary="Generate Nutrition Label")
@@ -59,111 +108,8 @@ async def generate_nutrition_label(
             servings_per_container=servings_per_container
         )
         
-        # Convert to dict for JSON response
-        return {
-            "formulation_id": nutrition_facts.formulation_id,
-            "formulation_name": nutrition_facts.formulation_name,
-            "serving_size": nutrition_facts.serving_size,
-            "serving_size_unit": nutrition_facts.serving_size_unit,
-            "servings_per_container": nutrition_facts.servings_per_container,
-            "calories": nutrition_facts.calories,
-            "nutrients": {
-                "total_fat": {
-                    "name": nutrition_facts.total_fat.name,
-                    "amount": nutrition_facts.total_fat.amount,
-                    "unit": nutrition_facts.total_fat.unit,
-                    "daily_value_percent": nutrition_facts.total_fat.daily_value_percent
-                },
-                "saturated_fat": {
-                    "name": nutrition_facts.saturated_fat.name,
-                    "amount": nutrition_facts.saturated_fat.amount,
-                    "unit": nutrition_facts.saturated_fat.unit,
-                    "daily_value_percent": nutrition_facts.saturated_fat.daily_value_percent
-                },
-                "trans_fat": {
-                    "name": nutrition_facts.trans_fat.name,
-                    "amount": nutrition_facts.trans_fat.amount,
-                    "unit": nutrition_facts.trans_fat.unit,
-                    "daily_value_percent": nutrition_facts.trans_fat.daily_value_percent
-                },
-                "cholesterol": {
-                    "name": nutrition_facts.cholesterol.name,
-                    "amount": nutrition_facts.cholesterol.amount,
-                    "unit": nutrition_facts.cholesterol.unit,
-                    "daily_value_percent": nutrition_facts.cholesterol.daily_value_percent
-                },
-                "sodium": {
-                    "name": nutrition_facts.sodium.name,
-                    "amount": nutrition_facts.sodium.amount,
-                    "unit": nutrition_facts.sodium.unit,
-                    "daily_value_percent": nutrition_facts.sodium.daily_value_percent
-                },
-                "total_carbohydrate": {
-                    "name": nutrition_facts.total_carbohydrate.name,
-                    "amount": nutrition_facts.total_carbohydrate.amount,
-                    "unit": nutrition_facts.total_carbohydrate.unit,
-                    "daily_value_percent": nutrition_facts.total_carbohydrate.daily_value_percent
-                },
-                "dietary_fiber": {
-                    "name": nutrition_facts.dietary_fiber.name,
-                    "amount": nutrition_facts.dietary_fiber.amount,
-                    "unit": nutrition_facts.dietary_fiber.unit,
-                    "daily_value_percent": nutrition_facts.dietary_fiber.daily_value_percent
-                },
-                "total_sugars": {
-                    "name": nutrition_facts.total_sugars.name,
-                    "amount": nutrition_facts.total_sugars.amount,
-                    "unit": nutrition_facts.total_sugars.unit,
-                    "daily_value_percent": nutrition_facts.total_sugars.daily_value_percent
-                },
-                "added_sugars": {
-                    "name": nutrition_facts.added_sugars.name,
-                    "amount": nutrition_facts.added_sugars.amount,
-                    "unit": nutrition_facts.added_sugars.unit,
-                    "daily_value_percent": nutrition_facts.added_sugars.daily_value_percent
-                },
-                "protein": {
-                    "name": nutrition_facts.protein.name,
-                    "amount": nutrition_facts.protein.amount,
-                    "unit": nutrition_facts.protein.unit,
-                    "daily_value_percent": nutrition_facts.protein.daily_value_percent
-                },
-                "vitamin_d": {
-                    "name": nutrition_facts.vitamin_d.name,
-                    "amount": nutrition_facts.vitamin_d.amount,
-                    "unit": nutrition_facts.vitamin_d.unit,
-                    "daily_value_percent": nutrition_facts.vitamin_d.daily_value_percent
-                },
-                "calcium": {
-                    "name": nutrition_facts.calcium.name,
-                    "amount": nutrition_facts.calcium.amount,
-                    "unit": nutrition_facts.calcium.unit,
-                    "daily_value_percent": nutrition_facts.calcium.daily_value_percent
-                },
-                "iron": {
-                    "name": nutrition_facts.iron.name,
-                    "amount": nutrition_facts.iron.amount,
-                    "unit": nutrition_facts.iron.unit,
-                    "daily_value_percent": nutrition_facts.iron.daily_value_percent
-                },
-                "potassium": {
-                    "name": nutrition_facts.potassium.name,
-                    "amount": nutrition_facts.potassium.amount,
-                    "unit": nutrition_facts.potassium.unit,
-                    "daily_value_percent": nutrition_facts.potassium.daily_value_percent
-                }
-            },
-            "additional_nutrients": [
-                {
-                    "name": nutrient.name,
-                    "amount": nutrient.amount,
-                    "unit": nutrient.unit,
-                    "daily_value_percent": nutrient.daily_value_percent
-                }
-                for nutrient in nutrition_facts.additional_nutrients
-            ]
-        }
-        
+        return _nutrition_facts_payload(nutrition_facts)
+
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -175,3 +121,100 @@ async def generate_nutrition_label(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate nutrition label"
         ) from exc
+
+
+@router.post(
+    "/nutrition-labels",
+    summary="Generate Nutrition Labels in Batch",
+    response_class=StreamingResponse,
+)
+@limiter.limit(settings.RATE_LIMIT_GRAPH_READ)
+async def generate_nutrition_labels(payload: NutritionLabelBatchRequest, request: Request):
+    """
+    Generate nutrition labels for many formulations and serving sizes in one call.
+
+    All formulations are read with a single knowledge-graph query and their
+    labels are aggregated together. Results stream back as newline-delimited
+    JSON in completion order, not request order. Each line is a label
+    (``{"kind": "label", "index": ..., ...}``, the same shape as
+    ``/{formulation_id}/nutrition-label``) or a per-item error
+    (``{"kind": "error", "index": ..., "detail": ...}``). ``index`` is the
+    item's position in ``labels``. If Neo4j fails after streaming has
+    started, an error line without an ``index`` is written instead of the
+    remaining results. A final ``{"kind": "summary", ...}`` line ends the
+    stream.
+    """
+    if len(payload.labels) > settings.NUTRITION_LABEL_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.NUTRITION_LABEL_BATCH_MAX_ITEMS} labels per request",
+        )
+
+    nutrition_service = get_nutrition_service(request)
+    if not nutrition_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Nutrition service not available (Neo4j not connected)"
+        )
+
+    results = nutrition_service.calculate_nutrition_labels(
+        [NutritionLabelRequest(**item.model_dump()) for item in payload.labels]
+    )
+
+    # The service runs its batch query before yielding anything, so awaiting
+    # the first result surfaces a query failure as an error status rather
+    # than a truncated 200 stream.
+    try:
+        first = await anext(results, None)
+    except neo4j_exceptions.ServiceUnavailable as exc:
+        logger.warning("Neo4j unavailable while generating nutrition labels", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Neo4j database unavailable",
+        ) from exc
+    except (neo4j_exceptions.Neo4jError, RuntimeError) as exc:
+        logger.error("Failed to generate nutrition labels", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate nutrition labels"
+        ) from exc
+
+    return StreamingResponse(
+        _labels_ndjson(first, results),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _labels_ndjson(
+    first: Optional[NutritionLabelResult],
+    results: AsyncGenerator[NutritionLabelResult, None],
+) -> AsyncIterator[str]:
+    counts = {"label": 0, "error": 0}
+
+    def _line(result: NutritionLabelResult) -> str:
+        if result.facts is not None:
+            counts["label"] += 1
+            return json.dumps({"kind": "label", "index": result.index, **_nutrition_facts_payload(result.facts)}) + "\n"
+        counts["error"] += 1
+        return json.dumps(
+            {
+                "kind": "error",
+                "index": result.index,
+                "formulation_id": result.request.formulation_id,
+                "detail": result.error,
+            }
+        ) + "\n"
+
+    try:
+        if first is not None:
+            yield _line(first)
+            async for result in results:
+                yield _line(result)
+    except (neo4j_exceptions.Neo4jError, neo4j_exceptions.ServiceUnavailable) as exc:
+        # Headers are already sent; report the failure in-band instead.
+        logger.warning("Neo4j nutrition label stream interrupted", exc_info=True)
+        yield json.dumps({"kind": "error", "detail": str(exc)}) + "\n"
+    finally:
+        await results.aclose()
+
+    yield json.dumps({"kind": "summary", "label_count": counts["label"], "error_count": counts["error"]}) + "\n"
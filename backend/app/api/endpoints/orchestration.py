@@ -1,5 +1,6 @@
 import logging
 from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from neo4j import exceptions as neo4j_exceptions
 
 from app.models.orchestration import OrchestrationPersistRequest, OrchestrationPersistResponse
@@ -24,7 +25,7 @@ async def persist_orchestration_run(payload: OrchestrationPersistRequest, reques
     service = OrchestrationPersistenceService(neo4j_client)
 
     try:
-        summary = service.persist_run(write_set)
+        summary = await run_in_threadpool(service.persist_run, write_set)
     except (neo4j_exceptions.Neo4jError, RuntimeError, ValueError) as exc:  # pragma: no cover - surface driver errors
         logger.error("Failed to persist orchestration run %s", write_set.run.get("runId"), exc_info=True)
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to write orchestration run") from exc
@@ -47,7 +48,7 @@ async def get_run_graph(run_id: str, request: Request) -> GraphDataResponse:
     search_service = GraphSearchService(neo4j_client)
 
     try:
-        result = search_service.search(run_id, mode="orchestration")
+        result = await run_in_threadpool(search_service.search, run_id, mode="orchestration")
     except LookupError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Orchestration run not found")
     except RuntimeError as exc:
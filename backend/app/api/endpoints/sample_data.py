@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from neo4j import exceptions as neo4j_exceptions
 from datetime import datetime
 import logging
 
+from app.db import queries
 from app.models.schemas import (
     SampleDataLoadRequest,
     SampleDataLoadResponse
@@ -35,7 +37,7 @@ async def load_sample_data(load_request: SampleDataLoadRequest, request: Request
         
         if load_request.clear_existing:
             clear_query = "MATCH (n) DETACH DELETE n"
-            neo4j_client.execute_query(clear_query)
+            await run_in_threadpool(neo4j_client.execute_query, clear_query)
             logger.info("Cleared existing data")
         
         constraint_queries = [
@@ -47,7 +49,7 @@ async def load_sample_data(load_request: SampleDataLoadRequest, request: Request
         
         for query in constraint_queries:
             try:
-                neo4j_client.execute_query(query)
+                await run_in_threadpool(neo4j_client.execute_query, query)
             except neo4j_exceptions.ConstraintError:
                 pass
             except neo4j_exceptions.Neo4jError as exc:
@@ -56,23 +58,26 @@ async def load_sample_data(load_request: SampleDataLoadRequest, request: Request
         should_load_all = "all" in load_request.datasets
         
         if should_load_all or "potato_chips" in load_request.datasets:
-            result = load_potato_chips_data(neo4j_client)
+            result = await run_in_threadpool(load_potato_chips_data, neo4j_client)
             nodes_created += result["nodes"]
             relationships_created += result["relationships"]
             datasets_loaded.append("potato_chips")
         
         if should_load_all or "cola" in load_request.datasets:
-            result = load_cola_data(neo4j_client)
+            result = await run_in_threadpool(load_cola_data, neo4j_client)
             nodes_created += result["nodes"]
             relationships_created += result["relationships"]
             datasets_loaded.append("cola")
         
         if should_load_all or "juices" in load_request.datasets:
-            result = load_juices_data(neo4j_client)
+            result = await run_in_threadpool(load_juices_data, neo4j_client)
             nodes_created += result["nodes"]
             relationships_created += result["relationships"]
             datasets_loaded.append("juices")
         
+        # The datasets write created_at but not the list sort key, so page them in like any formulation
+        await run_in_threadpool(neo4j_client.execute_write, queries.FORMULATION_BACKFILL_SORT_KEYS)
+        
         execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
         
         return SampleDataLoadResponse(
@@ -441,7 +446,7 @@ async def clear_database(request: Request):
     
     try:
         query = "MATCH (n) DETACH DELETE n"
-        neo4j_client.execute_query(query)
+        await run_in_threadpool(neo4j_client.execute_query, query)
         
         return {"success": True, "message": "Database cleared successfully"}
     
@@ -1,6 +1,7 @@
 """Schema migration API endpoint."""
 
 from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from neo4j import exceptions as neo4j_exceptions
 from typing import Dict, Any
 import logging
@@ -35,7 +36,7 @@ async def migrate_to_knowledge_graph(request: Request) -> Dict[str, Any]:
         WHERE f.ingredients IS NOT NULL
         RETURN count(f) as formulations_with_ingredients
         """
-        result = neo4j_client.execute_query(check_query)
+        result = await run_in_threadpool(neo4j_client.execute_query, check_query)
         formulations_count = result[0]['formulations_with_ingredients'] if result else 0
         
         if formulations_count == 0:
@@ -111,7 +112,7 @@ async def migrate_to_knowledge_graph(request: Request) -> Dict[str, Any]:
                count(DISTINCT f) as formulations_processed
         """
         
-        result = neo4j_client.execute_query(migration_query)
+        result = await run_in_threadpool(neo4j_client.execute_query, migration_query)
         
         if not result:
             raise ValueError("Migration query returned no results")
@@ -132,7 +133,7 @@ async def migrate_to_knowledge_graph(request: Request) -> Dict[str, Any]:
         LIMIT 1
         """
         
-        verify_result = neo4j_client.execute_query(verify_query)
+        verify_result = await run_in_threadpool(neo4j_client.execute_query, verify_query)
         verification = verify_result[0] if verify_result else {}
         
         # Step 4: Create indexes
@@ -144,7 +145,7 @@ async def migrate_to_knowledge_graph(request: Request) -> Dict[str, Any]:
         
         for idx_query in index_queries:
             try:
-                neo4j_client.execute_write(idx_query)
+                await run_in_threadpool(neo4j_client.execute_write, idx_query)
             except neo4j_exceptions.ConstraintError:
                 continue
             except neo4j_exceptions.Neo4jError as exc:
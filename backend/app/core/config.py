@@ -55,7 +55,16 @@ class Settings(BaseSettings):
     NEO4J_MAX_CONNECTION_POOL_SIZE: int = Field(default=50, ge=1)
     NEO4J_MAX_CONNECTION_LIFETIME_SECONDS: int = Field(default=3600, ge=0)
     NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS: int = Field(default=60, ge=0)
+    NEO4J_MAX_TRANSACTION_RETRY_TIME_SECONDS: float = Field(default=30.0, ge=0)
+    NEO4J_FETCH_SIZE: int = Field(default=1000, ge=1)
     NEO4J_ENCRYPTED: bool = False
+    NEO4J_WARMUP_QUERY_PLANS: bool = True
+    NEO4J_PROFILE_SAMPLE_RATE: float = Field(default=0.0, ge=0.0, le=1.0)
+    NEO4J_PAYLOAD_SAMPLE_RATE: float = Field(default=0.1, ge=0.0, le=1.0)
+    NEO4J_POOL_ADAPTIVE: bool = False
+    NEO4J_POOL_MIN_SIZE: int = Field(default=5, ge=1)
+    NEO4J_POOL_TARGET_WAIT_MS: float = Field(default=50.0, ge=0)
+    NEO4J_POOL_ADJUST_INTERVAL_SECONDS: float = Field(default=30.0, gt=0)
 
     OLLAMA_BASE_URL: str = Field(default="")
     OLLAMA_MODEL: str = Field(default="llama2")
@@ -76,6 +85,8 @@ class Settings(BaseSettings):
     FDC_REQUEST_TIMEOUT: int = 30
 
     GRAPH_SCHEMA_NAME: str = "FormulationGraph"
+    GRAPH_STREAM_MAX_ROWS: int = Field(default=100_000, ge=1)
+    GRAPH_EXPORT_DEGREE_CAP: int = Field(default=25, ge=1)
 
     GRAPHRAG_CHUNK_INDEX_NAME: str = Field(default="knowledge_chunks")
     GRAPHRAG_METADATA_ID_KEYS: List[str] = Field(default_factory=list)
@@ -85,9 +96,29 @@ class Settings(BaseSettings):
 
     FORMULATION_CACHE_TTL_SECONDS: int = 20
     FORMULATION_CACHE_MAX_ENTRIES: int = 256
+    FORMULATION_CACHE_MAX_BYTES: int = Field(default=32 * 1024 * 1024, ge=1)
+    FORMULATION_CACHE_STALE_SECONDS: float = Field(default=0.0, ge=0)
     FORMULATION_RETRY_ATTEMPTS: int = 3
     FORMULATION_RETRY_BACKOFF_SECONDS: float = 0.35
     FORMULATION_RETRY_MAX_BACKOFF_SECONDS: float = 2.0
+    FORMULATION_MAX_CONCURRENCY: int = Field(default=8, ge=1)
+    FORMULATION_MAX_QUEUE_DEPTH: int = Field(default=64, ge=0)
+    FORMULATION_QUEUE_TIMEOUT_SECONDS: float = Field(default=2.0, ge=0)
+    FORMULATION_SHARED_CACHE_URL: str | None = None
+    FORMULATION_SHARED_CACHE_TTL_SECONDS: float = Field(default=60.0, gt=0)
+    FORMULATION_SHARED_CACHE_PREFIX: str = "formulation-graph:"
+    FORMULATION_SHARED_CACHE_CHANNEL: str = "formulations:events"
+    FORMULATION_BULK_BATCH_SIZE: int = Field(default=200, ge=1)
+    FORMULATION_BULK_MAX_ROWS: int = Field(default=50_000, ge=1)
+    FORMULATION_EVENT_WORKERS: int = Field(default=4, ge=0)
+    FORMULATION_EVENT_QUEUE_SIZE: int = Field(default=1024, ge=1)
+    FORMULATION_EVENT_HANDLER_TIMEOUT_SECONDS: float = Field(default=5.0, gt=0)
+    FORMULATION_EVENT_MAX_ATTEMPTS: int = Field(default=3, ge=1)
+    NUTRITION_LABEL_BATCH_MAX_ITEMS: int = Field(default=1000, ge=1)
+    NUTRITION_PROFILE_TTL_SECONDS: float = Field(default=300.0, gt=0)
+    NUTRITION_PROFILE_MAX_ENTRIES: int = Field(default=4096, ge=1)
+    NUTRITION_FOOD_MATCH_TTL_SECONDS: float = Field(default=3600.0, gt=0)
+    NUTRITION_FOOD_MATCH_MAX_ENTRIES: int = Field(default=10_000, ge=1)
 
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_DEFAULT: str | list[str] | None = "120/minute"
@@ -0,0 +1,138 @@
+"""Coalesce concurrent calls for the same key into one execution.
+
+When a hot cache entry expires, every concurrent reader misses at once. A
+single-flight group lets the first caller for a key run the load, and every
+caller that arrives while that load is in flight waits for its result
+instead of issuing its own query. :class:`SingleFlight` is for coroutines on
+one event loop. :class:`ThreadSingleFlight` is for blocking code called from
+worker threads.
+
+Results and exceptions are shared by every caller of the same flight, so
+callers must treat the result as read-only. Only coalesce reads that any
+caller could equally have issued. Reads pinned to a causal bookmark must
+not join a flight that started earlier.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from app.core.metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_CALLS = metrics_registry.counter(
+    "singleflight_calls_total",
+    "Calls through a single-flight group, by whether they ran the load or joined one in flight.",
+    ("group", "role"),
+)
+
+
+class SingleFlight(Generic[T]):
+    """Async single-flight group.
+
+    The load runs as its own task, so cancelling one waiting caller does not
+    cancel the load for the others.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._calls: Dict[Hashable, "asyncio.Task[T]"] = {}
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``load()``, sharing one execution per ``key``."""
+        task = self._calls.get(key)
+        if task is None:
+            SINGLEFLIGHT_CALLS.inc(self._name, "leader")
+            task = self._start(key, load)
+        else:
+            SINGLEFLIGHT_CALLS.inc(self._name, "shared")
+        return await asyncio.shield(task)
+
+    def refresh(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> None:
+        """Run ``load()`` in the background unless a flight for ``key`` is already running.
+
+        Used for stale-while-revalidate: the caller serves its stale value
+        and does not wait. Failures are logged, and the stale value keeps
+        being served until it ages out.
+        """
+        if key in self._calls:
+            return
+        SINGLEFLIGHT_CALLS.inc(self._name, "refresh")
+
+        def report(done: "asyncio.Task[T]") -> None:
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning("Background refresh of %r in %s failed: %s", key, self._name, done.exception())
+
+        self._start(key, load).add_done_callback(report)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _start(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        task = asyncio.ensure_future(load())
+        self._calls[key] = task
+
+        def finished(done: "asyncio.Task[T]") -> None:
+            if self._calls.get(key) is done:
+                del self._calls[key]
+            if not done.cancelled():
+                # Mark the exception retrieved; callers that awaited the flight already saw it
+                done.exception()
+
+        task.add_done_callback(finished)
+        return task
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ThreadSingleFlight(Generic[T]):
+    """Thread-safe single-flight group for blocking loads."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Return the result of ``load()``, sharing one execution per ``key``."""
+        with self._lock:
+            joined = self._calls.get(key)
+            leader = joined is None
+            call = joined if joined is not None else _Call()
+            if leader:
+                self._calls[key] = call
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(self._name, "shared")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        SINGLEFLIGHT_CALLS.inc(self._name, "leader")
+        try:
+            call.result = load()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+__all__ = ["SingleFlight", "ThreadSingleFlight"]
@@ -0,0 +1,116 @@
+"""Causal consistency helpers built on Neo4j driver bookmarks.
+
+A write transaction ends with a bookmark that identifies the database state it
+produced. A later transaction started with that bookmark waits until the
+serving cluster member has caught up to it, so a read routed to a follower or
+read replica still sees the preceding write. :class:`CausalContext` carries
+these bookmarks through one logical operation. It also round-trips them to
+HTTP clients as an opaque token in the ``X-Neo4j-Bookmark`` header.
+
+Only the token's shape is checked on the way in. Whether the bookmark strings
+mean anything is up to the server, which rejects unknown ones with one of
+:data:`INVALID_BOOKMARK_CODES`; :func:`is_invalid_bookmark` spots those so
+callers can report a client error rather than an outage.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Iterable, Optional
+
+from neo4j import Bookmarks
+from neo4j.exceptions import ClientError
+
+BOOKMARK_HEADER = "X-Neo4j-Bookmark"
+
+# Server errors for a bookmark this database never issued or cannot interpret
+INVALID_BOOKMARK_CODES = frozenset(
+    {
+        "Neo.ClientError.Transaction.InvalidBookmark",
+        "Neo.ClientError.Transaction.InvalidBookmarkMixture",
+    }
+)
+
+
+class InvalidBookmarkError(ValueError):
+    """Raised when the server rejects the bookmarks a client sent."""
+
+
+def is_invalid_bookmark(exc: BaseException) -> bool:
+    """Whether ``exc`` is the server rejecting a bookmark."""
+    return isinstance(exc, ClientError) and exc.code in INVALID_BOOKMARK_CODES
+
+
+class CausalContext:
+    """Bookmarks threaded through the client calls of one logical operation.
+
+    Pass the same context to consecutive calls. Every session started with it
+    waits for the bookmarks collected so far, and every write replaces them
+    with the bookmark it produced. A context is not meant to be shared between
+    concurrent operations; use :meth:`fork` and :meth:`join` for that.
+    """
+
+    __slots__ = ("_bookmarks",)
+
+    def __init__(self, bookmarks: Optional[Iterable[str]] = None) -> None:
+        values = [value for value in (bookmarks or ()) if value]
+        self._bookmarks: Optional[Bookmarks] = Bookmarks.from_raw_values(values) if values else None
+
+    @property
+    def bookmarks(self) -> Optional[Bookmarks]:
+        """Bookmarks to start the next session with, or ``None`` if there are none."""
+        return self._bookmarks
+
+    def __bool__(self) -> bool:
+        return self._bookmarks is not None
+
+    def update(self, bookmarks: Optional[Bookmarks]) -> None:
+        """Replace the tracked bookmarks with those returned by a finished session."""
+        if bookmarks:
+            self._bookmarks = bookmarks
+
+    def fork(self) -> "CausalContext":
+        """Return an independent copy for a parallel branch of the operation."""
+        branch = CausalContext()
+        branch._bookmarks = self._bookmarks
+        return branch
+
+    def join(self, branches: Iterable["CausalContext"]) -> None:
+        """Merge the bookmarks of parallel branches so later calls wait for all of them."""
+        merged = Bookmarks()
+        for branch in branches:
+            if branch._bookmarks:
+                merged = merged + branch._bookmarks
+        self.update(merged)
+
+    def token(self) -> str:
+        """Encode the bookmarks for the ``X-Neo4j-Bookmark`` header (empty if none)."""
+        if not self._bookmarks:
+            return ""
+        raw = json.dumps(sorted(self._bookmarks.raw_values), separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def from_token(cls, token: Optional[str]) -> "CausalContext":
+        """Decode a token produced by :meth:`token`; raises ``ValueError`` when malformed."""
+        if not token or not token.strip():
+            return cls()
+        padded = token.strip() + "=" * (-len(token.strip()) % 4)
+        try:
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise ValueError("Malformed bookmark token") from exc
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError("Malformed bookmark token")
+        return cls(values)
+
+
+__all__ = [
+    "BOOKMARK_HEADER",
+    "INVALID_BOOKMARK_CODES",
+    "CausalContext",
+    "InvalidBookmarkError",
+    "is_invalid_bookmark",
+]
@@ -1,31 +1,50 @@
-from datetime import date, datetime, time
-from decimal import Decimal
+import asyncio
+import base64
+import binascii
 import logging
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from fastapi import Request
 
-from neo4j import GraphDatabase, Driver
-from neo4j.exceptions import Neo4jError, ServiceUnavailable, AuthError
+from neo4j import READ_ACCESS, AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver
+from neo4j.exceptions import AuthError, ClientError, DriverError, Neo4jError, ServiceUnavailable
 
-try:  # neo4j graph primitives for richer JSON conversion
-    from neo4j.graph import Node as GraphNode, Relationship as GraphRelationship, Path as GraphPath
-except ImportError:  # pragma: no cover - fallback when graph helpers unavailable
-    GraphNode = GraphRelationship = GraphPath = None
-
-try:  # Neo4j temporal helpers are optional depending on driver version
-    from neo4j.time import (
-        Date as GraphDate,
-        DateTime as GraphDateTime,
-        Duration as GraphDuration,
-        Time as GraphTime,
-    )
-except ImportError:  # pragma: no cover - older driver fallback
-    GraphDate = GraphDateTime = GraphDuration = GraphTime = None
+from app.db import queries
+from app.db.causal import CausalContext
+from app.db.pool_monitor import AsyncPoolMonitor, PoolMonitor
+from app.db.query_metrics import QueryObservation
+from app.db.query_registry import NamedQuery, QueryLike, registry as query_registry
+from app.db.serializers import serialize_record, serialize_value
 
 logger = logging.getLogger(__name__)
 
-class Neo4jClient:
+_COUNTER_KEYS = ("nodes_created", "relationships_created", "properties_set")
+
+DEFAULT_EXPORT_DEGREE_CAP = 25
+MAX_EXPORT_PAGE_SIZE = 1000
+
+
+class Neo4jBatchWriteError(RuntimeError):
+    """Raised when batches of an ``execute_write_batch`` call still fail after retries.
+
+    Batches that succeeded stay committed. ``summary`` holds their aggregated
+    counters and ``failed_batches`` maps each failed batch index to its error.
+    """
+
+    def __init__(self, message: str, *, summary: Dict[str, Any], failed_batches: Dict[int, BaseException]) -> None:
+        super().__init__(message)
+        self.summary = summary
+        self.failed_batches = failed_batches
+
+
+class _Neo4jClientBase:
+    """Connection settings and value conversion shared by the sync and async clients."""
+
+    _pool_monitor_class: Any = PoolMonitor
+    _pool_label = "sync"
+
     def __init__(
         self,
         uri: str,
@@ -36,80 +55,512 @@ class Neo4jClient:
         max_connection_pool_size: Optional[int] = None,
         max_connection_lifetime_seconds: Optional[int] = None,
         connection_acquisition_timeout_seconds: Optional[int] = None,
+        max_transaction_retry_time_seconds: Optional[float] = None,
+        fetch_size: int = 1000,
+        profile_sample_rate: float = 0.0,
+        payload_sample_rate: float = 0.0,
         encrypted: bool = False,
     ) -> None:
         self.uri = uri
         self.user = user
         self.password = password
         self.database = database
-        self.driver: Optional[Driver] = None
+        self.driver: Any = None
+        self.fetch_size = fetch_size
+        # Fractions of calls that capture PROFILE db hits / JSON result size
+        self.profile_sample_rate = profile_sample_rate
+        self.payload_sample_rate = payload_sample_rate
         self._max_connection_pool_size = max_connection_pool_size
         self._max_connection_lifetime_seconds = max_connection_lifetime_seconds
         self._connection_acquisition_timeout_seconds = connection_acquisition_timeout_seconds
+        self._max_transaction_retry_time_seconds = max_transaction_retry_time_seconds
         self._encrypted = encrypted
-    
-    def connect(self):
+        # Sessions are admitted through the monitor so pool usage can be observed
+        self.pool_monitor = self._pool_monitor_class(
+            max_connection_pool_size,
+            connection_acquisition_timeout_seconds,
+            client=self._pool_label,
+        )
+
+    def _driver_options(self) -> Dict[str, Any]:
+        connection_kwargs: Dict[str, Any] = {}
+        if self._max_connection_pool_size is not None:
+            connection_kwargs["max_connection_pool_size"] = self._max_connection_pool_size
+        if self._max_connection_lifetime_seconds is not None:
+            connection_kwargs["max_connection_lifetime"] = self._max_connection_lifetime_seconds
+        if self._connection_acquisition_timeout_seconds is not None:
+            connection_kwargs["connection_acquisition_timeout"] = (
+                self._connection_acquisition_timeout_seconds
+            )
+        if self._max_transaction_retry_time_seconds is not None:
+            # Upper bound for the driver's own retries of managed transactions
+            connection_kwargs["max_transaction_retry_time"] = self._max_transaction_retry_time_seconds
+        if self._encrypted:
+            connection_kwargs["encrypted"] = True
+        return connection_kwargs
+
+    @classmethod
+    def _record_to_dict(cls, record: Any) -> Dict[str, Any]:
+        # Convert Neo4j types to JSON-serializable primitives
+        return serialize_record(record)
+
+    @staticmethod
+    def _summary_counters(summary: Any) -> Dict[str, Any]:
+        return {
+            "nodes_created": summary.counters.nodes_created,
+            "relationships_created": summary.counters.relationships_created,
+            "properties_set": summary.counters.properties_set
+        }
+
+    # Kept for callers that convert ad-hoc values; see app.db.serializers.
+    _jsonify = staticmethod(serialize_value)
+
+    @staticmethod
+    def _prepare(
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]],
+        *,
+        expect_write: Optional[bool] = None,
+    ) -> Tuple[str, Dict[str, Any], Optional[NamedQuery]]:
+        """Resolve registry names and validate parameters for named queries.
+
+        ``expect_write`` guards the explicit read/write entry points against a
+        named query declared with the other access mode.
+        """
+        named = query_registry.resolve(query)
+        if named is None:
+            return query, dict(parameters or {}), None  # type: ignore[return-value]
+        if expect_write is not None and named.is_write != expect_write:
+            raise ValueError(f"Query {named.name!r} is declared as {named.access_mode}")
+        return named.cypher, named.validate(parameters), named
+
+    def _session_config(self, causal: Optional[CausalContext] = None, **extra: Any) -> Dict[str, Any]:
+        config: Dict[str, Any] = {"database": self.database, **extra}
+        if causal is not None and causal.bookmarks is not None:
+            config["bookmarks"] = causal.bookmarks
+        return config
+
+    def _observe(self, cypher: str, named: Optional[NamedQuery], mode: str) -> QueryObservation:
+        """Start measuring a call; only managed ``read``/``write`` calls are profiled."""
+        return QueryObservation(
+            cypher,
+            named,
+            mode,
+            profile_sample_rate=self.profile_sample_rate if mode in ("read", "write") else 0.0,
+            payload_sample_rate=self.payload_sample_rate,
+        )
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return live connection pool usage for health reporting."""
+        return self.pool_monitor.snapshot()
+
+    @staticmethod
+    def _row_batches(rows: Sequence[Dict[str, Any]], batch_size: int) -> List[List[Dict[str, Any]]]:
+        size = max(1, int(batch_size))
+        rows = list(rows)
+        return [rows[start : start + size] for start in range(0, len(rows), size)]
+
+    @staticmethod
+    def _batch_totals(row_count: int, batch_count: int) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {key: 0 for key in _COUNTER_KEYS}
+        totals.update({"rows": row_count, "batches": batch_count, "retried_batches": 0})
+        return totals
+
+    @staticmethod
+    def _add_counters(totals: Dict[str, Any], counters: Dict[str, Any]) -> None:
+        for key in _COUNTER_KEYS:
+            totals[key] += counters.get(key, 0) or 0
+
+    @staticmethod
+    def _batch_retryable(exc: BaseException) -> bool:
+        # Client errors (syntax, constraint violations, bad parameters) fail the same way every time
+        return not isinstance(exc, ClientError)
+
+    @staticmethod
+    def _raise_batch_failures(totals: Dict[str, Any], failures: Dict[int, BaseException]) -> None:
+        if not failures:
+            return
+        first_index = min(failures)
+        raise Neo4jBatchWriteError(
+            f"{len(failures)} of {totals['batches']} write batches failed; "
+            f"batch {first_index}: {failures[first_index]}",
+            summary=totals,
+            failed_batches=failures,
+        )
+
+    @staticmethod
+    def _graph_data_query(limit: int, max_limit: int = 500) -> Tuple[NamedQuery, Dict[str, Any]]:
         try:
-            connection_kwargs = {}
-            if self._max_connection_pool_size is not None:
-                connection_kwargs["max_connection_pool_size"] = self._max_connection_pool_size
-            if self._max_connection_lifetime_seconds is not None:
-                connection_kwargs["max_connection_lifetime"] = self._max_connection_lifetime_seconds
-            if self._connection_acquisition_timeout_seconds is not None:
-                connection_kwargs["connection_acquisition_timeout"] = (
-                    self._connection_acquisition_timeout_seconds
-                )
-            if self._encrypted:
-                connection_kwargs["encrypted"] = True
+            limit_value = int(limit)
+        except (TypeError, ValueError):
+            limit_value = 100
+        safe_limit = max(1, min(limit_value, max_limit))
+        return queries.GRAPH_DATA, {"limit": safe_limit}
 
+    @staticmethod
+    def encode_export_cursor(element_id: str) -> str:
+        """Encode the last exported element id as an opaque page cursor."""
+        return base64.urlsafe_b64encode(element_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_export_cursor(cursor: Optional[str]) -> Optional[str]:
+        """Return the element id behind ``cursor``; raises ``ValueError`` when malformed."""
+        if not cursor or not cursor.strip():
+            return None
+        token = cursor.strip()
+        try:
+            padded = (token + "=" * (-len(token) % 4)).encode("ascii")
+            element_id = base64.b64decode(padded, altchars=b"-_", validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise ValueError("Malformed export cursor") from exc
+        if not element_id:
+            raise ValueError("Malformed export cursor")
+        return element_id
+
+    @classmethod
+    def _graph_export_query(
+        cls,
+        limit: int,
+        *,
+        cursor: Optional[str],
+        labels: Optional[Sequence[str]],
+        degree_cap: int,
+    ) -> Tuple[NamedQuery, Dict[str, Any]]:
+        label_filter = sorted({label for label in labels or () if label}) or None
+        return queries.GRAPH_EXPORT_PAGE, {
+            "after": cls.decode_export_cursor(cursor),
+            "labels": label_filter,
+            "limit": max(1, min(int(limit), MAX_EXPORT_PAGE_SIZE)),
+            "degree_cap": max(1, int(degree_cap)),
+        }
+
+    @classmethod
+    def _build_export_page(cls, records: List[Dict[str, Any]], limit: int, degree_cap: int) -> Dict[str, Any]:
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+        truncated: List[Dict[str, Any]] = []
+        seen_nodes: Set[str] = set()
+        last_id: Optional[str] = None
+
+        for record in records:
+            node = cls._graph_node_entry(record.get("n"))
+            if node is None:
+                continue
+            last_id = node["id"]
+            if node["id"] not in seen_nodes:
+                seen_nodes.add(node["id"])
+                nodes.append(node)
+            for link in record.get("links") or ():
+                neighbour = cls._graph_node_entry(link.get("m"))
+                if neighbour is not None and neighbour["id"] not in seen_nodes:
+                    seen_nodes.add(neighbour["id"])
+                    nodes.append(neighbour)
+                rel = link.get("r")
+                if isinstance(rel, dict):
+                    edges.append({"id": rel.get("id"), **cls._graph_edge_entry(rel)})
+            degree = int(record.get("degree") or 0)
+            if degree > degree_cap:
+                truncated.append({"id": node["id"], "degree": degree})
+
+        # A short page means the scan is exhausted
+        full_page = len(records) >= limit and last_id is not None
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "next_cursor": cls.encode_export_cursor(last_id) if full_page else None,  # type: ignore[arg-type]
+            "truncated_nodes": truncated,
+        }
+
+    @staticmethod
+    def _graph_node_entry(raw: Any) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        if not isinstance(raw, dict):
+            try:
+                raw = dict(raw)
+            except TypeError:
+                return None
+        node_id = raw.get("id")
+        if node_id is None:
+            return None
+        labels = list(raw.get("labels") or [])
+        props = raw.get("properties") or {}
+        return {
+            "id": str(node_id),
+            "label": labels[0] if labels else props.get("label", "Unknown"),
+            "labels": labels,
+            "properties": props,
+        }
+
+    @staticmethod
+    def _graph_edge_entry(rel: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "source": str(rel.get("start")) if rel.get("start") is not None else None,
+            "target": str(rel.get("end")) if rel.get("end") is not None else None,
+            "type": rel.get("type"),
+            "properties": rel.get("properties") or {},
+        }
+
+    @classmethod
+    def _graph_elements(cls, record: Dict[str, Any], seen_nodes: Set[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield ``("node", entry)``/``("edge", entry)`` pairs for one n-r-m row.
+
+        Node ids already present in ``seen_nodes`` are skipped and new ones are
+        added, so callers can dedupe across a whole result without holding
+        the node payloads themselves.
+        """
+        for key in ("n", "m"):
+            node = cls._graph_node_entry(record.get(key))
+            if node is None or node["id"] in seen_nodes:
+                continue
+            seen_nodes.add(node["id"])
+            yield "node", node
+
+        rel = record.get("r")
+        if isinstance(rel, dict):
+            yield "edge", cls._graph_edge_entry(rel)
+
+
+class Neo4jClient(_Neo4jClientBase):
+    driver: Optional[Driver]
+
+    def connect(self):
+        try:
             self.driver = GraphDatabase.driver(
                 self.uri,
                 auth=(self.user, self.password),
-                **connection_kwargs,
+                **self._driver_options(),
             )
+            self.pool_monitor.attach_driver(self.driver)
             self.driver.verify_connectivity()
             logger.info("Connected to Neo4j at %s", self.uri)
         except (ServiceUnavailable, AuthError, Neo4jError, OSError):
             logger.exception("Failed to connect to Neo4j at %s", self.uri)
             raise
-    
+
     def close(self):
         if self.driver:
             self.driver.close()
             logger.info("Neo4j connection closed")
-    
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+
+    @contextmanager
+    def _session(self, **config: Any) -> Iterator[Any]:
+        with self.pool_monitor.slot():
+            with self.driver.session(**config) as session:  # type: ignore[union-attr]
+                yield session
+
+    def execute_query(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run ``query`` and return its records.
+
+        Named queries are routed by their declared access mode; ad-hoc Cypher
+        runs in an auto-commit transaction. With ``causal``, the session waits
+        for the context's bookmarks and then records the bookmark it produced.
+        """
         if not self.driver:
             raise RuntimeError("Neo4j driver not initialized")
-        
-        with self.driver.session(database=self.database) as session:
-            result = session.run(query, parameters or {})
-            records = []
-            for record in result:
-                # Convert Neo4j types to JSON-serializable primitives
-                record_dict = {}
-                for key in record.keys():
-                    record_dict[key] = self._jsonify(record[key])
-                records.append(record_dict)
-            return records
-    
-    def execute_read(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Alias for execute_query for read operations."""
-        return self.execute_query(query, parameters)
-    
-    def execute_write(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+
+        cypher, params, named = self._prepare(query, parameters)
+        if named is not None and not named.is_write:
+            return self.execute_read(named, params, causal=causal)
+        if named is not None:
+            with self._observe(cypher, named, "write") as observation:
+                with self._session(**self._session_config(causal)) as session:
+                    records = session.execute_write(self._read_records, observation.statement, params, observation)
+                    if causal is not None:
+                        causal.update(session.last_bookmarks())
+                return observation.record_rows(records)
+
+        with self._observe(cypher, None, "auto") as observation:
+            with self._session(**self._session_config(causal)) as session:
+                result = session.run(cypher, params)
+                records = [self._record_to_dict(record) for record in result]
+                if causal is not None:
+                    causal.update(session.last_bookmarks())
+                return observation.record_rows(records)
+
+    def execute_read(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a read-only query in a managed READ transaction.
+
+        Cluster deployments route the transaction to followers or read
+        replicas, and the driver retries it on transient failures. Pass the
+        ``causal`` context of preceding writes to read your own writes.
+        """
         if not self.driver:
             raise RuntimeError("Neo4j driver not initialized")
-        
-        with self.driver.session(database=self.database) as session:
-            result = session.run(query, parameters or {})
-            summary = result.consume()
-            return {
-                "nodes_created": summary.counters.nodes_created,
-                "relationships_created": summary.counters.relationships_created,
-                "properties_set": summary.counters.properties_set
-            }
-    
+
+        cypher, params, named = self._prepare(query, parameters, expect_write=False)
+        with self._observe(cypher, named, "read") as observation:
+            with self._session(**self._session_config(causal, default_access_mode=READ_ACCESS)) as session:
+                records = session.execute_read(self._read_records, observation.statement, params, observation)
+            return observation.record_rows(records)
+
+    def execute_write(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        """Run a write query in a managed WRITE transaction with driver retries.
+
+        With ``causal``, the resulting bookmark is recorded so later reads in
+        the same operation observe this write.
+        """
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, params, named = self._prepare(query, parameters, expect_write=True)
+        return self._run_write(cypher, params, named, causal)
+
+    def execute_write_batch(
+        self,
+        query: QueryLike,
+        rows: Sequence[Dict[str, Any]],
+        *,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+        concurrency: int = 4,
+        batch_retries: int = 1,
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        """Write ``rows`` in ``UNWIND $rows`` batches across parallel managed transactions.
+
+        ``query`` must read its input from ``$rows``. ``parameters`` are shared
+        by every batch. Each batch commits on its own, so transaction memory
+        stays bounded by ``batch_size``. Up to ``concurrency`` batches run at
+        once on separate sessions. Batches that still fail after the driver's
+        own retries are re-submitted up to ``batch_retries`` more times;
+        batches that succeeded are not re-run. Returns the summed write counters
+        together with ``rows``, ``batches`` and ``retried_batches``. Raises
+        :class:`Neo4jBatchWriteError` if any batch fails in the end. With
+        ``causal``, every batch waits for its bookmarks and the context ends up
+        holding the bookmarks of all committed batches.
+        """
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, shared, named = self._prepare(query, {**(parameters or {}), "rows": []}, expect_write=True)
+        batches = self._row_batches(rows, batch_size)
+        totals = self._batch_totals(sum(len(batch) for batch in batches), len(batches))
+        pending = list(range(len(batches)))
+        failures: Dict[int, BaseException] = {}
+        branches = [causal.fork() if causal is not None else None for _ in batches]
+
+        for attempt in range(max(0, batch_retries) + 1):
+            if attempt:
+                totals["retried_batches"] += len(pending)
+            workers = max(1, min(concurrency, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neo4j-batch") as pool:
+                futures = {
+                    pool.submit(
+                        self._run_write, cypher, {**shared, "rows": batches[index]}, named, branches[index]
+                    ): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        self._add_counters(totals, future.result())
+                    except (Neo4jError, DriverError) as exc:
+                        logger.warning("Write batch %d of %d failed: %s", index, len(batches), exc)
+                        failures[index] = exc
+                    else:
+                        failures.pop(index, None)
+            pending = sorted(index for index, exc in failures.items() if self._batch_retryable(exc))
+            if not pending:
+                break
+
+        if causal is not None:
+            causal.join(branch for branch in branches if branch is not None)
+        self._raise_batch_failures(totals, failures)
+        return totals
+
+    def _run_write(
+        self,
+        cypher: str,
+        params: Dict[str, Any],
+        named: Optional[NamedQuery],
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        with self._observe(cypher, named, "write") as observation:
+            with self._session(**self._session_config(causal)) as session:
+                counters = session.execute_write(self._write_counters, observation.statement, params, observation)
+                if causal is not None:
+                    causal.update(session.last_bookmarks())
+                return counters
+
+    @classmethod
+    def _read_records(
+        cls,
+        tx: Any,
+        query: str,
+        parameters: Dict[str, Any],
+        observation: Optional[QueryObservation] = None,
+    ) -> List[Dict[str, Any]]:
+        result = tx.run(query, parameters)
+        records = [cls._record_to_dict(record) for record in result]
+        if observation is not None and observation.profiled:
+            observation.record_summary(result.consume())
+        return records
+
+    @classmethod
+    def _write_counters(
+        cls,
+        tx: Any,
+        query: str,
+        parameters: Dict[str, Any],
+        observation: Optional[QueryObservation] = None,
+    ) -> Dict[str, Any]:
+        result = tx.run(query, parameters)
+        summary = result.consume()
+        if observation is not None:
+            observation.record_summary(summary)
+        return cls._summary_counters(summary)
+
+    def stream_query(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        fetch_size: Optional[int] = None,
+        causal: Optional[CausalContext] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records one at a time as the driver pulls them from the server.
+
+        Records are jsonified lazily, so memory stays bounded by ``fetch_size``
+        rather than by the result size. The session stays open until the
+        generator is exhausted or closed. Streams run in auto-commit READ
+        sessions: nothing is retried, because records may already have been
+        handed to the caller.
+        """
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, params, named = self._prepare(query, parameters, expect_write=False)
+        with self._observe(cypher, named, "stream") as observation:
+            with self._session(
+                **self._session_config(
+                    causal,
+                    default_access_mode=READ_ACCESS,
+                    fetch_size=fetch_size or self.fetch_size,
+                )
+            ) as session:
+                for record in session.run(cypher, params):
+                    observation.add_rows()
+                    yield self._record_to_dict(record)
+
     def check_health(self) -> bool:
         try:
             if self.driver:
@@ -118,141 +569,326 @@ class Neo4jClient:
             return False
         except (Neo4jError, ServiceUnavailable, AuthError, OSError):
             return False
-    
-    @staticmethod
-    def _jsonify(value: Any) -> Any:
-        """Convert Neo4j driver values into JSON-serializable primitives."""
-
-        if isinstance(value, (list, tuple, set)):
-            return [Neo4jClient._jsonify(item) for item in value]
-
-        if isinstance(value, dict):
-            return {key: Neo4jClient._jsonify(val) for key, val in value.items()}
-
-        if GraphNode is not None and isinstance(value, GraphNode):
-            props = {key: Neo4jClient._jsonify(val) for key, val in dict(value).items()}
-            return {
-                "id": getattr(value, "element_id", getattr(value, "id", None)),
-                "labels": list(getattr(value, "labels", [])),
-                "properties": props,
-            }
-
-        if GraphRelationship is not None and isinstance(value, GraphRelationship):
-            props = {key: Neo4jClient._jsonify(val) for key, val in dict(value).items()}
-            start_id = getattr(value, "start_node_element_id", None)
-            if start_id is None and hasattr(value, "start_node"):
-                start_id = getattr(value.start_node, "element_id", getattr(value.start_node, "id", None))
-            end_id = getattr(value, "end_node_element_id", None)
-            if end_id is None and hasattr(value, "end_node"):
-                end_id = getattr(value.end_node, "element_id", getattr(value.end_node, "id", None))
-            return {
-                "id": getattr(value, "element_id", getattr(value, "id", None)),
-                "type": value.type,
-                "start": start_id,
-                "end": end_id,
-                "properties": props,
-            }
-
-        if GraphPath is not None and isinstance(value, GraphPath):
-            return {
-                "nodes": [Neo4jClient._jsonify(node) for node in value.nodes],
-                "relationships": [Neo4jClient._jsonify(rel) for rel in value.relationships],
-            }
-
-        if isinstance(value, (datetime, date, time)):
-            return value.isoformat()
-
-        if GraphDateTime is not None and isinstance(value, GraphDateTime):
-            return value.iso_format()
-
-        if GraphDate is not None and isinstance(value, GraphDate):
-            return value.iso_format()
-
-        if GraphTime is not None and isinstance(value, GraphTime):
-            return value.iso_format()
-
-        if GraphDuration is not None and isinstance(value, GraphDuration):
-            return value.total_seconds()
-
-        if isinstance(value, Decimal):
-            return float(value)
-
-        if hasattr(value, "isoformat"):
-            try:
-                return value.isoformat()
-            except (TypeError, ValueError):  # pragma: no cover - defensive
-                return str(value)
 
-        return value
+    def export_subgraph(
+        self,
+        *,
+        limit: int = 200,
+        cursor: Optional[str] = None,
+        labels: Optional[Sequence[str]] = None,
+        degree_cap: int = DEFAULT_EXPORT_DEGREE_CAP,
+    ) -> Dict[str, Any]:
+        """Return one page of the graph, keyed on node element ids.
+
+        Pages hold up to ``limit`` start nodes in element id order, each with
+        at most ``degree_cap`` outgoing relationships and their end nodes.
+        ``labels`` restricts both ends to nodes carrying one of the labels.
+        Pass the returned ``next_cursor`` to get the following page; it is
+        ``None`` on the last one. ``truncated_nodes`` lists nodes whose
+        relationships were capped, with their full degree.
+
+        Element ids are not indexed, so each page scans and sorts every node
+        past the cursor: O(N) per page, with only the response bounded.
+        """
+        query, parameters = self._graph_export_query(limit, cursor=cursor, labels=labels, degree_cap=degree_cap)
+        records = self.execute_read(query, parameters)
+        return self._build_export_page(records, parameters["limit"], parameters["degree_cap"])
 
     def get_graph_data(self, limit: int = 100) -> Dict[str, Any]:
+        page = self.export_subgraph(limit=min(limit, 500))
+        return {"nodes": page["nodes"], "edges": page["edges"]}
+
+    def stream_graph_data(self, limit: int, *, max_limit: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream deduplicated graph nodes and edges as ``(kind, entry)`` pairs."""
+        query, parameters = self._graph_data_query(limit, max_limit)
+        seen_nodes: Set[str] = set()
+        for record in self.stream_query(query, parameters):
+            yield from self._graph_elements(record, seen_nodes)
+
+
+class AsyncNeo4jClient(_Neo4jClientBase):
+    """Neo4j client backed by the asyncio driver.
+
+    Mirrors :class:`Neo4jClient` with awaitable methods so request handlers can
+    query the graph without stalling the event loop while Bolt round trips
+    are in flight.
+    """
+
+    driver: Optional[AsyncDriver]
+    _pool_monitor_class = AsyncPoolMonitor
+    _pool_label = "async"
+
+    async def connect(self) -> None:
         try:
-            limit_value = int(limit)
-        except (TypeError, ValueError):
-            limit_value = 100
-        safe_limit = max(1, min(limit_value, 500))
-        query = (
-            "MATCH (n)\n"
-            "OPTIONAL MATCH (n)-[r]->(m)\n"
-            "RETURN n, r, m\n"
-            "LIMIT $limit"
-        )
+            self.driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                **self._driver_options(),
+            )
+            self.pool_monitor.attach_driver(self.driver)
+            await self.driver.verify_connectivity()
+            logger.info("Connected async Neo4j driver to %s", self.uri)
+        except (ServiceUnavailable, AuthError, Neo4jError, OSError):
+            logger.exception("Failed to connect async Neo4j driver to %s", self.uri)
+            raise
 
-        records = self.execute_query(query, {"limit": safe_limit})
+    async def close(self) -> None:
+        if self.driver:
+            await self.driver.close()
+            logger.info("Async Neo4j connection closed")
 
-        nodes_dict: Dict[str, Dict[str, Any]] = {}
-        edges: List[Dict[str, Any]] = []
+    @asynccontextmanager
+    async def _session(self, **config: Any) -> AsyncIterator[Any]:
+        async with self.pool_monitor.slot():
+            async with self.driver.session(**config) as session:  # type: ignore[union-attr]
+                yield session
 
-        def _normalise_node(raw: Any) -> Optional[Dict[str, Any]]:
-            if not raw:
-                return None
-            if isinstance(raw, dict):
-                return raw
-            try:
-                return dict(raw)
-            except TypeError:
-                return None
+    async def execute_query(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run ``query`` and return its records (see Neo4jClient.execute_query)."""
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
 
-        for record in records:
-            node_a = _normalise_node(record.get("n"))
-            rel = record.get("r") if isinstance(record.get("r"), dict) else None
-            node_b = _normalise_node(record.get("m"))
-
-            for node in (node_a, node_b):
-                if not node:
-                    continue
-                node_id = node.get("id")
-                if node_id is None:
-                    continue
-                node_key = str(node_id)
-                if node_key in nodes_dict:
-                    continue
-                labels = list(node.get("labels") or [])
-                props = node.get("properties") or {}
-                label = labels[0] if labels else props.get("label", "Unknown")
-                nodes_dict[node_key] = {
-                    "id": node_key,
-                    "label": label,
-                    "labels": labels,
-                    "properties": props,
-                }
+        cypher, params, named = self._prepare(query, parameters)
+        if named is not None and not named.is_write:
+            return await self.execute_read(named, params, causal=causal)
+        if named is not None:
+            with self._observe(cypher, named, "write") as observation:
+                async with self._session(**self._session_config(causal)) as session:
+                    records = await session.execute_write(
+                        self._read_records, observation.statement, params, observation
+                    )
+                    if causal is not None:
+                        causal.update(await session.last_bookmarks())
+                return observation.record_rows(records)
+
+        with self._observe(cypher, None, "auto") as observation:
+            async with self._session(**self._session_config(causal)) as session:
+                result = await session.run(cypher, params)
+                records = [self._record_to_dict(record) async for record in result]
+                if causal is not None:
+                    causal.update(await session.last_bookmarks())
+                return observation.record_rows(records)
+
+    async def execute_read(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a read-only query in a managed READ transaction (see Neo4jClient.execute_read)."""
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, params, named = self._prepare(query, parameters, expect_write=False)
+        with self._observe(cypher, named, "read") as observation:
+            async with self._session(
+                **self._session_config(causal, default_access_mode=READ_ACCESS)
+            ) as session:
+                records = await session.execute_read(self._read_records, observation.statement, params, observation)
+            return observation.record_rows(records)
+
+    async def execute_write(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        """Run a write query in a managed WRITE transaction (see Neo4jClient.execute_write)."""
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
 
-            if rel:
-                edges.append(
-                    {
-                        "source": str(rel.get("start")) if rel.get("start") is not None else None,
-                        "target": str(rel.get("end")) if rel.get("end") is not None else None,
-                        "type": rel.get("type"),
-                        "properties": rel.get("properties") or {},
-                    }
+        cypher, params, named = self._prepare(query, parameters, expect_write=True)
+        return await self._run_write(cypher, params, named, causal)
+
+    async def execute_write_batch(
+        self,
+        query: QueryLike,
+        rows: Sequence[Dict[str, Any]],
+        *,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+        concurrency: int = 4,
+        batch_retries: int = 1,
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of :meth:`Neo4jClient.execute_write_batch`."""
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, shared, named = self._prepare(query, {**(parameters or {}), "rows": []}, expect_write=True)
+        batches = self._row_batches(rows, batch_size)
+        totals = self._batch_totals(sum(len(batch) for batch in batches), len(batches))
+        pending = list(range(len(batches)))
+        failures: Dict[int, BaseException] = {}
+        branches = [causal.fork() if causal is not None else None for _ in batches]
+        limiter = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_batch(index: int) -> Tuple[int, Any]:
+            async with limiter:
+                try:
+                    return index, await self._run_write(
+                        cypher, {**shared, "rows": batches[index]}, named, branches[index]
+                    )
+                except (Neo4jError, DriverError) as exc:
+                    logger.warning("Write batch %d of %d failed: %s", index, len(batches), exc)
+                    return index, exc
+
+        for attempt in range(max(0, batch_retries) + 1):
+            if attempt:
+                totals["retried_batches"] += len(pending)
+            for index, outcome in await asyncio.gather(*(run_batch(index) for index in pending)):
+                if isinstance(outcome, BaseException):
+                    failures[index] = outcome
+                else:
+                    failures.pop(index, None)
+                    self._add_counters(totals, outcome)
+            pending = sorted(index for index, exc in failures.items() if self._batch_retryable(exc))
+            if not pending:
+                break
+
+        if causal is not None:
+            causal.join(branch for branch in branches if branch is not None)
+        self._raise_batch_failures(totals, failures)
+        return totals
+
+    async def _run_write(
+        self,
+        cypher: str,
+        params: Dict[str, Any],
+        named: Optional[NamedQuery],
+        causal: Optional[CausalContext] = None,
+    ) -> Dict[str, Any]:
+        with self._observe(cypher, named, "write") as observation:
+            async with self._session(**self._session_config(causal)) as session:
+                counters = await session.execute_write(
+                    self._write_counters, observation.statement, params, observation
                 )
+                if causal is not None:
+                    causal.update(await session.last_bookmarks())
+                return counters
 
-        return {
-            "nodes": list(nodes_dict.values()),
-            "edges": edges,
-        }
+    @classmethod
+    async def _read_records(
+        cls,
+        tx: Any,
+        query: str,
+        parameters: Dict[str, Any],
+        observation: Optional[QueryObservation] = None,
+    ) -> List[Dict[str, Any]]:
+        result = await tx.run(query, parameters)
+        records = [cls._record_to_dict(record) async for record in result]
+        if observation is not None and observation.profiled:
+            observation.record_summary(await result.consume())
+        return records
+
+    @classmethod
+    async def _write_counters(
+        cls,
+        tx: Any,
+        query: str,
+        parameters: Dict[str, Any],
+        observation: Optional[QueryObservation] = None,
+    ) -> Dict[str, Any]:
+        result = await tx.run(query, parameters)
+        summary = await result.consume()
+        if observation is not None:
+            observation.record_summary(summary)
+        return cls._summary_counters(summary)
+
+    async def stream_query(
+        self,
+        query: QueryLike,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        fetch_size: Optional[int] = None,
+        causal: Optional[CausalContext] = None,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Async counterpart of :meth:`Neo4jClient.stream_query`."""
+        if not self.driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        cypher, params, named = self._prepare(query, parameters, expect_write=False)
+        with self._observe(cypher, named, "stream") as observation:
+            async with self._session(
+                **self._session_config(
+                    causal,
+                    default_access_mode=READ_ACCESS,
+                    fetch_size=fetch_size or self.fetch_size,
+                )
+            ) as session:
+                result = await session.run(cypher, params)
+                async for record in result:
+                    observation.add_rows()
+                    yield self._record_to_dict(record)
+
+    async def check_health(self) -> bool:
+        try:
+            if self.driver:
+                await self.driver.verify_connectivity()
+                return True
+            return False
+        except (Neo4jError, ServiceUnavailable, AuthError, OSError):
+            return False
+
+    async def export_subgraph(
+        self,
+        *,
+        limit: int = 200,
+        cursor: Optional[str] = None,
+        labels: Optional[Sequence[str]] = None,
+        degree_cap: int = DEFAULT_EXPORT_DEGREE_CAP,
+    ) -> Dict[str, Any]:
+        """Return one page of the graph; see :meth:`Neo4jClient.export_subgraph`."""
+        query, parameters = self._graph_export_query(limit, cursor=cursor, labels=labels, degree_cap=degree_cap)
+        records = await self.execute_read(query, parameters)
+        return self._build_export_page(records, parameters["limit"], parameters["degree_cap"])
+
+    async def get_graph_data(self, limit: int = 100) -> Dict[str, Any]:
+        page = await self.export_subgraph(limit=min(limit, 500))
+        return {"nodes": page["nodes"], "edges": page["edges"]}
+
+    async def stream_graph_data(
+        self, limit: int, *, max_limit: int = 500
+    ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+        """Stream deduplicated graph nodes and edges as ``(kind, entry)`` pairs."""
+        query, parameters = self._graph_data_query(limit, max_limit)
+        seen_nodes: Set[str] = set()
+        async for record in self.stream_query(query, parameters):
+            for element in self._graph_elements(record, seen_nodes):
+                yield element
+
+
+def neo4j_client_options(config: Any) -> Dict[str, Any]:
+    """Constructor arguments for either client, read from a Settings object."""
+    return {
+        "uri": config.NEO4J_URI,
+        "user": config.NEO4J_USER,
+        "password": config.NEO4J_PASSWORD,
+        "database": config.NEO4J_DATABASE,
+        "max_connection_pool_size": config.NEO4J_MAX_CONNECTION_POOL_SIZE,
+        "max_connection_lifetime_seconds": config.NEO4J_MAX_CONNECTION_LIFETIME_SECONDS,
+        "connection_acquisition_timeout_seconds": config.NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
+        "max_transaction_retry_time_seconds": config.NEO4J_MAX_TRANSACTION_RETRY_TIME_SECONDS,
+        "fetch_size": config.NEO4J_FETCH_SIZE,
+        "profile_sample_rate": config.NEO4J_PROFILE_SAMPLE_RATE,
+        "payload_sample_rate": config.NEO4J_PAYLOAD_SAMPLE_RATE,
+        "encrypted": config.NEO4J_ENCRYPTED,
+    }
 
 
 def get_neo4j_client(request: Request) -> Optional["Neo4jClient"]:
     """Convenience accessor for the per-app Neo4j client."""
     return getattr(request.app.state, "neo4j_client", None)  # type: ignore[attr-defined]
+
+
+def get_async_neo4j_client(request: Request) -> Optional["AsyncNeo4jClient"]:
+    """Convenience accessor for the per-app async Neo4j client."""
+    return getattr(request.app.state, "async_neo4j_client", None)  # type: ignore[attr-defined]
@@ -0,0 +1,387 @@
+"""Connection pool telemetry and adaptive sizing for the Neo4j clients.
+
+The driver does not publish pool statistics. Instead, each client passes
+every session through a :class:`PoolMonitor` (or :class:`AsyncPoolMonitor`).
+The monitor is an admission gate sized to the driver pool. A session holds
+at most one connection at a time, so the number of admitted sessions tracks
+the number of pooled connections in use. This gives us:
+
+* in-use and waiting counts, exported as gauges, and the admission slots
+  still ``available``. The driver's own idle connections, when it exposes
+  them, are reported separately under ``connections``;
+* an acquisition wait-time histogram and a timeout counter;
+* a resizable limit. :class:`PoolSizeController` uses it to recommend, and
+  optionally apply, an effective pool size between a floor and the
+  configured driver maximum.
+
+Both clients create the driver with ``NEO4J_MAX_CONNECTION_POOL_SIZE`` as the
+ceiling. Connections are opened lazily, so lowering the admission limit
+also caps how many connections the driver opens.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Sequence
+
+from neo4j.exceptions import ServiceUnavailable
+
+from app.core.metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Driver default when NEO4J_MAX_CONNECTION_POOL_SIZE is not set
+DEFAULT_POOL_SIZE = 100
+_RECENT_WAITS = 1024
+
+POOL_LIMIT = metrics_registry.gauge(
+    "neo4j_pool_limit", "Effective number of concurrent Neo4j sessions allowed.", ("client",)
+)
+POOL_IN_USE = metrics_registry.gauge(
+    "neo4j_pool_in_use", "Neo4j sessions currently holding a pooled connection.", ("client",)
+)
+POOL_WAITING = metrics_registry.gauge(
+    "neo4j_pool_waiting", "Callers waiting for a Neo4j connection slot.", ("client",)
+)
+POOL_ACQUISITION_WAIT = metrics_registry.histogram(
+    "neo4j_pool_acquisition_wait_seconds",
+    "Time spent waiting for a Neo4j connection slot.",
+    ("client",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0),
+)
+POOL_ACQUISITION_TIMEOUTS = metrics_registry.counter(
+    "neo4j_pool_acquisition_timeouts_total",
+    "Callers that gave up waiting for a Neo4j connection slot.",
+    ("client",),
+)
+
+
+class PoolAcquisitionTimeout(ServiceUnavailable):
+    """Raised when no connection slot frees up within the acquisition timeout.
+
+    Subclasses ``ServiceUnavailable`` so existing dependency-error handling
+    (503 responses, pipeline error mapping) applies unchanged.
+    """
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _PoolStats:
+    """Counters shared by the sync and async monitors."""
+
+    def __init__(self, max_size: Optional[int], acquisition_timeout: Optional[float], client: str) -> None:
+        self.max_size = max(1, int(max_size or DEFAULT_POOL_SIZE))
+        self.acquisition_timeout = acquisition_timeout if acquisition_timeout else None
+        self.client = client
+        self._limit = self.max_size
+        self._in_use = 0
+        self._waiting = 0
+        self._stats_lock = threading.Lock()
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._recent_waits: Deque[float] = deque(maxlen=_RECENT_WAITS)
+        self._window = self._new_window()
+        self._driver: Any = None
+        POOL_LIMIT.set(client, value=self._limit)
+
+    @staticmethod
+    def _new_window() -> Dict[str, Any]:
+        return {"acquisitions": 0, "timeouts": 0, "waits": [], "peak_in_use": 0, "peak_waiting": 0}
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def attach_driver(self, driver: Any) -> None:
+        """Remember the driver so snapshots can include its own connection counts."""
+        self._driver = driver
+
+    def _record_wait_started(self) -> None:
+        self._waiting += 1
+        POOL_WAITING.set(self.client, value=self._waiting)
+        with self._stats_lock:
+            self._window["peak_waiting"] = max(self._window["peak_waiting"], self._waiting)
+
+    def _record_wait_finished(self) -> None:
+        self._waiting -= 1
+        POOL_WAITING.set(self.client, value=self._waiting)
+
+    def _record_acquired(self, waited: float) -> None:
+        POOL_ACQUISITION_WAIT.observe(self.client, value=waited)
+        POOL_IN_USE.set(self.client, value=self._in_use)
+        with self._stats_lock:
+            self._acquisitions += 1
+            self._recent_waits.append(waited)
+            self._window["acquisitions"] += 1
+            if len(self._window["waits"]) < _RECENT_WAITS:
+                self._window["waits"].append(waited)
+            self._window["peak_in_use"] = max(self._window["peak_in_use"], self._in_use)
+
+    def _record_released(self) -> None:
+        POOL_IN_USE.set(self.client, value=self._in_use)
+
+    def _record_timeout(self, waited: float) -> PoolAcquisitionTimeout:
+        POOL_ACQUISITION_WAIT.observe(self.client, value=waited)
+        POOL_ACQUISITION_TIMEOUTS.inc(self.client)
+        with self._stats_lock:
+            self._timeouts += 1
+            self._window["timeouts"] += 1
+        return PoolAcquisitionTimeout(
+            f"Timed out after {waited:.1f}s waiting for a Neo4j connection "
+            f"({self._in_use}/{self._limit} in use, {self._waiting} waiting)"
+        )
+
+    def _set_limit(self, size: int) -> int:
+        self._limit = max(1, min(int(size), self.max_size))
+        POOL_LIMIT.set(self.client, value=self._limit)
+        return self._limit
+
+    def window(self, *, reset: bool = False) -> Dict[str, Any]:
+        """Return (and optionally restart) the observation window used for sizing."""
+        with self._stats_lock:
+            current = self._window
+            if reset:
+                self._window = self._new_window()
+            return {**current, "waits": list(current["waits"])}
+
+    def _driver_connections(self) -> Optional[Dict[str, int]]:
+        # Best effort: the driver keeps its pool private, so tolerate layout changes.
+        pool = getattr(self._driver, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if not isinstance(connections, dict):
+            return None
+        try:
+            pooled = [conn for queue in list(connections.values()) for conn in list(queue)]
+        except RuntimeError:
+            return None
+        in_use = sum(1 for conn in pooled if getattr(conn, "in_use", False))
+        return {"open": len(pooled), "in_use": in_use, "idle": len(pooled) - in_use}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            waits = list(self._recent_waits)
+            acquisitions = self._acquisitions
+            timeouts = self._timeouts
+        payload: Dict[str, Any] = {
+            "limit": self._limit,
+            "max_size": self.max_size,
+            "in_use": self._in_use,
+            "available": max(0, self._limit - self._in_use),
+            "waiting": self._waiting,
+            "acquisitions": acquisitions,
+            "timeouts": timeouts,
+            "wait_seconds": {
+                "p50": _percentile(waits, 0.5),
+                "p95": _percentile(waits, 0.95),
+                "max": max(waits) if waits else 0.0,
+            },
+        }
+        connections = self._driver_connections()
+        if connections is not None:
+            payload["connections"] = connections
+        return payload
+
+
+class PoolMonitor(_PoolStats):
+    """Thread-safe admission gate for the synchronous client."""
+
+    def __init__(self, max_size: Optional[int], acquisition_timeout: Optional[float] = None, *, client: str = "sync"):
+        super().__init__(max_size, acquisition_timeout, client)
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one connection slot for the duration of the block."""
+        start = time.perf_counter()
+        with self._cond:
+            # Only a caller that finds the pool full counts as waiting
+            if self._in_use >= self._limit:
+                self._record_wait_started()
+                try:
+                    acquired = self._cond.wait_for(
+                        lambda: self._in_use < self._limit, timeout=self.acquisition_timeout
+                    )
+                finally:
+                    self._record_wait_finished()
+                if not acquired:
+                    raise self._record_timeout(time.perf_counter() - start)
+            self._in_use += 1
+            self._record_acquired(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_use -= 1
+                self._record_released()
+                self._cond.notify()
+
+    def set_limit(self, size: int) -> int:
+        with self._cond:
+            limit = self._set_limit(size)
+            self._cond.notify_all()
+        return limit
+
+
+class AsyncPoolMonitor(_PoolStats):
+    """Admission gate for the asyncio client; must be used from one event loop."""
+
+    def __init__(self, max_size: Optional[int], acquisition_timeout: Optional[float] = None, *, client: str = "async"):
+        super().__init__(max_size, acquisition_timeout, client)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        if self._waiters or self._in_use >= self._limit:
+            await self._wait_for_slot(start)
+        else:
+            self._in_use += 1
+        self._record_acquired(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._in_use -= 1
+            self._record_released()
+            self._wake()
+
+    async def _wait_for_slot(self, start: float) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._record_wait_started()
+        try:
+            await asyncio.wait_for(waiter, self.acquisition_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over as the timeout fired; give it back
+                self._in_use -= 1
+                self._wake()
+            raise self._record_timeout(time.perf_counter() - start) from None
+        finally:
+            self._record_wait_finished()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _wake(self) -> None:
+        # Hand freed slots straight to waiters so newcomers cannot overtake them
+        while self._waiters and self._in_use < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
+
+    def set_limit(self, size: int) -> int:
+        limit = self._set_limit(size)
+        self._wake()
+        return limit
+
+
+@dataclass
+class PoolRecommendation:
+    current: int
+    recommended: int
+    reason: str
+    p95_wait_seconds: float
+    peak_in_use: int
+    peak_waiting: int
+    timeouts: int
+    acquisitions: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PoolSizeController:
+    """Recommends (and optionally applies) an effective pool size from observed waits.
+
+    Each evaluation looks at the window since the last :meth:`adjust`. When
+    callers timed out, or the 95th-percentile wait exceeded
+    ``target_wait_seconds``, the pool grows by a quarter or by the peak
+    number of waiters, whichever is larger. When waits were negligible and
+    less than half the pool was ever busy, it shrinks by a quarter but
+    keeps headroom above the observed peak. The size stays between
+    ``min_size`` and the monitor's ``max_size``.
+    """
+
+    def __init__(self, monitor: _PoolStats, *, min_size: int = 1, target_wait_seconds: float = 0.05) -> None:
+        self.monitor = monitor
+        self.min_size = max(1, min(int(min_size), monitor.max_size))
+        self.target_wait_seconds = max(0.0, target_wait_seconds)
+
+    def recommend(self, window: Optional[Dict[str, Any]] = None) -> PoolRecommendation:
+        stats = window if window is not None else self.monitor.window()
+        current = self.monitor.limit
+        p95 = _percentile(stats["waits"], 0.95)
+        peak_in_use = stats["peak_in_use"]
+        peak_waiting = stats["peak_waiting"]
+
+        if stats["timeouts"] or (stats["acquisitions"] and p95 > self.target_wait_seconds):
+            step = max(1, peak_waiting, math.ceil(current * 0.25))
+            recommended = min(self.monitor.max_size, current + step)
+            reason = "acquisition timeouts" if stats["timeouts"] else "wait p95 above target"
+        elif stats["acquisitions"] and p95 <= self.target_wait_seconds / 10 and peak_in_use < current / 2:
+            floor = max(self.min_size, math.ceil(peak_in_use * 1.5), 1)
+            recommended = max(floor, current - max(1, current // 4))
+            recommended = min(recommended, current)
+            reason = "pool mostly idle"
+        else:
+            recommended = current
+            reason = "within target"
+
+        return PoolRecommendation(
+            current=current,
+            recommended=recommended,
+            reason=reason,
+            p95_wait_seconds=p95,
+            peak_in_use=peak_in_use,
+            peak_waiting=peak_waiting,
+            timeouts=stats["timeouts"],
+            acquisitions=stats["acquisitions"],
+        )
+
+    def adjust(self, *, apply: bool = True) -> PoolRecommendation:
+        """Evaluate the window since the last call, start a new one and apply the result."""
+        recommendation = self.recommend(self.monitor.window(reset=True))
+        if apply and recommendation.recommended != recommendation.current:
+            self.monitor.set_limit(recommendation.recommended)  # type: ignore[attr-defined]
+        return recommendation
+
+
+async def run_pool_controllers(controllers: Sequence[PoolSizeController], interval_seconds: float) -> None:
+    """Apply each controller's recommendation every ``interval_seconds`` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for controller in controllers:
+            recommendation = controller.adjust()
+            if recommendation.recommended != recommendation.current:
+                logger.info(
+                    "Resized %s Neo4j pool from %d to %d (%s, wait p95 %.3fs)",
+                    controller.monitor.client,
+                    recommendation.current,
+                    recommendation.recommended,
+                    recommendation.reason,
+                    recommendation.p95_wait_seconds,
+                )
+
+
+__all__ = [
+    "AsyncPoolMonitor",
+    "DEFAULT_POOL_SIZE",
+    "PoolAcquisitionTimeout",
+    "PoolMonitor",
+    "PoolRecommendation",
+    "PoolSizeController",
+    "run_pool_controllers",
+]
@@ -0,0 +1,756 @@
+"""Named Cypher queries used by the API services and endpoints.
+
+Queries are grouped by domain and registered in :data:`app.db.query_registry.registry`
+on import, so the startup plan warmup and per-query metrics see all of them.
+Ad-hoc Cypher (LLM-generated statements, schema migrations, sample data
+loaders) intentionally stays out of the registry.
+"""
+
+from app.db.query_registry import WRITE, registry
+
+# --- Graph explorer -----------------------------------------------------------
+
+GRAPH_DATA = registry.define(
+    "graph.data",
+    """
+    MATCH (n)
+    OPTIONAL MATCH (n)-[r]->(m)
+    RETURN n, r, m
+    LIMIT $limit
+    """,
+    parameters=("limit",),
+)
+
+# Keyset page of start nodes ordered by element id. Each node brings at most
+# $degree_cap outgoing relationships (also in element id order) plus its full
+# degree, so callers can tell when a hub was truncated. $after and $labels
+# may be null to start from the beginning / skip label filtering.
+# elementId() is not indexable: every page is an AllNodesScan plus a sort of
+# the nodes past $after, so page cost grows with the graph, not the page.
+GRAPH_EXPORT_PAGE = registry.define(
+    "graph.export_page",
+    """
+    MATCH (n)
+    WHERE ($after IS NULL OR elementId(n) > $after)
+      AND ($labels IS NULL OR any(label IN labels(n) WHERE label IN $labels))
+    WITH n
+    ORDER BY elementId(n)
+    LIMIT $limit
+    CALL {
+        WITH n
+        OPTIONAL MATCH (n)-[r]->(m)
+        WHERE $labels IS NULL OR any(label IN labels(m) WHERE label IN $labels)
+        WITH r, m
+        ORDER BY elementId(r)
+        LIMIT $degree_cap
+        RETURN collect(CASE WHEN r IS NULL THEN NULL ELSE {r: r, m: m} END) AS links
+    }
+    RETURN n,
+           links,
+           COUNT {
+               MATCH (n)-[]->(other)
+               WHERE $labels IS NULL OR any(label IN labels(other) WHERE label IN $labels)
+           } AS degree
+    ORDER BY elementId(n)
+    """,
+    parameters=("after", "labels", "limit", "degree_cap"),
+)
+
+# --- Formulations -------------------------------------------------------------
+
+# Returns a formulation in the shape read by formulation_pipeline._map_formulation_record.
+_FORMULATION_WITH_INGREDIENTS = """
+    OPTIONAL MATCH (f)-[c:CONTAINS]->(i:Food)
+    RETURN f, collect({
+        name: i.name,
+        percentage: coalesce(c['percentage'], 0.0),
+        cost_per_kg: coalesce(c['cost_per_kg'], 0.0),
+        function: coalesce(c['function'], i['function'], 'unspecified'),
+        quantity_kg: coalesce(c['quantity_kg'], coalesce(c['percentage'], 0.0) / 100.0),
+        cost_reference: coalesce(
+            c['cost_reference'],
+            (coalesce(c['percentage'], 0.0) / 100.0) * coalesce(c['cost_per_kg'], 0.0)
+        )
+    }) as ingredients
+"""
+
+# Links each row of $ingredients to f; rows carry name, percentage,
+# cost_per_kg, function, quantity_kg and cost_reference. A unit subquery, so
+# an empty list leaves the outer row intact.
+_LINK_INGREDIENTS = """
+    CALL {
+        WITH f
+        UNWIND coalesce($ingredients, []) AS ing
+        MERGE (i:Food {name: ing.name})
+        CREATE (f)-[:CONTAINS {
+            percentage: ing.percentage,
+            cost_per_kg: ing.cost_per_kg,
+            function: ing.function,
+            quantity_kg: ing.quantity_kg,
+            cost_reference: ing.cost_reference
+        }]->(i)
+    }
+"""
+
+FORMULATION_GET = registry.define(
+    "formulation.get",
+    "MATCH (f:Formulation {id: $id})" + _FORMULATION_WITH_INGREDIENTS,
+    parameters=("id",),
+)
+
+# Keyset pagination. f.sort_ts mirrors coalesce(updated_at, created_at) and is
+# written by every Formulation writer; with the composite index on (sort_ts, id)
+# a page is a backwards range seek from the cursor instead of a scan and SKIP.
+# The first (and any offset) page uses the same order, so cursors continue it.
+FORMULATION_SORT_INDEX = (
+    "CREATE INDEX formulation_sort_idx IF NOT EXISTS FOR (f:Formulation) ON (f.sort_ts, f.id)"
+)
+
+FORMULATION_LIST = registry.define(
+    "formulation.list",
+    """
+    MATCH (f:Formulation)
+    WITH f
+    ORDER BY f.sort_ts DESC, f.id DESC
+    SKIP $skip
+    LIMIT $limit
+    """
+    + _FORMULATION_WITH_INGREDIENTS
+    + """
+    ORDER BY f.sort_ts DESC, f.id DESC
+    """,
+    parameters=("skip", "limit"),
+)
+
+FORMULATION_LIST_AFTER = registry.define(
+    "formulation.list_after",
+    """
+    MATCH (f:Formulation)
+    WHERE f.sort_ts <= $after_ts AND (f.sort_ts < $after_ts OR f.id < $after_id)
+    WITH f
+    ORDER BY f.sort_ts DESC, f.id DESC
+    LIMIT $limit
+    """
+    + _FORMULATION_WITH_INGREDIENTS
+    + """
+    ORDER BY f.sort_ts DESC, f.id DESC
+    """,
+    parameters=("after_ts", "after_id", "limit"),
+)
+
+# Sets sort_ts on formulations written before it existed or by hand; runs at
+# startup and after sample data loads. Temporal values are stored as strings.
+FORMULATION_BACKFILL_SORT_KEYS = registry.define(
+    "formulation.backfill_sort_keys",
+    """
+    MATCH (f:Formulation)
+    WHERE f.sort_ts IS NULL
+    SET f.sort_ts = toString(coalesce(f.updated_at, f.created_at, datetime()))
+    RETURN count(f) AS updated
+    """,
+    access_mode=WRITE,
+)
+
+FORMULATION_COUNT = registry.define(
+    "formulation.count",
+    "MATCH (f:Formulation) RETURN count(f) as total",
+)
+
+# Creates the formulation, its ingredient links and the cost rollup in one
+# transaction and returns the result.
+FORMULATION_CREATE = registry.define(
+    "formulation.create",
+    """
+    CREATE (f:Formulation {
+        id: $id,
+        name: $name,
+        description: $description,
+        status: $status,
+        created_at: $created_at,
+        sort_ts: $created_at
+    })
+    SET f.cost_per_kg = reduce(total = 0.0, ing IN $ingredients | total + ing.cost_reference),
+        f.cost_basis_kg = 1.0,
+        f.cost_updated_at = datetime()
+    WITH f
+    """
+    + _LINK_INGREDIENTS
+    + "    WITH f"
+    + _FORMULATION_WITH_INGREDIENTS,
+    parameters=("id", "name", "description", "status", "created_at", "ingredients"),
+    access_mode=WRITE,
+)
+
+# Bulk import: creates every row of $formulations (id, name, description,
+# status, created_at, ingredients) with its links and cost rollup in one
+# transaction and returns the created ids.
+FORMULATION_CREATE_BATCH = registry.define(
+    "formulation.create_batch",
+    """
+    UNWIND $formulations AS row
+    CREATE (f:Formulation {
+        id: row.id,
+        name: row.name,
+        description: row.description,
+        status: row.status,
+        created_at: row.created_at,
+        sort_ts: row.created_at
+    })
+    SET f.cost_per_kg = reduce(total = 0.0, ing IN row.ingredients | total + ing.cost_reference),
+        f.cost_basis_kg = 1.0,
+        f.cost_updated_at = datetime()
+    WITH f, row
+    CALL {
+        WITH f, row
+        UNWIND row.ingredients AS ing
+        MERGE (i:Food {name: ing.name})
+        CREATE (f)-[:CONTAINS {
+            percentage: ing.percentage,
+            cost_per_kg: ing.cost_per_kg,
+            function: ing.function,
+            quantity_kg: ing.quantity_kg,
+            cost_reference: ing.cost_reference
+        }]->(i)
+    }
+    RETURN f.id AS id
+    """,
+    parameters=("formulations",),
+    access_mode=WRITE,
+)
+
+# Applies $fields (name/description/status) and, when $ingredients is not
+# null, replaces the ingredient links and recomputes the cost rollup, all in
+# one transaction. Returns no rows when the formulation does not exist.
+FORMULATION_UPDATE = registry.define(
+    "formulation.update",
+    """
+    MATCH (f:Formulation {id: $id})
+    SET f += $fields,
+        f.updated_at = $updated_at,
+        f.sort_ts = $updated_at
+    WITH f
+    CALL {
+        WITH f
+        WITH f WHERE $ingredients IS NOT NULL
+        MATCH (f)-[old:CONTAINS]->(:Food)
+        DELETE old
+    }
+    """
+    + _LINK_INGREDIENTS
+    + """
+    WITH f
+    SET f.cost_per_kg = CASE
+            WHEN $ingredients IS NULL THEN f.cost_per_kg
+            ELSE reduce(total = 0.0, ing IN $ingredients | total + ing.cost_reference)
+        END,
+        f.cost_basis_kg = CASE WHEN $ingredients IS NULL THEN f.cost_basis_kg ELSE 1.0 END,
+        f.cost_updated_at = CASE WHEN $ingredients IS NULL THEN f.cost_updated_at ELSE datetime() END
+    WITH f
+    """
+    + _FORMULATION_WITH_INGREDIENTS,
+    parameters=("id", "fields", "updated_at", "ingredients"),
+    access_mode=WRITE,
+)
+
+FORMULATION_DELETE = registry.define(
+    "formulation.delete",
+    """
+    MATCH (f:Formulation {id: $id})
+    DETACH DELETE f
+    """,
+    parameters=("id",),
+    access_mode=WRITE,
+)
+
+FORMULATION_KEYWORD_IDS = registry.define(
+    "formulation.keyword_ids",
+    """
+    MATCH (f:Formulation)
+    WHERE toLower(f.name) CONTAINS toLower($query)
+       OR toLower(f.description) CONTAINS toLower($query)
+    RETURN f.id as id
+    LIMIT 5
+    """,
+    parameters=("query",),
+)
+
+FORMULATION_COST_INPUTS = registry.define(
+    "formulation.cost_inputs",
+    """
+    MATCH (f:Formulation {id: $id})
+    OPTIONAL MATCH (f)-[c:CONTAINS]->(i:Food)
+    RETURN f.name as name, collect({
+        name: i.name,
+        percentage: c.percentage,
+        cost_per_kg: c.cost_per_kg
+    }) as ingredients
+    """,
+    parameters=("id",),
+)
+
+# --- Nutrition ----------------------------------------------------------------
+
+# Aggregates a matched formulation f into one row with its ingredients and
+# their per-100g nutrient rows.
+_FORMULATION_NUTRIENTS = """
+    OPTIONAL MATCH (f)-[ci:CONTAINS_INGREDIENT]->(ing:Ingredient)
+    OPTIONAL MATCH (ing)-[:DERIVED_FROM]->(food:Food)
+    OPTIONAL MATCH (food)-[cn:CONTAINS_NUTRIENT]->(n:Nutrient)
+    WITH f, ci, ing, food,
+         collect({
+             nutrient_name: n.nutrientName,
+             amount: cn.value,
+             unit: n.unitName,
+             per100g: cn.per100g,
+             fdc_id: food.fdcId
+         }) AS nutrient_rows
+    WITH f, ci, ing, food,
+         [row IN nutrient_rows WHERE row.nutrient_name IS NOT NULL] AS nutrients
+    WITH f,
+         collect(
+             CASE
+                 WHEN ing IS NULL THEN NULL
+                 ELSE {
+                     name: ing.name,
+                     percentage: ci.percentage,
+                     quantity_kg: ci.quantity_kg,
+                     food_fdc_id: food.fdcId,
+                     food_description: food.description,
+                     nutrients: nutrients
+                 }
+             END
+         ) AS ingredient_collection
+    RETURN f.id AS formulation_id,
+           f.name AS formulation_name,
+           [item IN ingredient_collection WHERE item IS NOT NULL] AS ingredients
+"""
+
+NUTRITION_FORMULATION_NUTRIENTS = registry.define(
+    "nutrition.formulation_nutrients",
+    "MATCH (f:Formulation {id: $formulation_id})" + _FORMULATION_NUTRIENTS,
+    parameters=("formulation_id",),
+)
+
+# One row per existing formulation in $formulation_ids; missing ids return no row.
+NUTRITION_FORMULATIONS_NUTRIENTS = registry.define(
+    "nutrition.formulations_nutrients",
+    """
+    UNWIND $formulation_ids AS formulation_id
+    MATCH (f:Formulation {id: formulation_id})
+    """
+    + _FORMULATION_NUTRIENTS,
+    parameters=("formulation_ids",),
+)
+
+NUTRITION_FORMULATION_HEADER = registry.define(
+    "nutrition.formulation_header",
+    """
+    MATCH (f:Formulation {id: $formulation_id})
+    RETURN f.id AS id, f.name AS name
+    """,
+    parameters=("formulation_id",),
+)
+
+NUTRITION_FORMULATION_INGREDIENTS = registry.define(
+    "nutrition.formulation_ingredients",
+    """
+    MATCH (f:Formulation {id: $formulation_id})-[rel:CONTAINS_INGREDIENT]->(ing:Ingredient)
+    OPTIONAL MATCH (ing)-[:DERIVED_FROM]->(food:Food)
+    RETURN ing.name AS ingredient_name,
+           rel.percentage AS percentage,
+           rel.quantity_kg AS quantity_kg,
+           food.description AS food_description,
+           food.fdcId AS food_fdc_id
+    """,
+    parameters=("formulation_id",),
+)
+
+# Full-text index over Food.description used to resolve free-text ingredient
+# names. Created by FDCService.ensure_schema and the default graph schema.
+FOOD_DESCRIPTION_FULLTEXT_INDEX_NAME = "food_description_fulltext"
+FOOD_DESCRIPTION_FULLTEXT_INDEX = (
+    f"CREATE FULLTEXT INDEX {FOOD_DESCRIPTION_FULLTEXT_INDEX_NAME} IF NOT EXISTS "
+    "FOR (f:Food) ON EACH [f.description]"
+)
+
+# Best-ranked Food for each {name, query} in $searches, where query is a
+# Lucene query built from the name. Names without a match return no row.
+# Ties prefer the shortest description, the closest match to a short name.
+NUTRITION_RESOLVE_FOODS = registry.define(
+    "nutrition.resolve_foods",
+    f"""
+    UNWIND $searches AS search
+    CALL {{
+        WITH search
+        CALL db.index.fulltext.queryNodes('{FOOD_DESCRIPTION_FULLTEXT_INDEX_NAME}', search.query)
+        YIELD node, score
+        WHERE node.fdcId IS NOT NULL
+        RETURN node, score
+        ORDER BY score DESC, size(node.description), node.fdcId
+        LIMIT 1
+    }}
+    RETURN search.name AS ingredient_name,
+           node.fdcId AS fdc_id,
+           node.description AS description,
+           score
+    """,
+    parameters=("searches",),
+)
+
+# Same contract as nutrition.resolve_foods for databases without the
+# full-text index: one statement for every name, but a label scan per name.
+NUTRITION_RESOLVE_FOODS_SCAN = registry.define(
+    "nutrition.resolve_foods_scan",
+    """
+    UNWIND $searches AS search
+    CALL {
+        WITH search
+        MATCH (food:Food)
+        WHERE food.fdcId IS NOT NULL AND toLower(food.description) CONTAINS search.name
+        RETURN food
+        ORDER BY size(food.description), food.fdcId
+        LIMIT 1
+    }
+    RETURN search.name AS ingredient_name,
+           food.fdcId AS fdc_id,
+           food.description AS description,
+           null AS score
+    """,
+    parameters=("searches",),
+)
+
+NUTRITION_FOODS_NUTRIENTS = registry.define(
+    "nutrition.foods_nutrients",
+    """
+    UNWIND $fdc_ids AS fdc_id
+    MATCH (food:Food {fdcId: fdc_id})-[rel:CONTAINS_NUTRIENT]->(n:Nutrient)
+    RETURN food.fdcId AS fdc_id,
+           food.description AS matched_food,
+           n.nutrientName AS nutrient_name,
+           rel.value AS amount,
+           n.unitName AS unit,
+           rel.per100g AS per100g
+    """,
+    parameters=("fdc_ids",),
+)
+
+NUTRITION_NUTRIENT_CATALOG = registry.define(
+    "nutrition.nutrient_catalog",
+    """
+    MATCH (n:Nutrient)
+    WHERE n.nutrientNumber IS NOT NULL AND n.nutrientName IS NOT NULL
+    RETURN n.nutrientNumber AS number,
+           n.nutrientName AS name,
+           n.unitName AS unit
+    """,
+)
+
+# --- FDC foods ----------------------------------------------------------------
+
+FDC_UPSERT_FOOD = registry.define(
+    "fdc.upsert_food",
+    """
+    MERGE (f:Food {fdcId: $fdcId})
+    SET f.description = $description,
+        f.dataType = $dataType,
+        f.foodCategory = $foodCategory,
+        f.brandOwner = $brandOwner,
+        f.brandName = $brandName,
+        f.gtinUpc = $gtinUpc,
+        f.ingredients = $ingredients,
+        f.servingSize = $servingSize,
+        f.servingSizeUnit = $servingSizeUnit,
+        f.publicationDate = $publicationDate,
+        f.updatedAt = datetime()
+
+    WITH f
+    MERGE (c:FoodCategory {description: $foodCategory})
+    SET c.categoryId = $categoryId
+    MERGE (f)-[:BELONGS_TO_CATEGORY]->(c)
+
+    WITH f
+    UNWIND $nutrients AS nutrient
+      MERGE (n:Nutrient {nutrientId: nutrient.nutrientId})
+      SET n.nutrientName = nutrient.nutrientName,
+          n.nutrientNumber = nutrient.nutrientNumber,
+          n.unitName = nutrient.unitName,
+          n.rank = nutrient.rank
+      MERGE (f)-[r:CONTAINS_NUTRIENT]->(n)
+      SET r.value = nutrient.value,
+          r.unit = nutrient.unitName,
+          r.per100g = nutrient.value,
+          r.derivationCode = nutrient.derivationCode
+    """,
+    parameters=(
+        "fdcId",
+        "description",
+        "dataType",
+        "foodCategory",
+        "categoryId",
+        "brandOwner",
+        "brandName",
+        "gtinUpc",
+        "ingredients",
+        "servingSize",
+        "servingSizeUnit",
+        "publicationDate",
+        "nutrients",
+    ),
+    access_mode=WRITE,
+)
+
+_FDC_FOOD_FILTER = """
+    WHERE $search = ''
+       OR toLower(f.description) CONTAINS $search
+       OR toLower(coalesce(f.brandOwner, '')) CONTAINS $search
+       OR toLower(coalesce(f.foodCategory, '')) CONTAINS $search
+"""
+
+FDC_LIST_FOODS = registry.define(
+    "fdc.list_foods",
+    f"""
+    MATCH (f:Food)
+    {_FDC_FOOD_FILTER}
+    WITH f
+    ORDER BY coalesce(f.description, '') ASC, f.fdcId
+    SKIP $skip
+    LIMIT $limit
+    RETURN f {{
+        .fdcId,
+        .description,
+        .dataType,
+        .brandOwner,
+        .brandName,
+        .foodCategory,
+        .servingSize,
+        .servingSizeUnit,
+        .ingredients,
+        .publicationDate,
+        .updatedAt,
+        .dataSource
+    }} AS food,
+    CASE
+        WHEN $include_nutrients
+        THEN [(f)-[rel:CONTAINS_NUTRIENT]->(n:Nutrient) |
+            {{
+                nutrientId: n.nutrientId,
+                nutrientName: n.nutrientName,
+                unitName: n.unitName,
+                rank: n.rank,
+                value: rel.value,
+                unit: rel.unit,
+                derivationCode: rel.derivationCode
+            }}
+        ]
+        ELSE []
+    END AS nutrients
+    """,
+    parameters=("search", "skip", "limit", "include_nutrients"),
+)
+
+FDC_COUNT_FOODS = registry.define(
+    "fdc.count_foods",
+    f"""
+    MATCH (f:Food)
+    {_FDC_FOOD_FILTER}
+    RETURN count(f) AS total
+    """,
+    parameters=("search",),
+)
+
+# --- Graph search -------------------------------------------------------------
+
+SEARCH_ORCHESTRATION_RUN = registry.define(
+    "search.orchestration_run",
+    """
+    MATCH (run:OrchestrationRun { runId: $runId })
+    RETURN run
+    LIMIT 1
+    """,
+    parameters=("runId",),
+)
+
+SEARCH_RUN_ENTITIES = registry.define(
+    "search.run_entities",
+    """
+    MATCH (run:OrchestrationRun { runId: $runId })-[:GENERATED_ENTITY]->(node:GraphEntity)
+    RETURN DISTINCT node
+    """,
+    parameters=("runId",),
+)
+
+SEARCH_RUN_RELATIONSHIPS = registry.define(
+    "search.run_relationships",
+    """
+    MATCH (source:GraphEntity)-[rel]->(target:GraphEntity)
+    WHERE $runId IN rel.generatedRunIds
+    RETURN source, rel, target
+    """,
+    parameters=("runId",),
+)
+
+SEARCH_KEYWORD_NODES = registry.define(
+    "search.keyword_nodes",
+    """
+    MATCH (n)
+    WHERE (
+        (n.name IS NOT NULL AND toLower(n.name) CONTAINS $term) OR
+        (n.label IS NOT NULL AND toLower(n.label) CONTAINS $term) OR
+        (n.id IS NOT NULL AND toLower(n.id) CONTAINS $term) OR
+        (n.description IS NOT NULL AND toLower(n.description) CONTAINS $term)
+    )
+    RETURN DISTINCT n
+    LIMIT $limit
+    """,
+    parameters=("term", "limit"),
+)
+
+SEARCH_RELATED_EDGES = registry.define(
+    "search.related_edges",
+    """
+    MATCH (a)-[r]->(b)
+    WHERE a.id IN $ids OR b.id IN $ids
+    RETURN a, r, b
+    LIMIT $limit
+    """,
+    parameters=("ids", "limit"),
+)
+
+# --- GraphRAG retrieval -------------------------------------------------------
+
+GRAPHRAG_VECTOR_SEARCH = registry.define(
+    "graphrag.vector_search",
+    """
+    CALL db.index.vector.queryNodes($index_name, $limit, $embedding)
+    YIELD node, score
+    OPTIONAL MATCH (source:KnowledgeSource)-[:HAS_CHUNK]->(node)
+    RETURN node, score, source
+    ORDER BY score DESC
+    """,
+    parameters=("index_name", "limit", "embedding"),
+)
+
+GRAPHRAG_ENTITY_NODES = registry.define(
+    "graphrag.entity_nodes",
+    """
+    MATCH (n)
+    WHERE n.id IN $entity_ids
+    RETURN n
+    """,
+    parameters=("entity_ids",),
+)
+
+GRAPHRAG_ENTITY_RELATIONSHIPS = registry.define(
+    "graphrag.entity_relationships",
+    """
+    MATCH (n)-[r]->(m)
+    WHERE n.id IN $entity_ids
+    RETURN n.id AS source_id, r, m
+    ORDER BY source_id
+    LIMIT $limit
+    """,
+    parameters=("entity_ids", "limit"),
+)
+
+# --- GraphRAG ingestion -------------------------------------------------------
+
+GRAPHRAG_UPSERT_SOURCE = registry.define(
+    "graphrag.upsert_source",
+    """
+    MERGE (source:KnowledgeSource {id: $source_id})
+    ON CREATE SET source.created_at = datetime()
+    SET source.type = $source_type,
+        source.updated_at = datetime()
+    """,
+    parameters=("source_id", "source_type"),
+    access_mode=WRITE,
+)
+
+# Written with execute_write_batch: one UNWIND batch of chunks per transaction.
+# The HAS_CHUNK edges are left to GRAPHRAG_LINK_CHUNKS, since every batch
+# creating them would lock the same KnowledgeSource node and run one at a time.
+GRAPHRAG_UPSERT_CHUNKS = registry.define(
+    "graphrag.upsert_chunks",
+    """
+    UNWIND $rows AS chunk
+    MERGE (c:KnowledgeChunk {chunk_id: chunk.chunk_id})
+    ON CREATE SET c.created_at = datetime()
+    SET c.content = chunk.content,
+        c.source = $source_id,
+        c.source_type = $source_type,
+        c.chunk_index = chunk.chunk_index,
+        c.chunk_strategy = chunk.chunk_strategy,
+        c.updated_at = datetime()
+    SET c.metadata_json = chunk.metadata_json,
+        c.metadata_keys = chunk.metadata_keys
+    FOREACH (_ IN CASE WHEN chunk.embedding IS NULL THEN [] ELSE [1] END |
+        SET c.embedding = chunk.embedding
+    )
+    """,
+    parameters=("source_id", "source_type", "rows"),
+    access_mode=WRITE,
+)
+
+# One transaction after the chunk batches, so the source node is locked once
+GRAPHRAG_LINK_CHUNKS = registry.define(
+    "graphrag.link_chunks",
+    """
+    MATCH (source:KnowledgeSource {id: $source_id})
+    UNWIND $chunk_ids AS chunk_id
+    MATCH (c:KnowledgeChunk {chunk_id: chunk_id})
+    MERGE (source)-[:HAS_CHUNK]->(c)
+    """,
+    parameters=("source_id", "chunk_ids"),
+    access_mode=WRITE,
+)
+
+# --- Manufacturing ------------------------------------------------------------
+
+MANUFACTURING_UNIT_OPERATIONS = registry.define(
+    "manufacturing.unit_operations",
+    """
+    MATCH (op:UnitOperation)
+    RETURN op {
+        .operation_id,
+        .operation_type,
+        .equipment_type,
+        .typical_time_min,
+        .typical_temperature_c,
+        .cost_per_hour,
+        .parameters,
+        .equipment_types
+    } as operation
+    ORDER BY op.operation_type
+    """,
+)
+
+MANUFACTURING_EQUIPMENT = registry.define(
+    "manufacturing.equipment",
+    """
+    MATCH (eq:Equipment)
+    RETURN eq {
+        .equipment_id,
+        .equipment_type,
+        .batch_size_category,
+        .min_batch_size_l,
+        .max_batch_size_l,
+        .cost_per_batch
+    } as equipment
+    ORDER BY eq.equipment_type
+    """,
+)
+
+MANUFACTURING_MATERIAL_GRADES = registry.define(
+    "manufacturing.material_grades",
+    """
+    MATCH (mg:MaterialGrade)
+    RETURN mg {
+        .grade_id,
+        .name,
+        .certifications,
+        .cost_multiplier,
+        .description
+    } as grade
+    ORDER BY mg.grade_id
+    """,
+)
@@ -0,0 +1,174 @@
+"""Per-query instrumentation for the Neo4j clients.
+
+Every call is labelled with its :class:`~app.db.query_registry.NamedQuery`
+name. Ad-hoc Cypher is labelled ``adhoc:<hash>``, a short stable hash of the
+normalised statement, so regressions can be traced back to the query
+that caused them. Every label is a permanent series, and generated Cypher
+(from the AI endpoints) is different almost every time. So only the first
+:data:`MAX_ADHOC_LABELS` distinct statements get their own label, and the
+rest share ``adhoc:other``. Two measurements are sampled because they are costly:
+
+* result size in bytes, which requires encoding the records to JSON;
+* ``PROFILE`` db hits, which makes the server collect a full profile.
+  Sampled read and write calls run as ``PROFILE <cypher>`` and the total
+  db hits are taken from the result summary. The query is not executed a
+  second time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from app.core.metrics import registry as metrics_registry
+from app.db.query_registry import NamedQuery
+
+_BYTES_BUCKETS = (256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+_DB_HITS_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+QUERY_DURATION = metrics_registry.histogram(
+    "neo4j_query_duration_seconds",
+    "Wall-clock time of Neo4j client calls, including retries and record conversion.",
+    ("query", "mode"),
+)
+QUERY_ROWS = metrics_registry.counter(
+    "neo4j_query_rows_total",
+    "Records returned to callers by Neo4j client calls.",
+    ("query",),
+)
+QUERY_ERRORS = metrics_registry.counter(
+    "neo4j_query_errors_total",
+    "Neo4j client calls that raised, by exception type.",
+    ("query", "error"),
+)
+QUERY_RESULT_BYTES = metrics_registry.histogram(
+    "neo4j_query_result_bytes",
+    "JSON-encoded size of sampled query results.",
+    ("query",),
+    buckets=_BYTES_BUCKETS,
+)
+QUERY_DB_HITS = metrics_registry.histogram(
+    "neo4j_query_db_hits",
+    "Total db hits reported by sampled PROFILE runs.",
+    ("query",),
+    buckets=_DB_HITS_BUCKETS,
+)
+
+
+MAX_ADHOC_LABELS = 100
+ADHOC_OVERFLOW_LABEL = "adhoc:other"
+_adhoc_labels: Set[str] = set()
+
+
+def query_label(cypher: str, named: Optional[NamedQuery] = None) -> str:
+    """Return the metrics label for a call: the query name, a Cypher hash, or ``adhoc:other``."""
+
+    if named is not None:
+        return named.name
+    normalised = " ".join(cypher.split())
+    label = "adhoc:" + hashlib.sha1(normalised.encode("utf-8")).hexdigest()[:12]
+    if label in _adhoc_labels:
+        return label
+    if len(_adhoc_labels) >= MAX_ADHOC_LABELS:
+        return ADHOC_OVERFLOW_LABEL
+    # Unlocked, so concurrent threads may overshoot the cap by a few; it only bounds growth
+    _adhoc_labels.add(label)
+    return label
+
+
+def total_db_hits(plan: Any) -> int:
+    """Sum ``dbHits`` over a profiled plan tree as returned in ``summary.profile``."""
+
+    if not isinstance(plan, Mapping):
+        return 0
+    hits = int(plan.get("dbHits") or 0)
+    for child in plan.get("children") or ():
+        hits += total_db_hits(child)
+    return hits
+
+
+def _profileable(cypher: str) -> bool:
+    head = cypher.lstrip()[:8].upper()
+    return not (head.startswith("EXPLAIN") or head.startswith("PROFILE"))
+
+
+class QueryObservation:
+    """Measures one client call; use as a (sync) context manager.
+
+    ``statement`` is the Cypher to send, with a ``PROFILE`` prefix when this
+    call was sampled for db hits. Transaction functions report what they see
+    through :meth:`record_summary`, and callers report the rows they return
+    through :meth:`record_rows` or :meth:`add_rows`.
+    """
+
+    __slots__ = ("label", "mode", "statement", "profiled", "_measure_bytes", "_rows", "_bytes", "_db_hits", "_start")
+
+    def __init__(
+        self,
+        cypher: str,
+        named: Optional[NamedQuery],
+        mode: str,
+        *,
+        profile_sample_rate: float = 0.0,
+        payload_sample_rate: float = 0.0,
+    ) -> None:
+        self.label = query_label(cypher, named)
+        self.mode = mode
+        self.profiled = (
+            profile_sample_rate > 0 and _profileable(cypher) and random.random() < profile_sample_rate
+        )
+        self.statement = f"PROFILE {cypher}" if self.profiled else cypher
+        self._measure_bytes = payload_sample_rate > 0 and random.random() < payload_sample_rate
+        self._rows = 0
+        self._bytes: Optional[int] = None
+        self._db_hits: Optional[int] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "QueryObservation":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        QUERY_DURATION.observe(self.label, self.mode, value=time.perf_counter() - self._start)
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            QUERY_ERRORS.inc(self.label, exc_type.__name__)
+            return
+        # Streams closed early by the consumer still report the rows they yielded
+        if self._rows:
+            QUERY_ROWS.inc(self.label, amount=self._rows)
+        if self._bytes is not None:
+            QUERY_RESULT_BYTES.observe(self.label, value=self._bytes)
+        if self._db_hits is not None:
+            QUERY_DB_HITS.observe(self.label, value=self._db_hits)
+
+    def record_rows(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Count ``records`` (and size them when sampled); returns them unchanged."""
+
+        self._rows += len(records)
+        if self._measure_bytes:
+            self._bytes = len(json.dumps(records, separators=(",", ":"), default=str).encode("utf-8"))
+        return records
+
+    def add_rows(self, count: int = 1) -> None:
+        self._rows += count
+
+    def record_summary(self, summary: Any) -> None:
+        """Capture db hits from a consumed result summary of a profiled run."""
+
+        if self.profiled:
+            self._db_hits = total_db_hits(getattr(summary, "profile", None))
+
+
+__all__ = [
+    "QUERY_DB_HITS",
+    "QUERY_DURATION",
+    "QUERY_ERRORS",
+    "QUERY_RESULT_BYTES",
+    "QUERY_ROWS",
+    "QueryObservation",
+    "query_label",
+    "total_db_hits",
+]
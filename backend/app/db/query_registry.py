@@ -0,0 +1,164 @@
+"""Registry of named Cypher queries.
+
+Each :class:`NamedQuery` carries a stable name, the parameters it expects and
+whether it reads or writes. The Neo4j clients accept either a ``NamedQuery``
+or its registered name. They validate the supplied parameters against the
+declaration and route the query to a READ or WRITE transaction. Because every
+query has a name, latency and row counts can be attributed per query, and the
+whole catalogue can be ``EXPLAIN``-ed at startup to warm the plan cache.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Union
+
+from neo4j.exceptions import AuthError, Neo4jError, ServiceUnavailable
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """A Cypher statement with a stable name, declared parameters and access mode."""
+
+    name: str
+    cypher: str
+    parameters: Tuple[str, ...] = ()
+    access_mode: str = READ
+    # Parameters that may be omitted by callers (for example optional filters).
+    optional_parameters: Tuple[str, ...] = ()
+    # Skip startup EXPLAIN, e.g. for procedures that need indexes created later.
+    warmup: bool = True
+
+    def __post_init__(self) -> None:
+        if self.access_mode not in (READ, WRITE):
+            raise ValueError(f"Query {self.name!r} has unknown access mode {self.access_mode!r}")
+
+    @property
+    def is_write(self) -> bool:
+        return self.access_mode == WRITE
+
+    def validate(self, parameters: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Return ``parameters`` as a dict, raising ``ValueError`` if they do not match the declaration."""
+
+        supplied = dict(parameters or {})
+        declared = set(self.parameters) | set(self.optional_parameters)
+        missing = [name for name in self.parameters if name not in supplied]
+        unexpected = sorted(set(supplied) - declared)
+        if missing or unexpected:
+            problems = []
+            if missing:
+                problems.append(f"missing {', '.join(missing)}")
+            if unexpected:
+                problems.append(f"unexpected {', '.join(unexpected)}")
+            raise ValueError(f"Invalid parameters for query {self.name!r}: {'; '.join(problems)}")
+        return supplied
+
+
+QueryLike = Union[str, NamedQuery]
+
+
+class QueryRegistry:
+    """Name-indexed collection of :class:`NamedQuery` definitions."""
+
+    def __init__(self) -> None:
+        self._queries: Dict[str, NamedQuery] = {}
+
+    def register(self, query: NamedQuery) -> NamedQuery:
+        existing = self._queries.get(query.name)
+        if existing is not None and existing != query:
+            raise ValueError(f"Query {query.name!r} is already registered with a different definition")
+        self._queries[query.name] = query
+        return query
+
+    def define(
+        self,
+        name: str,
+        cypher: str,
+        *,
+        parameters: Tuple[str, ...] = (),
+        access_mode: str = READ,
+        optional_parameters: Tuple[str, ...] = (),
+        warmup: bool = True,
+    ) -> NamedQuery:
+        """Create and register a query in one step."""
+
+        return self.register(
+            NamedQuery(
+                name=name,
+                cypher=cypher,
+                parameters=tuple(parameters),
+                access_mode=access_mode,
+                optional_parameters=tuple(optional_parameters),
+                warmup=warmup,
+            )
+        )
+
+    def get(self, name: str) -> Optional[NamedQuery]:
+        return self._queries.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._queries
+
+    def __iter__(self) -> Iterator[NamedQuery]:
+        return iter(list(self._queries.values()))
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def resolve(self, query: QueryLike) -> Optional[NamedQuery]:
+        """Return the ``NamedQuery`` for ``query`` or ``None`` for ad-hoc Cypher strings."""
+
+        if isinstance(query, NamedQuery):
+            return query
+        return self._queries.get(query)
+
+
+registry = QueryRegistry()
+
+
+def warm_query_plans(neo4j_client: Any, queries: Optional[QueryRegistry] = None) -> Dict[str, Any]:
+    """``EXPLAIN`` every registered query so the plan cache is warm before traffic arrives.
+
+    ``EXPLAIN`` plans the statement without executing it, so write queries are
+    safe to warm. Failures are logged and reported, never raised. A query that
+    cannot be planned yet (for example because its index does not exist) must
+    not stop the application from starting.
+    """
+
+    source = queries if queries is not None else registry
+    warmed: list[str] = []
+    failed: Dict[str, str] = {}
+    for query in source:
+        if not query.warmup:
+            continue
+        statement = f"EXPLAIN {query.cypher.strip()}"
+        try:
+            if query.is_write:
+                neo4j_client.execute_write(statement)
+            else:
+                neo4j_client.execute_read(statement)
+        except (Neo4jError, ServiceUnavailable, AuthError, RuntimeError) as exc:
+            failed[query.name] = str(exc)
+            logger.warning("Plan warmup failed for query %s: %s", query.name, exc)
+            continue
+        warmed.append(query.name)
+
+    logger.info("Warmed %d Neo4j query plans (%d failed)", len(warmed), len(failed))
+    return {"warmed": warmed, "failed": failed}
+
+
+__all__ = [
+    "READ",
+    "WRITE",
+    "NamedQuery",
+    "QueryLike",
+    "QueryRegistry",
+    "registry",
+    "warm_query_plans",
+]
@@ -0,0 +1,197 @@
+"""Conversion of Neo4j driver values into JSON-serializable primitives.
+
+Every record returned by the Neo4j clients passes through
+:func:`serialize_value`, so the converter is written for the common case:
+strings, numbers and plain containers of them. Dispatch goes through a table
+keyed on the exact ``type`` of the value, so a primitive costs one dict lookup
+instead of a walk down an ``isinstance`` chain. Types that are not in the table
+(relationship subclasses the driver creates per relationship type, datetime
+subclasses, ...) are resolved once through their MRO and then cached.
+
+Containers that already hold only JSON-safe values are returned as-is, which
+makes serializing already-converted data close to free.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Mapping
+
+try:  # neo4j graph primitives for richer JSON conversion
+    from neo4j.graph import Node as GraphNode, Path as GraphPath, Relationship as GraphRelationship
+except ImportError:  # pragma: no cover - fallback when graph helpers unavailable
+    GraphNode = GraphRelationship = GraphPath = None
+
+try:  # Neo4j temporal helpers are optional depending on driver version
+    from neo4j.time import (
+        Date as GraphDate,
+        DateTime as GraphDateTime,
+        Duration as GraphDuration,
+        Time as GraphTime,
+    )
+except ImportError:  # pragma: no cover - older driver fallback
+    GraphDate = GraphDateTime = GraphDuration = GraphTime = None
+
+Converter = Callable[[Any], Any]
+
+_JSON_SAFE = frozenset({str, int, float, bool, type(None)})
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def serialize_value(value: Any) -> Any:
+    """Return ``value`` converted into JSON-serializable primitives."""
+
+    value_type = type(value)
+    if value_type in _JSON_SAFE:
+        return value
+    converter = _DISPATCH.get(value_type)
+    if converter is None:
+        converter = _resolve_converter(value_type)
+    return converter(value)
+
+
+def serialize_record(record: Any) -> Dict[str, Any]:
+    """Serialize a driver ``Record`` (or any mapping with ``keys()``) into a dict."""
+
+    return {key: serialize_value(record[key]) for key in record.keys()}
+
+
+def register_converter(value_type: type, converter: Converter) -> None:
+    """Register ``converter`` for ``value_type`` and its subclasses."""
+
+    _CONVERTERS[value_type] = converter
+    # Subclasses resolved earlier may have cached a less specific converter.
+    _DISPATCH.clear()
+    _DISPATCH.update(_CONVERTERS)
+
+
+def _resolve_converter(value_type: type) -> Converter:
+    for base in value_type.__mro__[1:]:
+        converter = _CONVERTERS.get(base)
+        if converter is not None:
+            break
+    else:
+        converter = _convert_isoformat if hasattr(value_type, "isoformat") else _identity
+    _DISPATCH[value_type] = converter
+    return converter
+
+
+def _convert_dict(value: Dict[Any, Any]) -> Dict[Any, Any]:
+    converted: Dict[Any, Any] | None = None
+    for key, item in value.items():
+        if type(item) in _JSON_SAFE:
+            continue
+        new_item = serialize_value(item)
+        if new_item is item:
+            continue
+        if converted is None:
+            converted = dict(value)
+        converted[key] = new_item
+    return value if converted is None else converted
+
+
+def _convert_list(value: List[Any]) -> List[Any]:
+    converted: List[Any] | None = None
+    for index, item in enumerate(value):
+        if type(item) in _JSON_SAFE:
+            continue
+        new_item = serialize_value(item)
+        if new_item is item:
+            continue
+        if converted is None:
+            converted = list(value)
+        converted[index] = new_item
+    return value if converted is None else converted
+
+
+def _convert_sequence(value: Any) -> List[Any]:
+    return [item if type(item) in _JSON_SAFE else serialize_value(item) for item in value]
+
+
+def _convert_properties(entity: Mapping[str, Any]) -> Dict[str, Any]:
+    return {key: item if type(item) in _JSON_SAFE else serialize_value(item) for key, item in entity.items()}
+
+
+def _entity_id(entity: Any) -> Any:
+    element_id = getattr(entity, "element_id", None)
+    if element_id is not None:
+        return element_id
+    # Only touch the deprecated integer id when no element id is available.
+    return getattr(entity, "id", None)
+
+
+def _convert_node(node: Any) -> Dict[str, Any]:
+    return {
+        "id": _entity_id(node),
+        "labels": list(getattr(node, "labels", [])),
+        "properties": _convert_properties(node),
+    }
+
+
+def _convert_relationship(rel: Any) -> Dict[str, Any]:
+    start_id = getattr(rel, "start_node_element_id", None)
+    if start_id is None and getattr(rel, "start_node", None) is not None:
+        start_id = _entity_id(rel.start_node)
+    end_id = getattr(rel, "end_node_element_id", None)
+    if end_id is None and getattr(rel, "end_node", None) is not None:
+        end_id = _entity_id(rel.end_node)
+    return {
+        "id": _entity_id(rel),
+        "type": rel.type,
+        "start": start_id,
+        "end": end_id,
+        "properties": _convert_properties(rel),
+    }
+
+
+def _convert_path(path: Any) -> Dict[str, Any]:
+    return {
+        "nodes": [_convert_node(node) for node in path.nodes],
+        "relationships": [serialize_value(rel) for rel in path.relationships],
+    }
+
+
+def _convert_isoformat(value: Any) -> Any:
+    try:
+        return value.isoformat()
+    except (TypeError, ValueError):  # pragma: no cover - defensive
+        return str(value)
+
+
+def _convert_iso_format(value: Any) -> str:
+    return value.iso_format()
+
+
+_CONVERTERS: Dict[type, Converter] = {
+    dict: _convert_dict,
+    list: _convert_list,
+    tuple: _convert_sequence,
+    set: _convert_sequence,
+    frozenset: _convert_sequence,
+    datetime: _convert_isoformat,
+    date: _convert_isoformat,
+    time: _convert_isoformat,
+    Decimal: float,
+}
+
+if GraphNode is not None:
+    _CONVERTERS[GraphNode] = _convert_node
+    _CONVERTERS[GraphRelationship] = _convert_relationship
+    _CONVERTERS[GraphPath] = _convert_path
+
+for _temporal in (GraphDateTime, GraphDate, GraphTime):
+    if _temporal is not None:
+        _CONVERTERS[_temporal] = _convert_iso_format
+
+if GraphDuration is not None:
+    # Duration is a (months, days, seconds, nanoseconds) tuple and has always been returned as that list
+    _CONVERTERS[GraphDuration] = _convert_sequence
+
+# Registered converters plus every type resolved through its MRO so far.
+_DISPATCH: Dict[type, Converter] = dict(_CONVERTERS)
+
+__all__ = ["serialize_value", "serialize_record", "register_converter"]
@@ -100,6 +100,31 @@ class FormulationResponse(BaseModel):
 class FormulationListResponse(BaseModel):
     formulations: List[FormulationResponse]
     total_count: int
+    next_cursor: Optional[str] = None
+
+class BulkImportRowError(BaseModel):
+    line: int
+    error: str
+    name: Optional[str] = None
+
+class BulkImportResponse(BaseModel):
+    created: int
+    failed: int
+    batches: int
+    ids: List[str]
+    errors: List[BulkImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
+    aborted: Optional[str] = None
+
+class NutritionLabelItem(BaseModel):
+    formulation_id: str = Field(..., min_length=1)
+    serving_size: float = Field(default=100.0, gt=0, description="Serving size amount")
+    serving_size_unit: str = Field(default="g", description="Serving size unit (g, ml, oz, etc)")
+    servings_per_container: Optional[float] = Field(default=None, gt=0)
+
+class NutritionLabelBatchRequest(BaseModel):
+    labels: List[NutritionLabelItem] = Field(..., min_length=1, description="Labels to generate")
 
 class CalculationRequest(BaseModel):
     formulation_id: str
@@ -165,6 +190,19 @@ class GraphDataResponse(BaseModel):
     edge_count: int
 
 
+class GraphExportTruncatedNode(BaseModel):
+    id: str
+    degree: int = Field(..., description="Relationships the node has within the label filter")
+
+
+class GraphExportResponse(GraphDataResponse):
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page; null on the last page")
+    truncated_nodes: List[GraphExportTruncatedNode] = Field(
+        default_factory=list,
+        description="Nodes whose relationships were cut at the degree cap",
+    )
+
+
 class GraphSchemaResetRequest(BaseModel):
     drop_data: bool = Field(default=True, description="Remove all nodes and relationships before reinstalling the schema")
     drop_constraints: bool = Field(default=True, description="Drop existing Neo4j constraints prior to reinstalling")
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from aiohttp import ClientError
 from neo4j.exceptions import AuthError, Neo4jError, ServiceUnavailable
 
+from app.db import queries
+
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -158,6 +160,7 @@ class FDCService:
             CREATE CONSTRAINT food_category_desc IF NOT EXISTS
             FOR (c:FoodCategory) REQUIRE c.description IS UNIQUE
             """,
+            queries.FOOD_DESCRIPTION_FULLTEXT_INDEX,
         ]
 
         for constraint in constraints:
@@ -196,39 +199,6 @@ class FDCService:
                 }
             )
 
-        cypher = """
-        MERGE (f:Food {fdcId: $fdcId})
-        SET f.description = $description,
-            f.dataType = $dataType,
-            f.foodCategory = $foodCategory,
-            f.brandOwner = $brandOwner,
-            f.brandName = $brandName,
-            f.gtinUpc = $gtinUpc,
-            f.ingredients = $ingredients,
-            f.servingSize = $servingSize,
-            f.servingSizeUnit = $servingSizeUnit,
-            f.publicationDate = $publicationDate,
-            f.updatedAt = datetime()
-
-        WITH f
-        MERGE (c:FoodCategory {description: $foodCategory})
-        SET c.categoryId = $categoryId
-        MERGE (f)-[:BELONGS_TO_CATEGORY]->(c)
-
-        WITH f
-        UNWIND $nutrients AS nutrient
-          MERGE (n:Nutrient {nutrientId: nutrient.nutrientId})
-          SET n.nutrientName = nutrient.nutrientName,
-              n.nutrientNumber = nutrient.nutrientNumber,
-              n.unitName = nutrient.unitName,
-              n.rank = nutrient.rank
-          MERGE (f)-[r:CONTAINS_NUTRIENT]->(n)
-          SET r.value = nutrient.value,
-              r.unit = nutrient.unitName,
-              r.per100g = nutrient.value,
-              r.derivationCode = nutrient.derivationCode
-        """
-
         params = {
             "fdcId": food_data.get("fdcId"),
             "description": food_data.get("description"),
@@ -245,7 +215,7 @@ class FDCService:
             "nutrients": nutrients_payload,
         }
 
-        summary = neo4j_client.execute_write(cypher, params)
+        summary = neo4j_client.execute_write(queries.FDC_UPSERT_FOOD, params)
 
         return {
             "nodes_created": summary.get("nodes_created", 0),
@@ -275,13 +245,6 @@ class FDCService:
             "search": search_term,
         }
 
-        match_filter = (
-            "WHERE $search = '' "
-            "OR toLower(f.description) CONTAINS $search "
-            "OR toLower(coalesce(f.brandOwner, '')) CONTAINS $search "
-            "OR toLower(coalesce(f.foodCategory, '')) CONTAINS $search"
-        )
-
         query_params = {
             **base_params,
             "skip": offset,
@@ -289,45 +252,7 @@ class FDCService:
             "include_nutrients": include_nutrients,
         }
 
-        data_query = (
-            "MATCH (f:Food)\n"
-            f"{match_filter}\n"
-            "WITH f\n"
-            "ORDER BY coalesce(f.description, '') ASC, f.fdcId\n"
-            "SKIP $skip\n"
-            "LIMIT $limit\n"
-            "RETURN f {\n"
-            "    .fdcId,\n"
-            "    .description,\n"
-            "    .dataType,\n"
-            "    .brandOwner,\n"
-            "    .brandName,\n"
-            "    .foodCategory,\n"
-            "    .servingSize,\n"
-            "    .servingSizeUnit,\n"
-            "    .ingredients,\n"
-            "    .publicationDate,\n"
-            "    .updatedAt,\n"
-            "    .dataSource\n"
-            "} AS food,\n"
-            "CASE\n"
-            "    WHEN $include_nutrients\n"
-            "    THEN [(f)-[rel:CONTAINS_NUTRIENT]->(n:Nutrient) |\n"
-            "        {\n"
-            "            nutrientId: n.nutrientId,\n"
-            "            nutrientName: n.nutrientName,\n"
-            "            unitName: n.unitName,\n"
-            "            rank: n.rank,\n"
-            "            value: rel.value,\n"
-            "            unit: rel.unit,\n"
-            "            derivationCode: rel.derivationCode\n"
-            "        }\n"
-            "    ]\n"
-            "    ELSE []\n"
-            "END AS nutrients"
-        )
-
-        records = neo4j_client.execute_query(data_query, query_params)
+        records = neo4j_client.execute_read(queries.FDC_LIST_FOODS, query_params)
 
         def _normalize(raw: Any) -> Dict[str, Any]:
             if isinstance(raw, dict):
@@ -344,13 +269,7 @@ class FDCService:
                 food["nutrients"] = record.get("nutrients", []) or []
             items.append(food)
 
-        total_query = (
-            "MATCH (f:Food)\n"
-            f"{match_filter}\n"
-            "RETURN count(f) AS total"
-        )
-
-        total_records = neo4j_client.execute_query(total_query, base_params)
+        total_records = neo4j_client.execute_read(queries.FDC_COUNT_FOODS, base_params)
         total = total_records[0].get("total", 0) if total_records else 0
 
         return {
@@ -0,0 +1,194 @@
+"""Resolve free-text ingredient names to FDC ``Food`` nodes.
+
+When the knowledge graph has no ``DERIVED_FROM`` link for an ingredient,
+the nutrition fallback has to guess its food from the name. Every
+unresolved name in a formulation is matched in one statement against the
+``food_description_fulltext`` index, and the best-ranked food wins. While
+the index is missing or still populating, a batched ``CONTAINS`` scan is
+used instead, and the index is tried again after a short backoff.
+
+:class:`FoodMatchCache` remembers the chosen food, or the absence of one,
+per normalized name. Repeat labels then skip resolution entirely. An FDC
+ingest can add a better match for any name, so the cache is cleared on
+``fdc.foods_ingested``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from neo4j.exceptions import ClientError
+
+from app.core.metrics import registry as metrics_registry
+from app.db import queries
+from app.services.nutrient_profiles import FOODS_INGESTED_EVENT
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# How Neo4j reports a full-text index that does not exist or is not ONLINE yet
+_FULLTEXT_UNAVAILABLE_CODES = frozenset({"Neo.ClientError.Schema.IndexNotFound"})
+_FULLTEXT_UNAVAILABLE_MESSAGES = ("no such fulltext schema index", "is not online", "not yet online")
+
+FOOD_MATCH_LOOKUPS = metrics_registry.counter(
+    "food_match_lookups_total",
+    "Ingredient name to FDC food lookups, by whether the match cache answered them.",
+    ("result",),
+)
+
+
+@dataclass(frozen=True)
+class FoodMatch:
+    """The FDC food chosen for an ingredient name."""
+
+    fdc_id: int
+    description: str
+    score: Optional[float] = None
+
+
+def fulltext_unavailable(exc: ClientError) -> bool:
+    """Whether ``exc`` means the full-text index cannot be queried yet, rather than a bad query."""
+    if exc.code in _FULLTEXT_UNAVAILABLE_CODES:
+        return True
+    message = (exc.message or str(exc)).lower()
+    return any(marker in message for marker in _FULLTEXT_UNAVAILABLE_MESSAGES)
+
+
+def normalize_name(name: str) -> str:
+    """Cache key and ``CONTAINS`` needle for an ingredient name."""
+    return " ".join(name.lower().split())
+
+
+def fulltext_query(name: str) -> Optional[str]:
+    """Lucene query ranking the exact phrase above foods that merely contain every word.
+
+    Only word characters survive, so the name cannot inject Lucene syntax.
+    Terms are lowercased, so words like ``and`` are never read as operators.
+    """
+    tokens = _TOKEN.findall(name.lower())
+    if not tokens:
+        return None
+    phrase = " ".join(tokens)
+    return f'"{phrase}"^2 OR ({" AND ".join(tokens)})'
+
+
+class FoodMatchCache:
+    """Bounded LRU of ingredient name to :class:`FoodMatch`, including misses."""
+
+    def __init__(self, *, ttl_seconds: float = 3600.0, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[Optional[FoodMatch], float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, name: str) -> Tuple[bool, Optional[FoodMatch]]:
+        """Return ``(found, match)``; ``match`` is ``None`` for a cached miss."""
+        key = normalize_name(name)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] >= self._ttl:
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[0]
+
+    def store(self, name: str, match: Optional[FoodMatch]) -> None:
+        key = normalize_name(name)
+        self._entries[key] = (match, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def attach(self, event_bus: Any) -> None:
+        """Forget every match when new FDC foods arrive."""
+
+        async def on_foods_ingested(event: Any) -> None:
+            self.clear()
+
+        await event_bus.subscribe(FOODS_INGESTED_EVENT, on_foods_ingested)
+
+
+class FoodResolver:
+    """Batched name resolution against the async Neo4j client."""
+
+    def __init__(
+        self,
+        neo4j_client: Any,
+        cache: Optional[FoodMatchCache] = None,
+        *,
+        fulltext_retry_seconds: float = 30.0,
+    ) -> None:
+        # Replaced on a settings refresh
+        self.neo4j_client = neo4j_client
+        self._cache = cache if cache is not None else FoodMatchCache()
+        self._fulltext_retry_seconds = fulltext_retry_seconds
+        # Scan instead of querying the index until this monotonic time
+        self._fulltext_retry_at = 0.0
+
+    async def resolve(self, names: Iterable[str]) -> Dict[str, Optional[FoodMatch]]:
+        """Return the chosen food for every name; at most one query for the uncached ones."""
+        matches: Dict[str, Optional[FoodMatch]] = {}
+        unresolved: Dict[str, List[str]] = {}
+        for name in names:
+            if name in matches or not name:
+                continue
+            found, match = self._cache.lookup(name)
+            if found:
+                FOOD_MATCH_LOOKUPS.inc("hit")
+                matches[name] = match
+            else:
+                FOOD_MATCH_LOOKUPS.inc("miss")
+                unresolved.setdefault(normalize_name(name), []).append(name)
+
+        if unresolved:
+            resolved = await self._query(list(unresolved))
+            for key, originals in unresolved.items():
+                match = resolved.get(key)
+                for name in originals:
+                    self._cache.store(name, match)
+                    matches[name] = match
+        return matches
+
+    async def _query(self, keys: List[str]) -> Dict[str, FoodMatch]:
+        if time.monotonic() >= self._fulltext_retry_at:
+            searches = [{"name": key, "query": query} for key in keys if (query := fulltext_query(key))]
+            try:
+                rows = await self.neo4j_client.execute_read(queries.NUTRITION_RESOLVE_FOODS, {"searches": searches})
+            except ClientError as exc:
+                if not fulltext_unavailable(exc):
+                    raise
+                # Missing or still populating (it is created at startup); scan for a while, then try again
+                logger.warning("Full-text food resolution unavailable, falling back to a scan: %s", exc)
+                self._fulltext_retry_at = time.monotonic() + self._fulltext_retry_seconds
+            else:
+                return self._matches(rows)
+
+        rows = await self.neo4j_client.execute_read(
+            queries.NUTRITION_RESOLVE_FOODS_SCAN,
+            {"searches": [{"name": key} for key in keys]},
+        )
+        return self._matches(rows)
+
+    @staticmethod
+    def _matches(rows: Iterable[Dict[str, Any]]) -> Dict[str, FoodMatch]:
+        matches: Dict[str, FoodMatch] = {}
+        for row in rows:
+            if row.get("ingredient_name") and row.get("fdc_id") is not None:
+                matches[row["ingredient_name"]] = FoodMatch(
+                    fdc_id=row["fdc_id"],
+                    description=row.get("description") or "",
+                    score=row.get("score"),
+                )
+        return matches
+
+
+__all__ = ["FoodMatch", "FoodMatchCache", "FoodResolver", "fulltext_query", "fulltext_unavailable", "normalize_name"]
@@ -0,0 +1,271 @@
+"""Streaming bulk import of formulations from JSON Lines or CSV.
+
+Rows are parsed and validated one at a time while the request body is still
+arriving. Valid rows are written in batches through
+:meth:`FormulationPipelineService.create_many`, one UNWIND transaction per
+batch, so cache invalidation and the ``formulation.created`` event happen
+once per batch rather than once per row.
+
+JSON Lines input has one :class:`FormulationCreate` object per line. CSV
+input has a header row with ``name``, ``description``, ``status``,
+``ingredient``, ``percentage``, ``cost_per_kg``, ``function`` and
+``supplier`` columns. It has one row per ingredient, and consecutive rows
+with the same ``name`` form one formulation.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.core.metrics import registry as metrics_registry
+from app.db.causal import CausalContext
+from app.models.schemas import FormulationCreate
+from app.services.formulation_pipeline import (
+    FormulationPipelineError,
+    FormulationPipelineService,
+    check_percentages,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("jsonl", "csv")
+CSV_FORMULATION_COLUMNS = ("name", "description", "status")
+CSV_INGREDIENT_COLUMNS = ("ingredient", "percentage", "cost_per_kg", "function", "supplier")
+
+BULK_IMPORT_ROWS = metrics_registry.counter(
+    "formulation_bulk_import_rows_total", "Formulations processed by bulk import.", ("result",)
+)
+BULK_IMPORT_BATCH_SECONDS = metrics_registry.histogram(
+    "formulation_bulk_import_batch_seconds", "Time spent writing one bulk import batch."
+)
+
+# (line number, parsed formulation or None, parse error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class BulkImportRowError:
+    line: int
+    error: str
+    name: Optional[str] = None
+
+
+@dataclass
+class BulkImportSummary:
+    created: int = 0
+    failed: int = 0
+    batches: int = 0
+    ids: List[str] = field(default_factory=list)
+    errors: List[BulkImportRowError] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    aborted: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        processed = self.created + self.failed
+        return processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Yield ``(line number, text)`` from a byte stream without buffering it whole."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            number += 1
+            yield number, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield number + 1, pending.rstrip("\r")
+
+
+async def iter_jsonl(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[ParsedRow]:
+    async for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, record, None
+
+
+class _LineFeed:
+    """Iterator a single :func:`csv.reader` pulls physical lines from as they arrive."""
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[ParsedRow]:
+    """Group CSV rows into formulations.
+
+    Physical lines are handed to one :func:`csv.reader` once they close every
+    quoted field, so a quoted value may span lines. Rows are numbered by the
+    line they start on.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header: Optional[List[str]] = None
+    current: Optional[Dict[str, Any]] = None
+    start = 0
+    record_start: Optional[int] = None
+    quotes = 0
+    async for number, line in lines:
+        if record_start is None:
+            if not line.strip():
+                continue
+            record_start = number
+        feed.lines.append(line + "\n")
+        # Quotes inside a field are doubled, so an odd count leaves a field open
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        values = next(reader)
+        row_number, record_start, quotes = record_start, None, 0
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            if "name" not in header or "ingredient" not in header:
+                yield row_number, None, "CSV header must include name and ingredient columns"
+                return
+            continue
+
+        row = {column: value.strip() for column, value in zip(header, values)}
+        name = row.get("name", "")
+        if current is not None and name != current["name"]:
+            yield start, current, None
+            current = None
+        if current is None:
+            start = row_number
+            current = {column: row.get(column) or None for column in CSV_FORMULATION_COLUMNS}
+            current["name"] = name
+            current["ingredients"] = []
+            if current["status"] is None:
+                del current["status"]
+        if row.get("ingredient"):
+            ingredient = {column: row.get(column) or None for column in CSV_INGREDIENT_COLUMNS}
+            ingredient["name"] = ingredient.pop("ingredient")
+            current["ingredients"].append(ingredient)
+    if current is not None:
+        yield start, current, None
+    if record_start is not None:
+        yield record_start, None, "Unterminated quoted field"
+
+
+def _validation_message(exc: ValidationError) -> str:
+    first = exc.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first.get('msg')}" if location else str(first.get("msg"))
+
+
+async def import_formulations(
+    pipeline: FormulationPipelineService,
+    chunks: AsyncIterator[bytes],
+    *,
+    fmt: str,
+    batch_size: int = 200,
+    max_rows: int = 50_000,
+    max_errors: int = 1000,
+    causal: Optional[CausalContext] = None,
+) -> BulkImportSummary:
+    """Parse, validate and write formulations from ``chunks``.
+
+    A failed batch write stops the import. Its rows are reported as failed,
+    and ``aborted`` carries the reason. Batches written before the failure
+    stay committed. Hitting ``max_rows`` also stops the import, but rows read
+    up to the limit are still written.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    summary = BulkImportSummary()
+    batch_size = max(1, batch_size)
+    pending: List[Tuple[int, FormulationCreate]] = []
+    started = time.perf_counter()
+
+    def fail(line: int, error: str, name: Optional[str] = None) -> None:
+        summary.failed += 1
+        BULK_IMPORT_ROWS.inc("failed")
+        if len(summary.errors) < max_errors:
+            summary.errors.append(BulkImportRowError(line=line, error=error, name=name))
+
+    async def flush() -> bool:
+        batch = list(pending)
+        pending.clear()
+        batch_started = time.perf_counter()
+        try:
+            ids = await pipeline.create_many([payload for _, payload in batch], causal=causal)
+        except (FormulationPipelineError, RuntimeError) as exc:
+            logger.warning("Bulk import batch of %d failed: %s", len(batch), exc)
+            for line, payload in batch:
+                fail(line, f"Batch write failed: {exc}", payload.name)
+            summary.aborted = str(exc) or exc.__class__.__name__
+            return False
+        BULK_IMPORT_BATCH_SECONDS.observe(value=time.perf_counter() - batch_started)
+        BULK_IMPORT_ROWS.inc("created", amount=len(ids))
+        summary.batches += 1
+        summary.created += len(ids)
+        summary.ids.extend(ids)
+        return True
+
+    rows = iter_csv(iter_lines(chunks)) if fmt == "csv" else iter_jsonl(iter_lines(chunks))
+    async for line, record, error in rows:
+        if summary.created + summary.failed + len(pending) >= max_rows:
+            summary.aborted = f"Import exceeds {max_rows} rows"
+            break
+        if record is None:
+            fail(line, error or "Unreadable row")
+            continue
+        name = record.get("name") if isinstance(record.get("name"), str) else None
+        try:
+            payload = FormulationCreate.model_validate(record)
+            check_percentages(payload.ingredients)
+        except ValidationError as exc:
+            fail(line, _validation_message(exc), name)
+            continue
+        except ValueError as exc:
+            fail(line, str(exc), name)
+            continue
+        pending.append((line, payload))
+        if len(pending) >= batch_size and not await flush():
+            break
+
+    if pending:
+        await flush()
+    summary.elapsed_seconds = time.perf_counter() - started
+    return summary
+
+
+__all__ = [
+    "BulkImportRowError",
+    "BulkImportSummary",
+    "SUPPORTED_FORMATS",
+    "import_formulations",
+    "iter_csv",
+    "iter_jsonl",
+    "iter_lines",
+]
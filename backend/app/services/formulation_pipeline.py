@@ -1,18 +1,38 @@
 import asyncio
+import base64
+import binascii
+import dataclasses
+import hashlib
+import json
 import logging
 import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 from neo4j.exceptions import AuthError, Neo4jError, ServiceUnavailable
+from pydantic import BaseModel, ConfigDict
 
+from app.core.metrics import registry as metrics_registry
+from app.core.singleflight import SingleFlight
+from app.db import queries
+from app.db.causal import CausalContext, InvalidBookmarkError, is_invalid_bookmark
 from app.models.schemas import (
     FormulationCreate,
     FormulationListResponse,
     FormulationResponse,
     FormulationUpdate,
 )
+from app.services.nutrient_registry import FOODS_INGESTED_EVENT
+from app.services.shared_cache import (
+    SHARED_CACHE_ERRORS,
+    CacheBackend,
+    CacheInvalidationRelay,
+    SharedCacheError,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,23 +48,58 @@ class FormulationDependencyError(FormulationPipelineError):
 class FormulationEventError(FormulationPipelineError):
     """Raised when an event handler fails unexpectedly."""
 
+
+class FormulationPipelineSaturatedError(FormulationPipelineError):
+    """Raised when an operation is shed because the pipeline is at capacity."""
+
+    def __init__(self, message: str, *, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
 T = TypeVar("T")
 
-_SINGLE_FORMULATION_QUERY = """
-MATCH (f:Formulation {id: $id})
-OPTIONAL MATCH (f)-[c:CONTAINS]->(i:Food)
-RETURN f, collect({
-    name: i.name,
-    percentage: coalesce(c['percentage'], 0.0),
-    cost_per_kg: coalesce(c['cost_per_kg'], 0.0),
-    function: coalesce(c['function'], i['function'], 'unspecified'),
-    quantity_kg: coalesce(c['quantity_kg'], coalesce(c['percentage'], 0.0) / 100.0),
-    cost_reference: coalesce(
-        c['cost_reference'],
-        (coalesce(c['percentage'], 0.0) / 100.0) * coalesce(c['cost_per_kg'], 0.0)
-    )
-}) as ingredients
-"""
+PIPELINE_QUEUE_WAIT = metrics_registry.histogram(
+    "formulation_pipeline_queue_wait_seconds",
+    "Time formulation operations waited for an execution slot.",
+    ("operation",),
+)
+PIPELINE_EXECUTION = metrics_registry.histogram(
+    "formulation_pipeline_execution_seconds",
+    "Time formulation operations spent running on the pipeline executor.",
+    ("operation",),
+)
+PIPELINE_REJECTIONS = metrics_registry.counter(
+    "formulation_pipeline_rejections_total",
+    "Formulation operations shed because the pipeline was saturated.",
+    ("operation", "reason"),
+)
+CACHE_REQUESTS = metrics_registry.counter(
+    "formulation_cache_requests_total", "Formulation cache lookups by result.", ("result",)
+)
+CACHE_EVICTIONS = metrics_registry.counter(
+    "formulation_cache_evictions_total", "Formulation cache entries evicted to respect size bounds."
+)
+CACHE_ENTRIES = metrics_registry.gauge("formulation_cache_entries", "Entries held by the formulation cache.")
+CACHE_BYTES = metrics_registry.gauge("formulation_cache_bytes", "Encoded bytes held by the formulation cache.")
+PIPELINE_IN_FLIGHT = metrics_registry.gauge(
+    "formulation_pipeline_in_flight", "Formulation operations currently executing."
+)
+PIPELINE_QUEUED = metrics_registry.gauge(
+    "formulation_pipeline_queued", "Formulation operations waiting for an execution slot."
+)
+EVENT_QUEUE_DEPTH = metrics_registry.gauge(
+    "formulation_event_queue_depth", "Formulation events waiting for an event bus worker."
+)
+EVENT_HANDLER_LAG = metrics_registry.histogram(
+    "formulation_event_handler_lag_seconds",
+    "Time from publishing a formulation event to a handler finishing it.",
+    ("event",),
+)
+EVENT_HANDLER_FAILURES = metrics_registry.counter(
+    "formulation_event_handler_failures_total",
+    "Formulation event deliveries that failed, by what happened next.",
+    ("event", "outcome"),
+)
 
 
 @dataclass
@@ -54,33 +109,84 @@ class FormulationEvent:
     type: str
     payload: Dict[str, Any]
     timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Set on events another worker published; the relay does not send them back out
+    remote: bool = False
+
+
+@dataclass
+class DeadLetter:
+    """Delivery that still failed after every retry."""
+
+    event: FormulationEvent
+    listener: str
+    error: str
+    attempts: int
+
+
+EventHandler = Callable[[FormulationEvent], Awaitable[None] | None]
 
 
 class FormulationEventBus:
-    """Minimal async event bus for formulation lifecycle events."""
+    """Async event bus for formulation lifecycle events.
+
+    With ``workers=0`` (the default) :meth:`publish` awaits each listener
+    inline and re-raises handler failures. With ``workers > 0``, events go
+    onto a bounded queue instead, and a worker pool fans each one out to its
+    listeners concurrently. Publishers then pay only for the enqueue, or wait
+    for space when the queue is full. Each delivery gets ``handler_timeout``
+    seconds and ``max_attempts`` tries. A delivery that never succeeds is kept
+    in a bounded dead-letter list and is not raised. Events are not ordered
+    across workers.
+    """
 
-    def __init__(self) -> None:
-        self._subscribers: Dict[str, List[Callable[[FormulationEvent], Awaitable[None] | None]]] = {}
+    def __init__(
+        self,
+        *,
+        workers: int = 0,
+        max_queue: int = 1024,
+        handler_timeout: float = 5.0,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.1,
+        dead_letter_limit: int = 100,
+    ) -> None:
+        self._subscribers: Dict[str, List[EventHandler]] = {}
         self._lock = asyncio.Lock()
-
-    async def subscribe(self, event_type: str, handler: Callable[[FormulationEvent], Awaitable[None] | None]) -> None:
+        self._workers = max(0, workers)
+        self._max_queue = max(1, max_queue)
+        self._handler_timeout = handler_timeout
+        self._max_attempts = max(1, max_attempts)
+        self._retry_backoff = retry_backoff
+        self._dead_letters: Deque[DeadLetter] = deque(maxlen=max(1, dead_letter_limit))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def queued(self) -> bool:
+        return self._workers > 0
+
+    async def subscribe(self, event_type: str, handler: EventHandler) -> None:
         async with self._lock:
             self._subscribers.setdefault(event_type, []).append(handler)
 
-    async def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
+    async def publish(self, event_type: str, payload: Dict[str, Any], *, remote: bool = False) -> None:
         async with self._lock:
             listeners = list(self._subscribers.get(event_type, []))
 
         if not listeners:
             return
 
-        event = FormulationEvent(type=event_type, payload=payload)
+        event = FormulationEvent(type=event_type, payload=payload, remote=remote)
+        if self.queued:
+            queue = self._ensure_workers()
+            await queue.put((time.monotonic(), event, listeners))
+            EVENT_QUEUE_DEPTH.set(value=queue.qsize())
+            return
+
         for listener in listeners:
-            listener_name = getattr(listener, "__name__", listener.__class__.__name__)
+            listener_name = _listener_name(listener)
             try:
-                result = listener(event)
-                if asyncio.iscoroutine(result):
-                    await result
+                await _call_listener(listener, event)
             except (FormulationPipelineError, RuntimeError, ValueError):
                 logger.error(
                     "Formulation event handler failed",
@@ -98,56 +204,354 @@ class FormulationEventBus:
                     f"Unexpected failure in '{event_type}' handler '{listener_name}'"
                 ) from exc
 
+    def dead_letters(self) -> List[DeadLetter]:
+        return list(self._dead_letters)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self._workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self._max_queue,
+            "dead_letters": len(self._dead_letters),
+        }
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered or dead-lettered."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def stop(self, *, timeout: float = 5.0) -> None:
+        """Deliver what is queued, within ``timeout``, then stop the workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            undelivered = self._queue.qsize() if self._queue is not None else 0
+            logger.warning("Dropping %d undelivered formulation events", undelivered)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        EVENT_QUEUE_DEPTH.set(value=0)
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        # Workers start on first publish so the bus can be built outside a running loop
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+            self._tasks = [loop.create_task(self._work(self._queue)) for _ in range(self._workers)]
+        return self._queue
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            enqueued_at, event, listeners = await queue.get()
+            EVENT_QUEUE_DEPTH.set(value=queue.qsize())
+            try:
+                await asyncio.gather(*(self._deliver(listener, event, enqueued_at) for listener in listeners))
+            finally:
+                queue.task_done()
 
-class FormulationPipelineCache:
-    """Process-local TTL cache for formulation read operations."""
+    async def _deliver(self, listener: EventHandler, event: FormulationEvent, enqueued_at: float) -> None:
+        listener_name = _listener_name(listener)
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await asyncio.wait_for(_call_listener(listener, event), self._handler_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # handler failures must not stop the worker
+                error = "timed out" if isinstance(exc, asyncio.TimeoutError) else f"{exc.__class__.__name__}: {exc}"
+                if attempt < self._max_attempts:
+                    EVENT_HANDLER_FAILURES.inc(event.type, "retried")
+                    await asyncio.sleep(self._retry_backoff * (2 ** (attempt - 1)))
+                    continue
+                EVENT_HANDLER_FAILURES.inc(event.type, "dead_lettered")
+                logger.error(
+                    "Formulation event handler gave up after %d attempts: %s",
+                    attempt,
+                    error,
+                    extra={"event": event.type, "listener": listener_name},
+                )
+                self._dead_letters.append(
+                    DeadLetter(event=event, listener=listener_name, error=error, attempts=attempt)
+                )
+                return
+            EVENT_HANDLER_LAG.observe(event.type, value=time.monotonic() - enqueued_at)
+            return
 
-    def __init__(self, ttl_seconds: int = 10, max_entries: int = 128) -> None:
-        self._ttl_seconds = ttl_seconds
-        self._max_entries = max(1, max_entries)
-        self._store: Dict[Any, Tuple[float, Any]] = {}
-        self._lock = asyncio.Lock()
 
-    async def get(self, key: Any) -> Optional[Any]:
-        async with self._lock:
-            entry = self._store.get(key)
-            if not entry:
-                return None
+def _listener_name(listener: EventHandler) -> str:
+    return getattr(listener, "__name__", listener.__class__.__name__)
 
-            expires_at, value = entry
-            if expires_at < time.time():
-                self._store.pop(key, None)
-                return None
 
-            return _safe_copy(value)
+async def _call_listener(listener: EventHandler, event: FormulationEvent) -> None:
+    result = listener(event)
+    if asyncio.iscoroutine(result):
+        await result
 
-    async def set(self, key: Any, value: Any) -> None:
-        async with self._lock:
-            if len(self._store) >= self._max_entries:
-                # Drop oldest entry to respect cache size
-                oldest_key = min(self._store.keys(), key=lambda candidate: self._store[candidate][0])
-                self._store.pop(oldest_key, None)
 
-            self._store[key] = (time.time() + self._ttl_seconds, _safe_copy(value))
+class CachedFormulationResponse(FormulationResponse):
+    """A :class:`FormulationResponse` that cannot be modified once built.
 
-    async def invalidate(self, predicate: Optional[Callable[[Any], bool]] = None) -> None:
-        async with self._lock:
-            if predicate is None:
-                self._store.clear()
-                return
+    The pipeline builds and caches formulations as this type, so a cache
+    hit can hand out the stored instance itself: assigning to a field
+    raises instead of changing what every other reader sees.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
-            keys_to_delete = [key for key in self._store if predicate(key)]
-            for key in keys_to_delete:
-                self._store.pop(key, None)
 
+@dataclass(frozen=True)
+class CacheEntry:
+    """Immutable cached response: the model plus its JSON encoding.
 
-def _safe_copy(value: Any) -> Any:
+    ``value`` is shared by every hit, so formulations are cached as frozen
+    :class:`CachedFormulationResponse` models. ``payload`` is the JSON
+    encoding used for size accounting and for answering requests without
+    re-serializing. ``etag`` is a strong validator derived from ``payload``.
+    """
+
+    value: Any
+    payload: bytes
+    expires_at: float
+    etag: str = ""
+
+    @classmethod
+    def build(cls, value: Any, expires_at: float = 0.0) -> "CacheEntry":
+        payload = _encode_cache_value(value)
+        return cls(value=value, payload=payload, expires_at=expires_at, etag=_etag(payload))
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+@dataclass(frozen=True)
+class ListPage:
+    """Cached list page: the ids it holds plus the sort keys that bound it.
+
+    Formulations themselves are cached under their own versioned keys, so a
+    page stays valid across edits that leave its membership and order alone.
+    """
+
+    skip: int
+    ids: Tuple[str, ...]
+    sort_keys: Tuple[str, ...]
+    # (sort_ts, id) the page starts after; None for offset pages
+    after: Optional[Tuple[str, str]] = None
+    next_cursor: Optional[str] = None
+
+
+def _sort_key(formulation: FormulationResponse) -> str:
+    # Mirrors f.sort_ts, which the pipeline writes from the same value
+    return formulation.updated_at or formulation.created_at or ""
+
+
+def _record_sort_key(record: Dict[str, Any], formulation: FormulationResponse) -> str:
+    # Prefer the stored key: backfilled rows hold Cypher's toString() of a
+    # temporal, which need not match the serialized created_at
+    node = record.get("f")
+    props = node.get("properties", node) if isinstance(node, dict) else {}
+    sort_ts = props.get("sort_ts") if isinstance(props, dict) else None
+    return sort_ts if isinstance(sort_ts, str) else _sort_key(formulation)
+
+
+def encode_list_cursor(sort_ts: str, formulation_id: str) -> str:
+    """Encode the last row of a list page as an opaque keyset cursor."""
+    raw = json.dumps([sort_ts, formulation_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_list_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Return the ``(sort_ts, id)`` behind ``cursor``; raises ``ValueError`` when malformed."""
+    if not cursor or not cursor.strip():
+        return None
+    token = cursor.strip()
     try:
-        from copy import deepcopy
+        padded = (token + "=" * (-len(token) % 4)).encode("ascii")
+        decoded = json.loads(base64.b64decode(padded, altchars=b"-_", validate=True).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Malformed formulation cursor") from exc
+    if not (
+        isinstance(decoded, list)
+        and len(decoded) == 2
+        and all(isinstance(part, str) and part for part in decoded)
+    ):
+        raise ValueError("Malformed formulation cursor")
+    return decoded[0], decoded[1]
+
+
+def _encode_shared_page(response: FormulationListResponse, sort_keys: Sequence[str]) -> bytes:
+    # The page's stored sort keys travel with it so other workers can cache it locally
+    payload = response.model_dump(mode="json")
+    payload["sort_keys"] = list(sort_keys)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_shared_page(raw: bytes) -> Tuple[FormulationListResponse, Optional[List[str]]]:
+    payload = json.loads(raw)
+    sort_keys = payload.pop("sort_keys", None)
+    if isinstance(payload.get("formulations"), list):
+        payload["formulations"] = [
+            CachedFormulationResponse.model_validate(formulation) for formulation in payload["formulations"]
+        ]
+    response = FormulationListResponse.model_validate(payload)
+    if not isinstance(sort_keys, list) or len(sort_keys) != len(response.formulations):
+        return response, None
+    return response, [str(key) for key in sort_keys]
+
+
+def _etag(payload: bytes) -> str:
+    # Content hash rather than version counters, which differ between workers
+    return '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+
+
+def _encode_cache_value(value: Any) -> bytes:
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode("utf-8")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = dataclasses.asdict(value)
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
 
-        return deepcopy(value)
-    except (TypeError, ValueError):  # pragma: no cover - defensive copy failures
-        return value
+
+class FormulationPipelineCache:
+    """Process-local LRU cache with TTL for formulation read operations.
+
+    Entries live in an ``OrderedDict`` in recency order, so hits, inserts and
+    evictions are O(1). Values are stored once as immutable
+    :class:`CacheEntry` objects: a hit hands back the stored model without
+    copying or re-validating it. The cache is bounded by ``max_entries`` and
+    by ``max_bytes`` of encoded payload; values larger than ``max_bytes`` are
+    not cached. No method awaits, so each runs atomically on the event loop
+    without a lock.
+
+    With ``stale_seconds`` set, expired entries are kept that much longer.
+    Lookups still miss on them, but :meth:`stale` returns them, so callers
+    can serve the old value while they refresh it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 10,
+        max_entries: int = 128,
+        max_bytes: int = 32 * 1024 * 1024,
+        stale_seconds: float = 0.0,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = max(0.0, stale_seconds)
+        self._max_entries = max(1, max_entries)
+        self._max_bytes = max(1, max_bytes)
+        self._store: "OrderedDict[Any, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    async def get(self, key: Any) -> Optional[Any]:
+        entry = await self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    async def get_entry(self, key: Any) -> Optional[CacheEntry]:
+        entry = self._store.get(key)
+        if entry is None:
+            self._record_miss()
+            return None
+        now = time.monotonic()
+        if entry.expires_at < now:
+            if entry.expires_at + self._stale_seconds < now:
+                self._remove(key)
+                self._expirations += 1
+                self._publish_size()
+            self._record_miss()
+            return None
+        self._store.move_to_end(key)
+        self._hits += 1
+        CACHE_REQUESTS.inc("hit")
+        return entry
+
+    async def set(self, key: Any, value: Any) -> Optional[CacheEntry]:
+        entry = CacheEntry.build(value, expires_at=time.monotonic() + self._ttl_seconds)
+        self._remove(key)
+        if entry.size > self._max_bytes:
+            self._publish_size()
+            return None
+
+        self._store[key] = entry
+        self._bytes += entry.size
+        while len(self._store) > self._max_entries or self._bytes > self._max_bytes:
+            self._remove(next(iter(self._store)))
+            self._evictions += 1
+            CACHE_EVICTIONS.inc()
+        self._publish_size()
+        return entry
+
+    def peek(self, key: Any) -> Optional[Any]:
+        """Return a live value without touching recency or hit statistics."""
+        entry = self._store.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            return None
+        return entry.value
+
+    def peek_entry(self, key: Any) -> Optional[CacheEntry]:
+        """Return a live or stale entry without touching recency or hit statistics."""
+        entry = self._store.get(key)
+        if entry is None or entry.expires_at + self._stale_seconds < time.monotonic():
+            return None
+        return entry
+
+    def stale(self, key: Any) -> Optional[Any]:
+        """Return an expired value that is still inside the stale window."""
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if entry.expires_at < now <= entry.expires_at + self._stale_seconds:
+            return entry.value
+        return None
+
+    async def delete(self, key: Any) -> None:
+        self._remove(key)
+        self._publish_size()
+
+    async def invalidate(self, predicate: Optional[Callable[[Any], bool]] = None) -> None:
+        if predicate is None:
+            self._store.clear()
+            self._bytes = 0
+        else:
+            for key in [key for key in self._store if predicate(key)]:
+                self._remove(key)
+        self._publish_size()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+    def _remove(self, key: Any) -> None:
+        entry = self._store.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _record_miss(self) -> None:
+        self._misses += 1
+        CACHE_REQUESTS.inc("miss")
+
+    def _publish_size(self) -> None:
+        CACHE_ENTRIES.set(value=len(self._store))
+        CACHE_BYTES.set(value=self._bytes)
 
 
 def _is_neo4j_exception(exc: BaseException) -> bool:
@@ -165,6 +569,32 @@ def _compute_cost_fields(percentage: Optional[float], cost_per_kg: Optional[floa
     return quantity_kg, cost_reference
 
 
+def _ingredient_rows(ingredients: List[Any]) -> List[Dict[str, Any]]:
+    """Build the ``$ingredients`` rows consumed by the create/update UNWIND."""
+    rows: List[Dict[str, Any]] = []
+    for ing in ingredients:
+        quantity_kg, cost_reference = _compute_cost_fields(ing.percentage, ing.cost_per_kg)
+        rows.append(
+            {
+                "name": ing.name,
+                "percentage": ing.percentage,
+                "cost_per_kg": ing.cost_per_kg if ing.cost_per_kg is not None else 0.0,
+                "function": ing.function or "unspecified",
+                "quantity_kg": quantity_kg,
+                "cost_reference": cost_reference,
+            }
+        )
+    return rows
+
+
+def check_percentages(ingredients: List[Any]) -> float:
+    """Return the ingredient percentage total; raises ``ValueError`` unless it is 100%."""
+    total_percentage = sum(ing.percentage for ing in ingredients)
+    if abs(total_percentage - 100.0) > 0.1:
+        raise ValueError(f"Ingredient percentages must sum to 100%. Current total: {total_percentage}%")
+    return total_percentage
+
+
 def _map_formulation_record(record: Dict[str, Any]) -> Optional[FormulationResponse]:
     form_node = record.get("f")
     if not form_node:
@@ -195,7 +625,7 @@ def _map_formulation_record(record: Dict[str, Any]) -> Optional[FormulationRespo
         ingredient.setdefault("cost_reference", cost_reference)
     total_percentage = sum(ing.get("percentage", 0.0) for ing in ingredients)
 
-    return FormulationResponse(
+    return CachedFormulationResponse(
         id=form_props.get("id", ""),
         name=form_props.get("name", ""),
         description=form_props.get("description"),
@@ -210,18 +640,66 @@ def _map_formulation_record(record: Dict[str, Any]) -> Optional[FormulationRespo
     )
 
 
-def _fetch_formulation(neo4j_client, formulation_id: str) -> Optional[FormulationResponse]:
+def _fetch_formulation(
+    neo4j_client, formulation_id: str, causal: Optional[CausalContext] = None
+) -> Optional[FormulationResponse]:
     if not neo4j_client:
         return None
 
-    records = neo4j_client.execute_query(_SINGLE_FORMULATION_QUERY, {"id": formulation_id})
+    records = neo4j_client.execute_read(queries.FORMULATION_GET, {"id": formulation_id}, causal=causal)
     if not records:
         return None
     return _map_formulation_record(records[0])
 
 
+_MAX_TRACKED_PAGES = 1024
+
+WRITE_EVENTS = ("formulation.created", "formulation.updated", "formulation.deleted")
+# Events relayed between workers and re-published on each worker's local bus
+RELAYED_EVENTS = WRITE_EVENTS + (FOODS_INGESTED_EVENT,)
+
+# Shared-tier keys. Get entries are written through on update and replaced by
+# a tombstone on delete, so a reader racing a delete cannot re-insert the row
+# (readers only add missing keys). List pages hang off a fleet-wide generation.
+_SHARED_TOMBSTONE = b"-"
+_SHARED_GENERATION_KEY = "formulations:list-generation"
+
+
+def _shared_get_key(formulation_id: str) -> str:
+    return f"formulations:get:{formulation_id}"
+
+
+def _shared_list_key(generation: int, position: str, limit: int) -> str:
+    return f"formulations:list:{generation}:{position}:{limit}"
+
+
 class FormulationPipelineService:
-    """Centralized formulation pipeline coordinating retries, caching, and events."""
+    """Centralized formulation pipeline coordinating retries, caching, and events.
+
+    Every public method accepts an optional :class:`CausalContext`. Writes
+    record their bookmarks in it, so callers can hand the token to HTTP
+    clients. Reads made with a non-empty context skip the cache and wait until
+    the serving cluster member has caught up to those bookmarks.
+
+    Cache keys are stamped rather than flushed. A formulation is cached under
+    ``("get", id, version)`` and a write bumps only that id's version. List
+    pages hold ids under ``("list", generation, skip, limit)`` and are
+    assembled from the per-formulation entries. A create bumps the
+    generation, since the new row sorts first and shifts every page. An
+    update or delete drops only the pages whose membership or order it
+    changes. Keyset pages, read with a ``cursor``, are keyed by the row they
+    start after and never shift: new and updated rows sort before every
+    cursor, so such a page only goes stale when one of its own rows changes.
+    The total count is cached under its own generation and adjusted in place
+    by creates and deletes rather than re-counted.
+
+    With a ``shared_cache`` the process-local cache becomes the first tier
+    in front of a :class:`CacheBackend` shared by every worker. Writes
+    update the shared tier once per key and publish their lifecycle event.
+    :func:`attach_shared_cache` relays those events, and FDC ingest events,
+    to the other workers. Each applies them through :meth:`apply_remote_event`
+    and re-publishes them to its own subscribers.
+    """
 
     def __init__(
         self,
@@ -232,6 +710,11 @@ class FormulationPipelineService:
         max_retries: int = 2,
         backoff_seconds: float = 0.3,
         max_backoff_seconds: float = 2.0,
+        max_concurrency: int = 8,
+        max_queue_depth: int = 64,
+        queue_timeout_seconds: float = 2.0,
+        shared_cache: Optional[CacheBackend] = None,
+        shared_ttl_seconds: float = 60.0,
     ) -> None:
         self._neo4j = neo4j_client
         self._cache = cache or FormulationPipelineCache()
@@ -239,320 +722,560 @@ class FormulationPipelineService:
         self._max_retries = max(1, max_retries)
         self._backoff_seconds = max(0.0, backoff_seconds)
         self._max_backoff_seconds = max(self._backoff_seconds, max_backoff_seconds)
-
-    async def create(self, payload: FormulationCreate) -> FormulationResponse:
+        # Operations drive the synchronous Neo4j client on a dedicated executor
+        # so they neither block the event loop nor compete with other
+        # to_thread users. The semaphore bounds concurrency to the executor
+        # size, and callers beyond max_queue_depth are shed rather than queued.
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_queue_depth = max(0, max_queue_depth)
+        self._queue_timeout_seconds = max(0.0, queue_timeout_seconds)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="formulation-pipeline"
+        )
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._queued = 0
+        self._in_flight = 0
+        self._versions: Dict[str, int] = {}
+        self._list_generation = 0
+        self._count_generation = 0
+        self._list_pages: Dict[Tuple[Any, ...], ListPage] = {}
+        # Bumped by every write; a list read that straddles one is not cached
+        self._write_epoch = 0
+        self._get_flights: SingleFlight[Optional[FormulationResponse]] = SingleFlight("formulation_get")
+        self._shared_cache = shared_cache
+        self._shared_ttl_seconds = shared_ttl_seconds
+        self._shared_generation = 0
+
+    @property
+    def neo4j_client(self):
+        return self._neo4j
+
+    @neo4j_client.setter
+    def neo4j_client(self, client) -> None:
+        """Point the service at a replacement client, e.g. after a settings refresh."""
+        self._neo4j = client
+
+    async def create(
+        self, payload: FormulationCreate, *, causal: Optional[CausalContext] = None
+    ) -> FormulationResponse:
+        causal = causal if causal is not None else CausalContext()
         created_at = datetime.now().isoformat()
         formulation_id = f"form_{int(datetime.now().timestamp() * 1000)}"
 
         def operation() -> FormulationResponse:
-            total_percentage = sum(ing.percentage for ing in payload.ingredients)
-            if abs(total_percentage - 100.0) > 0.1:
-                raise ValueError(
-                    f"Ingredient percentages must sum to 100%. Current total: {total_percentage}%"
-                )
-
-            manual_ingredients: List[Dict[str, Any]] = []
-            manual_cost_per_kg = 0.0
-            for ing in payload.ingredients:
-                ingredient_dict = ing.model_dump()
-                quantity_kg, cost_reference = _compute_cost_fields(ing.percentage, ing.cost_per_kg)
-                ingredient_dict["quantity_kg"] = quantity_kg
-                ingredient_dict["cost_reference"] = cost_reference
-                manual_ingredients.append(ingredient_dict)
-                manual_cost_per_kg += cost_reference
+            total_percentage = check_percentages(payload.ingredients)
+            rows = _ingredient_rows(payload.ingredients)
 
             if self._neo4j:
-                self._persist_creation(formulation_id, payload, created_at)
-                created = _fetch_formulation(self._neo4j, formulation_id)
+                created = self._persist_creation(formulation_id, payload, created_at, rows, causal)
                 if created:
                     return created
 
-            return FormulationResponse(
+            return CachedFormulationResponse(
                 id=formulation_id,
                 name=payload.name,
                 description=payload.description,
                 status=payload.status,
-                ingredients=manual_ingredients,
+                ingredients=rows,
                 total_percentage=total_percentage,
                 created_at=created_at,
-                cost_per_kg=manual_cost_per_kg,
+                cost_per_kg=sum(row["cost_reference"] for row in rows),
                 cost_basis_kg=1.0,
                 cost_updated_at=datetime.now().isoformat(),
             )
 
-        result = await self._execute_with_retry(operation, op_name="create formulation")
-        await self._cache.invalidate()
-        await self._publish("formulation.created", {"id": result.id})
+        result = await self._execute_with_retry(operation, op_name="create formulation", kind="create")
+        await self._apply_write("formulation.created", result.id)
+        entry = await self._cache.set(self._get_key(result.id), result)
+        await self._publish("formulation.created", await self._shared_write(result.id, entry))
         return result
 
-    def _persist_creation(self, formulation_id: str, payload: FormulationCreate, created_at: str) -> None:
-        self._neo4j.execute_query(
-            """
-            CREATE (f:Formulation {
-                id: $id,
-                name: $name,
-                description: $description,
-                status: $status,
-                created_at: $created_at
-            })
-            RETURN f
-            """,
+    def _persist_creation(
+        self,
+        formulation_id: str,
+        payload: FormulationCreate,
+        created_at: str,
+        rows: List[Dict[str, Any]],
+        causal: CausalContext,
+    ) -> Optional[FormulationResponse]:
+        # One transaction: node, ingredient links, cost rollup and the read-back
+        records = self._neo4j.execute_query(
+            queries.FORMULATION_CREATE,
             {
                 "id": formulation_id,
                 "name": payload.name,
                 "description": payload.description,
                 "status": payload.status,
                 "created_at": created_at,
+                "ingredients": rows,
             },
+            causal=causal,
         )
+        return _map_formulation_record(records[0]) if records else None
 
-        total_cost_reference = 0.0
-        for ing in payload.ingredients:
-            quantity_kg, cost_reference = _compute_cost_fields(ing.percentage, ing.cost_per_kg)
-            total_cost_reference += cost_reference
-            self._neo4j.execute_query(
-                """
-                MATCH (f:Formulation {id: $form_id})
-                MERGE (i:Food {name: $name})
-                CREATE (f)-[:CONTAINS {
-                    percentage: $percentage,
-                    cost_per_kg: $cost_per_kg,
-                    function: $function,
-                    quantity_kg: $quantity_kg,
-                    cost_reference: $cost_reference
-                }]->(i)
-                """,
-                {
-                    "form_id": formulation_id,
-                    "name": ing.name,
-                    "percentage": ing.percentage,
-                    "cost_per_kg": ing.cost_per_kg if ing.cost_per_kg is not None else 0.0,
-                    "function": ing.function or "unspecified",
-                    "quantity_kg": quantity_kg,
-                    "cost_reference": cost_reference,
-                },
-            )
+    async def list(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        causal: Optional[CausalContext] = None,
+    ) -> FormulationListResponse:
+        after = decode_list_cursor(cursor)
+        if after is None:
+            page_key: Tuple[Any, ...] = ("list", self._list_generation, skip, limit)
+            shared_key = _shared_list_key(self._shared_generation, str(skip), limit)
+        else:
+            page_key = ("list_after", after[0], after[1], limit)
+            shared_key = _shared_list_key(self._shared_generation, f"after:{encode_list_cursor(*after)}", limit)
+        count_key = ("count", self._count_generation)
+        epoch = self._write_epoch
+        if not causal:
+            cached = await self._cached_page(page_key)
+            if cached is not None:
+                formulations, next_cursor = cached
+                total_count = await self._total_count(count_key)
+                # Every part was validated when it was cached
+                return FormulationListResponse.model_construct(
+                    formulations=formulations, total_count=total_count, next_cursor=next_cursor
+                )
+            shared = await self._shared_get(shared_key)
+            if shared is not None:
+                response, shared_sort_keys = _decode_shared_page(shared)
+                if epoch == self._write_epoch and shared_sort_keys is not None:
+                    await self._store_list(page_key, count_key, skip, after, response, shared_sort_keys)
+                return response
 
-        self._neo4j.execute_query(
-            """
-            MATCH (f:Formulation {id: $id})
-            SET f.cost_per_kg = $cost_per_kg,
-                f.cost_basis_kg = $cost_basis_kg,
-                f.cost_updated_at = datetime()
-            RETURN f
-            """,
-            {
-                "id": formulation_id,
-                "cost_per_kg": total_cost_reference,
-                "cost_basis_kg": 1.0,
-            },
-        )
+        if not self._neo4j:
+            return FormulationListResponse(formulations=[], total_count=0)
 
-    async def list(self, *, skip: int = 0, limit: int = 50) -> FormulationListResponse:
-        cache_key = ("list", skip, limit)
-        cached = await self._cache.get(cache_key)
-        if cached:
-            return FormulationListResponse.model_validate(cached)
+        known_count = None if causal else self._cache.peek(count_key)
 
-        if not self._neo4j:
-            response = FormulationListResponse(formulations=[], total_count=0)
-            await self._cache.set(cache_key, response.model_dump())
-            return response
-
-        def operation() -> FormulationListResponse:
-            query = """
-            MATCH (f:Formulation)
-            OPTIONAL MATCH (f)-[c:CONTAINS]->(i:Food)
-            RETURN f, collect({
-                name: i.name,
-                percentage: coalesce(c['percentage'], 0.0),
-                cost_per_kg: coalesce(c['cost_per_kg'], 0.0),
-                function: coalesce(c['function'], i['function'], 'unspecified'),
-                quantity_kg: coalesce(c['quantity_kg'], coalesce(c['percentage'], 0.0) / 100.0),
-                cost_reference: coalesce(
-                    c['cost_reference'],
-                    (coalesce(c['percentage'], 0.0) / 100.0) * coalesce(c['cost_per_kg'], 0.0)
+        def operation() -> Tuple[FormulationListResponse, List[str]]:
+            if after is None:
+                records = self._neo4j.execute_read(
+                    queries.FORMULATION_LIST, {"skip": skip, "limit": limit}, causal=causal
+                )
+            else:
+                records = self._neo4j.execute_read(
+                    queries.FORMULATION_LIST_AFTER,
+                    {"after_ts": after[0], "after_id": after[1], "limit": limit},
+                    causal=causal,
                 )
-            }) as ingredients
-            ORDER BY coalesce(f.updated_at, f.created_at) DESC
-            SKIP $skip
-            LIMIT $limit
-            """
-
-            records = self._neo4j.execute_query(query, {"skip": skip, "limit": limit})
             formulations: List[FormulationResponse] = []
+            sort_keys: List[str] = []
             for record in records:
                 mapped = _map_formulation_record(record)
                 if mapped:
                     formulations.append(mapped)
+                    sort_keys.append(_record_sort_key(record, mapped))
+
+            total_count = known_count
+            if total_count is None:
+                count_result = self._neo4j.execute_read(queries.FORMULATION_COUNT, causal=causal)
+                total_count = count_result[0].get("total", 0) if count_result else 0
 
-            count_query = "MATCH (f:Formulation) RETURN count(f) as total"
-            count_result = self._neo4j.execute_query(count_query)
-            total_count = count_result[0].get("total", 0) if count_result else 0
+            next_cursor = None
+            if formulations and len(records) >= limit:
+                next_cursor = encode_list_cursor(sort_keys[-1], formulations[-1].id)
 
-            return FormulationListResponse(formulations=formulations, total_count=total_count)
+            response = FormulationListResponse(
+                formulations=formulations, total_count=total_count, next_cursor=next_cursor
+            )
+            return response, sort_keys
 
-        response = await self._execute_with_retry(operation, op_name="list formulations")
-        await self._cache.set(cache_key, response.model_dump())
+        response, sort_keys = await self._execute_with_retry(operation, op_name="list formulations", kind="list")
+        if epoch == self._write_epoch:
+            await self._store_list(page_key, count_key, skip, after, response, sort_keys)
+            if self._shared_cache is not None:
+                await self._shared_set(shared_key, _encode_shared_page(response, sort_keys))
         return response
 
-    async def get(self, formulation_id: str) -> Optional[FormulationResponse]:
-        cache_key = ("get", formulation_id)
+    async def _cached_page(
+        self, page_key: Tuple[Any, ...]
+    ) -> Optional[Tuple[List[FormulationResponse], Optional[str]]]:
+        page = await self._cache.get(page_key)
+        if page is None:
+            self._list_pages.pop(page_key, None)
+            return None
+        formulations: List[FormulationResponse] = []
+        for formulation_id in page.ids:
+            formulation = await self._cache.get(self._get_key(formulation_id))
+            if formulation is None:
+                return None
+            formulations.append(formulation)
+        return formulations, page.next_cursor
+
+    async def _total_count(self, count_key: Tuple[Any, ...]) -> int:
+        cached = await self._cache.get(count_key)
+        if cached is not None:
+            return cached
+
+        def operation() -> int:
+            count_result = self._neo4j.execute_read(queries.FORMULATION_COUNT)
+            return count_result[0].get("total", 0) if count_result else 0
+
+        total_count = await self._execute_with_retry(operation, op_name="count formulations", kind="list")
+        if count_key == ("count", self._count_generation):
+            await self._cache.set(count_key, total_count)
+        return total_count
+
+    async def _store_list(
+        self,
+        page_key: Tuple[Any, ...],
+        count_key: Tuple[Any, ...],
+        skip: int,
+        after: Optional[Tuple[str, str]],
+        response: FormulationListResponse,
+        sort_keys: Sequence[str],
+    ) -> None:
+        """Cache a page under the stored ``f.sort_ts`` keys its rows are ordered by."""
+        for formulation in response.formulations:
+            await self._cache.set(self._get_key(formulation.id), formulation)
+        await self._cache.set(count_key, response.total_count)
+        page = ListPage(
+            skip=skip,
+            ids=tuple(formulation.id for formulation in response.formulations),
+            sort_keys=tuple(sort_keys),
+            after=after,
+            next_cursor=response.next_cursor,
+        )
+        if await self._cache.set(page_key, page) is None:
+            return
+        self._list_pages[page_key] = page
+        if len(self._list_pages) > _MAX_TRACKED_PAGES:
+            # Forget pages the LRU has already evicted
+            for tracked in [key for key in self._list_pages if self._cache.peek(key) is None]:
+                del self._list_pages[tracked]
+
+    async def get(
+        self, formulation_id: str, *, causal: Optional[CausalContext] = None
+    ) -> Optional[FormulationResponse]:
+        cache_key = self._get_key(formulation_id)
+        if causal:
+            return await self._load(formulation_id, cache_key, causal)
+
         cached = await self._cache.get(cache_key)
-        if cached:
-            return FormulationResponse.model_validate(cached)
+        if cached is not None:
+            return cached
+        stale = self._cache.stale(cache_key)
+        if stale is not None:
+            self._get_flights.refresh(cache_key, lambda: self._load(formulation_id, cache_key, None))
+            return stale
+        # Concurrent misses for one formulation share a single fetch
+        return await self._get_flights.do(cache_key, lambda: self._load(formulation_id, cache_key, None))
+
+    async def get_entry(
+        self, formulation_id: str, *, causal: Optional[CausalContext] = None
+    ) -> Optional[CacheEntry]:
+        """Like :meth:`get`, but return the cache entry with its JSON payload and ETag."""
+        result = await self.get(formulation_id, causal=causal)
+        if result is None:
+            return None
+        entry = self._cache.peek_entry(self._get_key(formulation_id))
+        if entry is None or entry.value is not result:
+            # Too large to cache, or replaced since; encode this one result
+            entry = CacheEntry.build(result)
+        return entry
+
+    def list_etag(self, page: FormulationListResponse) -> str:
+        """Strong ETag for a list page, built from its formulations' cached ETags."""
+        parts = [str(page.total_count), page.next_cursor or ""]
+        for formulation in page.formulations:
+            entry = self._cache.peek_entry(self._get_key(formulation.id))
+            if entry is None or entry.value is not formulation:
+                entry = CacheEntry.build(formulation)
+            parts.append(entry.etag)
+        return _etag("\n".join(parts).encode("utf-8"))
+
+    async def _load(
+        self, formulation_id: str, cache_key: Tuple[Any, ...], causal: Optional[CausalContext]
+    ) -> Optional[FormulationResponse]:
+        if not causal:
+            shared = await self._shared_get(_shared_get_key(formulation_id))
+            if shared is not None:
+                shared_result = CachedFormulationResponse.model_validate_json(shared)
+                await self._cache.set(cache_key, shared_result)
+                return shared_result
 
         if not self._neo4j:
             return None
 
         def operation() -> Optional[FormulationResponse]:
-            return _fetch_formulation(self._neo4j, formulation_id)
+            return _fetch_formulation(self._neo4j, formulation_id, causal)
 
-        result = await self._execute_with_retry(operation, op_name=f"get formulation {formulation_id}")
+        result = await self._execute_with_retry(operation, op_name=f"get formulation {formulation_id}", kind="get")
         if result:
-            await self._cache.set(cache_key, result.model_dump())
+            entry = await self._cache.set(cache_key, result)
+            if entry is not None:
+                await self._shared_set(_shared_get_key(formulation_id), entry.payload, only_if_absent=True)
         return result
 
-    async def update(self, formulation_id: str, payload: FormulationUpdate) -> FormulationResponse:
+    async def update(
+        self, formulation_id: str, payload: FormulationUpdate, *, causal: Optional[CausalContext] = None
+    ) -> FormulationResponse:
         if not self._neo4j:
             raise RuntimeError("Neo4j database not connected")
 
+        causal = causal if causal is not None else CausalContext()
+
         update_data = payload.model_dump(exclude_unset=True)
         if not update_data:
             raise ValueError("No update fields provided")
 
-        def operation() -> FormulationResponse:
-            existing = _fetch_formulation(self._neo4j, formulation_id)
-            if not existing:
-                raise LookupError(f"Formulation {formulation_id} not found")
+        fields = {key: update_data[key] for key in ("name", "description", "status") if key in update_data}
+        rows: Optional[List[Dict[str, Any]]] = None
+        if "ingredients" in update_data:
+            ingredients_payload = payload.ingredients or []
+            check_percentages(ingredients_payload)
+            rows = _ingredient_rows(ingredients_payload)
 
-            fields = set(update_data.keys())
-            updated_name = payload.name if "name" in fields else existing.name
-            updated_description = payload.description if "description" in fields else existing.description
-            updated_status = payload.status if "status" in fields else existing.status
-            updated_at = datetime.now().isoformat()
-
-            self._neo4j.execute_query(
-                """
-                MATCH (f:Formulation {id: $id})
-                SET f.name = $name,
-                    f.description = $description,
-                    f.status = $status,
-                    f.updated_at = $updated_at
-                RETURN f
-                """,
+        def operation() -> FormulationResponse:
+            # Field changes, ingredient replacement, cost rollup and the
+            # read-back run as one transaction, so a failure leaves no partial update
+            records = self._neo4j.execute_query(
+                queries.FORMULATION_UPDATE,
                 {
                     "id": formulation_id,
-                    "name": updated_name,
-                    "description": updated_description,
-                    "status": updated_status,
-                    "updated_at": updated_at,
+                    "fields": fields,
+                    "updated_at": datetime.now().isoformat(),
+                    "ingredients": rows,
                 },
+                causal=causal,
             )
+            if not records:
+                raise LookupError(f"Formulation {formulation_id} not found")
 
-            if "ingredients" in fields:
-                ingredients_payload = payload.ingredients or []
-                total_percentage = sum(ing.percentage for ing in ingredients_payload)
-
-                if abs(total_percentage - 100.0) > 0.1:
-                    raise ValueError(
-                        f"Ingredient percentages must sum to 100%. Current total: {total_percentage}%"
-                    )
-
-                self._neo4j.execute_query(
-                    """
-                    MATCH (:Formulation {id: $id})-[rel:CONTAINS]->(:Food)
-                    DELETE rel
-                    """,
-                    {"id": formulation_id},
-                )
-
-                total_cost_reference = 0.0
-                for ing in ingredients_payload:
-                    quantity_kg, cost_reference = _compute_cost_fields(ing.percentage, ing.cost_per_kg)
-                    total_cost_reference += cost_reference
-                    self._neo4j.execute_query(
-                        """
-                        MATCH (f:Formulation {id: $form_id})
-                        MERGE (i:Food {name: $name})
-                        CREATE (f)-[:CONTAINS {
-                            percentage: $percentage,
-                            cost_per_kg: $cost_per_kg,
-                            function: $function,
-                            quantity_kg: $quantity_kg,
-                            cost_reference: $cost_reference
-                        }]->(i)
-                        """,
-                        {
-                            "form_id": formulation_id,
-                            "name": ing.name,
-                            "percentage": ing.percentage,
-                            "cost_per_kg": ing.cost_per_kg if ing.cost_per_kg is not None else 0.0,
-                            "function": ing.function or "unspecified",
-                            "quantity_kg": quantity_kg,
-                            "cost_reference": cost_reference,
-                        },
-                    )
-
-                self._neo4j.execute_query(
-                    """
-                    MATCH (f:Formulation {id: $id})
-                    SET f.cost_per_kg = $cost_per_kg,
-                        f.cost_basis_kg = $cost_basis_kg,
-                        f.cost_updated_at = datetime()
-                    RETURN f
-                    """,
-                    {
-                        "id": formulation_id,
-                        "cost_per_kg": total_cost_reference,
-                        "cost_basis_kg": 1.0,
-                    },
-                )
-
-            updated_formulation = _fetch_formulation(self._neo4j, formulation_id)
+            updated_formulation = _map_formulation_record(records[0])
             if not updated_formulation:
                 raise RuntimeError("Formulation update failed to persist")
 
             return updated_formulation
 
-        response = await self._execute_with_retry(operation, op_name=f"update formulation {formulation_id}")
-        await self._cache.invalidate(lambda key: isinstance(key, tuple) and key[0] in {"list", "get"})
-        await self._cache.set(("get", response.id), response.model_dump())
-        await self._publish("formulation.updated", {"id": response.id})
+        response = await self._execute_with_retry(operation, op_name=f"update formulation {formulation_id}", kind="update")
+        await self._apply_write("formulation.updated", formulation_id)
+        entry = await self._cache.set(self._get_key(formulation_id), response)
+        await self._publish("formulation.updated", await self._shared_write(formulation_id, entry))
         return response
 
-    async def delete(self, formulation_id: str) -> None:
+    async def delete(self, formulation_id: str, *, causal: Optional[CausalContext] = None) -> None:
         if not self._neo4j:
             raise RuntimeError("Neo4j database not connected")
 
         def operation() -> None:
-            existing = _fetch_formulation(self._neo4j, formulation_id)
+            existing = _fetch_formulation(self._neo4j, formulation_id, causal)
             if not existing:
                 raise LookupError(f"Formulation {formulation_id} not found")
 
-            self._neo4j.execute_query(
-                """
-                MATCH (f:Formulation {id: $id})
-                DETACH DELETE f
-                """,
+            self._neo4j.execute_write(
+                queries.FORMULATION_DELETE,
                 {"id": formulation_id},
+                causal=causal,
             )
 
-        await self._execute_with_retry(operation, op_name=f"delete formulation {formulation_id}")
-        await self._cache.invalidate(lambda key: isinstance(key, tuple) and key[0] in {"list", "get"})
-        await self._publish("formulation.deleted", {"id": formulation_id})
+        await self._execute_with_retry(operation, op_name=f"delete formulation {formulation_id}", kind="delete")
+        await self._apply_write("formulation.deleted", formulation_id)
+        await self._publish("formulation.deleted", await self._shared_write(formulation_id, None))
+
+    async def create_many(
+        self, payloads: Sequence[FormulationCreate], *, causal: Optional[CausalContext] = None
+    ) -> List[str]:
+        """Create ``payloads`` in one write transaction and return their ids.
+
+        Callers validate percentages first. The batch invalidates the cache
+        and publishes one ``formulation.created`` event carrying every id.
+        """
+        if not payloads:
+            return []
+        if not self._neo4j:
+            raise RuntimeError("Neo4j database not connected")
+
+        causal = causal if causal is not None else CausalContext()
+        created_at = datetime.now().isoformat()
+        prefix = f"form_{int(datetime.now().timestamp() * 1000)}_{uuid.uuid4().hex[:6]}"
+        rows = [
+            {
+                "id": f"{prefix}_{index}",
+                "name": payload.name,
+                "description": payload.description,
+                "status": payload.status,
+                "created_at": created_at,
+                "ingredients": _ingredient_rows(payload.ingredients),
+            }
+            for index, payload in enumerate(payloads)
+        ]
+
+        def operation() -> List[str]:
+            records = self._neo4j.execute_query(
+                queries.FORMULATION_CREATE_BATCH, {"formulations": rows}, causal=causal
+            )
+            return [record["id"] for record in records]
+
+        ids = await self._execute_with_retry(
+            operation, op_name=f"create {len(rows)} formulations", kind="create_batch"
+        )
+        await self._apply_write("formulation.created", ids[0] if ids else "", created=len(ids))
+        event = await self._shared_bump_generation({"id": ids[0] if ids else None, "ids": ids})
+        await self._publish("formulation.created", event)
+        return ids
+
+    async def apply_remote_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """Apply another worker's event here and hand it to local subscribers.
+
+        Formulation writes update this worker's cache first. The event is then
+        published on the local bus marked ``remote``, so subscribers such as
+        the nutrient profile store hear it and the relay does not send it
+        back out.
+        """
+        if event_type in WRITE_EVENTS:
+            if not payload.get("id"):
+                return
+            ids = payload.get("ids")
+            created = len(ids) if isinstance(ids, list) else 1
+            await self._apply_write(event_type, str(payload["id"]), created=created)
+            generation = payload.get("list_generation")
+            if isinstance(generation, int):
+                self._shared_generation = max(self._shared_generation, generation)
+        elif event_type not in RELAYED_EVENTS:
+            return
+        await self._event_bus.publish(event_type, payload, remote=True)
+
+    async def sync_shared_generation(self) -> None:
+        """Adopt the fleet-wide list generation; raises :class:`SharedCacheError`."""
+        if self._shared_cache is None:
+            return
+        raw = await self._shared_cache.get(_SHARED_GENERATION_KEY)
+        self._shared_generation = max(self._shared_generation, int(raw or 0))
+
+    async def _apply_write(self, event_type: str, formulation_id: str, *, created: int = 1) -> None:
+        """Advance the local cache stamps for a committed write.
+
+        ``created`` is the number of formulations a create event covers.
+        """
+        if event_type == "formulation.created":
+            # The new formulation sorts first, so every cached page shifts by one
+            await self._bump_list_generation()
+        else:
+            # updated_at moves an updated formulation to the front of the list
+            await self._invalidate_pages(formulation_id, moved_to_front=event_type == "formulation.updated")
+            self._versions[formulation_id] = self._versions.get(formulation_id, 0) + 1
+        if event_type != "formulation.updated":
+            # Carry the cached total over instead of re-counting every formulation
+            previous = self._cache.peek(("count", self._count_generation))
+            self._count_generation += 1
+            if isinstance(previous, int):
+                delta = created if event_type == "formulation.created" else -1
+                await self._cache.set(("count", self._count_generation), max(0, previous + delta))
+        self._write_epoch += 1
+
+    async def _shared_get(self, key: str) -> Optional[bytes]:
+        if self._shared_cache is None:
+            return None
+        try:
+            value = await self._shared_cache.get(key)
+        except SharedCacheError as exc:
+            SHARED_CACHE_ERRORS.inc("get")
+            logger.warning("Shared formulation cache read failed: %s", exc)
+            return None
+        return None if value == _SHARED_TOMBSTONE else value
+
+    async def _shared_set(self, key: str, payload: bytes, *, only_if_absent: bool = False) -> None:
+        if self._shared_cache is None:
+            return
+        try:
+            await self._shared_cache.set(key, payload, self._shared_ttl_seconds, only_if_absent=only_if_absent)
+        except SharedCacheError as exc:
+            SHARED_CACHE_ERRORS.inc("set")
+            logger.warning("Shared formulation cache write failed: %s", exc)
+
+    async def _shared_write(self, formulation_id: str, entry: Optional[CacheEntry]) -> Dict[str, Any]:
+        """Write a committed change through to the shared tier; return the event payload."""
+        payload: Dict[str, Any] = {"id": formulation_id}
+        if self._shared_cache is None:
+            return payload
+        await self._shared_set(
+            _shared_get_key(formulation_id), entry.payload if entry is not None else _SHARED_TOMBSTONE
+        )
+        return await self._shared_bump_generation(payload)
+
+    async def _shared_bump_generation(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Start a new fleet-wide list generation and record it in the event payload."""
+        if self._shared_cache is None:
+            return payload
+        try:
+            generation = await self._shared_cache.incr(_SHARED_GENERATION_KEY)
+        except SharedCacheError as exc:
+            SHARED_CACHE_ERRORS.inc("incr")
+            logger.warning("Shared formulation list generation bump failed: %s", exc)
+        else:
+            self._shared_generation = max(self._shared_generation, generation)
+            payload["list_generation"] = generation
+        return payload
+
+    def _get_key(self, formulation_id: str) -> Tuple[Any, ...]:
+        return ("get", formulation_id, self._versions.get(formulation_id, 0))
+
+    async def _bump_list_generation(self) -> None:
+        # Offset pages only; keyset pages are keyed by their cursor
+        self._list_generation += 1
+        for page_key in [key for key, page in self._list_pages.items() if page.after is None]:
+            del self._list_pages[page_key]
+            await self._cache.delete(page_key)
+
+    async def _last_sort_key(self, formulation_id: str) -> Optional[str]:
+        # Only pages know the stored sort_ts; a cached row alone may be backfilled
+        # with a key in another format, so it cannot place the row among pages
+        for page in self._list_pages.values():
+            if formulation_id in page.ids:
+                return page.sort_keys[page.ids.index(formulation_id)]
+        return None
+
+    async def _invalidate_pages(self, formulation_id: str, *, moved_to_front: bool) -> None:
+        """Drop the cached pages whose membership or order a write changes.
+
+        A formulation at position ``p`` that moves to the front shifts
+        positions ``0..p-1`` down by one; one that is deleted shifts every
+        position after ``p`` up by one. Offset pages outside that range keep
+        their rows. When the formulation's old sort key is unknown, the
+        position is unknown too, and every offset page is dropped. A keyset
+        page is stale only when it holds the formulation.
+        """
+        if not self._list_pages:
+            return
+        old_key = await self._last_sort_key(formulation_id)
+
+        for page_key, page in list(self._list_pages.items()):
+            if page.after is not None:
+                stale = formulation_id in page.ids
+            elif old_key is None:
+                stale = True
+            elif formulation_id in page.ids:
+                stale = not (moved_to_front and page.skip == 0 and page.ids[0] == formulation_id)
+            elif not page.ids:
+                stale = False
+            elif moved_to_front:
+                stale = page.sort_keys[-1] >= old_key
+            else:
+                stale = page.sort_keys[0] <= old_key
+            if stale:
+                del self._list_pages[page_key]
+                await self._cache.delete(page_key)
 
     async def _publish(self, event_type: str, payload: Dict[str, Any]) -> None:
         if not self._event_bus:
             return
         await self._event_bus.publish(event_type, payload)
 
-    async def _execute_with_retry(self, operation: Callable[[], T], *, op_name: str | None = None) -> T:
+    async def _execute_with_retry(
+        self, operation: Callable[[], T], *, op_name: str | None = None, kind: str = "other"
+    ) -> T:
         attempt = 0
         while True:
             try:
-                return operation()
+                return await self._run_bounded(operation, kind)
             except (Neo4jError, ServiceUnavailable, AuthError) as exc:
+                if is_invalid_bookmark(exc):
+                    raise InvalidBookmarkError(str(exc)) from exc
                 raise FormulationDependencyError(str(exc)) from exc
             except (OSError, TimeoutError) as exc:
                 attempt += 1
@@ -568,6 +1291,75 @@ class FormulationPipelineService:
                 )
                 await asyncio.sleep(sleep_for)
 
+    async def _run_bounded(self, operation: Callable[[], T], kind: str) -> T:
+        """Run ``operation`` on the pipeline executor once a slot is free.
+
+        Raises :class:`FormulationPipelineSaturatedError` when the wait queue
+        is full or no slot frees up within the queue timeout. The slot is
+        held per attempt, so retry backoff does not occupy capacity.
+        """
+        if self._slots.locked() and self._queued >= self._max_queue_depth:
+            PIPELINE_REJECTIONS.inc(kind, "queue_full")
+            raise FormulationPipelineSaturatedError(
+                "Formulation pipeline is saturated", retry_after=max(1.0, self._queue_timeout_seconds)
+            )
+
+        queued_at = time.perf_counter()
+        self._queued += 1
+        PIPELINE_QUEUED.set(value=self._queued)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._queue_timeout_seconds or None)
+        except asyncio.TimeoutError as exc:
+            PIPELINE_REJECTIONS.inc(kind, "queue_timeout")
+            raise FormulationPipelineSaturatedError(
+                "Timed out waiting for a formulation pipeline slot",
+                retry_after=max(1.0, self._queue_timeout_seconds),
+            ) from exc
+        finally:
+            self._queued -= 1
+            PIPELINE_QUEUED.set(value=self._queued)
+
+        started = time.perf_counter()
+        PIPELINE_QUEUE_WAIT.observe(kind, value=started - queued_at)
+        self._in_flight += 1
+        PIPELINE_IN_FLIGHT.set(value=self._in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, operation)
+        finally:
+            PIPELINE_EXECUTION.observe(kind, value=time.perf_counter() - started)
+            self._in_flight -= 1
+            PIPELINE_IN_FLIGHT.set(value=self._in_flight)
+            self._slots.release()
+
+    async def ensure_sort_keys(self) -> int:
+        """Create the keyset index and backfill ``sort_ts``; returns the rows backfilled.
+
+        Idempotent, so it runs on every start.
+        """
+        if not self._neo4j:
+            return 0
+
+        def operation() -> int:
+            self._neo4j.execute_write(queries.FORMULATION_SORT_INDEX)
+            records = self._neo4j.execute_query(queries.FORMULATION_BACKFILL_SORT_KEYS)
+            return records[0].get("updated", 0) if records else 0
+
+        return await self._execute_with_retry(operation, op_name="backfill formulation sort keys", kind="maintenance")
+
+    def load(self) -> Dict[str, int]:
+        """Return current executor usage for health and diagnostics."""
+        return {
+            "max_concurrency": self._max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_queue_depth": self._max_queue_depth,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pipeline executor; running operations finish first."""
+        self._executor.shutdown(wait=True)
+
 
 def get_formulation_pipeline(request) -> Optional[FormulationPipelineService]:
     return getattr(request.app.state, "formulation_pipeline", None)
@@ -579,12 +1371,30 @@ def attach_formulation_pipeline(
     *,
     cache_ttl: int = 10,
     cache_entries: int = 128,
+    cache_max_bytes: int = 32 * 1024 * 1024,
+    cache_stale: float = 0.0,
     retry_attempts: int = 3,
     retry_backoff: float = 0.3,
     retry_max_backoff: float = 2.0,
+    max_concurrency: int = 8,
+    max_queue_depth: int = 64,
+    queue_timeout: float = 2.0,
+    shared_cache: Optional[CacheBackend] = None,
+    shared_cache_ttl: float = 60.0,
+    event_workers: int = 0,
+    event_queue_size: int = 1024,
+    event_handler_timeout: float = 5.0,
+    event_max_attempts: int = 3,
 ) -> FormulationPipelineService:
-    cache = FormulationPipelineCache(ttl_seconds=cache_ttl, max_entries=cache_entries)
-    event_bus = FormulationEventBus()
+    cache = FormulationPipelineCache(
+        ttl_seconds=cache_ttl, max_entries=cache_entries, max_bytes=cache_max_bytes, stale_seconds=cache_stale
+    )
+    event_bus = FormulationEventBus(
+        workers=event_workers,
+        max_queue=event_queue_size,
+        handler_timeout=event_handler_timeout,
+        max_attempts=event_max_attempts,
+    )
     pipeline = FormulationPipelineService(
         neo4j_client,
         cache=cache,
@@ -592,20 +1402,52 @@ def attach_formulation_pipeline(
         max_retries=retry_attempts,
         backoff_seconds=retry_backoff,
         max_backoff_seconds=retry_max_backoff,
+        max_concurrency=max_concurrency,
+        max_queue_depth=max_queue_depth,
+        queue_timeout_seconds=queue_timeout,
+        shared_cache=shared_cache,
+        shared_ttl_seconds=shared_cache_ttl,
     )
     app.state.formulation_pipeline = pipeline
     app.state.formulation_event_bus = event_bus
     return pipeline
 
 
+async def attach_shared_cache(
+    app, pipeline: FormulationPipelineService, backend: CacheBackend, *, channel: str
+) -> Optional[CacheInvalidationRelay]:
+    """Start relaying formulation writes between workers through ``backend``.
+
+    Returns ``None`` when the backend is unreachable at startup; the pipeline
+    then keeps serving from its local cache and treats shared reads as misses.
+    """
+    relay = CacheInvalidationRelay(backend, channel)
+    try:
+        await pipeline.sync_shared_generation()
+        await relay.start(pipeline._event_bus, RELAYED_EVENTS, pipeline.apply_remote_event)
+    except SharedCacheError as exc:
+        logger.warning("Shared formulation cache unavailable: %s", exc)
+        return None
+    app.state.formulation_cache_relay = relay
+    return relay
+
+
 __all__ = [
     "FormulationDependencyError",
     "FormulationPipelineError",
+    "FormulationPipelineSaturatedError",
     "FormulationEventError",
     "FormulationEvent",
     "FormulationEventBus",
+    "DeadLetter",
+    "CacheEntry",
+    "CachedFormulationResponse",
     "FormulationPipelineCache",
+    "decode_list_cursor",
+    "encode_list_cursor",
     "FormulationPipelineService",
     "attach_formulation_pipeline",
+    "attach_shared_cache",
+    "check_percentages",
     "get_formulation_pipeline",
 ]
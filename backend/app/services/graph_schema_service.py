@@ -1227,7 +1227,9 @@ class GraphSchemaService:
     DEFAULT_INDEX_STATEMENTS: Tuple[str, ...] = (
         "CREATE INDEX ingredient_name_idx IF NOT EXISTS FOR (i:Ingredient) ON (i.name)",
         "CREATE INDEX food_description_idx IF NOT EXISTS FOR (f:Food) ON (f.description)",
+        "CREATE FULLTEXT INDEX food_description_fulltext IF NOT EXISTS FOR (f:Food) ON EACH [f.description]",
         "CREATE INDEX formulation_status_idx IF NOT EXISTS FOR (f:Formulation) ON (f.status)",
+        "CREATE INDEX formulation_sort_idx IF NOT EXISTS FOR (f:Formulation) ON (f.sort_ts, f.id)",
         "CREATE INDEX label_claim_type_idx IF NOT EXISTS FOR (l:LabelClaim) ON (l.claimType)",
         "CREATE INDEX risk_assessment_target_idx IF NOT EXISTS FOR (r:RiskAssessment) ON (r.target_id)",
         "CREATE INDEX knowledge_chunk_source_idx IF NOT EXISTS FOR (c:KnowledgeChunk) ON (c.source)",
@@ -1261,6 +1263,14 @@ class GraphSchemaService:
         self._neo4j = neo4j_client
         self._schema_name = schema_name or self.DEFAULT_SCHEMA["name"]
 
+    @property
+    def neo4j_client(self) -> Optional[Neo4jClient]:
+        return self._neo4j
+
+    @neo4j_client.setter
+    def neo4j_client(self, client: Optional[Neo4jClient]) -> None:
+        self._neo4j = client
+
     def _default_schema(self) -> Dict[str, Any]:
         """Return a deep copy so callers can mutate without affecting defaults."""
         default_copy = copy.deepcopy(self.DEFAULT_SCHEMA)
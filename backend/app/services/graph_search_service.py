@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from neo4j import exceptions as neo4j_exceptions
 
+from app.db import queries
 from app.db.neo4j_client import Neo4jClient
 from app.services.graphrag_retrieval import GraphRAGRetrievalService, HybridRetrievalResult
 
@@ -62,12 +63,8 @@ class GraphSearchService:
 
     def _search_orchestration_run(self, run_id: str) -> Dict[str, Any]:
         try:
-            run_records = self._neo4j.execute_query(
-                """
-                MATCH (run:OrchestrationRun { runId: $runId })
-                RETURN run
-                LIMIT 1
-                """,
+            run_records = self._neo4j.execute_read(
+                queries.SEARCH_ORCHESTRATION_RUN,
                 {"runId": run_id},
             )
         except neo4j_exceptions.Neo4jError as exc:
@@ -77,40 +74,33 @@ class GraphSearchService:
         if not run_records:
             raise LookupError("Orchestration run not found")
 
-        run_node = Neo4jClient._jsonify(run_records[0].get("run"))
+        run_node = run_records[0].get("run")
         run_props = (run_node or {}).get("properties", {})
 
-        node_records = self._neo4j.execute_query(
-            """
-            MATCH (run:OrchestrationRun { runId: $runId })-[:GENERATED_ENTITY]->(node:GraphEntity)
-            RETURN DISTINCT node
-            """,
+        node_records = self._neo4j.execute_read(
+            queries.SEARCH_RUN_ENTITIES,
             {"runId": run_id},
         )
 
         nodes_map: Dict[str, Dict[str, Any]] = {}
         for record in node_records:
-            raw_node = Neo4jClient._jsonify(record.get("node"))
+            raw_node = record.get("node")
             if not raw_node:
                 continue
             node = self._format_node(raw_node)
             if node:
                 nodes_map[node["id"]] = node
 
-        edge_records = self._neo4j.execute_query(
-            """
-            MATCH (source:GraphEntity)-[rel]->(target:GraphEntity)
-            WHERE $runId IN rel.generatedRunIds
-            RETURN source, rel, target
-            """,
+        edge_records = self._neo4j.execute_read(
+            queries.SEARCH_RUN_RELATIONSHIPS,
             {"runId": run_id},
         )
 
         edges: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
         for record in edge_records:
-            source = self._format_node(Neo4jClient._jsonify(record.get("source")))
-            target = self._format_node(Neo4jClient._jsonify(record.get("target")))
-            rel = Neo4jClient._jsonify(record.get("rel"))
+            source = self._format_node(record.get("source"))
+            target = self._format_node(record.get("target"))
+            rel = record.get("rel")
             if not source or not target or not rel:
                 continue
             nodes_map.setdefault(source["id"], source)
@@ -157,18 +147,8 @@ class GraphSearchService:
     ) -> Dict[str, Any]:
         params = {"term": query.lower(), "limit": int(max(1, limit))}
         try:
-            node_records = self._neo4j.execute_query(
-                """
-                MATCH (n)
-                WHERE (
-                    (exists(n.name) AND toLower(n.name) CONTAINS $term) OR
-                    (exists(n.label) AND toLower(n.label) CONTAINS $term) OR
-                    (exists(n.id) AND toLower(n.id) CONTAINS $term) OR
-                    (exists(n.description) AND toLower(n.description) CONTAINS $term)
-                )
-                RETURN DISTINCT n
-                LIMIT $limit
-                """,
+            node_records = self._neo4j.execute_read(
+                queries.SEARCH_KEYWORD_NODES,
                 params,
             )
         except neo4j_exceptions.Neo4jError as exc:
@@ -180,7 +160,7 @@ class GraphSearchService:
         matched_ids: List[str] = []
 
         for record in node_records:
-            node = self._format_node(Neo4jClient._jsonify(record.get("n")))
+            node = self._format_node(record.get("n"))
             if not node:
                 continue
             nodes_map[node["id"]] = node
@@ -201,14 +181,9 @@ class GraphSearchService:
         if include_related and matched_ids:
             edge_limit = max(1, min(500, limit * 6))
             try:
-                edge_records = self._neo4j.execute_query(
-                    """
-                    MATCH (a)-[r]->(b)
-                    WHERE a.id IN $ids OR b.id IN $ids
-                    RETURN a, r, b
-                    LIMIT $edge_limit
-                    """,
-                    {"ids": matched_ids, "edge_limit": edge_limit},
+                edge_records = self._neo4j.execute_read(
+                    queries.SEARCH_RELATED_EDGES,
+                    {"ids": matched_ids, "limit": edge_limit},
                 )
             except neo4j_exceptions.Neo4jError as exc:
                 logger.warning("Failed to load related edges for keyword search: %s", exc)
@@ -216,9 +191,9 @@ class GraphSearchService:
 
             seen_edges: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
             for record in edge_records:
-                source = self._format_node(Neo4jClient._jsonify(record.get("a")))
-                target = self._format_node(Neo4jClient._jsonify(record.get("b")))
-                rel = Neo4jClient._jsonify(record.get("r"))
+                source = self._format_node(record.get("a"))
+                target = self._format_node(record.get("b"))
+                rel = record.get("r")
                 if not source or not target or not rel:
                     continue
                 nodes_map.setdefault(source["id"], source)
@@ -299,13 +274,8 @@ class GraphSearchService:
         if include_related and nodes_map:
             related_limit = max(1, min(200, limit * 4))
             try:
-                additional = self._neo4j.execute_query(
-                    """
-                    MATCH (a)-[r]->(b)
-                    WHERE a.id IN $ids OR b.id IN $ids
-                    RETURN a, r, b
-                    LIMIT $limit
-                    """,
+                additional = self._neo4j.execute_read(
+                    queries.SEARCH_RELATED_EDGES,
                     {"ids": list(nodes_map.keys()), "limit": related_limit},
                 )
             except neo4j_exceptions.Neo4jError as exc:
@@ -313,9 +283,9 @@ class GraphSearchService:
                 additional = []
 
             for record in additional:
-                source = self._format_node(Neo4jClient._jsonify(record.get("a")))
-                target = self._format_node(Neo4jClient._jsonify(record.get("b")))
-                rel = Neo4jClient._jsonify(record.get("r"))
+                source = self._format_node(record.get("a"))
+                target = self._format_node(record.get("b"))
+                rel = record.get("r")
                 if not source or not target or not rel:
                     continue
                 nodes_map.setdefault(source["id"], source)
@@ -14,7 +14,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Protocol, Set
 
-from app.db.neo4j_client import Neo4jClient
+from app.db import queries
+from app.db.serializers import serialize_value
 
 Metadata = Dict[str, Any]
 
@@ -23,6 +24,20 @@ class QueryRunner(Protocol):
     def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:  # noqa: D401 - protocol stub
         """Execute a Cypher query and return raw Neo4j records."""
 
+    def execute_write(self, query: Any, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:  # noqa: D401 - protocol stub
+        """Run a write query and return its counters."""
+
+    def execute_write_batch(  # noqa: D401 - protocol stub
+        self,
+        query: Any,
+        rows: Sequence[Dict[str, Any]],
+        *,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+        concurrency: int = 4,
+    ) -> Dict[str, Any]:
+        """Write ``rows`` in UNWIND batches and return aggregated counters."""
+
 
 class EmbeddingClient(Protocol):
     def embed_texts(self, texts: Sequence[str]) -> Sequence[Sequence[float]]:  # noqa: D401 - protocol stub
@@ -51,7 +66,7 @@ class SourceIngestionResult:
 def _jsonify(value: Any) -> Any:
     """Convert Neo4j driver values into JSON-safe primitives."""
 
-    return Neo4jClient._jsonify(value)
+    return serialize_value(value)
 
 
 def normalize_record(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -238,6 +253,8 @@ class GraphRAGIngestionService:
         write_to_neo4j: bool = True,
         embed_chunks: bool = False,
         embedding_batch_size: int = 16,
+        write_batch_size: int = 500,
+        write_concurrency: int = 4,
     ) -> None:
         self.manifest = manifest
         self.manifest_path = manifest_path
@@ -248,6 +265,8 @@ class GraphRAGIngestionService:
         self.write_to_neo4j = bool(neo4j_client) and write_to_neo4j
         self.embed_chunks = bool(embedding_client) and embed_chunks
         self.embedding_batch_size = max(1, embedding_batch_size)
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_concurrency = max(1, write_concurrency)
         if self.persist_chunks and output_dir is not None:
             output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -433,42 +452,22 @@ class GraphRAGIngestionService:
             for chunk in chunks
         ]
 
-        query = """
-        MERGE (source:KnowledgeSource {id: $source_id})
-        ON CREATE SET source.created_at = datetime()
-        SET source.type = $source_type,
-            source.updated_at = datetime()
-
-        WITH source, $chunks AS chunkList
-        UNWIND chunkList AS chunk
-        MERGE (c:KnowledgeChunk {chunk_id: chunk.chunk_id})
-        ON CREATE SET c.created_at = datetime()
-        SET c.content = chunk.content,
-            c.source = $source_id,
-            c.source_type = $source_type,
-            c.chunk_index = chunk.chunk_index,
-            c.chunk_strategy = chunk.chunk_strategy,
-            c.updated_at = datetime()
-        SET c.metadata_json = chunk.metadata_json,
-            c.metadata_keys = chunk.metadata_keys
-        FOREACH (_ IN CASE WHEN chunk.embedding IS NULL THEN [] ELSE [1] END |
-            SET c.embedding = chunk.embedding
+        source_params = {"source_id": source_id, "source_type": source_type}
+        source_summary = self.neo4j_client.execute_write(queries.GRAPHRAG_UPSERT_SOURCE, source_params)
+        chunk_summary = self.neo4j_client.execute_write_batch(
+            queries.GRAPHRAG_UPSERT_CHUNKS,
+            chunk_payload,
+            parameters=source_params,
+            batch_size=self.write_batch_size,
+            concurrency=self.write_concurrency,
         )
-        MERGE (source)-[:HAS_CHUNK]->(c)
-        """
-
-        summary = self.neo4j_client.execute_write(
-            query,
-            {
-                "source_id": source_id,
-                "source_type": source_type,
-                "chunks": chunk_payload,
-            },
+        link_summary = self.neo4j_client.execute_write(
+            queries.GRAPHRAG_LINK_CHUNKS,
+            {"source_id": source_id, "chunk_ids": [row["chunk_id"] for row in chunk_payload]},
         )
         return {
-            "nodes_created": summary.get("nodes_created", 0),
-            "relationships_created": summary.get("relationships_created", 0),
-            "properties_set": summary.get("properties_set", 0),
+            key: source_summary.get(key, 0) + chunk_summary.get(key, 0) + link_summary.get(key, 0)
+            for key in ("nodes_created", "relationships_created", "properties_set")
         }
 
     def _resolve_files(self, ingestion_cfg: Dict[str, Any]) -> List[Path]:
@@ -13,6 +13,8 @@ from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from neo4j import exceptions as neo4j_exceptions
 
+from app.core.singleflight import ThreadSingleFlight
+from app.db import queries
 from app.db.neo4j_client import Neo4jClient
 from app.services.embedding_service import EmbeddingClient, EmbeddingClientError
 
@@ -85,6 +87,7 @@ class GraphRAGRetrievalService:
         self.chunk_content_truncate_chars = max(0, int(chunk_content_truncate_chars or 0))
         self._cache: OrderedDict[str, Tuple[float, HybridRetrievalResult]] = OrderedDict()
         self._cache_lock = Lock()
+        self._in_flight: ThreadSingleFlight[HybridRetrievalResult] = ThreadSingleFlight("graphrag_retrieve")
 
     def retrieve(
         self,
@@ -101,6 +104,14 @@ class GraphRAGRetrievalService:
         if cached is not None:
             return cached
 
+        # Concurrent misses for the same query share one embedding and search
+        result = self._in_flight.do(
+            (canonical_query, limit, structured_limit),
+            lambda: self._retrieve_uncached(canonical_query, limit, structured_limit),
+        )
+        return copy.deepcopy(result)
+
+    def _retrieve_uncached(self, canonical_query: str, limit: int, structured_limit: int) -> HybridRetrievalResult:
         query_vector = self._embed_query(canonical_query)
         chunk_hits = self._vector_search(query_vector, limit)
 
@@ -138,17 +149,9 @@ class GraphRAGRetrievalService:
         return [float(value) for value in vector]
 
     def _vector_search(self, embedding: Sequence[float], limit: int) -> List[RetrievalChunk]:
-        cypher = """
-        CALL db.index.vector.queryNodes($index_name, $limit, $embedding)
-        YIELD node, score
-        OPTIONAL MATCH (source:KnowledgeSource)-[:HAS_CHUNK]->(node)
-        RETURN node, score, source
-        ORDER BY score DESC
-        """
-
         try:
-            records = self.neo4j_client.execute_query(
-                cypher,
+            records = self.neo4j_client.execute_read(
+                queries.GRAPHRAG_VECTOR_SEARCH,
                 {
                     "index_name": self.chunk_index_name,
                     "limit": int(max(1, limit)),
@@ -160,7 +163,7 @@ class GraphRAGRetrievalService:
 
         chunks: List[RetrievalChunk] = []
         for raw in records:
-            node_dict = Neo4jClient._jsonify(raw.get("node")) if raw.get("node") else None
+            node_dict = raw.get("node")
             if not node_dict:
                 continue
 
@@ -208,20 +211,18 @@ class GraphRAGRetrievalService:
     def _extract_source_id(self, source_obj: Any) -> Optional[str]:
         if not source_obj:
             return None
-        source_dict = Neo4jClient._jsonify(source_obj)
-        return str(source_dict.get("properties", {}).get("id")) if source_dict else None
+        # Records from the client are already JSON-safe dicts.
+        return str(source_obj.get("properties", {}).get("id"))
 
     def _extract_source_type(self, source_obj: Any) -> Optional[str]:
         if not source_obj:
             return None
-        source_dict = Neo4jClient._jsonify(source_obj)
-        return source_dict.get("properties", {}).get("type") if source_dict else None
+        return source_obj.get("properties", {}).get("type")
 
     def _extract_source_description(self, source_obj: Any) -> Optional[str]:
         if not source_obj:
             return None
-        source_dict = Neo4jClient._jsonify(source_obj)
-        return source_dict.get("properties", {}).get("description") if source_dict else None
+        return source_obj.get("properties", {}).get("description")
 
     def _parse_metadata(self, metadata_json: Any) -> Dict[str, Any]:
         if not metadata_json:
@@ -263,14 +264,9 @@ class GraphRAGRetrievalService:
         *,
         structured_limit: int,
     ) -> List[StructuredEntityContext]:
-        nodes_query = """
-        MATCH (n)
-        WHERE n.id IN $entity_ids
-        RETURN n
-        """
         try:
-            node_records = self.neo4j_client.execute_query(
-                nodes_query,
+            node_records = self.neo4j_client.execute_read(
+                queries.GRAPHRAG_ENTITY_NODES,
                 {"entity_ids": list(entity_ids)},
             )
         except (neo4j_exceptions.Neo4jError, RuntimeError, ValueError, TypeError) as exc:
@@ -278,7 +274,7 @@ class GraphRAGRetrievalService:
 
         node_lookup: Dict[str, StructuredEntityContext] = {}
         for record in node_records:
-            node_dict = Neo4jClient._jsonify(record.get("n")) if record.get("n") else None
+            node_dict = record.get("n")
             if not node_dict:
                 continue
             node_props = node_dict.get("properties", {})
@@ -290,16 +286,9 @@ class GraphRAGRetrievalService:
         if not node_lookup:
             return []
 
-        rel_query = """
-        MATCH (n)-[r]->(m)
-        WHERE n.id IN $entity_ids
-        RETURN n.id AS source_id, r, m
-        ORDER BY source_id
-        LIMIT $limit
-        """
         try:
-            rel_records = self.neo4j_client.execute_query(
-                rel_query,
+            rel_records = self.neo4j_client.execute_read(
+                queries.GRAPHRAG_ENTITY_RELATIONSHIPS,
                 {
                     "entity_ids": list(node_lookup.keys()),
                     "limit": int(max(0, structured_limit)),
@@ -314,8 +303,8 @@ class GraphRAGRetrievalService:
             if context is None:
                 continue
 
-            rel_dict = Neo4jClient._jsonify(record.get("r")) if record.get("r") else None
-            target_dict = Neo4jClient._jsonify(record.get("m")) if record.get("m") else None
+            rel_dict = record.get("r")
+            target_dict = record.get("m")
             if not rel_dict or not target_dict:
                 continue
 
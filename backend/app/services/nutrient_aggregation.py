@@ -0,0 +1,186 @@
+"""Nutrient aggregation for nutrition labels.
+
+A label is the percentage-weighted sum of each ingredient's per-100g
+nutrient values, scaled to the serving size. :func:`aggregate_nutrients_loop`
+computes one label in a single pass. :func:`aggregate_nutrients_batch`
+labels many ``(formulation, serving size)`` requests and parses each
+formulation's rows only once, however many serving sizes ask for it.
+
+There is no vectorized engine here: both paths are plain Python loops.
+The batch path only saves time when one formulation is labelled at several
+serving sizes. A single label costs exactly what the per-label loop always
+did.
+
+Both paths share :func:`parse_nutrient`, so they agree on which rows count
+and on the keys they produce, and the batch path applies the same
+operations in the same order, so its results equal the loop's exactly.
+Labels that come from a materialized profile
+(:class:`~app.services.nutrient_profiles.NutrientProfile`) are scaled after
+summation instead and may differ from the loop in the last few ulps.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.services.nutrient_registry import NutrientRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def parse_nutrient(nutrient: Any) -> Optional[Tuple[str, float, str]]:
+    """Return ``(name, amount, unit)`` for a nutrient row, or ``None`` to skip it.
+
+    Rows come from several sources: the knowledge graph, the ingredient
+    fallback query, and raw FDC payloads. Each names its fields differently.
+    """
+    if not isinstance(nutrient, dict):
+        return None
+
+    nested = nutrient.get("nutrient") or nutrient.get("nutrient_info")
+    if isinstance(nested, dict):
+        name = nested.get("name") or nested.get("nutrientName") or nested.get("nutrient_name")
+        amount = nutrient.get("amount") or nested.get("amount") or nested.get("value")
+        unit = nutrient.get("unit") or nested.get("unit") or nested.get("unitName")
+    else:
+        name = nutrient.get("name") or nutrient.get("nutrientName") or nutrient.get("nutrient_name")
+        amount = nutrient.get("amount") or nutrient.get("value") or nutrient.get("nutrientAmount")
+        unit = nutrient.get("unit") or nutrient.get("unitName")
+
+    if not name:
+        return None
+    try:
+        amount_val = 0.0 if amount is None else float(amount)
+    except (TypeError, ValueError):
+        logger.debug("Skipping nutrient %s with non-numeric amount %r", name, amount)
+        return None
+    return name, amount_val, unit or "g"
+
+
+def ingredient_rows(
+    ingredient: Mapping[str, Any],
+    nutrients: Optional["NutrientRegistry"] = None,
+) -> List[Tuple[str, float, str]]:
+    """Parsed ``(name, amount, unit)`` rows of one ingredient.
+
+    With a registry, each label line the ingredient reports is added as one
+    more row, taken from the ingredient's own best-ranked FDC number. Summing
+    those rows keeps every ingredient on the line even when ingredients
+    report it under different numbers.
+    """
+    rows = [parsed for parsed in map(parse_nutrient, ingredient.get("nutrients") or []) if parsed is not None]
+    if nutrients is not None and rows:
+        rows.extend(nutrients.label_rows(rows))
+    return rows
+
+
+def ingredient_fraction(ingredient: Mapping[str, Any]) -> float:
+    """Share of the formulation an ingredient makes up, from its percentage."""
+    try:
+        return float(ingredient.get("percentage", 0)) / 100.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def aggregate_nutrients_loop(
+    ingredients: Sequence[Mapping[str, Any]],
+    serving_size: float,
+    nutrients: Optional["NutrientRegistry"] = None,
+) -> Dict[str, float]:
+    """Pure Python aggregation, keyed ``name|unit`` in first-seen order."""
+    aggregated: Dict[str, float] = {}
+    for ingredient in ingredients:
+        rows = ingredient_rows(ingredient, nutrients)
+        if not rows:
+            continue
+        percentage = ingredient_fraction(ingredient)
+        for name, amount, unit in rows:
+            key = f"{name}|{unit}"
+            aggregated[key] = aggregated.get(key, 0.0) + amount * percentage * (serving_size / 100.0)
+    return aggregated
+
+
+def weighted_rows(
+    ingredients: Sequence[Mapping[str, Any]],
+    nutrients: Optional["NutrientRegistry"] = None,
+) -> Tuple[List[str], List[Tuple[int, float]]]:
+    """Parse a formulation's nutrient rows once for any number of serving sizes.
+
+    Returns the ``name|unit`` keys in first-seen order and one
+    ``(key index, amount * fraction)`` term per nutrient row, in the order
+    :func:`aggregate_nutrients_loop` visits them.
+    """
+    columns: Dict[str, int] = {}
+    terms: List[Tuple[int, float]] = []
+    for ingredient in ingredients:
+        rows = ingredient_rows(ingredient, nutrients)
+        if not rows:
+            continue
+        percentage = ingredient_fraction(ingredient)
+        for name, amount, unit in rows:
+            column = columns.setdefault(f"{name}|{unit}", len(columns))
+            terms.append((column, amount * percentage))
+    return list(columns), terms
+
+
+def _scaled_totals(keys: List[str], terms: List[Tuple[int, float]], serving_size: float) -> Dict[str, float]:
+    # Same multiplication order and summation order as the loop, so results match it exactly
+    scale = serving_size / 100.0
+    totals = [0.0] * len(keys)
+    for column, weighted in terms:
+        totals[column] += weighted * scale
+    return dict(zip(keys, totals))
+
+
+def aggregate_nutrients(
+    ingredients: Sequence[Mapping[str, Any]],
+    serving_size: float,
+    nutrients: Optional["NutrientRegistry"] = None,
+) -> Dict[str, float]:
+    """Aggregate nutrients for one serving of a formulation."""
+    return aggregate_nutrients_loop(ingredients, serving_size, nutrients)
+
+
+def aggregate_nutrients_batch(
+    groups: Sequence[Sequence[Mapping[str, Any]]],
+    requests: Sequence[Tuple[int, float]],
+    nutrients: Optional["NutrientRegistry"] = None,
+) -> List[Dict[str, float]]:
+    """Aggregate one label per ``(group index, serving size)`` request.
+
+    A group requested more than once is parsed once by
+    :func:`weighted_rows`, and each of its requests then only scales and
+    sums the parsed terms; a group requested once goes straight through
+    :func:`aggregate_nutrients_loop`. Each result holds the keys its group reports, in the same
+    order and with the same values :func:`aggregate_nutrients_loop` would
+    give. With a registry, results also carry the per-line keys of
+    :meth:`NutrientRegistry.label_rows`.
+    """
+    uses: Dict[int, int] = {}
+    for index, _ in requests:
+        uses[index] = uses.get(index, 0) + 1
+
+    parsed: Dict[int, Tuple[List[str], List[Tuple[int, float]]]] = {}
+    labels: List[Dict[str, float]] = []
+    for index, serving_size in requests:
+        if uses[index] == 1:
+            # Parsing into terms only pays off when the terms are reused
+            labels.append(aggregate_nutrients_loop(groups[index], serving_size, nutrients))
+            continue
+        if index not in parsed:
+            parsed[index] = weighted_rows(groups[index], nutrients)
+        labels.append(_scaled_totals(*parsed[index], serving_size))
+    return labels
+
+
+__all__ = [
+    "aggregate_nutrients",
+    "aggregate_nutrients_batch",
+    "aggregate_nutrients_loop",
+    "ingredient_fraction",
+    "ingredient_rows",
+    "parse_nutrient",
+    "weighted_rows",
+]
@@ -0,0 +1,261 @@
+"""Materialized per-100g nutrient profiles for formulations.
+
+A nutrition label only needs a formulation's percentage-weighted per-100g
+nutrient values, scaled to the serving size. :class:`NutrientProfileStore`
+keeps that vector for each formulation, so a label request can skip the
+``Formulation -> Ingredient -> Food -> Nutrient`` traversal. A profile is
+computed the first time it is asked for. After that it is kept up to date
+from the formulation event bus:
+
+* formulation writes recompute that formulation's stored profile, and
+  deletes drop it;
+* ``fdc.foods_ingested`` (published after an FDC ingest) recomputes every
+  stored profile that draws on one of the re-ingested foods.
+
+With a shared formulation cache, other workers' events are relayed onto
+this worker's bus too. Profiles also expire after ``ttl_seconds``. That
+bounds staleness for changes this worker never hears about, such as edits
+made directly in Neo4j or writes made while the relay was down.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from app.core.metrics import registry as metrics_registry
+from app.core.singleflight import SingleFlight
+from app.db import queries
+from app.services.nutrient_aggregation import aggregate_nutrients_batch
+from app.services.nutrient_registry import FOODS_INGESTED_EVENT, NutrientRegistry
+from app.services.nutrient_registry import registry as nutrient_registry
+
+logger = logging.getLogger(__name__)
+
+PROFILE_EVENTS = ("formulation.created", "formulation.updated", "formulation.deleted", FOODS_INGESTED_EVENT)
+
+NUTRIENT_PROFILE_LOOKUPS = metrics_registry.counter(
+    "nutrient_profile_lookups_total",
+    "Nutrient profile lookups, by whether a stored profile answered them.",
+    ("result",),
+)
+NUTRIENT_PROFILE_REFRESHES = metrics_registry.counter(
+    "nutrient_profile_refreshes_total",
+    "Stored nutrient profiles recomputed after an event, by what changed.",
+    ("reason",),
+)
+
+
+@dataclass(frozen=True)
+class NutrientProfile:
+    """Per-100g nutrient totals for one formulation, keyed ``name|unit``."""
+
+    formulation_id: str
+    formulation_name: str
+    per_100g: Dict[str, float]
+    fdc_ids: FrozenSet[int]
+    loaded_at: float
+
+    def scale(self, serving_size: float) -> Dict[str, float]:
+        """Aggregated nutrients for ``serving_size`` grams, as the label builder expects."""
+        factor = serving_size / 100.0
+        return {key: value * factor for key, value in self.per_100g.items()}
+
+
+def build_profiles(
+    records: Iterable[Mapping[str, Any]],
+    nutrients: Optional[NutrientRegistry] = None,
+) -> Dict[str, NutrientProfile]:
+    """Compute profiles from ``nutrition.formulations_nutrients`` rows in one pass.
+
+    Only ingredients with nutrient rows count, as for a live label.
+    Formulations with no nutrient data get no profile.
+    """
+    backed: List[Mapping[str, Any]] = []
+    groups: List[List[Mapping[str, Any]]] = []
+    for record in records:
+        ingredients = [ing for ing in record.get("ingredients") or [] if ing.get("nutrients")]
+        if record.get("formulation_id") and ingredients:
+            backed.append(record)
+            groups.append(ingredients)
+
+    totals = aggregate_nutrients_batch(
+        groups,
+        [(index, 100.0) for index in range(len(groups))],
+        nutrients if nutrients is not None else nutrient_registry,
+    )
+    loaded_at = time.monotonic()
+    profiles: Dict[str, NutrientProfile] = {}
+    for record, ingredients, per_100g in zip(backed, groups, totals):
+        if not per_100g:
+            continue
+        fdc_ids = {ing.get("food_fdc_id") for ing in ingredients}
+        fdc_ids.update(nutrient.get("fdc_id") for ing in ingredients for nutrient in ing["nutrients"])
+        profiles[str(record["formulation_id"])] = NutrientProfile(
+            formulation_id=str(record["formulation_id"]),
+            formulation_name=record.get("formulation_name") or "",
+            per_100g=per_100g,
+            fdc_ids=frozenset(int(fdc_id) for fdc_id in fdc_ids if isinstance(fdc_id, int)),
+            loaded_at=loaded_at,
+        )
+    return profiles
+
+
+class NutrientProfileStore:
+    """Bounded LRU of :class:`NutrientProfile` values kept current from events."""
+
+    def __init__(
+        self,
+        neo4j_client: Any,
+        *,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 4096,
+        nutrients: Optional[NutrientRegistry] = None,
+    ) -> None:
+        # Expects an AsyncNeo4jClient, like NutritionCalculationService; replaced on a settings refresh
+        self.neo4j_client = neo4j_client
+        self._nutrients = nutrients
+        self._ttl = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._profiles: "OrderedDict[str, NutrientProfile]" = OrderedDict()
+        self._by_food: Dict[int, Set[str]] = {}
+        # Loads in flight per id, and a version bumped when one of those ids is
+        # invalidated so the earlier load cannot store its result. Both only
+        # hold ids with a load pending.
+        self._loading: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._flights: SingleFlight[Dict[str, NutrientProfile]] = SingleFlight("nutrient_profiles")
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    async def attach(self, event_bus: Any) -> None:
+        """Subscribe to the events that change a profile."""
+        for event_type in PROFILE_EVENTS:
+            await event_bus.subscribe(event_type, self.handle_event)
+
+    def peek(self, formulation_id: str) -> Optional[NutrientProfile]:
+        """The stored profile if it is still fresh, without loading or touching LRU order."""
+        profile = self._profiles.get(formulation_id)
+        if profile is None or time.monotonic() - profile.loaded_at >= self._ttl:
+            return None
+        return profile
+
+    async def get(self, formulation_id: str) -> Optional[NutrientProfile]:
+        """Return the profile, loading it on a miss; ``None`` when the graph has no nutrient data."""
+        profile = self.peek(formulation_id)
+        if profile is not None:
+            NUTRIENT_PROFILE_LOOKUPS.inc("hit")
+            self._profiles.move_to_end(formulation_id)
+            return profile
+
+        NUTRIENT_PROFILE_LOOKUPS.inc("miss")
+        loaded = await self._flights.do(formulation_id, lambda: self.refresh([formulation_id]))
+        return loaded.get(formulation_id)
+
+    async def refresh(self, formulation_ids: Iterable[str]) -> Dict[str, NutrientProfile]:
+        """Recompute profiles for ``formulation_ids`` with one query and store them."""
+        ids = list(dict.fromkeys(formulation_ids))
+        if not ids:
+            return {}
+        for formulation_id in ids:
+            self._loading[formulation_id] = self._loading.get(formulation_id, 0) + 1
+        versions = {formulation_id: self._versions.get(formulation_id, 0) for formulation_id in ids}
+        try:
+            records = await self.neo4j_client.execute_read(
+                queries.NUTRITION_FORMULATIONS_NUTRIENTS,
+                {"formulation_ids": ids},
+            )
+            profiles = build_profiles(records, self._nutrients)
+            for formulation_id in ids:
+                if self._versions.get(formulation_id, 0) != versions[formulation_id]:
+                    # Invalidated while this load was running; the newer refresh stores its own result
+                    continue
+                profile = profiles.get(formulation_id)
+                if profile is None:
+                    self._discard(formulation_id)
+                else:
+                    self._store(profile)
+        finally:
+            for formulation_id in ids:
+                pending = self._loading[formulation_id] - 1
+                if pending:
+                    self._loading[formulation_id] = pending
+                else:
+                    del self._loading[formulation_id]
+                    self._versions.pop(formulation_id, None)
+        return profiles
+
+    def invalidate(self, formulation_id: str) -> bool:
+        """Drop a stored profile and void any load in flight; returns whether one was stored."""
+        if formulation_id in self._loading:
+            self._versions[formulation_id] = self._versions.get(formulation_id, 0) + 1
+        return self._discard(formulation_id)
+
+    def formulations_using(self, fdc_ids: Iterable[int]) -> Set[str]:
+        """Ids of stored profiles that draw on any of ``fdc_ids``."""
+        affected: Set[str] = set()
+        for fdc_id in fdc_ids:
+            affected.update(self._by_food.get(fdc_id, ()))
+        return affected
+
+    async def handle_event(self, event: Any) -> None:
+        """Invalidate the profiles an event touches and recompute the stored ones.
+
+        Formulations with no stored profile are only invalidated. They are
+        computed on their next label request instead of on every write.
+        """
+        payload = event.payload or {}
+        if event.type == FOODS_INGESTED_EVENT:
+            affected = self.formulations_using(
+                int(fdc_id) for fdc_id in payload.get("fdc_ids") or [] if str(fdc_id).isdigit()
+            )
+            reason = "food"
+        else:
+            ids = payload.get("ids") or [payload.get("id")]
+            affected = {str(formulation_id) for formulation_id in ids if formulation_id}
+            reason = "formulation"
+
+        stored = [formulation_id for formulation_id in affected if self.invalidate(formulation_id)]
+        if event.type == "formulation.deleted" or not stored:
+            return
+        NUTRIENT_PROFILE_REFRESHES.inc(reason, amount=len(stored))
+        await self.refresh(stored)
+
+    def _store(self, profile: NutrientProfile) -> None:
+        self._discard(profile.formulation_id)
+        self._profiles[profile.formulation_id] = profile
+        for fdc_id in profile.fdc_ids:
+            self._by_food.setdefault(fdc_id, set()).add(profile.formulation_id)
+        while len(self._profiles) > self._max_entries:
+            oldest = next(iter(self._profiles))
+            self._discard(oldest)
+
+    def _discard(self, formulation_id: str) -> bool:
+        profile = self._profiles.pop(formulation_id, None)
+        if profile is None:
+            return False
+        for fdc_id in profile.fdc_ids:
+            users = self._by_food.get(fdc_id)
+            if users is not None:
+                users.discard(formulation_id)
+                if not users:
+                    del self._by_food[fdc_id]
+        return True
+
+
+def get_nutrient_profile_store(request) -> Optional[NutrientProfileStore]:
+    return getattr(request.app.state, "nutrient_profile_store", None)
+
+
+__all__ = [
+    "FOODS_INGESTED_EVENT",
+    "NutrientProfile",
+    "NutrientProfileStore",
+    "PROFILE_EVENTS",
+    "build_profiles",
+    "get_nutrient_profile_store",
+]
@@ -0,0 +1,261 @@
+"""Canonical nutrient registry for nutrition label assembly.
+
+FDC names the same nutrient differently across data types. For example,
+number 269 is "Sugars, total including NLEA" in SR Legacy and "Total
+Sugars" in Foundation foods. Foundation foods report energy only as
+"Energy (Atwater General Factors)". Matching label lines by name prefix
+therefore picks the wrong row or none at all, and mixes kcal with kJ.
+
+:class:`NutrientRegistry` maps every ``name|unit`` key to its FDC
+nutrient number once. It then maps the number to a label line, with the
+factor that converts the row's unit into the label's unit. When several
+numbers feed one line (kcal and kJ energy, say), each ingredient
+contributes its best-ranked one instead of all of them.
+
+That choice is made per ingredient during aggregation. Ingredients often
+report a line under different numbers, as SR Legacy and Foundation foods
+do for energy, fat, carbohydrate, fiber and sugars. The aggregated totals
+then carry one ``label:<field>|<unit>`` key per line, and assembling a
+label is a direct lookup of those keys.
+
+The built-in table covers the label nutrients under their usual FDC names.
+:meth:`NutrientRegistry.load` adds every ``Nutrient`` node in the graph, so
+other data types' names resolve by number as well.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.db import queries
+
+logger = logging.getLogger(__name__)
+
+# Published after an FDC ingest; nutrient names, profiles and food matches may all change
+FOODS_INGESTED_EVENT = "fdc.foods_ingested"
+
+
+@dataclass(frozen=True)
+class LabelLine:
+    """One line of the nutrition facts panel and the FDC numbers that can fill it, best first."""
+
+    field: str
+    unit: str
+    numbers: Tuple[str, ...]
+    # Plain names seen in hand-entered data without an FDC number, tried after every number
+    aliases: Tuple[str, ...] = ()
+
+
+LABEL_LINES: Tuple[LabelLine, ...] = (
+    LabelLine("calories", "kcal", ("208", "957", "958", "268"), ("calories", "energy")),
+    LabelLine("total_fat", "g", ("204", "298"), ("total fat", "fat, total", "fat")),
+    LabelLine("saturated_fat", "g", ("606",), ("saturated fat",)),
+    LabelLine("trans_fat", "g", ("605",), ("trans fat",)),
+    LabelLine("cholesterol", "mg", ("601",), ("cholesterol",)),
+    LabelLine("sodium", "mg", ("307",), ("sodium",)),
+    LabelLine("total_carbohydrate", "g", ("205", "205.2"), ("total carbohydrate", "carbohydrate")),
+    LabelLine("dietary_fiber", "g", ("291", "293"), ("dietary fiber", "fiber")),
+    LabelLine("total_sugars", "g", ("269", "269.3"), ("total sugars", "sugars, total", "sugars")),
+    LabelLine("added_sugars", "g", ("539",), ("added sugars",)),
+    LabelLine("protein", "g", ("203",), ("protein",)),
+    LabelLine("vitamin_d", "mcg", ("328", "324"), ("vitamin d",)),
+    LabelLine("calcium", "mg", ("301",), ("calcium",)),
+    LabelLine("iron", "mg", ("303",), ("iron",)),
+    LabelLine("potassium", "mg", ("306",), ("potassium",)),
+)
+
+LABEL_FIELDS: Tuple[str, ...] = tuple(line.field for line in LABEL_LINES)
+
+# Aggregated keys of the per-line rows from NutrientRegistry.label_rows, e.g. "label:calories|kcal"
+LABEL_KEY_PREFIX = "label:"
+LABEL_KEYS: Tuple[str, ...] = tuple(f"{LABEL_KEY_PREFIX}{line.field}|{line.unit}" for line in LABEL_LINES)
+
+# (number, name, unit) for the label nutrients under their usual FDC names
+DEFAULT_NUTRIENTS: Tuple[Tuple[str, str, str], ...] = (
+    ("208", "Energy", "KCAL"),
+    ("268", "Energy", "kJ"),
+    ("957", "Energy (Atwater General Factors)", "KCAL"),
+    ("958", "Energy (Atwater Specific Factors)", "KCAL"),
+    ("204", "Total lipid (fat)", "G"),
+    ("298", "Total fat (NLEA)", "G"),
+    ("606", "Fatty acids, total saturated", "G"),
+    ("605", "Fatty acids, total trans", "G"),
+    ("601", "Cholesterol", "MG"),
+    ("307", "Sodium, Na", "MG"),
+    ("205", "Carbohydrate, by difference", "G"),
+    ("205.2", "Carbohydrate, by summation", "G"),
+    ("291", "Fiber, total dietary", "G"),
+    ("293", "Total dietary fiber (AOAC 2011.25)", "G"),
+    ("269", "Sugars, total including NLEA", "G"),
+    ("269", "Total Sugars", "G"),
+    ("269.3", "Sugars, Total", "G"),
+    ("539", "Sugars, added", "G"),
+    ("203", "Protein", "G"),
+    ("328", "Vitamin D (D2 + D3)", "UG"),
+    ("324", "Vitamin D (D2 + D3), International Units", "IU"),
+    ("301", "Calcium, Ca", "MG"),
+    ("303", "Iron, Fe", "MG"),
+    ("306", "Potassium, K", "MG"),
+)
+
+_MASS_IN_GRAMS = {"g": 1.0, "mg": 1e-3, "ug": 1e-6, "µg": 1e-6, "mcg": 1e-6}
+_ENERGY_IN_KCAL = {"kcal": 1.0, "kj": 1 / 4.184}
+# International Units per label unit only exist per nutrient; 1 IU of vitamin D is 0.025 mcg
+_IU_FACTORS = {"vitamin_d": 0.025}
+
+
+def unit_factor(unit: str, line: LabelLine) -> Optional[float]:
+    """Factor converting ``unit`` into the line's unit, or ``None`` if they are incompatible.
+
+    Rows without a unit are taken to be in the label unit already.
+    """
+    source = unit.strip().lower()
+    target = line.unit
+    if not source or source == target:
+        return 1.0
+    if source in _MASS_IN_GRAMS and target in _MASS_IN_GRAMS:
+        return _MASS_IN_GRAMS[source] / _MASS_IN_GRAMS[target]
+    if source in _ENERGY_IN_KCAL and target in _ENERGY_IN_KCAL:
+        return _ENERGY_IN_KCAL[source] / _ENERGY_IN_KCAL[target]
+    if source == "iu":
+        return _IU_FACTORS.get(line.field)
+    return None
+
+
+class NutrientRegistry:
+    """Resolves aggregated ``name|unit`` keys to label lines by FDC nutrient number."""
+
+    def __init__(self, nutrients: Iterable[Tuple[str, str, str]] = DEFAULT_NUTRIENTS) -> None:
+        self._lines: Dict[str, Tuple[int, int]] = {}
+        self._aliases: Dict[str, Tuple[int, int]] = {}
+        for index, line in enumerate(LABEL_LINES):
+            for rank, number in enumerate(line.numbers):
+                self._lines[number] = (index, rank)
+            for rank, alias in enumerate(line.aliases, start=len(line.numbers)):
+                self._aliases[alias] = (index, rank)
+        self._numbers: Dict[Tuple[str, str], str] = {}
+        # A name in an unregistered unit (sodium in g, say) still has a number; the factor converts it
+        self._names: Dict[str, str] = {}
+        self._resolved: Dict[str, Optional[Tuple[int, int, float]]] = {}
+        # Client used for reloads once attached; replaced on a settings refresh
+        self.neo4j_client: Any = None
+        self.update(nutrients)
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def update(self, nutrients: Iterable[Tuple[Any, Any, Any]]) -> int:
+        """Register ``(number, name, unit)`` rows; returns how many were new."""
+        added = 0
+        for number, name, unit in nutrients:
+            if not number or not name:
+                continue
+            key = (str(name).strip().lower(), str(unit or "").strip().lower())
+            if key not in self._numbers:
+                added += 1
+            self._numbers[key] = str(number)
+            self._names.setdefault(key[0], str(number))
+        # Earlier resolutions may have missed a name that is now known
+        self._resolved = {}
+        return added
+
+    async def load(self, neo4j_client: Any) -> int:
+        """Add every ``Nutrient`` node in the graph; returns how many names were new."""
+        records = await neo4j_client.execute_read(queries.NUTRITION_NUTRIENT_CATALOG)
+        added = self.update((record.get("number"), record.get("name"), record.get("unit")) for record in records)
+        logger.info("Nutrient registry loaded %d names (%d new)", len(self), added)
+        return added
+
+    async def attach(self, event_bus: Any, neo4j_client: Any) -> None:
+        """Reload after FDC ingests, which can add ``Nutrient`` nodes."""
+        self.neo4j_client = neo4j_client
+
+        async def on_foods_ingested(event: Any) -> None:
+            await self.load(self.neo4j_client)
+
+        await event_bus.subscribe(FOODS_INGESTED_EVENT, on_foods_ingested)
+
+    def number(self, name: str, unit: str) -> Optional[str]:
+        """FDC nutrient number for a name and unit, or for the name alone in another unit."""
+        key = (name.strip().lower(), unit.strip().lower())
+        return self._numbers.get(key) or self._names.get(key[0])
+
+    def resolve(self, key: str) -> Optional[Tuple[int, int, float]]:
+        """``(line index, rank, unit factor)`` for an aggregated key, or ``None`` if it is not on the label."""
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        name, _, unit = key.partition("|")
+        number = self.number(name, unit)
+        slot = self._lines.get(number) if number is not None else self._aliases.get(name.strip().lower())
+        resolved = None
+        if slot is not None:
+            factor = unit_factor(unit, LABEL_LINES[slot[0]])
+            if factor is not None:
+                resolved = (slot[0], slot[1], factor)
+        self._resolved[key] = resolved
+        return resolved
+
+    def label_rows(self, rows: Iterable[Tuple[str, float, str]]) -> List[Tuple[str, float, str]]:
+        """``(name, amount, unit)`` rows, one per label line, for a single ingredient's nutrients.
+
+        Each line uses the ingredient's best-ranked number, in label units.
+        The row names are :data:`LABEL_KEY_PREFIX` plus the field, so once
+        aggregated they sit under :data:`LABEL_KEYS`.
+        """
+        values, ranks = self._best((f"{name}|{unit}", amount) for name, amount, unit in rows)
+        return [
+            (f"{LABEL_KEY_PREFIX}{line.field}", values[index], line.unit)
+            for index, line in enumerate(LABEL_LINES)
+            if ranks[index] != math.inf
+        ]
+
+    def label_values(self, aggregated: Mapping[str, float]) -> List[float]:
+        """Amount for each of :data:`LABEL_LINES`, in label units, from aggregated nutrients.
+
+        Totals aggregated with this registry are read straight from their
+        :data:`LABEL_KEYS`. Totals aggregated without one are resolved as if
+        they came from a single ingredient.
+        """
+        if any(key in aggregated for key in LABEL_KEYS):
+            return [aggregated.get(key, 0.0) for key in LABEL_KEYS]
+        return self._best(aggregated.items())[0]
+
+    def _best(self, items: Iterable[Tuple[str, float]]) -> Tuple[List[float], List[float]]:
+        # Per line, the sum of the rows under the best rank present, and that rank
+        values = [0.0] * len(LABEL_LINES)
+        ranks = [math.inf] * len(LABEL_LINES)
+        for key, amount in items:
+            resolved = self.resolve(key)
+            if resolved is None:
+                continue
+            index, rank, factor = resolved
+            if rank < ranks[index]:
+                ranks[index] = rank
+                values[index] = amount * factor
+            elif rank == ranks[index]:
+                values[index] += amount * factor
+        return values, ranks
+
+
+# Shared by every label; main extends it from the graph at startup
+registry = NutrientRegistry()
+
+
+__all__ = [
+    "DEFAULT_NUTRIENTS",
+    "FOODS_INGESTED_EVENT",
+    "LABEL_FIELDS",
+    "LABEL_KEY_PREFIX",
+    "LABEL_KEYS",
+    "LABEL_LINES",
+    "LabelLine",
+    "NutrientRegistry",
+    "registry",
+    "unit_factor",
+]
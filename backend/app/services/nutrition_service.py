@@ -1,9 +1,17 @@
 """Nutrition calculation service for formulations."""
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncGenerator, Dict, List, Optional, Any, Sequence
 from dataclasses import dataclass
 
+from neo4j import exceptions as neo4j_exceptions
+
+from app.db import queries
+from app.services.food_resolution import FoodResolver
+from app.services.nutrient_aggregation import aggregate_nutrients, aggregate_nutrients_batch
+from app.services.nutrient_profiles import NutrientProfile, NutrientProfileStore
+from app.services.nutrient_registry import LABEL_KEY_PREFIX, NutrientRegistry, registry as nutrient_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +50,24 @@ class NutritionFacts:
     additional_nutrients: List[NutrientValue]
 
 
+@dataclass
+class NutritionLabelRequest:
+    """One label in a batch: a formulation and the serving to label it for."""
+    formulation_id: str
+    serving_size: float = 100.0
+    serving_size_unit: str = "g"
+    servings_per_container: Optional[float] = None
+
+
+@dataclass
+class NutritionLabelResult:
+    """Outcome of one batch request; ``index`` is its position in the batch."""
+    index: int
+    request: NutritionLabelRequest
+    facts: Optional[NutritionFacts] = None
+    error: Optional[str] = None
+
+
 # FDA Daily Values for nutrition label (based on 2000 calorie diet)
 FDA_DAILY_VALUES: Dict[str, Dict[str, Any]] = {
     "Total Fat": {"amount": 78, "unit": "g"},
@@ -61,8 +87,21 @@ FDA_DAILY_VALUES: Dict[str, Dict[str, Any]] = {
 class NutritionCalculationService:
     """Service responsible for generating nutrition labels from the knowledge graph."""
 
-    def __init__(self, neo4j_client: Any) -> None:
+    def __init__(
+        self,
+        neo4j_client: Any,
+        profiles: Optional[NutrientProfileStore] = None,
+        foods: Optional[FoodResolver] = None,
+        nutrients: Optional[NutrientRegistry] = None,
+    ) -> None:
+        # Expects an AsyncNeo4jClient so label generation never blocks the event loop.
         self.neo4j_client = neo4j_client
+        # Materialized per-100g profiles; without a store every label traverses the graph
+        self.profiles = profiles
+        # Pass a shared resolver so ingredient name matches are cached across requests
+        self.foods = foods if foods is not None else FoodResolver(neo4j_client)
+        # Maps aggregated name|unit keys to label lines; main extends the shared one from the graph
+        self.nutrients = nutrients if nutrients is not None else nutrient_registry
 
     async def calculate_nutrition_label(
         self,
@@ -76,7 +115,18 @@ class NutritionCalculationService:
         if serving_size <= 0:
             raise ValueError("Serving size must be greater than zero")
 
-        formulation = await self._get_formulation_with_nutrients(formulation_id)
+        profile = await self.profiles.get(formulation_id) if self.profiles is not None else None
+        if profile is not None:
+            return self._profile_facts(
+                profile,
+                NutritionLabelRequest(formulation_id, serving_size, serving_size_unit, servings_per_container),
+            )
+
+        if self.profiles is not None:
+            # The store just ran the nutrient query and found no data; go straight to the fallback
+            formulation = await self._get_formulation_from_ingredients(formulation_id)
+        else:
+            formulation = await self._get_formulation_with_nutrients(formulation_id)
         if not formulation:
             raise ValueError(f"Formulation {formulation_id} not found")
 
@@ -97,144 +147,255 @@ class NutritionCalculationService:
             servings_per_container=servings_per_container,
         )
 
+    async def calculate_nutrition_labels(
+        self,
+        requests: Sequence[NutritionLabelRequest],
+    ) -> AsyncGenerator[NutritionLabelResult, None]:
+        """Yield a label or an error for every request, in the order they complete.
+
+        Every distinct formulation comes back from one knowledge-graph query,
+        and all of their labels are aggregated in one pass. With a profile
+        store, stored profiles answer without a query and only the rest are
+        read (and stored). Formulations
+        without nutrient data in the graph then go through the per-ingredient
+        fallback one at a time, and their labels follow as each lookup
+        finishes. A failed fallback lookup only fails that formulation's
+        requests. The batch query runs before anything is yielded, so its
+        failure propagates from the first ``anext``.
+        """
+
+        pending: Dict[str, List[int]] = {}
+        invalid: List[int] = []
+        for index, request in enumerate(requests):
+            if request.serving_size <= 0:
+                invalid.append(index)
+                continue
+            pending.setdefault(request.formulation_id, []).append(index)
+
+        # Run the batch query before the first yield, so a failure surfaces
+        # before any result does, even when the first result is an error.
+        formulations: Dict[str, Any] = {}
+        if pending and self.profiles is not None:
+            # Stored profiles answer directly; the rest are loaded, and stored, with one query
+            for formulation_id in pending:
+                profile = self.profiles.peek(formulation_id)
+                if profile is not None:
+                    formulations[formulation_id] = profile
+            missing = [formulation_id for formulation_id in pending if formulation_id not in formulations]
+            if missing:
+                formulations.update(await self.profiles.refresh(missing))
+        elif pending:
+            records = await self.neo4j_client.execute_read(
+                queries.NUTRITION_FORMULATIONS_NUTRIENTS,
+                {"formulation_ids": list(pending)},
+            )
+            for record in records:
+                formulation = self._nutrient_backed_formulation(record)
+                if formulation is not None and record.get("formulation_id") in pending:
+                    formulations[record["formulation_id"]] = formulation
+
+        for index in invalid:
+            yield NutritionLabelResult(index, requests[index], error="Serving size must be greater than zero")
+        if not pending:
+            return
+
+        if self.profiles is not None:
+            for formulation_id, profile in formulations.items():
+                for index in pending[formulation_id]:
+                    facts = self._profile_facts(profile, requests[index])
+                    yield NutritionLabelResult(index, requests[index], facts=facts)
+        else:
+            for result in self._label_batch(formulations, pending, requests):
+                yield result
+        logger.info(
+            "Knowledge graph returned nutrient data for %d of %d formulations",
+            len(formulations),
+            len(pending),
+        )
+
+        for formulation_id, indexes in pending.items():
+            if formulation_id in formulations:
+                continue
+            try:
+                formulation = await self._get_formulation_from_ingredients(formulation_id)
+            except (neo4j_exceptions.Neo4jError, neo4j_exceptions.ServiceUnavailable, RuntimeError) as exc:
+                logger.error("Fallback nutrient lookup failed for %s", formulation_id, exc_info=True)
+                for index in indexes:
+                    yield NutritionLabelResult(index, requests[index], error=f"Nutrient lookup failed: {exc}")
+                continue
+
+            if not formulation:
+                error = f"Formulation {formulation_id} not found"
+            elif not formulation.get("ingredients"):
+                error = f"No ingredients found for formulation {formulation_id}"
+            else:
+                for result in self._label_batch({formulation_id: formulation}, pending, requests):
+                    yield result
+                continue
+            for index in indexes:
+                yield NutritionLabelResult(index, requests[index], error=error)
+
+    def _profile_facts(self, profile: NutrientProfile, request: NutritionLabelRequest) -> NutritionFacts:
+        """Label a request by scaling a materialized per-100g profile."""
+
+        return self._build_nutrition_facts(
+            formulation_id=profile.formulation_id,
+            formulation_name=profile.formulation_name,
+            aggregated_nutrients=profile.scale(request.serving_size),
+            serving_size=request.serving_size,
+            serving_size_unit=request.serving_size_unit,
+            servings_per_container=request.servings_per_container,
+        )
+
+    def _label_batch(
+        self,
+        formulations: Dict[str, Dict[str, Any]],
+        pending: Dict[str, List[int]],
+        requests: Sequence[NutritionLabelRequest],
+    ) -> List[NutritionLabelResult]:
+        """Build the labels for every pending request of ``formulations`` together."""
+
+        if not formulations:
+            return []
+        groups = list(formulations)
+        positions = {formulation_id: group for group, formulation_id in enumerate(groups)}
+        indexes = [index for formulation_id in groups for index in pending[formulation_id]]
+        aggregated = aggregate_nutrients_batch(
+            [formulations[formulation_id]["ingredients"] for formulation_id in groups],
+            [(positions[requests[index].formulation_id], requests[index].serving_size) for index in indexes],
+            self.nutrients,
+        )
+
+        results: List[NutritionLabelResult] = []
+        for index, nutrients in zip(indexes, aggregated):
+            request = requests[index]
+            if not nutrients:
+                results.append(
+                    NutritionLabelResult(index, request, error="No nutrient data available for aggregation")
+                )
+                continue
+            formulation = formulations[request.formulation_id]
+            facts = self._build_nutrition_facts(
+                formulation_id=formulation.get("id") or request.formulation_id,
+                formulation_name=formulation.get("name", ""),
+                aggregated_nutrients=nutrients,
+                serving_size=request.serving_size,
+                serving_size_unit=request.serving_size_unit,
+                servings_per_container=request.servings_per_container,
+            )
+            results.append(NutritionLabelResult(index, request, facts=facts))
+        return results
+
     async def _get_formulation_with_nutrients(
         self,
         formulation_id: str,
     ) -> Optional[Dict[str, Any]]:
         """Fetch formulation data with nutrient details from the knowledge graph."""
 
-        kg_query = """
-        MATCH (f:Formulation {id: $formulation_id})
-        OPTIONAL MATCH (f)-[ci:CONTAINS_INGREDIENT]->(ing:Ingredient)
-        OPTIONAL MATCH (ing)-[:DERIVED_FROM]->(food:Food)
-        OPTIONAL MATCH (food)-[cn:CONTAINS_NUTRIENT]->(n:Nutrient)
-        WITH f, ci, ing, food,
-             collect({
-                 nutrient_name: n.nutrientName,
-                 amount: cn.value,
-                 unit: n.unitName,
-                 per100g: cn.per100g,
-                 fdc_id: food.fdcId
-             }) AS nutrient_rows
-        WITH f, ci, ing, food,
-             [row IN nutrient_rows WHERE row.nutrient_name IS NOT NULL] AS nutrients
-        WITH f,
-             collect(
-                 CASE
-                     WHEN ing IS NULL THEN NULL
-                     ELSE {
-                         name: ing.name,
-                         percentage: ci.percentage,
-                         quantity_kg: ci.quantity_kg,
-                         food_fdc_id: food.fdcId,
-                         food_description: food.description,
-                         nutrients: nutrients
-                     }
-                 END
-             ) AS ingredient_collection
-        RETURN f.id AS formulation_id,
-               f.name AS formulation_name,
-               [item IN ingredient_collection WHERE item IS NOT NULL] AS ingredients
-        """
-
-        results = self.neo4j_client.execute_query(kg_query, {"formulation_id": formulation_id})
+        results = await self.neo4j_client.execute_read(
+            queries.NUTRITION_FORMULATION_NUTRIENTS,
+            {"formulation_id": formulation_id},
+        )
         if results:
-            record = results[0]
-            ingredients = record.get("ingredients", []) or []
-            nutrient_backed = [ing for ing in ingredients if ing.get("nutrients")]
-            if nutrient_backed:
-                logger.info(
-                    "Knowledge graph retrieved %d ingredients with nutrient data",
-                    len(nutrient_backed),
-                )
-                return {
-                    "id": record.get("formulation_id"),
-                    "name": record.get("formulation_name"),
-                    "ingredients": nutrient_backed,
-                }
+            formulation = self._nutrient_backed_formulation(results[0])
+            if formulation is not None:
+                return formulation
+
+        return await self._get_formulation_from_ingredients(formulation_id)
+
+    @staticmethod
+    def _nutrient_backed_formulation(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Keep the ingredients that have nutrient rows, or ``None`` when none do."""
+
+        ingredients = record.get("ingredients", []) or []
+        nutrient_backed = [ing for ing in ingredients if ing.get("nutrients")]
+        if not nutrient_backed:
+            return None
+        logger.info(
+            "Knowledge graph retrieved %d ingredients with nutrient data",
+            len(nutrient_backed),
+        )
+        return {
+            "id": record.get("formulation_id"),
+            "name": record.get("formulation_name"),
+            "ingredients": nutrient_backed,
+        }
+
+    async def _get_formulation_from_ingredients(
+        self,
+        formulation_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Look nutrients up per ingredient when the graph has no linked nutrient data."""
 
         logger.info(
             "Knowledge graph nutrients missing for %s, falling back to ingredient lookup",
             formulation_id,
         )
 
-        fallback_formulation = self.neo4j_client.execute_query(
-            """
-            MATCH (f:Formulation {id: $formulation_id})
-            RETURN f.id AS id, f.name AS name
-            """,
+        fallback_formulation = await self.neo4j_client.execute_read(
+            queries.NUTRITION_FORMULATION_HEADER,
             {"formulation_id": formulation_id},
         )
         if not fallback_formulation:
             return None
 
-        ingredient_rows = self.neo4j_client.execute_query(
-            """
-            MATCH (f:Formulation {id: $formulation_id})-[rel:CONTAINS_INGREDIENT]->(ing:Ingredient)
-            OPTIONAL MATCH (ing)-[:DERIVED_FROM]->(food:Food)
-            RETURN ing.name AS ingredient_name,
-                   rel.percentage AS percentage,
-                   rel.quantity_kg AS quantity_kg,
-                   food.description AS food_description,
-                   food.fdcId AS food_fdc_id
-            """,
+        ingredient_rows = await self.neo4j_client.execute_read(
+            queries.NUTRITION_FORMULATION_INGREDIENTS,
             {"formulation_id": formulation_id},
         )
 
-        ingredients_with_nutrients: List[Dict[str, Any]] = []
-        for row in ingredient_rows:
-            ingredient_name = row.get("ingredient_name")
-            if not ingredient_name:
-                continue
-
-            nutrient_rows = self.neo4j_client.execute_query(
-                """
-                MATCH (food:Food)
-                WHERE ($fdc_id IS NOT NULL AND food.fdcId = $fdc_id)
-                   OR (food.fdcId IS NOT NULL AND toLower(food.description) CONTAINS toLower($ingredient_name))
-                OPTIONAL MATCH (food)-[rel:CONTAINS_NUTRIENT]->(n:Nutrient)
-                RETURN food.description AS matched_food,
-                       food.fdcId AS fdc_id,
-                       n.nutrientName AS nutrient_name,
-                       rel.value AS amount,
-                       n.unitName AS unit,
-                       rel.per100g AS per100g
-                """,
-                {
-                    "ingredient_name": ingredient_name,
-                    "fdc_id": row.get("food_fdc_id"),
-                },
+        rows = [row for row in ingredient_rows if row.get("ingredient_name")]
+        # Ingredients already linked to a food use it; the rest are resolved by name in one query
+        matches = await self.foods.resolve(
+            row["ingredient_name"] for row in rows if row.get("food_fdc_id") is None
+        )
+        food_ids: List[Optional[int]] = []
+        for row in rows:
+            if row.get("food_fdc_id") is not None:
+                food_ids.append(row["food_fdc_id"])
+            else:
+                match = matches.get(row["ingredient_name"])
+                food_ids.append(match.fdc_id if match is not None else None)
+
+        nutrients_by_food: Dict[int, List[Dict[str, Any]]] = {}
+        distinct_ids = list(dict.fromkeys(fdc_id for fdc_id in food_ids if fdc_id is not None))
+        if distinct_ids:
+            nutrient_rows = await self.neo4j_client.execute_read(
+                queries.NUTRITION_FOODS_NUTRIENTS,
+                {"fdc_ids": distinct_ids},
             )
+            for nut in nutrient_rows:
+                if not nut.get("nutrient_name"):
+                    continue
+                nutrients_by_food.setdefault(nut.get("fdc_id"), []).append(
+                    {
+                        "nutrient_name": nut.get("nutrient_name"),
+                        "amount": nut.get("amount"),
+                        "unit": nut.get("unit"),
+                        "per100g": nut.get("per100g"),
+                        "matched_food": nut.get("matched_food"),
+                        "fdc_id": nut.get("fdc_id"),
+                    }
+                )
 
-            nutrients = [
-                {
-                    "nutrient_name": nut.get("nutrient_name"),
-                    "amount": nut.get("amount"),
-                    "unit": nut.get("unit"),
-                    "per100g": nut.get("per100g"),
-                    "matched_food": nut.get("matched_food"),
-                    "fdc_id": nut.get("fdc_id"),
-                }
-                for nut in nutrient_rows
-                if nut.get("nutrient_name")
-            ]
-
-            logger.info(
-                "Fallback lookup retrieved %d nutrients for ingredient %s",
-                len(nutrients),
-                ingredient_name,
-            )
+        logger.info(
+            "Fallback lookup matched %d of %d ingredients to foods for %s",
+            sum(fdc_id is not None for fdc_id in food_ids),
+            len(rows),
+            formulation_id,
+        )
 
-            ingredients_with_nutrients.append(
-                {
-                    "name": ingredient_name,
-                    "percentage": row.get("percentage", 0.0),
-                    "quantity_kg": row.get("quantity_kg"),
-                    "food_description": row.get("food_description"),
-                    "food_fdc_id": row.get("food_fdc_id"),
-                    "nutrients": nutrients,
-                }
-            )
+        ingredients_with_nutrients: List[Dict[str, Any]] = [
+            {
+                "name": row["ingredient_name"],
+                "percentage": row.get("percentage", 0.0),
+                "quantity_kg": row.get("quantity_kg"),
+                "food_description": row.get("food_description"),
+                "food_fdc_id": row.get("food_fdc_id"),
+                "nutrients": nutrients_by_food.get(fdc_id, []) if fdc_id is not None else [],
+            }
+            for row, fdc_id in zip(rows, food_ids)
+        ]
 
         return {
             "id": fallback_formulation[0].get("id", formulation_id),
@@ -249,99 +410,12 @@ class NutritionCalculationService:
     ) -> Dict[str, float]:
         """Aggregate nutrients from ingredients weighted by percentage."""
 
-        logger.info(
+        logger.debug(
             "Aggregating nutrients for %d ingredients (serving_size=%s)",
             len(ingredients),
             serving_size,
         )
-
-        aggregated: Dict[str, float] = {}
-        for ingredient in ingredients:
-            nutrients = ingredient.get("nutrients", []) or []
-            nutrient_count = len(nutrients)
-            logger.info(
-                "Ingredient %s: percentage=%s, nutrients=%d",
-                ingredient.get("name"),
-                ingredient.get("percentage"),
-                nutrient_count,
-            )
-
-            try:
-                percentage = float(ingredient.get("percentage", 0)) / 100.0
-            except (TypeError, ValueError):  # pragma: no cover - defensive fallback
-                percentage = 0.0
-
-            if not nutrients:
-                continue
-
-            logger.debug(
-                "Sample nutrient row for %s: %s",
-                ingredient.get("name"),
-                nutrients[0],
-            )
-
-            for nutrient in nutrients:
-                name = None
-                amount = None
-                unit = None
-
-                if isinstance(nutrient, dict):
-                    nested = nutrient.get("nutrient") or nutrient.get("nutrient_info")
-                    if isinstance(nested, dict):
-                        name = (
-                            nested.get("name")
-                            or nested.get("nutrientName")
-                            or nested.get("nutrient_name")
-                        )
-                        amount = (
-                            nutrient.get("amount")
-                            or nested.get("amount")
-                            or nested.get("value")
-                        )
-                        unit = (
-                            nutrient.get("unit")
-                            or nested.get("unit")
-                            or nested.get("unitName")
-                        )
-                    else:
-                        name = (
-                            nutrient.get("name")
-                            or nutrient.get("nutrientName")
-                            or nutrient.get("nutrient_name")
-                        )
-                        amount = (
-                            nutrient.get("amount")
-                            or nutrient.get("value")
-                            or nutrient.get("nutrientAmount")
-                        )
-                        unit = nutrient.get("unit") or nutrient.get("unitName")
-
-                if not name:
-                    logger.debug(
-                        "Skipping unnamed nutrient row for %s",
-                        ingredient.get("name"),
-                    )
-                    continue
-
-                try:
-                    amount_val = 0.0 if amount is None else float(amount)
-                except (TypeError, ValueError) as exc:  # pragma: no cover - defensive fallback
-                    logger.debug(
-                        "Skipping nutrient %s for %s due to non-numeric amount %s (%s)",
-                        name,
-                        ingredient.get("name"),
-                        amount,
-                        exc,
-                    )
-                    continue
-
-                unit = unit or "g"
-                weighted_amount = amount_val * percentage * (serving_size / 100.0)
-
-                key = f"{name}|{unit}"
-                aggregated[key] = aggregated.get(key, 0.0) + weighted_amount
-
-        return aggregated
+        return aggregate_nutrients(ingredients, serving_size, self.nutrients)
 
     def _build_nutrition_facts(
         self,
@@ -354,34 +428,30 @@ class NutritionCalculationService:
     ) -> NutritionFacts:
         """Build FDA-compliant nutrition facts structure."""
 
-        def get_nutrient(names: List[str]) -> float:
-            for name in names:
-                for key, value in aggregated_nutrients.items():
-                    if key.startswith(name):
-                        return value
-            return 0.0
-
         def calc_dv_percent(amount: float, nutrient_name: str) -> Optional[float]:
             dv_info = FDA_DAILY_VALUES.get(nutrient_name)
             if dv_info and float(dv_info["amount"] or 0) > 0:
                 return round((amount / float(dv_info["amount"])) * 100, 0)
             return None
 
-        calories = get_nutrient(["Energy", "Calories"])
-        total_fat = get_nutrient(["Total lipid (fat)", "Fat, total", "Total Fat"])
-        saturated_fat = get_nutrient(["Fatty acids, total saturated", "Saturated fat"])
-        trans_fat = get_nutrient(["Fatty acids, total trans", "Trans fat"])
-        cholesterol = get_nutrient(["Cholesterol"])
-        sodium = get_nutrient(["Sodium, Na", "Sodium"])
-        total_carbs = get_nutrient(["Carbohydrate, by difference", "Carbohydrate"])
-        fiber = get_nutrient(["Fiber, total dietary", "Fiber"])
-        total_sugars = get_nutrient(["Sugars, total including NLEA", "Sugars, total", "Sugars"])
-        added_sugars = get_nutrient(["Sugars, added"])
-        protein = get_nutrient(["Protein"])
-        vitamin_d = get_nutrient(["Vitamin D (D2 + D3)", "Vitamin D"])
-        calcium = get_nutrient(["Calcium, Ca", "Calcium"])
-        iron = get_nutrient(["Iron, Fe", "Iron"])
-        potassium = get_nutrient(["Potassium, K", "Potassium"])
+        # Read from the per-line totals the registry added during aggregation
+        (
+            calories,
+            total_fat,
+            saturated_fat,
+            trans_fat,
+            cholesterol,
+            sodium,
+            total_carbs,
+            fiber,
+            total_sugars,
+            added_sugars,
+            protein,
+            vitamin_d,
+            calcium,
+            iron,
+            potassium,
+        ) = self.nutrients.label_values(aggregated_nutrients)
 
         primary_nutrients = {
             "Total Fat",
@@ -405,7 +475,7 @@ class NutritionCalculationService:
         additional: List[NutrientValue] = []
         for key, value in aggregated_nutrients.items():
             name, _, unit = key.partition("|")
-            if name in primary_nutrients:
+            if name in primary_nutrients or name.startswith(LABEL_KEY_PREFIX):
                 continue
             additional.append(
                 NutrientValue(
@@ -1,9 +1,8 @@
 import json
 import logging
-import time
 from typing import Any, Dict, List
 
-from neo4j.exceptions import Neo4jError, ServiceUnavailable, SessionExpired, TransientError
+from neo4j.exceptions import Neo4jError
 
 from app.db.neo4j_client import Neo4jClient
 from .orchestration_types import GraphWriteSet, PersistenceSummary
@@ -14,18 +13,8 @@ logger = logging.getLogger(__name__)
 class OrchestrationPersistenceService:
     """Persists the output of a multi-agent orchestration into Neo4j."""
 
-    def __init__(
-        self,
-        neo4j_client: Neo4jClient,
-        *,
-        max_retries: int = 2,
-        backoff_seconds: float = 0.35,
-        max_backoff_seconds: float = 2.0,
-    ):
+    def __init__(self, neo4j_client: Neo4jClient):
         self.neo4j_client = neo4j_client
-        self.max_retries = max(0, max_retries)
-        self.backoff_seconds = max(0.0, backoff_seconds)
-        self.max_backoff_seconds = max_backoff_seconds
 
     def persist_run(self, write_set: GraphWriteSet) -> PersistenceSummary:
         if not self.neo4j_client.driver:
@@ -34,41 +23,21 @@ class OrchestrationPersistenceService:
         query = self._build_query()
         parameters = self._snapshot_to_parameters(write_set)
 
-        attempt = 0
-        while True:
-            try:
-                if attempt:
-                    logger.info(
-                        "Retrying orchestration run %s (attempt %s)",
-                        write_set.run.get("runId"),
-                        attempt + 1,
-                    )
-
-                logger.debug("Persisting orchestration run %s", write_set.run.get("runId"))
-                result = self.neo4j_client.execute_write(query, parameters)
-                return PersistenceSummary(
-                    run_id=write_set.run.get("runId", ""),
-                    nodes_created=result.get("nodes_created", 0),
-                    relationships_created=result.get("relationships_created", 0),
-                    properties_set=result.get("properties_set", 0),
-                )
-            except (ServiceUnavailable, SessionExpired, TransientError) as exc:
-                if attempt >= self.max_retries:
-                    logger.error("Neo4j write retries exhausted for run %s", write_set.run.get("runId"))
-                    raise
-
-                backoff = min(self.backoff_seconds * (2 ** attempt), self.max_backoff_seconds)
-                logger.warning(
-                    "Retryable Neo4j error while persisting run %s: %s. Backing off %.2fs",
-                    write_set.run.get("runId"),
-                    exc,
-                    backoff,
-                )
-                time.sleep(backoff)
-                attempt += 1
-            except Neo4jError as exc:
-                logger.error("Failed to persist orchestration run: %s", exc)
-                raise
+        # execute_write runs a managed transaction, so transient errors and
+        # leader switches are retried by the driver up to its retry budget.
+        try:
+            logger.debug("Persisting orchestration run %s", write_set.run.get("runId"))
+            result = self.neo4j_client.execute_write(query, parameters)
+        except Neo4jError as exc:
+            logger.error("Failed to persist orchestration run: %s", exc)
+            raise
+
+        return PersistenceSummary(
+            run_id=write_set.run.get("runId", ""),
+            nodes_created=result.get("nodes_created", 0),
+            relationships_created=result.get("relationships_created", 0),
+            properties_set=result.get("properties_set", 0),
+        )
 
     def _build_query(self) -> str:
         return """
@@ -143,7 +112,7 @@ class OrchestrationPersistenceService:
             WHEN run.runId IN n.generatedRunIds THEN n.generatedRunIds
             ELSE n.generatedRunIds + run.runId
         END
-        FOREACH (_ IN CASE WHEN toLower(coalesce(node.type, '')) = 'formulation' THEN [1] ELSE [] END | SET n:Formulation)
+        FOREACH (_ IN CASE WHEN toLower(coalesce(node.type, '')) = 'formulation' THEN [1] ELSE [] END | SET n:Formulation, n.sort_ts = toString(datetime()))
         FOREACH (_ IN CASE WHEN toLower(coalesce(node.type, '')) = 'ingredient' THEN [1] ELSE [] END | SET n:Ingredient)
         FOREACH (_ IN CASE WHEN toLower(coalesce(node.type, '')) = 'process' THEN [1] ELSE [] END | SET n:Process)
         FOREACH (_ IN CASE WHEN toLower(coalesce(node.type, '')) = 'cost' THEN [1] ELSE [] END | SET n:Cost)
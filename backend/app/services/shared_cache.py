@@ -0,0 +1,410 @@
+"""Cache backends shared between API worker processes.
+
+:class:`CacheBackend` is the contract the formulation pipeline uses for its
+cross-worker tier: byte values with a TTL, plus a pub/sub channel for
+invalidation messages. :class:`RedisCacheBackend` implements it over the
+Redis protocol (RESP2) with a small asyncio client, so any Redis-compatible
+server works without another dependency. :class:`CacheInvalidationRelay`
+forwards local :class:`~app.services.formulation_pipeline.FormulationEventBus`
+events to the other workers and applies the events they send.
+
+Shared-tier failures are never fatal. Backends raise
+:class:`SharedCacheError`, and callers treat it as a miss.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from app.core.metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_ERRORS = metrics_registry.counter(
+    "shared_cache_errors_total", "Shared cache operations that failed and were treated as misses.", ("operation",)
+)
+SHARED_CACHE_INVALIDATIONS = metrics_registry.counter(
+    "shared_cache_invalidations_total", "Invalidation messages relayed between workers.", ("direction",)
+)
+
+
+class SharedCacheError(Exception):
+    """Raised when the shared cache backend cannot complete an operation."""
+
+
+class RespReplyError(SharedCacheError):
+    """Raised for ``-ERR`` replies from the server."""
+
+
+class Subscription(ABC):
+    """An open subscription to one pub/sub channel."""
+
+    @abstractmethod
+    async def get_message(self) -> bytes:
+        """Wait for the next message published on the channel."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Unsubscribe and release the connection."""
+
+
+class CacheBackend(ABC):
+    """Byte-oriented cache shared by every worker process."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under ``key`` or ``None``."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float, *, only_if_absent: bool = False) -> bool:
+        """Store ``value`` for ``ttl_seconds``; return ``False`` if ``only_if_absent`` and the key exists."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> int:
+        """Remove ``keys`` and return how many existed."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment the integer under ``key`` and return the new value."""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: bytes) -> None:
+        """Publish ``message`` to every subscriber of ``channel``."""
+
+    @abstractmethod
+    async def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to ``channel``; the subscription is active when this returns."""
+
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
+
+
+class RespConnection:
+    """Single asyncio connection speaking RESP2.
+
+    Commands are serialized by a lock, so one connection can be shared by
+    concurrent callers. Any transport failure closes the connection, and the
+    next command reconnects.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        db: int = 0,
+        password: Optional[str] = None,
+        username: Optional[str] = None,
+        timeout_seconds: float = 1.0,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._username = username
+        self._timeout_seconds = timeout_seconds
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def execute(self, *args: Any) -> Any:
+        async with self._lock:
+            try:
+                if not self.connected:
+                    await self._connect()
+                return await asyncio.wait_for(self._roundtrip(args), self._timeout_seconds)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                await self.close()
+                raise SharedCacheError(f"Shared cache command {args[0]!r} failed: {exc}") from exc
+
+    async def send(self, *args: Any) -> None:
+        """Write a command without reading its reply (used once subscribed)."""
+        if not self.connected:
+            await self._connect()
+        _, writer = self._require_streams()
+        writer.write(_encode_command(args))
+        await writer.drain()
+
+    async def read_reply(self) -> Any:
+        reader, _ = self._require_streams()
+        try:
+            return await _read_reply(reader)
+        except (OSError, asyncio.IncompleteReadError) as exc:
+            await self.close()
+            raise SharedCacheError(f"Shared cache connection lost: {exc}") from exc
+
+    async def close(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:  # pragma: no cover - already torn down
+                pass
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), self._timeout_seconds
+        )
+        if self._password is not None:
+            auth = ("AUTH", self._username, self._password) if self._username else ("AUTH", self._password)
+            await self._roundtrip(auth)
+        if self._db:
+            await self._roundtrip(("SELECT", self._db))
+
+    async def _roundtrip(self, args: Iterable[Any]) -> Any:
+        reader, writer = self._require_streams()
+        writer.write(_encode_command(args))
+        await writer.drain()
+        return await _read_reply(reader)
+
+    def _require_streams(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._reader is None or self._writer is None:
+            raise SharedCacheError("Shared cache connection is closed")
+        return self._reader, self._writer
+
+
+def _encode_command(args: Iterable[Any]) -> bytes:
+    parts: List[bytes] = []
+    items = list(args)
+    parts.append(b"*%d\r\n" % len(items))
+    for item in items:
+        if isinstance(item, bytes):
+            data = item
+        elif isinstance(item, str):
+            data = item.encode("utf-8")
+        else:
+            data = str(item).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        raise RespReplyError(body.decode("utf-8"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise SharedCacheError(f"Unexpected RESP reply prefix {prefix!r}")
+
+
+class _RespSubscription(Subscription):
+    def __init__(self, connection: RespConnection, channel: str) -> None:
+        self._connection = connection
+        self._channel = channel
+
+    async def get_message(self) -> bytes:
+        while True:
+            reply = await self._connection.read_reply()
+            if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                return reply[2]
+
+    async def close(self) -> None:
+        await self._connection.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """:class:`CacheBackend` for Redis-compatible servers.
+
+    Keys are namespaced by ``prefix``. Commands share one connection; every
+    subscription opens its own, as RESP2 requires.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        *,
+        db: int = 0,
+        password: Optional[str] = None,
+        username: Optional[str] = None,
+        prefix: str = "",
+        timeout_seconds: float = 1.0,
+    ) -> None:
+        self._connection_args: Dict[str, Any] = {
+            "db": db,
+            "password": password,
+            "username": username,
+            "timeout_seconds": timeout_seconds,
+        }
+        self._host = host
+        self._port = port
+        self._prefix = prefix
+        self._connection = RespConnection(host, port, **self._connection_args)
+
+    @classmethod
+    def from_url(cls, url: str, *, prefix: str = "", timeout_seconds: float = 1.0) -> "RedisCacheBackend":
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported shared cache URL scheme: {parsed.scheme!r}")
+        path = parsed.path.lstrip("/")
+        return cls(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=int(path) if path else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            username=unquote(parsed.username) if parsed.username else None,
+            prefix=prefix,
+            timeout_seconds=timeout_seconds,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._connection.execute("GET", self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float, *, only_if_absent: bool = False) -> bool:
+        args: List[Any] = ["SET", self._prefix + key, value, "PX", max(1, int(ttl_seconds * 1000))]
+        if only_if_absent:
+            args.append("NX")
+        return await self._connection.execute(*args) is not None
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self._connection.execute("DEL", *(self._prefix + key for key in keys))
+
+    async def incr(self, key: str) -> int:
+        return await self._connection.execute("INCR", self._prefix + key)
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self._connection.execute("PUBLISH", self._prefix + channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        connection = RespConnection(self._host, self._port, **self._connection_args)
+        try:
+            await connection.send("SUBSCRIBE", self._prefix + channel)
+            reply = await asyncio.wait_for(connection.read_reply(), self._connection_args["timeout_seconds"])
+        except (OSError, asyncio.TimeoutError) as exc:
+            await connection.close()
+            raise SharedCacheError(f"Shared cache subscribe failed: {exc}") from exc
+        if not (isinstance(reply, list) and reply and reply[0] == b"subscribe"):
+            await connection.close()
+            raise SharedCacheError(f"Unexpected subscribe reply: {reply!r}")
+        return _RespSubscription(connection, channel)
+
+    async def close(self) -> None:
+        await self._connection.close()
+
+
+RemoteEventHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class CacheInvalidationRelay:
+    """Fan local lifecycle events out to other workers and apply theirs.
+
+    Each relay stamps outgoing messages with its ``origin`` and ignores its
+    own messages when they come back, so a worker never invalidates twice.
+    Events marked ``remote`` came from another worker and are not sent again.
+    A lost subscription is re-established with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        channel: str,
+        *,
+        origin: Optional[str] = None,
+        reconnect_seconds: float = 0.5,
+        max_reconnect_seconds: float = 10.0,
+    ) -> None:
+        self._backend = backend
+        self._channel = channel
+        self.origin = origin or uuid.uuid4().hex
+        self._reconnect_seconds = reconnect_seconds
+        self._max_reconnect_seconds = max(reconnect_seconds, max_reconnect_seconds)
+        self._subscription: Optional[Subscription] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, event_bus, event_types: Iterable[str], on_remote: RemoteEventHandler) -> None:
+        self._subscription = await self._backend.subscribe(self._channel)
+        for event_type in event_types:
+            await event_bus.subscribe(event_type, self._forward)
+        self._task = asyncio.create_task(self._listen(on_remote))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._subscription is not None:
+            await self._subscription.close()
+            self._subscription = None
+
+    async def _forward(self, event) -> None:
+        if event.remote:
+            return
+        message = json.dumps({"origin": self.origin, "type": event.type, "payload": event.payload}, default=str)
+        try:
+            await self._backend.publish(self._channel, message.encode("utf-8"))
+            SHARED_CACHE_INVALIDATIONS.inc("sent")
+        except SharedCacheError as exc:
+            SHARED_CACHE_ERRORS.inc("publish")
+            logger.warning("Failed to relay %s to other workers: %s", event.type, exc)
+
+    async def _listen(self, on_remote: RemoteEventHandler) -> None:
+        delay = self._reconnect_seconds
+        while True:
+            try:
+                if self._subscription is None:
+                    self._subscription = await self._backend.subscribe(self._channel)
+                    delay = self._reconnect_seconds
+                raw = await self._subscription.get_message()
+            except SharedCacheError as exc:
+                SHARED_CACHE_ERRORS.inc("subscribe")
+                logger.warning("Shared cache subscription lost: %s", exc)
+                if self._subscription is not None:
+                    await self._subscription.close()
+                    self._subscription = None
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._max_reconnect_seconds)
+                continue
+
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                logger.warning("Ignoring malformed invalidation message")
+                continue
+            if message.get("origin") == self.origin:
+                continue
+            SHARED_CACHE_INVALIDATIONS.inc("received")
+            try:
+                await on_remote(message.get("type", ""), message.get("payload") or {})
+            except Exception:  # pragma: no cover - keep listening after handler bugs
+                logger.exception("Failed to apply remote %s event", message.get("type"))
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheInvalidationRelay",
+    "RedisCacheBackend",
+    "RespConnection",
+    "RespReplyError",
+    "SharedCacheError",
+    "Subscription",
+]
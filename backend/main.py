@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 
@@ -58,15 +59,28 @@ class SanitizingFormatter(logging.Formatter):
         return _sanitize_text(formatted)
 
 from app.api.routes import router
+from app.core import metrics
 from app.core.config import settings
 from app.core.rate_limit import limiter
-from app.db.neo4j_client import Neo4jClient
+from app.db import queries
+from app.db.causal import BOOKMARK_HEADER
+from app.db.neo4j_client import AsyncNeo4jClient, Neo4jClient, neo4j_client_options
+from app.db.pool_monitor import PoolSizeController, run_pool_controllers
+from app.db.query_registry import warm_query_plans
 from app.services.ollama_service import OllamaService
 from app.services.fdc_service import FDCService, FDCServiceError
 from app.services.graph_schema_service import GraphSchemaService
-from app.services.formulation_pipeline import attach_formulation_pipeline
+from app.services.formulation_pipeline import (
+    FormulationPipelineError,
+    attach_formulation_pipeline,
+    attach_shared_cache,
+)
+from app.services.shared_cache import CacheInvalidationRelay, RedisCacheBackend
 from app.services.embedding_service import OllamaEmbeddingClient
 from app.services.graphrag_retrieval import GraphRAGRetrievalService
+from app.services.food_resolution import FoodMatchCache, FoodResolver
+from app.services.nutrient_profiles import NutrientProfileStore
+from app.services.nutrient_registry import registry as nutrient_registry
 
 
 def configure_logging() -> None:
@@ -100,32 +114,57 @@ async def lifespan(fastapi_app: FastAPI):
     logger.info("Starting up Formulation Graph Studio API...")
 
     neo4j_client: Neo4jClient | None = None
+    async_neo4j_client: AsyncNeo4jClient | None = None
     ollama_service: OllamaService | None = None
     fdc_service: FDCService | None = None
     graph_schema_service: GraphSchemaService | None = None
     formulation_pipeline: Any = None
     graphrag_retrieval_service: GraphRAGRetrievalService | None = None
+    pool_controllers: dict[str, PoolSizeController] = {}
+    pool_task: asyncio.Task | None = None
+    shared_cache: RedisCacheBackend | None = None
+    cache_relay: CacheInvalidationRelay | None = None
 
     try:
-        neo4j_client = Neo4jClient(
-            uri=settings.NEO4J_URI,
-            user=settings.NEO4J_USER,
-            password=settings.NEO4J_PASSWORD,
-            database=settings.NEO4J_DATABASE,
-            max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
-            max_connection_lifetime_seconds=settings.NEO4J_MAX_CONNECTION_LIFETIME_SECONDS,
-            connection_acquisition_timeout_seconds=settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
-            encrypted=settings.NEO4J_ENCRYPTED,
-        )
+        neo4j_client = Neo4jClient(**neo4j_client_options(settings))
         neo4j_client.connect()
         logger.info("Neo4j connected")
+        try:
+            # Backs ingredient-to-food resolution; created before warmup so that query can be planned
+            await asyncio.to_thread(neo4j_client.execute_write, queries.FOOD_DESCRIPTION_FULLTEXT_INDEX)
+        except neo4j_exceptions.Neo4jError as exc:
+            logger.warning("Food full-text index creation failed: %s", exc)
+        if settings.NEO4J_WARMUP_QUERY_PLANS:
+            await asyncio.to_thread(warm_query_plans, neo4j_client)
     except neo4j_exceptions.Neo4jError as exc:
         logger.warning("Neo4j connection failed: %s", exc)
         neo4j_client = None
     except OSError as exc:  # pragma: no cover - defensive guard
         logger.exception("Unexpected OS error during Neo4j startup")
         raise RuntimeError("Neo4j startup failed due to system error") from exc
-    
+
+    if neo4j_client is not None:
+        try:
+            async_neo4j_client = AsyncNeo4jClient(**neo4j_client_options(settings))
+            await async_neo4j_client.connect()
+            logger.info("Async Neo4j driver connected")
+        except (neo4j_exceptions.Neo4jError, neo4j_exceptions.DriverError, OSError) as exc:
+            logger.warning("Async Neo4j connection failed: %s", exc)
+            async_neo4j_client = None
+
+    for name, client in (("neo4j", neo4j_client), ("neo4j_async", async_neo4j_client)):
+        if client is not None:
+            pool_controllers[name] = PoolSizeController(
+                client.pool_monitor,
+                min_size=settings.NEO4J_POOL_MIN_SIZE,
+                target_wait_seconds=settings.NEO4J_POOL_TARGET_WAIT_MS / 1000,
+            )
+    if pool_controllers and settings.NEO4J_POOL_ADAPTIVE:
+        pool_task = asyncio.create_task(
+            run_pool_controllers(list(pool_controllers.values()), settings.NEO4J_POOL_ADJUST_INTERVAL_SECONDS)
+        )
+        logger.info("Adaptive Neo4j pool sizing enabled")
+
     try:
         ollama_service = OllamaService(
             base_url=settings.OLLAMA_BASE_URL,
@@ -162,15 +201,73 @@ async def lifespan(fastapi_app: FastAPI):
         schema_name=settings.GRAPH_SCHEMA_NAME,
     )
 
+    if settings.FORMULATION_SHARED_CACHE_URL:
+        try:
+            shared_cache = RedisCacheBackend.from_url(
+                settings.FORMULATION_SHARED_CACHE_URL, prefix=settings.FORMULATION_SHARED_CACHE_PREFIX
+            )
+        except ValueError as exc:
+            logger.warning("Shared formulation cache disabled: %s", exc)
+            shared_cache = None
+
     formulation_pipeline = attach_formulation_pipeline(
         fastapi_app,
         neo4j_client,
         cache_ttl=settings.FORMULATION_CACHE_TTL_SECONDS,
         cache_entries=settings.FORMULATION_CACHE_MAX_ENTRIES,
+        cache_max_bytes=settings.FORMULATION_CACHE_MAX_BYTES,
+        cache_stale=settings.FORMULATION_CACHE_STALE_SECONDS,
         retry_attempts=settings.FORMULATION_RETRY_ATTEMPTS,
         retry_backoff=settings.FORMULATION_RETRY_BACKOFF_SECONDS,
         retry_max_backoff=settings.FORMULATION_RETRY_MAX_BACKOFF_SECONDS,
+        max_concurrency=settings.FORMULATION_MAX_CONCURRENCY,
+        max_queue_depth=settings.FORMULATION_MAX_QUEUE_DEPTH,
+        queue_timeout=settings.FORMULATION_QUEUE_TIMEOUT_SECONDS,
+        shared_cache=shared_cache,
+        shared_cache_ttl=settings.FORMULATION_SHARED_CACHE_TTL_SECONDS,
+        event_workers=settings.FORMULATION_EVENT_WORKERS,
+        event_queue_size=settings.FORMULATION_EVENT_QUEUE_SIZE,
+        event_handler_timeout=settings.FORMULATION_EVENT_HANDLER_TIMEOUT_SECONDS,
+        event_max_attempts=settings.FORMULATION_EVENT_MAX_ATTEMPTS,
     )
+    if neo4j_client is not None:
+        try:
+            backfilled = await formulation_pipeline.ensure_sort_keys()
+            if backfilled:
+                logger.info("Backfilled sort keys on %d formulations", backfilled)
+        except FormulationPipelineError as exc:
+            logger.warning("Formulation sort key backfill failed: %s", exc)
+    if shared_cache is not None:
+        cache_relay = await attach_shared_cache(
+            fastapi_app,
+            formulation_pipeline,
+            shared_cache,
+            channel=settings.FORMULATION_SHARED_CACHE_CHANNEL,
+        )
+        if cache_relay is not None:
+            logger.info("Shared formulation cache connected")
+
+    nutrient_profile_store = None
+    food_resolver = None
+    if async_neo4j_client is not None:
+        nutrient_profile_store = NutrientProfileStore(
+            async_neo4j_client,
+            ttl_seconds=settings.NUTRITION_PROFILE_TTL_SECONDS,
+            max_entries=settings.NUTRITION_PROFILE_MAX_ENTRIES,
+        )
+        await nutrient_profile_store.attach(fastapi_app.state.formulation_event_bus)
+        food_match_cache = FoodMatchCache(
+            ttl_seconds=settings.NUTRITION_FOOD_MATCH_TTL_SECONDS,
+            max_entries=settings.NUTRITION_FOOD_MATCH_MAX_ENTRIES,
+        )
+        await food_match_cache.attach(fastapi_app.state.formulation_event_bus)
+        food_resolver = FoodResolver(async_neo4j_client, food_match_cache)
+        try:
+            await nutrient_registry.load(async_neo4j_client)
+        except (neo4j_exceptions.Neo4jError, neo4j_exceptions.ServiceUnavailable, RuntimeError) as exc:
+            # Labels still resolve the common FDC names from the built-in table
+            logger.warning("Nutrient registry load failed: %s", exc)
+        await nutrient_registry.attach(fastapi_app.state.formulation_event_bus, async_neo4j_client)
 
     graphrag_retrieval_service = None
     if neo4j_client and settings.GRAPHRAG_CHUNK_INDEX_NAME:
@@ -199,21 +296,43 @@ async def lifespan(fastapi_app: FastAPI):
             logger.info("GraphRAG retrieval skipped - embedding configuration missing")
 
     fastapi_app.state.neo4j_client = neo4j_client
+    fastapi_app.state.async_neo4j_client = async_neo4j_client
+    fastapi_app.state.neo4j_pool_controllers = pool_controllers
     fastapi_app.state.ollama_service = ollama_service
     fastapi_app.state.fdc_service = fdc_service
     fastapi_app.state.graph_schema_service = graph_schema_service
     fastapi_app.state.graphrag_retrieval_service = graphrag_retrieval_service
+    fastapi_app.state.nutrient_profile_store = nutrient_profile_store
+    fastapi_app.state.food_resolver = food_resolver
 
     try:
         yield
     finally:
-        if neo4j_client:
-            neo4j_client.close()
-            logger.info("Neo4j connection closed")
+        if pool_task is not None:
+            pool_task.cancel()
+        if formulation_pipeline:
+            # Deliver queued events, including relayed invalidations, before the relay goes away.
+            # Their handlers query Neo4j, so the clients are closed only after this.
+            await fastapi_app.state.formulation_event_bus.stop()
+        if cache_relay is not None:
+            await cache_relay.stop()
+        if shared_cache is not None:
+            await shared_cache.close()
         if formulation_pipeline:
+            formulation_pipeline.shutdown()
             # Clear cached references to avoid leaking across reloads
             fastapi_app.state.formulation_pipeline = None
             fastapi_app.state.formulation_event_bus = None
+        # A settings refresh may have replaced the clients created here
+        neo4j_client = fastapi_app.state.neo4j_client
+        async_neo4j_client = fastapi_app.state.async_neo4j_client
+        if neo4j_client:
+            neo4j_client.close()
+            logger.info("Neo4j connection closed")
+        if async_neo4j_client:
+            await async_neo4j_client.close()
+            fastapi_app.state.nutrient_profile_store = None
+            fastapi_app.state.food_resolver = None
         if ollama_service:
             await ollama_service.close()
             logger.info("OLLAMA client session closed")
@@ -237,6 +356,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[BOOKMARK_HEADER],
 )
 
 app.state.limiter = limiter
@@ -266,7 +386,7 @@ async def health_check(request: Request):
     neo4j_client: Neo4jClient | None = getattr(request.app.state, "neo4j_client", None)
     if neo4j_client is not None:
         try:
-            dependencies["neo4j"] = "healthy" if neo4j_client.check_health() else "unhealthy"
+            dependencies["neo4j"] = "healthy" if await run_in_threadpool(neo4j_client.check_health) else "unhealthy"
         except neo4j_exceptions.Neo4jError:
             dependencies["neo4j"] = "unhealthy"
 
@@ -281,6 +401,15 @@ async def health_check(request: Request):
     if fdc_service is not None:
         dependencies["fdc"] = "healthy" if await fdc_service.check_health() else "unhealthy"
 
+    # Pool usage plus the size the controller would pick from recent waits
+    pools: dict[str, Any] = {}
+    controllers: dict[str, PoolSizeController] = getattr(request.app.state, "neo4j_pool_controllers", None) or {}
+    for name, controller in controllers.items():
+        pools[name] = {
+            **controller.monitor.snapshot(),
+            "recommended_size": controller.recommend().recommended,
+        }
+
     if all(status == "healthy" for status in dependencies.values()):
         overall_status = "healthy"
     elif any(status == "unhealthy" for status in dependencies.values()):
@@ -291,10 +420,17 @@ async def health_check(request: Request):
     return {
         "status": overall_status,
         "dependencies": dependencies,
+        "neo4j_pool": pools,
         "timestamp": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_handler() -> Response:
+    """Expose process metrics in the Prometheus text format."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon_handler() -> Response:
     """Return a 204 so favicon fetches from API clients do not log 404s."""
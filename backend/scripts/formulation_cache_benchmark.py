@@ -0,0 +1,210 @@
+"""Measure formulation cache hit rate under a mixed read/write workload.
+
+Drives :class:`FormulationPipelineService` against an in-memory stand-in for
+Neo4j with a seeded 90/10 read/write mix. Reads are list pages, skewed towards
+the first pages, and single-formulation gets. Writes are mostly updates, plus
+some creates and deletes. Two invalidation strategies run the same operation
+sequence:
+
+* ``flush`` reproduces the previous behaviour. Every write drops all list and
+  get entries, and the update re-primes only the updated formulation.
+* ``stamped`` is the current pipeline. It uses versioned get keys and a list
+  generation, and drops only the pages whose membership or order a write
+  changes.
+
+A read counts as served from cache when it issued no query. No Neo4j
+instance is required.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.models.schemas import FormulationCreate, FormulationUpdate, IngredientInput
+from app.services.formulation_pipeline import FormulationPipelineCache, FormulationPipelineService
+
+
+class InMemoryFormulations:
+    """Serves the named formulation queries from a dict and counts reads."""
+
+    def __init__(self, count: int) -> None:
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        for index in range(count):
+            self.rows[f"seed_{index}"] = {
+                "id": f"seed_{index}",
+                "name": f"Formulation {index}",
+                "status": "draft",
+                "created_at": f"2025-01-01T00:{index // 60:02d}:{index % 60:02d}",
+            }
+        self.reads = 0
+
+    def _record(self, formulation_id: str) -> Dict[str, Any]:
+        return {"f": dict(self.rows[formulation_id]), "ingredients": []}
+
+    def execute_read(self, query, parameters=None, *, causal=None):
+        self.reads += 1
+        if query.name == "formulation.count":
+            return [{"total": len(self.rows)}]
+        if query.name == "formulation.get":
+            return [self._record(parameters["id"])] if parameters["id"] in self.rows else []
+        ordered = sorted(self.rows.values(), key=lambda row: row.get("updated_at") or row["created_at"], reverse=True)
+        window = ordered[parameters["skip"] : parameters["skip"] + parameters["limit"]]
+        return [self._record(row["id"]) for row in window]
+
+    def execute_query(self, query, parameters=None, *, causal=None):
+        if query.name == "formulation.create":
+            self.rows[parameters["id"]] = {
+                key: parameters[key] for key in ("id", "name", "description", "status", "created_at")
+            }
+            return [self._record(parameters["id"])]
+        if parameters["id"] not in self.rows:
+            return []
+        self.rows[parameters["id"]].update(parameters["fields"], updated_at=parameters["updated_at"])
+        return [self._record(parameters["id"])]
+
+    def execute_write(self, query, parameters=None, *, causal=None):
+        self.rows.pop(parameters["id"], None)
+        return []
+
+
+class FlushingPipeline(FormulationPipelineService):
+    """Pipeline with the invalidation it used before stamped keys."""
+
+    async def create(self, payload, *, causal=None):
+        result = await super().create(payload, causal=causal)
+        await self._cache.invalidate()
+        return result
+
+    async def update(self, formulation_id, payload, *, causal=None):
+        result = await super().update(formulation_id, payload, causal=causal)
+        await self._cache.invalidate()
+        await self._cache.set(self._get_key(formulation_id), result)
+        return result
+
+    async def delete(self, formulation_id, *, causal=None):
+        await super().delete(formulation_id, causal=causal)
+        await self._cache.invalidate()
+
+
+async def run_workload(
+    pipeline_class: type,
+    *,
+    formulations: int,
+    operations: int,
+    write_ratio: float,
+    page_size: int,
+    pages: int,
+    seed: int,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    store = InMemoryFormulations(formulations)
+    pipeline = pipeline_class(store, cache=FormulationPipelineCache(ttl_seconds=3600, max_entries=4096))
+    page_weights = [1.0 / (index + 1) for index in range(pages)]
+    created = 0
+    counts = {"list": 0, "list_cached": 0, "get": 0, "get_cached": 0, "writes": 0}
+    try:
+        for _ in range(operations):
+            ids = list(store.rows)
+            if rng.random() < write_ratio:
+                counts["writes"] += 1
+                roll = rng.random()
+                if roll < 0.8:
+                    await pipeline.update(rng.choice(ids), FormulationUpdate(name=f"Renamed {rng.random():.6f}"))
+                elif roll < 0.9 or len(ids) <= page_size * pages:
+                    created += 1
+                    await pipeline.create(
+                        FormulationCreate(
+                            name=f"Created {created}",
+                            ingredients=[IngredientInput(name="Water", percentage=100.0)],
+                        )
+                    )
+                    # Ids are millisecond timestamps; keep them unique
+                    await asyncio.sleep(0.002)
+                else:
+                    await pipeline.delete(rng.choice(ids))
+                continue
+
+            before = store.reads
+            if rng.random() < 0.7:
+                page = rng.choices(range(pages), weights=page_weights)[0]
+                await pipeline.list(skip=page * page_size, limit=page_size)
+                kind = "list"
+            else:
+                await pipeline.get(rng.choice(ids))
+                kind = "get"
+            counts[kind] += 1
+            if store.reads == before:
+                counts[f"{kind}_cached"] += 1
+    finally:
+        pipeline.shutdown()
+
+    reads = counts["list"] + counts["get"]
+    return {
+        **counts,
+        "read_hit_rate": (counts["list_cached"] + counts["get_cached"]) / reads if reads else 0.0,
+        "list_hit_rate": counts["list_cached"] / counts["list"] if counts["list"] else 0.0,
+        "get_hit_rate": counts["get_cached"] / counts["get"] if counts["get"] else 0.0,
+        "cache": pipeline._cache.stats(),
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark formulation cache hit rate under mixed reads and writes")
+    parser.add_argument("--formulations", type=int, default=500, help="Formulations seeded before the run")
+    parser.add_argument("--operations", type=int, default=5000, help="Operations per strategy")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Fraction of operations that are writes")
+    parser.add_argument("--page-size", type=int, default=20, help="List page size")
+    parser.add_argument("--pages", type=int, default=10, help="Distinct list pages readers request")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed shared by both strategies")
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    results: Dict[str, Any] = {}
+    for name, pipeline_class in (("flush", FlushingPipeline), ("stamped", FormulationPipelineService)):
+        results[name] = asyncio.run(
+            run_workload(
+                pipeline_class,
+                formulations=args.formulations,
+                operations=args.operations,
+                write_ratio=args.write_ratio,
+                page_size=args.page_size,
+                pages=args.pages,
+                seed=args.seed,
+            )
+        )
+
+    print("Formulation Cache Hit Rate")
+    print("==========================")
+    print(f"{args.operations} operations, {args.write_ratio:.0%} writes, {args.formulations} formulations")
+    for name, payload in results.items():
+        print(
+            f"  {name:<8} reads={payload['read_hit_rate']:.1%} "
+            f"list={payload['list_hit_rate']:.1%} get={payload['get_hit_rate']:.1%}"
+        )
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
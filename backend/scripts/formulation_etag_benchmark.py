@@ -0,0 +1,191 @@
+"""Measure what conditional GETs save a client polling the formulations API.
+
+Runs the formulations router in-process against an in-memory stand-in for
+Neo4j. A simulated frontend polls one list page and the formulation it has
+open. Between polls, another user occasionally edits a formulation. Two
+clients replay the same seeded sequence:
+
+* ``unconditional`` re-downloads every response, as the frontend did before
+  ETags.
+* ``conditional`` sends the last ETag it saw as ``If-None-Match`` and keeps
+  its copy on 304.
+
+The report covers response body bytes, 304 share, and process CPU time.
+Because client and server share the process, CPU time includes the test
+client's own overhead for both modes. No Neo4j instance is required.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import formulations
+from app.services.formulation_pipeline import attach_formulation_pipeline
+
+
+class InMemoryFormulations:
+    """Serves the named formulation queries from a dict."""
+
+    def __init__(self, count: int, ingredients: int) -> None:
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.ingredients: Dict[str, List[Dict[str, Any]]] = {}
+        share = 100.0 / ingredients
+        for index in range(count):
+            formulation_id = f"seed_{index}"
+            self.rows[formulation_id] = {
+                "id": formulation_id,
+                "name": f"Formulation {index}",
+                "description": "Seeded for the polling benchmark",
+                "status": "draft",
+                "created_at": f"2025-01-01T00:{index // 60:02d}:{index % 60:02d}",
+            }
+            self.ingredients[formulation_id] = [
+                {"name": f"Ingredient {part}", "percentage": share, "cost_per_kg": 1.25, "function": "base"}
+                for part in range(ingredients)
+            ]
+        self.reads = 0
+
+    def _record(self, formulation_id: str) -> Dict[str, Any]:
+        return {
+            "f": dict(self.rows[formulation_id]),
+            "ingredients": [dict(ingredient) for ingredient in self.ingredients[formulation_id]],
+        }
+
+    def execute_read(self, query, parameters=None, *, causal=None):
+        self.reads += 1
+        if query.name == "formulation.count":
+            return [{"total": len(self.rows)}]
+        if query.name == "formulation.get":
+            return [self._record(parameters["id"])] if parameters["id"] in self.rows else []
+        ordered = sorted(self.rows.values(), key=lambda row: row.get("updated_at") or row["created_at"], reverse=True)
+        window = ordered[parameters["skip"] : parameters["skip"] + parameters["limit"]]
+        return [self._record(row["id"]) for row in window]
+
+    def execute_query(self, query, parameters=None, *, causal=None):
+        self.rows[parameters["id"]].update(parameters["fields"], updated_at=parameters["updated_at"])
+        return [self._record(parameters["id"])]
+
+
+def run_client(
+    *,
+    conditional: bool,
+    formulations_count: int,
+    ingredients: int,
+    polls: int,
+    page_size: int,
+    edit_probability: float,
+    seed: int,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    store = InMemoryFormulations(formulations_count, ingredients)
+    app = FastAPI()
+    pipeline = attach_formulation_pipeline(app, store, cache_ttl=3600, cache_entries=4096)
+    app.include_router(formulations.router, prefix="/formulations")
+    etags: Dict[str, str] = {}
+    counts = {"requests": 0, "not_modified": 0, "body_bytes": 0}
+
+    def poll(client: TestClient, url: str, params: Dict[str, Any]) -> None:
+        headers = {"If-None-Match": etags[url]} if conditional and url in etags else {}
+        response = client.get(url, params=params, headers=headers)
+        counts["requests"] += 1
+        counts["body_bytes"] += len(response.content)
+        if response.status_code == 304:
+            counts["not_modified"] += 1
+        elif "ETag" in response.headers:
+            etags[url] = response.headers["ETag"]
+
+    ids = list(store.rows)
+    opened = ids[0]
+    try:
+        with TestClient(app) as client:
+            started = time.process_time()
+            for _ in range(polls):
+                if rng.random() < edit_probability:
+                    edited = rng.choice(ids[:page_size])
+                    client.put(f"/formulations/{edited}", json={"description": f"Edited {rng.random():.6f}"})
+                poll(client, "/formulations", {"limit": page_size})
+                poll(client, f"/formulations/{opened}", {})
+            cpu_seconds = time.process_time() - started
+    finally:
+        pipeline.shutdown()
+
+    return {
+        **counts,
+        "not_modified_rate": counts["not_modified"] / counts["requests"] if counts["requests"] else 0.0,
+        "cpu_seconds": cpu_seconds,
+        "neo4j_reads": store.reads,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark conditional GETs for a polling formulations client")
+    parser.add_argument("--formulations", type=int, default=200, help="Formulations seeded before the run")
+    parser.add_argument("--ingredients", type=int, default=12, help="Ingredients per formulation")
+    parser.add_argument("--polls", type=int, default=500, help="Polling rounds per client")
+    parser.add_argument("--page-size", type=int, default=25, help="List page size the client polls")
+    parser.add_argument("--edit-probability", type=float, default=0.05, help="Chance of an edit before each poll")
+    parser.add_argument("--seed", type=int, default=11, help="Random seed shared by both clients")
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    results: Dict[str, Any] = {}
+    for name, conditional in (("unconditional", False), ("conditional", True)):
+        results[name] = run_client(
+            conditional=conditional,
+            formulations_count=args.formulations,
+            ingredients=args.ingredients,
+            polls=args.polls,
+            page_size=args.page_size,
+            edit_probability=args.edit_probability,
+            seed=args.seed,
+        )
+
+    baseline, conditional = results["unconditional"], results["conditional"]
+    results["savings"] = {
+        "body_bytes": 1 - conditional["body_bytes"] / baseline["body_bytes"] if baseline["body_bytes"] else 0.0,
+        "cpu_seconds": 1 - conditional["cpu_seconds"] / baseline["cpu_seconds"] if baseline["cpu_seconds"] else 0.0,
+    }
+
+    print("Formulation Polling With Conditional GETs")
+    print("=========================================")
+    print(f"{args.polls} polls, {args.edit_probability:.0%} edit chance, {args.ingredients} ingredients each")
+    for name in ("unconditional", "conditional"):
+        payload = results[name]
+        print(
+            f"  {name:<13} bytes={payload['body_bytes']:>10,} 304s={payload['not_modified_rate']:.1%} "
+            f"cpu={payload['cpu_seconds']:.3f}s"
+        )
+    print(
+        f"  saved         bytes={results['savings']['body_bytes']:.1%} "
+        f"cpu={results['savings']['cpu_seconds']:.1%}"
+    )
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
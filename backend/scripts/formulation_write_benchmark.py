@@ -0,0 +1,200 @@
+"""Compare formulation create/update latency: per-ingredient writes vs one UNWIND transaction.
+
+The legacy path reproduces what ``FormulationPipelineService`` used to do for
+every save, each call in its own transaction:
+
+1. ``CREATE (f)`` (or ``SET`` on update, followed by deleting the old links);
+2. one ``MERGE (i:Food) CREATE (f)-[:CONTAINS]->(i)`` per ingredient;
+3. the cost ``SET``;
+4. a read-back.
+
+The new path runs ``formulation.create`` / ``formulation.update`` from
+:mod:`app.db.queries`. Each is a single write transaction that unwinds the
+ingredient list, rolls up cost and returns the formulation.
+
+Formulations and Food nodes created by the run use a ``bench_`` prefix and
+are deleted afterwards. Requires a reachable Neo4j instance configured
+through the usual NEO4J_* settings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.core.config import settings
+from app.db import queries
+from app.db.neo4j_client import Neo4jClient
+
+LEGACY_CREATE = """
+CREATE (f:Formulation {id: $id, name: $name, description: $description, status: $status, created_at: $created_at})
+RETURN f
+"""
+LEGACY_UPDATE = """
+MATCH (f:Formulation {id: $id})
+SET f.name = $name, f.description = $description, f.status = $status, f.updated_at = $updated_at
+RETURN f
+"""
+LEGACY_REMOVE_INGREDIENTS = "MATCH (:Formulation {id: $id})-[rel:CONTAINS]->(:Food) DELETE rel"
+LEGACY_ADD_INGREDIENT = """
+MATCH (f:Formulation {id: $form_id})
+MERGE (i:Food {name: $name})
+CREATE (f)-[:CONTAINS {
+    percentage: $percentage, cost_per_kg: $cost_per_kg, function: $function,
+    quantity_kg: $quantity_kg, cost_reference: $cost_reference
+}]->(i)
+"""
+LEGACY_SET_COST = """
+MATCH (f:Formulation {id: $id})
+SET f.cost_per_kg = $cost_per_kg, f.cost_basis_kg = $cost_basis_kg, f.cost_updated_at = datetime()
+RETURN f
+"""
+CLEANUP = """
+MATCH (f:Formulation) WHERE f.id STARTS WITH 'bench_'
+DETACH DELETE f
+WITH count(*) AS removed
+MATCH (i:Food) WHERE i.name STARTS WITH 'bench_'
+DETACH DELETE i
+"""
+
+
+def ingredient_rows(count: int, run_tag: str) -> List[Dict[str, Any]]:
+    share = 100.0 / count
+    rows = []
+    for index in range(count):
+        cost_per_kg = 1.0 + index % 7
+        rows.append(
+            {
+                "name": f"bench_{run_tag}_ingredient_{index}",
+                "percentage": share,
+                "cost_per_kg": cost_per_kg,
+                "function": "filler",
+                "quantity_kg": share / 100.0,
+                "cost_reference": share / 100.0 * cost_per_kg,
+            }
+        )
+    return rows
+
+
+def legacy_save(client: Neo4jClient, formulation_id: str, rows: List[Dict[str, Any]], *, update: bool) -> None:
+    now = datetime.now().isoformat()
+    header = {"id": formulation_id, "name": "Benchmark", "description": None, "status": "draft"}
+    if update:
+        client.execute_write(LEGACY_UPDATE, {**header, "updated_at": now})
+        client.execute_write(LEGACY_REMOVE_INGREDIENTS, {"id": formulation_id})
+    else:
+        client.execute_write(LEGACY_CREATE, {**header, "created_at": now})
+    for row in rows:
+        client.execute_write(LEGACY_ADD_INGREDIENT, {"form_id": formulation_id, **row})
+    client.execute_write(
+        LEGACY_SET_COST,
+        {"id": formulation_id, "cost_per_kg": sum(row["cost_reference"] for row in rows), "cost_basis_kg": 1.0},
+    )
+    client.execute_read(queries.FORMULATION_GET, {"id": formulation_id})
+
+
+def unwind_save(client: Neo4jClient, formulation_id: str, rows: List[Dict[str, Any]], *, update: bool) -> None:
+    now = datetime.now().isoformat()
+    if update:
+        client.execute_query(
+            queries.FORMULATION_UPDATE,
+            {"id": formulation_id, "fields": {"name": "Benchmark"}, "updated_at": now, "ingredients": rows},
+        )
+    else:
+        client.execute_query(
+            queries.FORMULATION_CREATE,
+            {
+                "id": formulation_id,
+                "name": "Benchmark",
+                "description": None,
+                "status": "draft",
+                "created_at": now,
+                "ingredients": rows,
+            },
+        )
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples)}
+
+
+def run_benchmark(client: Neo4jClient, sizes: List[int], repeats: int) -> Dict[str, Dict[str, Any]]:
+    run_tag = uuid.uuid4().hex[:8]
+    results: Dict[str, Dict[str, Any]] = {}
+    strategies = {"legacy": legacy_save, "unwind": unwind_save}
+    for size in sizes:
+        rows = ingredient_rows(size, run_tag)
+        timings: Dict[str, List[float]] = {f"{name}_{op}": [] for name in strategies for op in ("create", "update")}
+        for repeat in range(repeats):
+            for name, save in strategies.items():
+                formulation_id = f"bench_{run_tag}_{name}_{size}_{repeat}"
+                for op in ("create", "update"):
+                    start = time.perf_counter()
+                    save(client, formulation_id, rows, update=op == "update")
+                    timings[f"{name}_{op}"].append((time.perf_counter() - start) * 1000)
+        results[str(size)] = {key: _summary(samples) for key, samples in timings.items()}
+    return results
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark formulation create/update write strategies")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[5, 50, 500], help="Ingredient counts per formulation"
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Saves per strategy and size")
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    client = Neo4jClient(
+        uri=settings.NEO4J_URI,
+        user=settings.NEO4J_USER,
+        password=settings.NEO4J_PASSWORD,
+        database=settings.NEO4J_DATABASE,
+        max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
+        encrypted=settings.NEO4J_ENCRYPTED,
+    )
+    client.connect()
+    try:
+        results = run_benchmark(client, args.sizes, args.repeats)
+    finally:
+        client.execute_write(CLEANUP)
+        client.close()
+
+    print("Formulation Save Latency")
+    print("========================")
+    for size, payload in results.items():
+        print(f"{size} ingredients")
+        for label, stats in payload.items():
+            print(f"  {label:<16} median={stats['median_ms']:.1f}ms min={stats['min_ms']:.1f}ms")
+        for op in ("create", "update"):
+            unwind = payload[f"unwind_{op}"]["median_ms"]
+            if unwind:
+                print(f"  {op} speed-up: {payload[f'legacy_{op}']['median_ms'] / unwind:.1f}x")
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
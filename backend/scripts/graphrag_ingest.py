@@ -71,6 +71,18 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         default=settings.OLLAMA_EMBED_BATCH_SIZE,
         help="Batch size when requesting embeddings",
     )
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=500,
+        help="Chunks written to Neo4j per UNWIND transaction",
+    )
+    parser.add_argument(
+        "--write-concurrency",
+        type=int,
+        default=4,
+        help="Chunk write transactions to run in parallel",
+    )
     return parser.parse_args(list(argv))
 
 
@@ -182,6 +194,8 @@ def run(argv: Iterable[str]) -> int:
             write_to_neo4j=not args.skip_neo4j,
             embed_chunks=not args.skip_embeddings,
             embedding_batch_size=args.embedding_batch_size,
+            write_batch_size=args.write_batch_size,
+            write_concurrency=args.write_concurrency,
         )
         results = service.ingest(dry_run=args.dry_run)
     finally:
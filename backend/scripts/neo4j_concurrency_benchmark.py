@@ -0,0 +1,187 @@
+"""Measure request latency under mixed Neo4j load for the sync and async clients.
+
+The benchmark simulates what the API does inside ``async def`` handlers: a
+handful of slow analytical queries run alongside many cheap point reads on the
+same event loop. With the synchronous ``Neo4jClient`` every call blocks the
+loop, so fast requests queue behind slow ones; with ``AsyncNeo4jClient`` they
+interleave. Latency percentiles are reported for both modes so the effect on
+p99 can be compared directly.
+
+Requires a reachable Neo4j instance configured through the usual NEO4J_*
+settings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.core.config import settings
+from app.db.neo4j_client import AsyncNeo4jClient, Neo4jClient
+
+FAST_QUERY = "RETURN 1 AS ok"
+# Pure-CPU query whose duration scales with $n, so no fixture data is needed.
+SLOW_QUERY = "UNWIND range(1, $n) AS x WITH x WHERE x % 7 = 0 RETURN count(x) AS hits"
+
+
+@dataclass
+class LatencySample:
+    fast_ms: List[float] = field(default_factory=list)
+    slow_ms: List[float] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "mean_ms": statistics.mean(values) if values else 0.0,
+    }
+
+
+def _client_kwargs() -> Dict[str, object]:
+    return {
+        "uri": settings.NEO4J_URI,
+        "user": settings.NEO4J_USER,
+        "password": settings.NEO4J_PASSWORD,
+        "database": settings.NEO4J_DATABASE,
+        "max_connection_pool_size": settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
+        "connection_acquisition_timeout_seconds": settings.NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
+        "max_transaction_retry_time_seconds": settings.NEO4J_MAX_TRANSACTION_RETRY_TIME_SECONDS,
+        "encrypted": settings.NEO4J_ENCRYPTED,
+    }
+
+
+async def run_sync_mode(fast_requests: int, slow_requests: int, slow_size: int) -> LatencySample:
+    """Call the blocking client straight from coroutines, as the handlers used to."""
+
+    client = Neo4jClient(**_client_kwargs())
+    client.connect()
+    sample = LatencySample()
+
+    async def fast_call(created_at: float) -> None:
+        await asyncio.sleep(0)
+        client.execute_query(FAST_QUERY)
+        sample.fast_ms.append((time.perf_counter() - created_at) * 1000)
+
+    async def slow_call(created_at: float) -> None:
+        await asyncio.sleep(0)
+        client.execute_query(SLOW_QUERY, {"n": slow_size})
+        sample.slow_ms.append((time.perf_counter() - created_at) * 1000)
+
+    try:
+        sample.wall_seconds = await _drive(fast_call, slow_call, fast_requests, slow_requests)
+    finally:
+        client.close()
+    return sample
+
+
+async def run_async_mode(fast_requests: int, slow_requests: int, slow_size: int) -> LatencySample:
+    client = AsyncNeo4jClient(**_client_kwargs())
+    await client.connect()
+    sample = LatencySample()
+
+    async def fast_call(created_at: float) -> None:
+        await client.execute_query(FAST_QUERY)
+        sample.fast_ms.append((time.perf_counter() - created_at) * 1000)
+
+    async def slow_call(created_at: float) -> None:
+        await client.execute_query(SLOW_QUERY, {"n": slow_size})
+        sample.slow_ms.append((time.perf_counter() - created_at) * 1000)
+
+    try:
+        sample.wall_seconds = await _drive(fast_call, slow_call, fast_requests, slow_requests)
+    finally:
+        await client.close()
+    return sample
+
+
+async def _drive(fast_call, slow_call, fast_requests: int, slow_requests: int) -> float:
+    # Latency is measured from task creation so time spent queued behind a
+    # blocked loop shows up in the numbers, exactly as a client would see it.
+    tasks = []
+    start = time.perf_counter()
+    slow_every = max(1, fast_requests // max(1, slow_requests))
+    issued_slow = 0
+    for index in range(fast_requests):
+        if issued_slow < slow_requests and index % slow_every == 0:
+            tasks.append(asyncio.create_task(slow_call(time.perf_counter())))
+            issued_slow += 1
+        tasks.append(asyncio.create_task(fast_call(time.perf_counter())))
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - start
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare sync vs async Neo4j client latency under mixed load")
+    parser.add_argument("--fast-requests", type=int, default=400, help="Number of cheap point reads to issue")
+    parser.add_argument("--slow-requests", type=int, default=20, help="Number of slow analytical queries to mix in")
+    parser.add_argument("--slow-size", type=int, default=2_000_000, help="Row count driving the slow query cost")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["sync", "async"],
+        default=["sync", "async"],
+        help="Client modes to benchmark",
+    )
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    runners = {"sync": run_sync_mode, "async": run_async_mode}
+    results: Dict[str, Dict[str, object]] = {}
+
+    for mode in args.modes:
+        sample = asyncio.run(runners[mode](args.fast_requests, args.slow_requests, args.slow_size))
+        results[mode] = {
+            "fast": summarize(sample.fast_ms),
+            "slow": summarize(sample.slow_ms),
+            "wall_seconds": sample.wall_seconds,
+        }
+
+    print("Neo4j Mixed-Load Latency")
+    print("========================")
+    for mode, payload in results.items():
+        fast = payload["fast"]
+        slow = payload["slow"]
+        print(f"Mode: {mode}")
+        print(f"  Fast reads  p50={fast['p50_ms']:.1f}ms p95={fast['p95_ms']:.1f}ms p99={fast['p99_ms']:.1f}ms")
+        print(f"  Slow reads  p50={slow['p50_ms']:.1f}ms p95={slow['p95_ms']:.1f}ms p99={slow['p99_ms']:.1f}ms")
+        print(f"  Wall time   {payload['wall_seconds']:.2f}s")
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
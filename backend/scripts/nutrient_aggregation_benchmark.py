@@ -0,0 +1,129 @@
+"""Compare nutrient aggregation paths for formulations of different sizes.
+
+Builds seeded ingredient lists where each ingredient carries a realistic
+number of per-100g nutrient rows drawn from a fixed nutrient set. It labels
+the same formulation for several serving sizes two ways:
+
+* ``loop``: one :func:`aggregate_nutrients_loop` call per serving size,
+  which re-parses every nutrient row each time.
+* ``batch``: one :func:`aggregate_nutrients_batch` call for all serving
+  sizes, which parses the rows once. This is what the batch label endpoint
+  and the profile store do.
+
+The batch results are checked to equal the loop's exactly before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services.nutrient_aggregation import aggregate_nutrients_batch, aggregate_nutrients_loop
+
+
+def build_ingredients(count: int, *, nutrients: int, per_ingredient: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    catalog = [(f"Nutrient {index}", "mg" if index % 3 else "g") for index in range(nutrients)]
+    ingredients = []
+    for index in range(count):
+        rows = [
+            {"nutrient_name": name, "amount": rng.uniform(0, 400), "unit": unit, "per100g": True}
+            for name, unit in rng.sample(catalog, min(per_ingredient, nutrients))
+        ]
+        ingredients.append({"name": f"Ingredient {index}", "percentage": 100.0 / count, "nutrients": rows})
+    return ingredients
+
+
+def time_call(call: Callable[[], Any], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-serving loop vs batch nutrient aggregation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Ingredient counts to test")
+    parser.add_argument("--nutrients", type=int, default=150, help="Distinct nutrients in the catalog")
+    parser.add_argument("--per-ingredient", type=int, default=60, help="Nutrient rows per ingredient")
+    parser.add_argument(
+        "--serving-sizes",
+        type=float,
+        nargs="+",
+        default=[30.0, 50.0, 100.0, 250.0],
+        help="Serving sizes in grams labelled per formulation",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions; the best run is reported")
+    parser.add_argument("--seed", type=int, default=5, help="Random seed for the ingredient data")
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    results: Dict[str, Any] = {}
+    for size in args.sizes:
+        ingredients = build_ingredients(
+            size, nutrients=args.nutrients, per_ingredient=args.per_ingredient, seed=args.seed
+        )
+        requests = [(0, serving_size) for serving_size in args.serving_sizes]
+
+        def loop() -> List[Dict[str, float]]:
+            return [aggregate_nutrients_loop(ingredients, serving_size) for serving_size in args.serving_sizes]
+
+        def batch() -> List[Dict[str, float]]:
+            return aggregate_nutrients_batch([ingredients], requests)
+
+        expected, actual = loop(), batch()
+        if any(list(got) != list(want) or got != want for got, want in zip(actual, expected)):
+            print(f"Batch result diverged from the loop at {size} ingredients")
+            return 1
+
+        loop_seconds = time_call(loop, args.repeat)
+        batch_seconds = time_call(batch, args.repeat)
+        results[str(size)] = {
+            "nutrient_rows": sum(len(ingredient["nutrients"]) for ingredient in ingredients),
+            "serving_sizes": len(args.serving_sizes),
+            "loop_ms": loop_seconds * 1000,
+            "batch_ms": batch_seconds * 1000,
+            "batch_speedup": loop_seconds / batch_seconds if batch_seconds else 0.0,
+        }
+
+    print("Nutrient Aggregation")
+    print("====================")
+    print(
+        f"{args.per_ingredient} nutrient rows per ingredient, {len(args.serving_sizes)} serving sizes, "
+        f"best of {args.repeat}"
+    )
+    for size, payload in results.items():
+        print(
+            f"  {size:>5} ingredients  loop={payload['loop_ms']:8.2f}ms  "
+            f"batch={payload['batch_ms']:8.2f}ms ({payload['batch_speedup']:.1f}x)"
+        )
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
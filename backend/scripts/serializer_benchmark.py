@@ -0,0 +1,201 @@
+"""Micro-benchmark Neo4j record serialization on FDC-shaped records.
+
+Builds in-memory ``Food`` nodes with their ``CONTAINS_NUTRIENT`` relationships
+and ``Nutrient`` nodes using the driver's own graph types. It then measures
+the per-record cost of the previous ``isinstance``-chain converter against the
+type-dispatched :func:`app.db.serializers.serialize_record`. The benchmark also
+times a second pass over already-converted records, which is what the GraphRAG
+services used to pay on every query.
+
+No Neo4j instance is required.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from neo4j.graph import Graph, Node, Relationship
+from neo4j.time import DateTime as GraphDateTime
+
+from app.db.serializers import serialize_record, serialize_value
+
+NUTRIENTS = [
+    (1008, "Energy", "208", "KCAL"),
+    (1003, "Protein", "203", "G"),
+    (1004, "Total lipid (fat)", "204", "G"),
+    (1005, "Carbohydrate, by difference", "205", "G"),
+    (1079, "Fiber, total dietary", "291", "G"),
+    (2000, "Sugars, total including NLEA", "269", "G"),
+    (1087, "Calcium, Ca", "301", "MG"),
+    (1089, "Iron, Fe", "303", "MG"),
+    (1093, "Sodium, Na", "307", "MG"),
+    (1253, "Cholesterol", "601", "MG"),
+    (1258, "Fatty acids, total saturated", "606", "G"),
+    (1257, "Fatty acids, total trans", "605", "G"),
+]
+
+
+class _Record(dict):
+    """Mimics ``neo4j.Record`` closely enough for serialization (``keys`` + item access)."""
+
+
+def _legacy_jsonify(value: Any) -> Any:
+    """The converter ``Neo4jClient._jsonify`` used before the dispatch table."""
+
+    if isinstance(value, (list, tuple, set)):
+        return [_legacy_jsonify(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _legacy_jsonify(val) for key, val in value.items()}
+    if isinstance(value, Node):
+        return {
+            "id": value.element_id,
+            "labels": list(value.labels),
+            "properties": {key: _legacy_jsonify(val) for key, val in dict(value).items()},
+        }
+    if isinstance(value, Relationship):
+        return {
+            "id": value.element_id,
+            "type": value.type,
+            "start": value.start_node.element_id if value.start_node else None,
+            "end": value.end_node.element_id if value.end_node else None,
+            "properties": {key: _legacy_jsonify(val) for key, val in dict(value).items()},
+        }
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, GraphDateTime):
+        return value.iso_format()
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def build_records(food_count: int) -> List[_Record]:
+    graph = Graph()
+    contains = graph.relationship_type("CONTAINS_NUTRIENT")
+    nutrient_nodes = [
+        Node(
+            graph,
+            f"4:bench:n{nutrient_id}",
+            nutrient_id,
+            ["Nutrient"],
+            {"nutrientId": nutrient_id, "nutrientName": name, "nutrientNumber": number, "unitName": unit, "rank": rank},
+        )
+        for rank, (nutrient_id, name, number, unit) in enumerate(NUTRIENTS)
+    ]
+    updated_at = GraphDateTime(2024, 4, 18, 12, 30, 0)
+
+    records: List[_Record] = []
+    for index in range(food_count):
+        food = Node(
+            graph,
+            f"4:bench:f{index}",
+            100_000 + index,
+            ["Food"],
+            {
+                "fdcId": 2_000_000 + index,
+                "description": f"Orange juice, brand {index}",
+                "dataType": "Branded",
+                "foodCategory": "Juices",
+                "brandOwner": "Citrus Co",
+                "gtinUpc": f"0{index:011d}",
+                "ingredients": "ORANGE JUICE, CALCIUM CITRATE, VITAMIN D3",
+                "servingSize": 240.0,
+                "servingSizeUnit": "ml",
+                "publicationDate": "2024-04-18",
+                "updatedAt": updated_at,
+            },
+        )
+        for rank, nutrient in enumerate(nutrient_nodes):
+            rel = contains(
+                graph,
+                f"5:bench:{index}:{rank}",
+                index * 100 + rank,
+                {"value": 1.5 * rank, "unit": nutrient["unitName"], "per100g": 1.5 * rank, "derivationCode": "LCCS"},
+            )
+            rel._start_node = food
+            rel._end_node = nutrient
+            records.append(_Record(f=food, r=rel, n=nutrient))
+    return records
+
+
+def _time_per_record(func: Callable[[Any], Any], records: List[Any], repeats: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for record in records:
+            func(record)
+        samples.append((time.perf_counter() - start) * 1_000_000 / len(records))
+    return samples
+
+
+def run_benchmark(food_count: int, repeats: int) -> Tuple[int, Dict[str, Dict[str, float]]]:
+    records = build_records(food_count)
+    converted = [serialize_record(record) for record in records]
+
+    legacy_raw = _time_per_record(
+        lambda record: {key: _legacy_jsonify(record[key]) for key in record.keys()}, records, repeats
+    )
+    dispatch_raw = _time_per_record(serialize_record, records, repeats)
+    legacy_converted = _time_per_record(_legacy_jsonify, converted, repeats)
+    dispatch_converted = _time_per_record(serialize_value, converted, repeats)
+
+    def summary(samples: List[float]) -> Dict[str, float]:
+        return {"median_us": statistics.median(samples), "min_us": min(samples)}
+
+    return len(records), {
+        "legacy_driver_records": summary(legacy_raw),
+        "dispatch_driver_records": summary(dispatch_raw),
+        "legacy_already_converted": summary(legacy_converted),
+        "dispatch_already_converted": summary(dispatch_converted),
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Neo4j record serialization on FDC-shaped records")
+    parser.add_argument("--foods", type=int, default=500, help="Number of Food nodes to synthesise")
+    parser.add_argument("--repeats", type=int, default=7, help="Timed passes over the record set")
+    parser.add_argument("--output-json", type=Path, help="Optional path to write results as JSON")
+    if argv is None:
+        return parser.parse_args()
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    args = parse_args(argv)
+    record_count, results = run_benchmark(args.foods, args.repeats)
+
+    print("Neo4j Record Serialization")
+    print("==========================")
+    print(f"Records per pass: {record_count} (Food x CONTAINS_NUTRIENT x Nutrient)")
+    for label, payload in results.items():
+        print(f"  {label:<28} median={payload['median_us']:.2f}us/record min={payload['min_us']:.2f}us/record")
+    legacy = results["legacy_driver_records"]["median_us"]
+    dispatch = results["dispatch_driver_records"]["median_us"]
+    if dispatch:
+        print(f"Speed-up on driver records: {legacy / dispatch:.2f}x")
+
+    if args.output_json is not None:
+        output_path = args.output_json.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"record_count": record_count, **results}, indent=2), encoding="utf-8")
+        print(f"Results written to {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
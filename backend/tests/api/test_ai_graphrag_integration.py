@@ -220,6 +220,45 @@ def test_ai_query_endpoint_handles_prompts(prompt: str) -> None:
     assert retrieval_service.requests[-1]["query"] == prompt
 
 
-@pytest.fixture
-def anyio_backend() -> str:
-    return "asyncio"
\ No newline at end of file
+class AsyncNutritionClient:
+    """Async client answering the keyword search and a single formulation's nutrients."""
+
+    def __init__(self) -> None:
+        self.queries: List[str] = []
+
+    async def execute_read(self, query, parameters=None):
+        self.queries.append(query.name)
+        if query.name == "formulation.keyword_ids":
+            return [{"id": "bar"}]
+        if query.name == "nutrition.formulation_nutrients":
+            return [
+                {
+                    "formulation_id": "bar",
+                    "formulation_name": "Oat Bar",
+                    "ingredients": [
+                        {
+                            "name": "Oats",
+                            "percentage": 100.0,
+                            "nutrients": [{"nutrient_name": "Energy", "amount": 389.0, "unit": "KCAL"}],
+                        }
+                    ],
+                }
+            ]
+        raise AssertionError(f"unexpected query {query.name}")
+
+
+def test_nutrition_query_labels_formulations_through_the_async_client() -> None:
+    app = FastAPI()
+    from app.api.endpoints.ai import router as ai_router  # local import to avoid circulars at module import
+
+    app.include_router(ai_router, prefix="/api/ai")
+    neo4j_client = AsyncNutritionClient()
+    app.state.async_neo4j_client = neo4j_client
+    app.state.ollama_service = None
+    app.state.graphrag_retrieval_service = None
+
+    response = TestClient(app).post("/api/ai/nutrition-query", params={"query_text": "oat bar"})
+
+    assert response.status_code == 200
+    assert [label["calories"] for label in response.json()["formulations"]] == [389.0]
+    assert neo4j_client.queries == ["formulation.keyword_ids", "nutrition.formulation_nutrients"]
@@ -0,0 +1,96 @@
+import asyncio
+import sys
+import types
+from pathlib import Path
+from typing import Any, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.api.endpoints import env  # type: ignore[import]
+from app.db.pool_monitor import PoolMonitor, PoolSizeController  # type: ignore[import]
+from app.services.food_resolution import FoodResolver  # type: ignore[import]
+from app.services.nutrient_profiles import NutrientProfileStore  # type: ignore[import]
+
+
+class FakeClient:
+    """Records its constructor options and whether it was closed."""
+
+    def __init__(self, **options: Any) -> None:
+        self.options = options
+        self.closed = False
+        self.pool_monitor = PoolMonitor(10)
+
+    def connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAsyncClient(FakeClient):
+    async def connect(self) -> None:  # type: ignore[override]
+        pass
+
+    async def close(self) -> None:  # type: ignore[override]
+        self.closed = True
+
+
+def test_settings_refresh_replaces_and_closes_both_clients(monkeypatch):
+    monkeypatch.setattr(env, "Neo4jClient", FakeClient)
+    monkeypatch.setattr(env, "AsyncNeo4jClient", FakeAsyncClient)
+    monkeypatch.setattr(env.nutrient_registry, "neo4j_client", None)
+    old_sync, old_async = FakeClient(), FakeAsyncClient()
+    controllers: Dict[str, PoolSizeController] = {
+        "neo4j": PoolSizeController(old_sync.pool_monitor),
+        "neo4j_async": PoolSizeController(old_async.pool_monitor),
+    }
+    state = types.SimpleNamespace(
+        neo4j_client=old_sync,
+        async_neo4j_client=old_async,
+        neo4j_pool_controllers=controllers,
+        nutrient_profile_store=NutrientProfileStore(old_async),
+        food_resolver=FoodResolver(old_async),
+    )
+
+    asyncio.run(env._refresh_neo4j_clients(state))
+
+    new_sync, new_async = state.neo4j_client, state.async_neo4j_client
+    assert isinstance(new_async, FakeAsyncClient) and new_async is not old_async
+    assert new_sync.options == new_async.options
+    assert new_async.options["fetch_size"] == env.settings.NEO4J_FETCH_SIZE
+    assert old_sync.closed and old_async.closed
+    assert controllers["neo4j"].monitor is new_sync.pool_monitor
+    assert controllers["neo4j_async"].monitor is new_async.pool_monitor
+    assert state.nutrient_profile_store.neo4j_client is new_async
+    assert state.food_resolver.neo4j_client is new_async
+    assert env.nutrient_registry.neo4j_client is new_async
+
+
+def test_failed_async_reconnect_keeps_the_existing_async_client(monkeypatch):
+    class FailingAsyncClient(FakeAsyncClient):
+        async def connect(self) -> None:  # type: ignore[override]
+            raise OSError("unreachable")
+
+    monkeypatch.setattr(env, "Neo4jClient", FakeClient)
+    monkeypatch.setattr(env, "AsyncNeo4jClient", FailingAsyncClient)
+    old_sync, old_async = FakeClient(), FakeAsyncClient()
+    monkeypatch.setattr(env.nutrient_registry, "neo4j_client", old_async)
+    pipeline = types.SimpleNamespace(neo4j_client=old_sync)
+    state = types.SimpleNamespace(
+        neo4j_client=old_sync,
+        async_neo4j_client=old_async,
+        formulation_pipeline=pipeline,
+        nutrient_profile_store=NutrientProfileStore(old_async),
+        food_resolver=FoodResolver(old_async),
+    )
+
+    asyncio.run(env._refresh_neo4j_clients(state))
+
+    assert state.neo4j_client is not old_sync and old_sync.closed
+    assert pipeline.neo4j_client is state.neo4j_client
+    assert state.async_neo4j_client is old_async and not old_async.closed
+    assert state.nutrient_profile_store.neo4j_client is old_async
+    assert state.food_resolver.neo4j_client is old_async
+    assert env.nutrient_registry.neo4j_client is old_async
@@ -1,5 +1,8 @@
+import asyncio
 import copy
+import json
 import sys
+import threading
 from datetime import datetime
 from importlib import import_module
 from pathlib import Path
@@ -8,11 +11,15 @@ from typing import Any, Dict, List, Optional
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from neo4j import Bookmarks
+from neo4j.exceptions import ClientError
 
 BACKEND_DIR = Path(__file__).resolve().parents[2]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
+from app.db.causal import CausalContext  # type: ignore[import]
+
 formulations = import_module("app.api.endpoints.formulations")
 pipeline = import_module("app.services.formulation_pipeline")
 
@@ -23,6 +30,10 @@ class FakeNeo4jClient:
     def __init__(self, initial_formulations: Optional[List[Dict[str, Any]]] = None):
         self.formulations: Dict[str, Dict[str, Any]] = {}
         self.captured_queries: List[Dict[str, Any]] = []
+        self.read_queries: List[str] = []
+        self.write_queries: List[str] = []
+        self.read_bookmarks: List[Optional[Bookmarks]] = []
+        self.commit_count = 0
 
         initial_formulations = initial_formulations or []
         for item in initial_formulations:
@@ -58,34 +69,67 @@ class FakeNeo4jClient:
     def __bool__(self) -> bool:  # pragma: no cover - ensure truthiness in the route guard
         return True
 
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None):
+    def execute_query(self, query: Any, parameters: Optional[Dict[str, Any]] = None, *, causal=None):
+        # Named write queries return records from a single write transaction
+        if getattr(query, "is_write", False):
+            self.write_queries.append(query.cypher)
+            records = self._dispatch(query, parameters)
+            self._commit(causal)
+            return records
+        return self._dispatch(query, parameters)
+
+    def _dispatch(self, query: Any, parameters: Optional[Dict[str, Any]] = None):
+        name = getattr(query, "name", None)
+        query = getattr(query, "cypher", query)
         params = parameters or {}
         self.captured_queries.append({"query": query, "params": params})
 
-        if "RETURN f, collect" in query and "MATCH (f:Formulation {id: $id})" in query:
-            formulation_id = params["id"]
-            return self._return_single(formulation_id)
+        if name == "formulation.create":
+            return self._create_formulation(params)
 
-        if "SET f.name = $name" in query and "MATCH (f:Formulation {id: $id})" in query:
+        if name == "formulation.update":
             return self._apply_update(params)
 
-        if "CREATE (f:Formulation" in query and "RETURN f" in query:
-            return self._create_formulation(params)
+        if name == "formulation.list":
+            ordered = sorted(
+                self.formulations,
+                key=lambda key: self.formulations[key]["node"].get("updated_at") or self.formulations[key]["node"]["created_at"],
+                reverse=True,
+            )
+            window = ordered[params["skip"] : params["skip"] + params["limit"]]
+            return [self._return_single(formulation_id)[0] for formulation_id in window]
 
-        if "DELETE rel" in query and "CONTAINS" in query:
-            return self._remove_ingredients(params)
+        if name == "formulation.count":
+            return [{"total": len(self.formulations)}]
 
-        if "MERGE (i:Food" in query and "CREATE (f)-[:CONTAINS" in query:
-            return self._add_ingredient(params)
+        if name == "formulation.create_batch":
+            return [{"id": self._create_formulation(row)[0]["f"]["id"]} for row in params["formulations"]]
 
-        if "SET f.cost_per_kg" in query and "MATCH (f:Formulation {id: $id})" in query:
-            return self._set_cost_metadata(params)
+        if "RETURN f, collect" in query and "MATCH (f:Formulation {id: $id})" in query:
+            formulation_id = params["id"]
+            return self._return_single(formulation_id)
 
         if "DETACH DELETE" in query and "MATCH (f:Formulation {id: $id})" in query:
             return self._delete_formulation(params)
 
         return []
 
+    def execute_read(self, query: Any, parameters: Optional[Dict[str, Any]] = None, *, causal=None):
+        self.read_queries.append(getattr(query, "cypher", query))
+        self.read_bookmarks.append(causal.bookmarks if causal is not None else None)
+        return self._dispatch(query, parameters)
+
+    def execute_write(self, query: Any, parameters: Optional[Dict[str, Any]] = None, *, causal=None):
+        self.write_queries.append(getattr(query, "cypher", query))
+        self._dispatch(query, parameters)
+        self._commit(causal)
+        return {"nodes_created": 0, "relationships_created": 0, "properties_set": 0}
+
+    def _commit(self, causal) -> None:
+        self.commit_count += 1
+        if causal is not None:
+            causal.update(Bookmarks.from_raw_values([f"FB:commit-{self.commit_count}"]))
+
     # Internal helpers -------------------------------------------------
     def _compute_cost_fields(self, percentage: Optional[float], cost_per_kg: Optional[float]) -> tuple[float, float]:
         pct = float(percentage or 0.0)
@@ -118,41 +162,17 @@ class FakeNeo4jClient:
         if not stored:
             return []
 
-        stored["node"]["name"] = params.get("name")
-        stored["node"]["description"] = params.get("description")
-        stored["node"]["status"] = params.get("status")
+        stored["node"].update(params.get("fields") or {})
         stored["node"]["updated_at"] = params.get("updated_at")
-        return [{"f": stored["node"]}]
-
-    def _remove_ingredients(self, params: Dict[str, Any]):
-        formulation_id = params["id"]
-        stored = self.formulations.get(formulation_id)
-        if stored:
-            stored["ingredients"] = []
-        return []
-
-    def _add_ingredient(self, params: Dict[str, Any]):
-        formulation_id = params["form_id"]
-        stored = self.formulations.get(formulation_id)
-        if not stored:
-            return []
-
-        quantity_kg = params.get("quantity_kg")
-        cost_reference = params.get("cost_reference")
-        if quantity_kg is None or cost_reference is None:
-            quantity_kg, cost_reference = self._compute_cost_fields(params.get("percentage"), params.get("cost_per_kg"))
-
-        stored["ingredients"].append(
-            {
-                "name": params.get("name"),
-                "percentage": params.get("percentage", 0.0),
-                "cost_per_kg": params.get("cost_per_kg", 0.0),
-                "function": params.get("function", "unspecified"),
-                "quantity_kg": quantity_kg,
-                "cost_reference": cost_reference,
-            }
-        )
-        return []
+        if params.get("ingredients") is not None:
+            self._replace_ingredients(stored, params["ingredients"])
+        return self._return_single(formulation_id)
+
+    def _replace_ingredients(self, stored: Dict[str, Any], rows: List[Dict[str, Any]]) -> None:
+        stored["ingredients"] = [copy.deepcopy(row) for row in rows]
+        stored["node"]["cost_per_kg"] = sum(row["cost_reference"] for row in rows)
+        stored["node"]["cost_basis_kg"] = 1.0
+        stored["node"]["cost_updated_at"] = datetime.utcnow().isoformat()
 
     def _delete_formulation(self, params: Dict[str, Any]):
         formulation_id = params["id"]
@@ -168,23 +188,11 @@ class FakeNeo4jClient:
             "status": params.get("status", "draft"),
             "created_at": params.get("created_at"),
             "updated_at": None,
-            "cost_per_kg": 0.0,
-            "cost_basis_kg": 1.0,
-            "cost_updated_at": datetime.utcnow().isoformat(),
         }
-        self.formulations[formulation_id] = {"node": node, "ingredients": []}
-        return [{"f": node, "ingredients": []}]
-
-    def _set_cost_metadata(self, params: Dict[str, Any]):
-        formulation_id = params["id"]
-        stored = self.formulations.get(formulation_id)
-        if not stored:
-            return []
-
-        stored["node"]["cost_per_kg"] = params.get("cost_per_kg", 0.0)
-        stored["node"]["cost_basis_kg"] = params.get("cost_basis_kg", 1.0)
-        stored["node"]["cost_updated_at"] = datetime.utcnow().isoformat()
-        return [{"f": stored["node"]}]
+        stored = {"node": node, "ingredients": []}
+        self._replace_ingredients(stored, params.get("ingredients") or [])
+        self.formulations[formulation_id] = stored
+        return self._return_single(formulation_id)
 
 
 def build_test_app(fake_client: FakeNeo4jClient) -> FastAPI:
@@ -357,6 +365,246 @@ def test_delete_formulation_removes_node(api_client, fake_neo4j_client):
     assert response.status_code == 200
     assert response.json()["detail"] == "Formulation form-123 deleted"
     assert "form-123" not in fake_neo4j_client.formulations
+    assert any("DETACH DELETE" in query for query in fake_neo4j_client.write_queries)
+    assert not any("DETACH DELETE" in query for query in fake_neo4j_client.read_queries)
 
     follow_up = api_client.get("/formulations/form-123")
-    assert follow_up.status_code == 404
\ No newline at end of file
+    assert follow_up.status_code == 404
+
+
+def test_writes_return_a_bookmark_that_later_reads_wait_for(api_client, fake_neo4j_client):
+    update = api_client.put("/formulations/form-123", json={"name": "Renamed"})
+
+    assert update.status_code == 200
+    token = update.headers["X-Neo4j-Bookmark"]
+    commits = fake_neo4j_client.commit_count
+
+    reads_before = len(fake_neo4j_client.read_queries)
+    response = api_client.get("/formulations/form-123", headers={"X-Neo4j-Bookmark": token})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    # A bookmarked GET skips the cache that the update just primed
+    assert len(fake_neo4j_client.read_queries) == reads_before + 1
+    assert fake_neo4j_client.read_bookmarks[-1].raw_values == {f"FB:commit-{commits}"}
+
+
+def test_malformed_bookmark_header_is_rejected(api_client):
+    response = api_client.get("/formulations/form-123", headers={"X-Neo4j-Bookmark": "not*a*token"})
+
+    assert response.status_code == 400
+
+
+class InvalidBookmark(ClientError):
+    code = "Neo.ClientError.Transaction.InvalidBookmark"
+
+
+def test_bookmark_rejected_by_the_server_is_a_client_error(api_client, fake_neo4j_client, monkeypatch):
+    def reject(*args: Any, **kwargs: Any):
+        raise InvalidBookmark("Supplied bookmark [FB:unknown] does not conform to pattern")
+
+    monkeypatch.setattr(fake_neo4j_client, "execute_read", reject)
+    monkeypatch.setattr(fake_neo4j_client, "execute_query", reject)
+    token = CausalContext(["FB:unknown"]).token()
+
+    fetched = api_client.get("/formulations/form-123", headers={"X-Neo4j-Bookmark": token})
+    updated = api_client.put("/formulations/form-123", json={"name": "Renamed"}, headers={"X-Neo4j-Bookmark": token})
+
+    assert (fetched.status_code, updated.status_code) == (400, 400)
+    assert fetched.json()["detail"] == "Invalid X-Neo4j-Bookmark header"
+
+
+def test_operations_run_on_the_pipeline_executor(api_client, fake_neo4j_client, monkeypatch):
+    threads: List[str] = []
+    original = fake_neo4j_client.execute_read
+
+    def recording_read(*args: Any, **kwargs: Any):
+        threads.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(fake_neo4j_client, "execute_read", recording_read)
+
+    response = api_client.get("/formulations/form-123")
+
+    assert response.status_code == 200
+    assert threads and all(name.startswith("formulation-pipeline") for name in threads)
+
+
+def test_saturated_pipeline_sheds_excess_operations(fake_neo4j_client):
+    service = pipeline.FormulationPipelineService(
+        fake_neo4j_client,
+        max_retries=1,
+        max_concurrency=1,
+        max_queue_depth=1,
+        queue_timeout_seconds=0.05,
+    )
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(service._execute_with_retry(lambda: release.wait(5), kind="test"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(service.get("form-123"))
+        # The get runs as a single-flight task, one loop turn later
+        await asyncio.sleep(0.01)
+        assert service.load() == {"max_concurrency": 1, "in_flight": 1, "queued": 1, "max_queue_depth": 1}
+
+        # The queue is full: a third caller is rejected without waiting
+        with pytest.raises(pipeline.FormulationPipelineSaturatedError):
+            await service.list()
+        # The queued caller gives up once its queue timeout elapses
+        with pytest.raises(pipeline.FormulationPipelineSaturatedError):
+            await waiter
+
+        release.set()
+        await blocker
+        return await service.get("form-123")
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        release.set()
+        service.shutdown()
+
+    assert result is not None and result.id == "form-123"
+    assert pipeline.PIPELINE_REJECTIONS.value("list", "queue_full") >= 1
+    assert pipeline.PIPELINE_REJECTIONS.value("get", "queue_timeout") >= 1
+    assert service.load()["in_flight"] == 0
+
+
+def test_saturated_pipeline_maps_to_503_with_retry_after(api_client, monkeypatch):
+    service = api_client.app.state.formulation_pipeline
+
+    async def saturated(*args: Any, **kwargs: Any):
+        raise pipeline.FormulationPipelineSaturatedError("busy", retry_after=2.5)
+
+    monkeypatch.setattr(service, "get", saturated)
+
+    response = api_client.get("/formulations/form-123")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_create_and_update_each_run_as_one_write_transaction(api_client, fake_neo4j_client):
+    ingredients = [{"name": f"Ingredient {index}", "percentage": 10.0, "cost_per_kg": 1.0} for index in range(10)]
+
+    created = api_client.post("/formulations", json={"name": "Ten Part Blend", "ingredients": ingredients})
+    assert created.status_code == 201
+    assert len(created.json()["ingredients"]) == 10
+
+    renamed = api_client.put(f"/formulations/{created.json()['id']}", json={"name": "Renamed Blend"})
+    assert renamed.status_code == 200
+    assert renamed.json()["name"] == "Renamed Blend"
+    assert len(renamed.json()["ingredients"]) == 10
+
+    assert fake_neo4j_client.commit_count == 2
+    assert fake_neo4j_client.read_queries == []
+    update_params = fake_neo4j_client.captured_queries[-1]["params"]
+    assert update_params["fields"] == {"name": "Renamed Blend"}
+    assert update_params["ingredients"] is None
+
+
+def test_update_of_missing_formulation_returns_404(api_client):
+    response = api_client.put("/formulations/missing", json={"name": "Ghost"})
+
+    assert response.status_code == 404
+
+
+def test_list_rejects_malformed_or_mixed_pagination(api_client):
+    assert api_client.get("/formulations", params={"cursor": "not a cursor!"}).status_code == 400
+    assert api_client.get("/formulations", params={"cursor": "WyJhIiwiYiJd", "skip": 5}).status_code == 400
+
+
+def test_bulk_import_writes_valid_rows_in_batches_and_reports_bad_ones(api_client, fake_neo4j_client, monkeypatch):
+    monkeypatch.setattr(formulations.settings, "FORMULATION_BULK_BATCH_SIZE", 2)
+    water = [{"name": "Water", "percentage": 100.0, "cost_per_kg": 0.5}]
+    lines = [
+        json.dumps({"name": "Bulk One", "ingredients": water}),
+        json.dumps({"name": "Bulk Two", "ingredients": water}),
+        "{not json",
+        json.dumps({"name": "Short", "ingredients": [{"name": "Water", "percentage": 60.0}]}),
+        "",
+        json.dumps({"name": "Bulk Three", "ingredients": water}),
+    ]
+
+    response = api_client.post(
+        "/formulations/bulk",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"], body["batches"]) == (3, 2, 2)
+    assert [error["line"] for error in body["errors"]] == [3, 4]
+    assert body["errors"][1]["name"] == "Short"
+    assert body["aborted"] is None
+    assert fake_neo4j_client.commit_count == 2
+    assert {fake_neo4j_client.formulations[item]["node"]["name"] for item in body["ids"]} == {
+        "Bulk One",
+        "Bulk Two",
+        "Bulk Three",
+    }
+
+
+def test_bulk_import_groups_csv_rows_by_name(api_client, fake_neo4j_client):
+    body = "\n".join(
+        [
+            "name,description,ingredient,percentage,cost_per_kg",
+            "Lemonade,Classic,Water,90,0.1",
+            "Lemonade,Classic,Lemon juice,10,3",
+            "Broken,,Water,150,",
+        ]
+    )
+
+    response = api_client.post("/formulations/bulk", content=body.encode(), headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["created"], summary["failed"]) == (1, 1)
+    assert summary["errors"][0]["line"] == 4
+    stored = fake_neo4j_client.formulations[summary["ids"][0]]
+    assert stored["node"]["description"] == "Classic"
+    assert [ingredient["name"] for ingredient in stored["ingredients"]] == ["Water", "Lemon juice"]
+
+
+def test_bulk_import_rejects_unknown_content_types(api_client):
+    response = api_client.post("/formulations/bulk", json=[{"name": "Nope"}])
+
+    assert response.status_code == 415
+
+
+def test_get_answers_matching_if_none_match_with_304_from_cache(api_client, fake_neo4j_client):
+    first = api_client.get("/formulations/form-123")
+    etag = first.headers["ETag"]
+    reads = len(fake_neo4j_client.read_queries)
+
+    repeat = api_client.get("/formulations/form-123", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["ETag"] == etag
+    assert len(fake_neo4j_client.read_queries) == reads
+
+    api_client.put("/formulations/form-123", json={"name": "Renamed Smoothie"})
+    changed = api_client.get("/formulations/form-123", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Renamed Smoothie"
+    assert changed.headers["ETag"] != etag
+    assert api_client.get("/formulations/form-123", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_list_page_etag_changes_only_when_the_page_does(api_client, fake_neo4j_client):
+    first = api_client.get("/formulations", params={"limit": 10})
+    etag = first.headers["ETag"]
+    assert first.json()["total_count"] == 1
+    reads = len(fake_neo4j_client.read_queries)
+
+    repeat = api_client.get("/formulations", params={"limit": 10}, headers={"If-None-Match": f'W/"other", {etag}'})
+    assert repeat.status_code == 304
+    assert len(fake_neo4j_client.read_queries) == reads
+
+    api_client.put("/formulations/form-123", json={"description": "Now with oats"})
+    changed = api_client.get("/formulations", params={"limit": 10}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["formulations"][0]["description"] == "Now with oats"
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from neo4j.exceptions import ServiceUnavailable
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.api.endpoints.graph import router as graph_router  # type: ignore[import]
+from app.core.config import settings  # type: ignore[import]
+from app.core.rate_limit import limiter  # type: ignore[import]
+from app.db.neo4j_client import AsyncNeo4jClient  # type: ignore[import]
+
+
+class StubAsyncNeo4jClient(AsyncNeo4jClient):
+    """Async client whose execute_read serves export pages from canned rows."""
+
+    def __init__(self, rows: List[Dict[str, Any]], *, fail: bool = False) -> None:
+        super().__init__("bolt://localhost:7687", "neo4j", "secret")
+        self.rows = rows
+        self.fail = fail
+        self.calls: List[Dict[str, Any]] = []
+
+    async def execute_read(self, query, parameters=None, *, causal=None):
+        self.calls.append(dict(parameters or {}))
+        if self.fail:
+            raise ServiceUnavailable("connection lost")
+        after = parameters.get("after")
+        page = [row for row in self.rows if after is None or row["n"]["id"] > after]
+        return page[: parameters["limit"]]
+
+
+def _row(node_id: str, degree: int = 0) -> Dict[str, Any]:
+    return {
+        "n": {"id": node_id, "labels": ["Food"], "properties": {"name": node_id}},
+        "links": [],
+        "degree": degree,
+    }
+
+
+def build_test_client(neo4j_client: Optional[StubAsyncNeo4jClient]) -> TestClient:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.state.async_neo4j_client = neo4j_client
+    app.include_router(graph_router, prefix="/api/graph")
+    return TestClient(app)
+
+
+def test_export_walks_all_pages_with_cursor():
+    neo4j_client = StubAsyncNeo4jClient([_row(f"4:a:{index}") for index in range(5)])
+    client = build_test_client(neo4j_client)
+
+    seen: List[str] = []
+    cursor = None
+    for _ in range(5):
+        params: Dict[str, Any] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/graph/export", params=params)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(node["id"] for node in body["nodes"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"4:a:{index}" for index in range(5)]
+    assert len(neo4j_client.calls) == 3
+
+
+def test_export_passes_label_filter_and_degree_cap():
+    neo4j_client = StubAsyncNeo4jClient([_row("4:a:1", degree=400)])
+    client = build_test_client(neo4j_client)
+
+    response = client.get("/api/graph/export", params=[("label", "Nutrient"), ("label", "Food"), ("degree_cap", 10)])
+
+    assert response.status_code == 200
+    assert response.json()["truncated_nodes"] == [{"id": "4:a:1", "degree": 400}]
+    assert neo4j_client.calls[0]["labels"] == ["Food", "Nutrient"]
+    assert neo4j_client.calls[0]["degree_cap"] == 10
+
+
+def test_export_uses_configured_degree_cap_by_default():
+    neo4j_client = StubAsyncNeo4jClient([])
+    client = build_test_client(neo4j_client)
+
+    response = client.get("/api/graph/export")
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
+    assert neo4j_client.calls[0]["degree_cap"] == settings.GRAPH_EXPORT_DEGREE_CAP
+
+
+def test_export_rejects_malformed_cursor():
+    client = build_test_client(StubAsyncNeo4jClient([]))
+
+    response = client.get("/api/graph/export", params={"cursor": "not a cursor!"})
+
+    assert response.status_code == 400
+
+
+def test_export_maps_neo4j_outage_to_503():
+    client = build_test_client(StubAsyncNeo4jClient([], fail=True))
+
+    response = client.get("/api/graph/export")
+
+    assert response.status_code == 503
@@ -0,0 +1,111 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from neo4j.exceptions import ServiceUnavailable
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.api.endpoints.graph import router as graph_router  # type: ignore[import]
+from app.core.rate_limit import limiter  # type: ignore[import]
+from app.db.neo4j_client import AsyncNeo4jClient  # type: ignore[import]
+
+
+class StubAsyncNeo4jClient(AsyncNeo4jClient):
+    """Async client whose stream_query replays canned rows instead of hitting Bolt."""
+
+    def __init__(self, rows: List[Dict[str, Any]], *, fail_after: Optional[int] = None) -> None:
+        super().__init__("bolt://localhost:7687", "neo4j", "secret")
+        self.rows = rows
+        self.fail_after = fail_after
+        self.queries: List[Dict[str, Any]] = []
+
+    async def stream_query(self, query, parameters=None, *, fetch_size=None):
+        self.queries.append({"query": query, "parameters": parameters or {}})
+        for index, row in enumerate(self.rows):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise ServiceUnavailable("connection lost")
+            yield row
+
+
+def _node(node_id: str, label: str, name: str) -> Dict[str, Any]:
+    return {"id": node_id, "labels": [label], "properties": {"name": name}}
+
+
+def _rel(start: str, end: str) -> Dict[str, Any]:
+    return {"id": f"{start}->{end}", "type": "CONTAINS", "start": start, "end": end, "properties": {}}
+
+
+ROWS = [
+    {"n": _node("1", "Formulation", "Cola"), "r": _rel("1", "2"), "m": _node("2", "Food", "Sugar")},
+    {"n": _node("1", "Formulation", "Cola"), "r": _rel("1", "3"), "m": _node("3", "Food", "Water")},
+    {"n": _node("2", "Food", "Sugar"), "r": None, "m": None},
+]
+
+
+def build_test_client(neo4j_client: Optional[StubAsyncNeo4jClient]) -> TestClient:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.state.async_neo4j_client = neo4j_client
+    app.include_router(graph_router, prefix="/api/graph")
+    return TestClient(app)
+
+
+def _read_lines(response) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_stream_emits_each_node_once_before_its_edges():
+    client = build_test_client(StubAsyncNeo4jClient(ROWS))
+
+    response = client.get("/api/graph/data/stream", params={"limit": 50})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _read_lines(response)
+    assert [line["kind"] for line in lines] == ["node", "node", "edge", "node", "edge", "summary"]
+    assert [line["id"] for line in lines if line["kind"] == "node"] == ["1", "2", "3"]
+    assert lines[2] == {"kind": "edge", "source": "1", "target": "2", "type": "CONTAINS", "properties": {}}
+    assert lines[-1] == {"kind": "summary", "node_count": 3, "edge_count": 2}
+
+
+def test_stream_caps_limit_at_configured_maximum(monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.GRAPH_STREAM_MAX_ROWS", 2)
+    stub = StubAsyncNeo4jClient(ROWS)
+    client = build_test_client(stub)
+
+    client.get("/api/graph/data/stream", params={"limit": 10_000})
+
+    assert stub.queries[0]["parameters"] == {"limit": 2}
+
+
+def test_stream_reports_interruption_in_band():
+    client = build_test_client(StubAsyncNeo4jClient(ROWS, fail_after=1))
+
+    response = client.get("/api/graph/data/stream")
+
+    assert response.status_code == 200
+    lines = _read_lines(response)
+    assert lines[-1]["kind"] == "error"
+    assert all(line["kind"] != "summary" for line in lines)
+
+
+def test_stream_returns_503_when_first_fetch_fails():
+    client = build_test_client(StubAsyncNeo4jClient(ROWS, fail_after=0))
+
+    response = client.get("/api/graph/data/stream")
+
+    assert response.status_code == 503
+
+
+def test_stream_requires_connected_client():
+    client = build_test_client(None)
+
+    response = client.get("/api/graph/data/stream")
+
+    assert response.status_code == 503
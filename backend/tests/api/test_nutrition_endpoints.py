@@ -0,0 +1,181 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from neo4j.exceptions import ServiceUnavailable
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.api.endpoints.nutrition import _labels_ndjson  # type: ignore[import]
+from app.api.endpoints.nutrition import router as nutrition_router  # type: ignore[import]
+from app.core.rate_limit import limiter  # type: ignore[import]
+from app.services.nutrition_service import (  # type: ignore[import]
+    NutritionCalculationService,
+    NutritionLabelRequest,
+    NutritionLabelResult,
+)
+
+
+def _nutrients(energy: float, protein: float, sodium: float) -> List[Dict[str, Any]]:
+    return [
+        {"nutrient_name": "Energy", "amount": energy, "unit": "kcal", "per100g": True},
+        {"nutrient_name": "Protein", "amount": protein, "unit": "g", "per100g": True},
+        {"nutrient_name": "Sodium, Na", "amount": sodium, "unit": "mg", "per100g": True},
+    ]
+
+
+GRAPH = {
+    "f1": {
+        "formulation_id": "f1",
+        "formulation_name": "Peanut Bar",
+        "ingredients": [
+            {"name": "Peanuts", "percentage": 60.0, "nutrients": _nutrients(567, 25.8, 18)},
+            {"name": "Honey", "percentage": 40.0, "nutrients": _nutrients(304, 0.3, 4)},
+        ],
+    },
+    # Linked in the graph but without nutrient rows, so labels need the fallback lookup
+    "f2": {
+        "formulation_id": "f2",
+        "formulation_name": "Salted Water",
+        "ingredients": [{"name": "Salt", "percentage": 1.0, "nutrients": []}],
+    },
+}
+
+
+class FakeNutritionClient:
+    """Answers the nutrition queries by name from GRAPH."""
+
+    def __init__(self, *, fail_batch: bool = False) -> None:
+        self.fail_batch = fail_batch
+        self.queries: List[Dict[str, Any]] = []
+
+    async def execute_read(self, query, parameters=None):
+        self.queries.append({"name": query.name, "parameters": parameters or {}})
+        if query.name == "nutrition.formulations_nutrients":
+            if self.fail_batch:
+                raise ServiceUnavailable("connection lost")
+            return [GRAPH[fid] for fid in parameters["formulation_ids"] if fid in GRAPH]
+        if query.name == "nutrition.formulation_nutrients":
+            record = GRAPH.get(parameters["formulation_id"])
+            return [record] if record else []
+        if query.name == "nutrition.formulation_header":
+            record = GRAPH.get(parameters["formulation_id"])
+            return [{"id": record["formulation_id"], "name": record["formulation_name"]}] if record else []
+        if query.name == "nutrition.formulation_ingredients":
+            return [{"ingredient_name": "Salt", "percentage": 1.0, "food_fdc_id": 746775}]
+        if query.name == "nutrition.foods_nutrients":
+            assert parameters["fdc_ids"] == [746775]
+            return [{"fdc_id": 746775, "nutrient_name": "Sodium, Na", "amount": 38758, "unit": "mg", "per100g": True}]
+        raise AssertionError(f"unexpected query {query.name}")
+
+
+def build_test_client(neo4j_client: Optional[FakeNutritionClient]) -> TestClient:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.state.async_neo4j_client = neo4j_client
+    app.include_router(nutrition_router, prefix="/api/formulations")
+    return TestClient(app)
+
+
+def _read_lines(response) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_labels_share_one_graph_query_and_match_single_labels():
+    client_stub = FakeNutritionClient()
+    client = build_test_client(client_stub)
+
+    response = client.post(
+        "/api/formulations/nutrition-labels",
+        json={
+            "labels": [
+                {"formulation_id": "f1", "serving_size": 40},
+                {"formulation_id": "missing"},
+                {"formulation_id": "f2", "serving_size": 250, "serving_size_unit": "ml"},
+                {"formulation_id": "f1", "serving_size": 100, "servings_per_container": 2},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _read_lines(response)
+    assert [(line["kind"], line.get("index")) for line in lines] == [
+        ("label", 0),
+        ("label", 3),
+        ("error", 1),
+        ("label", 2),
+        ("summary", None),
+    ]
+    assert lines[2] == {"kind": "error", "index": 1, "formulation_id": "missing", "detail": "Formulation missing not found"}
+    assert lines[-1] == {"kind": "summary", "label_count": 3, "error_count": 1}
+    assert lines[3]["nutrients"]["sodium"]["amount"] == round(38758 * 0.01 * 2.5, 0)
+
+    batch_queries = [query for query in client_stub.queries if query["name"] == "nutrition.formulations_nutrients"]
+    assert batch_queries == [
+        {"name": "nutrition.formulations_nutrients", "parameters": {"formulation_ids": ["f1", "missing", "f2"]}}
+    ]
+    assert not any(query["name"] == "nutrition.formulation_nutrients" for query in client_stub.queries)
+
+    single = client.post("/api/formulations/f1/nutrition-label", params={"serving_size": 40})
+    assert single.status_code == 200
+    assert {key: value for key, value in lines[0].items() if key not in {"kind", "index"}} == single.json()
+
+
+def test_batch_rejects_more_labels_than_configured(monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.NUTRITION_LABEL_BATCH_MAX_ITEMS", 2)
+    client = build_test_client(FakeNutritionClient())
+
+    response = client.post(
+        "/api/formulations/nutrition-labels",
+        json={"labels": [{"formulation_id": "f1"}] * 3},
+    )
+
+    assert response.status_code == 413
+
+
+def test_batch_query_outage_is_reported_before_streaming():
+    client = build_test_client(FakeNutritionClient(fail_batch=True))
+
+    response = client.post("/api/formulations/nutrition-labels", json={"labels": [{"formulation_id": "f1"}]})
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Neo4j database unavailable"
+
+
+def test_batch_query_runs_before_an_invalid_first_item_is_yielded():
+    client_stub = FakeNutritionClient(fail_batch=True)
+    service = NutritionCalculationService(client_stub)
+    results = service.calculate_nutrition_labels(
+        [NutritionLabelRequest("f1", 0.0, "g", None), NutritionLabelRequest("f1", 100.0, "g", None)]
+    )
+
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(results.__anext__())
+    assert [query["name"] for query in client_stub.queries] == ["nutrition.formulations_nutrients"]
+
+
+def test_outage_after_streaming_starts_is_reported_in_band():
+    request = NutritionLabelRequest("f1", 0.0, "g", 1.0)
+
+    async def results():
+        yield NutritionLabelResult(1, request, error="Serving size must be greater than zero")
+        raise ServiceUnavailable("connection lost")
+
+    async def collect():
+        stream = results()
+        first = await stream.__anext__()
+        return [json.loads(line) async for line in _labels_ndjson(first, stream)]
+
+    lines = asyncio.run(collect())
+
+    assert [line["kind"] for line in lines] == ["error", "error", "summary"]
+    assert lines[1] == {"kind": "error", "detail": "connection lost"}
+    assert lines[2] == {"kind": "summary", "label_count": 0, "error_count": 1}
@@ -0,0 +1,452 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable, TransientError
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from neo4j import READ_ACCESS, Bookmarks
+
+from app.db import queries  # type: ignore[import]
+from app.db.causal import CausalContext  # type: ignore[import]
+from app.db.query_metrics import QUERY_DB_HITS  # type: ignore[import]
+from app.db.neo4j_client import (  # type: ignore[import]
+    DEFAULT_EXPORT_DEGREE_CAP,
+    AsyncNeo4jClient,
+    Neo4jBatchWriteError,
+    Neo4jClient,
+)
+
+
+class FakeRecord:
+    def __init__(self, values: Dict[str, Any]) -> None:
+        self._values = values
+
+    def keys(self):
+        return list(self._values.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+
+class FakeCounters:
+    nodes_created = 1
+    relationships_created = 2
+    properties_set = 3
+
+
+class FakeSummary:
+    counters = FakeCounters()
+
+
+class FakeAsyncResult:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = [FakeRecord(row) for row in rows]
+
+    def __aiter__(self):
+        self._iter = iter(self._rows)
+        return self
+
+    async def __anext__(self) -> FakeRecord:
+        try:
+            return next(self._iter)
+        except StopIteration as exc:
+            raise StopAsyncIteration from exc
+
+    async def consume(self) -> FakeSummary:
+        return FakeSummary()
+
+
+class FakeAsyncSession:
+    def __init__(self, driver: "FakeAsyncDriver", config: Dict[str, Any]) -> None:
+        self._driver = driver
+        self.config = config
+
+    async def __aenter__(self) -> "FakeAsyncSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> FakeAsyncResult:
+        self._driver.calls.append({"query": query, "parameters": parameters or {}, "config": self.config})
+        return FakeAsyncResult(self._driver.rows)
+
+    async def execute_read(self, work, *args: Any) -> Any:
+        self._driver.transactions.append("read")
+        return await work(self, *args)
+
+    async def execute_write(self, work, *args: Any) -> Any:
+        self._driver.transactions.append("write")
+        return await work(self, *args)
+
+
+class FakeAsyncDriver:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+        self.calls: List[Dict[str, Any]] = []
+        self.transactions: List[str] = []
+
+    def session(self, **config: Any) -> FakeAsyncSession:
+        return FakeAsyncSession(self, config)
+
+
+class FakeResult:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = [FakeRecord(row) for row in rows]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def consume(self) -> FakeSummary:
+        return FakeSummary()
+
+
+class FakeSession:
+    """Session double that replays managed-transaction work like the driver does."""
+
+    def __init__(self, driver: "FakeDriver", config: Dict[str, Any]) -> None:
+        self._driver = driver
+        self.config = config
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> FakeResult:
+        self._driver.calls.append({"query": query, "parameters": parameters or {}, "config": self.config})
+        failure = self._driver.failures.pop(0) if self._driver.failures else None
+        if failure is not None:
+            raise failure
+        return FakeResult(self._driver.rows)
+
+    def _retrying(self, kind: str, work, *args: Any) -> Any:
+        self._driver.transactions.append(kind)
+        while True:
+            try:
+                return work(self, *args)
+            except TransientError:
+                continue
+
+    def execute_read(self, work, *args: Any) -> Any:
+        return self._retrying("read", work, *args)
+
+    def last_bookmarks(self) -> Bookmarks:
+        return Bookmarks.from_raw_values([f"FB:{len(self._driver.calls)}"])
+
+    def execute_write(self, work, *args: Any) -> Any:
+        return self._retrying("write", work, *args)
+
+
+class FakeDriver:
+    def __init__(self, rows: List[Dict[str, Any]], failures: Optional[List[Exception]] = None) -> None:
+        self.rows = rows
+        self.failures = list(failures or [])
+        self.calls: List[Dict[str, Any]] = []
+        self.transactions: List[str] = []
+
+    def session(self, **config: Any) -> FakeSession:
+        return FakeSession(self, config)
+
+
+def build_client(rows: List[Dict[str, Any]], failures: Optional[List[Exception]] = None) -> Neo4jClient:
+    client = Neo4jClient("bolt://localhost:7687", "neo4j", "secret", database="graph")
+    client.driver = FakeDriver(rows, failures)  # type: ignore[assignment]
+    return client
+
+
+def build_async_client(rows: List[Dict[str, Any]]) -> AsyncNeo4jClient:
+    client = AsyncNeo4jClient("bolt://localhost:7687", "neo4j", "secret", database="graph")
+    client.driver = FakeAsyncDriver(rows)  # type: ignore[assignment]
+    return client
+
+
+def test_async_execute_query_jsonifies_records():
+    client = build_async_client([{"name": "Sugar", "tags": ("sweet", "dry")}])
+
+    records = asyncio.run(client.execute_query("MATCH (n) RETURN n.name AS name", {"limit": 1}))
+
+    assert records == [{"name": "Sugar", "tags": ["sweet", "dry"]}]
+    call = client.driver.calls[0]  # type: ignore[union-attr]
+    assert call["parameters"] == {"limit": 1}
+    assert call["config"]["database"] == "graph"
+
+
+def test_async_execute_write_returns_counters():
+    client = build_async_client([])
+
+    summary = asyncio.run(client.execute_write("CREATE (n:Test)"))
+
+    assert summary == {"nodes_created": 1, "relationships_created": 2, "properties_set": 3}
+
+
+def _export_row(node_id: str, label: str, links: List[Tuple[str, str]], degree: Optional[int] = None):
+    return {
+        "n": {"id": node_id, "labels": [label], "properties": {"name": node_id}},
+        "links": [
+            {
+                "r": {"id": rel_id, "type": "CONTAINS", "start": node_id, "end": end_id, "properties": {}},
+                "m": {"id": end_id, "labels": ["Food"], "properties": {"name": end_id}},
+            }
+            for rel_id, end_id in links
+        ],
+        "degree": len(links) if degree is None else degree,
+    }
+
+
+def test_async_get_graph_data_builds_nodes_and_edges():
+    rows = [_export_row("4:a:1", "Formulation", [("5:a:1", "4:a:2")])]
+    client = build_async_client(rows)
+
+    payload = asyncio.run(client.get_graph_data(limit=10_000))
+
+    assert [node["id"] for node in payload["nodes"]] == ["4:a:1", "4:a:2"]
+    assert payload["edges"] == [
+        {"id": "5:a:1", "source": "4:a:1", "target": "4:a:2", "type": "CONTAINS", "properties": {}}
+    ]
+    parameters = client.driver.calls[0]["parameters"]  # type: ignore[union-attr]
+    assert parameters == {"after": None, "labels": None, "limit": 500, "degree_cap": DEFAULT_EXPORT_DEGREE_CAP}
+
+
+def test_export_subgraph_pages_with_element_id_cursor():
+    rows = [
+        _export_row("4:a:1", "Formulation", [("5:a:1", "4:a:3"), ("5:a:2", "4:a:4")], degree=9),
+        _export_row("4:a:3", "Food", []),
+    ]
+    client = build_client(rows)
+
+    page = client.export_subgraph(limit=2, labels=["Food", "Formulation", "Food"], degree_cap=2)
+
+    assert [node["id"] for node in page["nodes"]] == ["4:a:1", "4:a:3", "4:a:4"]
+    assert [edge["id"] for edge in page["edges"]] == ["5:a:1", "5:a:2"]
+    assert page["truncated_nodes"] == [{"id": "4:a:1", "degree": 9}]
+    assert client.decode_export_cursor(page["next_cursor"]) == "4:a:3"
+    parameters = client.driver.calls[0]["parameters"]  # type: ignore[union-attr]
+    assert parameters["labels"] == ["Food", "Formulation"]
+    assert client.driver.transactions == ["read"]  # type: ignore[union-attr]
+
+    client.export_subgraph(limit=2, cursor=page["next_cursor"])
+    assert client.driver.calls[1]["parameters"]["after"] == "4:a:3"  # type: ignore[union-attr]
+
+
+def test_export_subgraph_last_page_has_no_cursor():
+    client = build_client([_export_row("4:a:9", "Food", [])])
+
+    page = client.export_subgraph(limit=5)
+
+    assert page["next_cursor"] is None
+    assert page["truncated_nodes"] == []
+
+
+def test_export_subgraph_rejects_malformed_cursor():
+    client = build_client([])
+
+    with pytest.raises(ValueError, match="Malformed export cursor"):
+        client.export_subgraph(cursor="%%%")
+
+
+def test_async_client_requires_connection():
+    client = AsyncNeo4jClient("bolt://localhost:7687", "neo4j", "secret")
+
+    with pytest.raises(RuntimeError, match="not initialized"):
+        asyncio.run(client.execute_query("RETURN 1"))
+
+
+def test_execute_read_uses_managed_read_transaction():
+    client = build_client([{"name": "Sugar"}])
+
+    records = client.execute_read("MATCH (n) RETURN n.name AS name", {"limit": 1})
+
+    assert records == [{"name": "Sugar"}]
+    assert client.driver.transactions == ["read"]  # type: ignore[union-attr]
+    config = client.driver.calls[0]["config"]  # type: ignore[union-attr]
+    assert config["default_access_mode"] == READ_ACCESS
+    assert config["database"] == "graph"
+
+
+def test_execute_write_is_retried_by_the_driver_on_transient_errors():
+    failure = TransientError("Neo.TransientError.Transaction.DeadlockDetected", "deadlock")
+    client = build_client([], failures=[failure])
+
+    summary = client.execute_write("CREATE (n:Test)")
+
+    assert summary == {"nodes_created": 1, "relationships_created": 2, "properties_set": 3}
+    assert client.driver.transactions == ["write"]  # type: ignore[union-attr]
+    assert len(client.driver.calls) == 2  # type: ignore[union-attr]
+    assert "default_access_mode" not in client.driver.calls[0]["config"]  # type: ignore[union-attr]
+
+
+def test_driver_options_include_transaction_retry_budget():
+    client = Neo4jClient("bolt://localhost:7687", "neo4j", "secret", max_transaction_retry_time_seconds=12.5)
+
+    assert client._driver_options()["max_transaction_retry_time"] == 12.5
+
+
+def test_async_execute_read_uses_managed_read_transaction():
+    client = build_async_client([{"name": "Salt"}])
+
+    records = asyncio.run(client.execute_read("MATCH (n) RETURN n.name AS name"))
+
+    assert records == [{"name": "Salt"}]
+    assert client.driver.transactions == ["read"]  # type: ignore[union-attr]
+    assert client.driver.calls[0]["config"]["default_access_mode"] == READ_ACCESS  # type: ignore[union-attr]
+
+
+def test_stream_query_yields_lazily_with_fetch_size():
+    client = build_client([{"name": "Sugar"}, {"name": "Salt"}])
+    client.fetch_size = 250
+
+    stream = client.stream_query("MATCH (n) RETURN n.name AS name")
+    assert client.driver.calls == []  # type: ignore[union-attr]
+
+    assert next(stream) == {"name": "Sugar"}
+    config = client.driver.calls[0]["config"]  # type: ignore[union-attr]
+    assert config["fetch_size"] == 250
+    assert config["default_access_mode"] == READ_ACCESS
+    assert list(stream) == [{"name": "Salt"}]
+
+
+def test_async_stream_query_honours_fetch_size_override():
+    client = build_async_client([{"tags": ("a", "b")}])
+
+    async def collect():
+        return [record async for record in client.stream_query("RETURN 1", fetch_size=5)]
+
+    assert asyncio.run(collect()) == [{"tags": ["a", "b"]}]
+    assert client.driver.calls[0]["config"]["fetch_size"] == 5  # type: ignore[union-attr]
+
+
+def test_named_queries_are_routed_by_access_mode():
+    client = build_client([{"total": 3}])
+
+    client.execute_query(queries.FORMULATION_COUNT)
+    client.execute_query("formulation.delete", {"id": "f-1"})
+
+    assert client.driver.transactions == ["read", "write"]  # type: ignore[union-attr]
+    assert client.driver.calls[1]["query"] == queries.FORMULATION_DELETE.cypher  # type: ignore[union-attr]
+    assert client.driver.calls[1]["parameters"] == {"id": "f-1"}  # type: ignore[union-attr]
+
+
+def test_named_query_parameters_and_access_mode_are_checked():
+    client = build_client([])
+
+    with pytest.raises(ValueError, match="missing id"):
+        client.execute_read(queries.FORMULATION_GET, {})
+    with pytest.raises(ValueError, match="write"):
+        client.execute_read(queries.FORMULATION_DELETE, {"id": "f-1"})
+    assert client.driver.calls == []  # type: ignore[union-attr]
+
+
+def test_sampled_reads_run_under_profile_and_record_db_hits(monkeypatch):
+    class ProfiledSummary(FakeSummary):
+        profile = {"dbHits": 7, "children": [{"dbHits": 5, "children": []}]}
+
+    monkeypatch.setattr(FakeResult, "consume", lambda self: ProfiledSummary())
+    client = build_client([{"total": 1}])
+    client.profile_sample_rate = 1.0
+    before = QUERY_DB_HITS.snapshot("formulation.count")
+
+    client.execute_read(queries.FORMULATION_COUNT)
+
+    assert client.driver.calls[0]["query"].startswith("PROFILE ")  # type: ignore[union-attr]
+    after = QUERY_DB_HITS.snapshot("formulation.count")
+    assert after["count"] == before["count"] + 1
+    assert after["sum"] == before["sum"] + 12
+
+
+def test_execute_write_batch_splits_rows_and_retries_only_failed_batches():
+    client = build_client([], failures=[ServiceUnavailable("connection dropped")])
+    rows = [{"id": index} for index in range(5)]
+
+    summary = client.execute_write_batch(
+        "UNWIND $rows AS row MERGE (n:Test {id: row.id}) SET n.tag = $tag",
+        rows,
+        parameters={"tag": "bulk"},
+        batch_size=2,
+        concurrency=1,
+    )
+
+    assert summary == {
+        "nodes_created": 3,
+        "relationships_created": 6,
+        "properties_set": 9,
+        "rows": 5,
+        "batches": 3,
+        "retried_batches": 1,
+    }
+    calls = client.driver.calls  # type: ignore[union-attr]
+    assert len(calls) == 4
+    assert all(call["parameters"]["tag"] == "bulk" for call in calls)
+    assert [len(call["parameters"]["rows"]) for call in calls] == [2, 2, 1, 2]
+
+
+def test_execute_write_batch_reports_batches_that_keep_failing():
+    failure = ClientError("Neo.ClientError.Schema.ConstraintValidationFailed", "duplicate")
+    client = build_client([], failures=[failure])
+
+    with pytest.raises(Neo4jBatchWriteError) as excinfo:
+        client.execute_write_batch("UNWIND $rows AS row CREATE (:Test)", [{}, {}, {}], batch_size=1, concurrency=1)
+
+    assert list(excinfo.value.failed_batches) == [0]
+    assert excinfo.value.summary["nodes_created"] == 2
+    assert excinfo.value.summary["retried_batches"] == 0
+    assert len(client.driver.calls) == 3  # type: ignore[union-attr]
+
+
+def test_async_execute_write_batch_aggregates_counters():
+    client = build_async_client([])
+
+    summary = asyncio.run(
+        client.execute_write_batch(
+            queries.GRAPHRAG_UPSERT_CHUNKS,
+            [{"chunk_id": "a"}] * 3,
+            parameters={"source_id": "docs", "source_type": "unstructured"},
+            batch_size=2,
+        )
+    )
+
+    assert summary["batches"] == 2
+    assert summary["nodes_created"] == 2
+    assert client.driver.transactions == ["write", "write"]  # type: ignore[union-attr]
+
+
+def test_causal_context_carries_write_bookmarks_into_later_reads():
+    client = build_client([{"total": 1}])
+    causal = CausalContext()
+
+    client.execute_read(queries.FORMULATION_COUNT, causal=causal)
+    client.execute_write("CREATE (n:Test)", causal=causal)
+    client.execute_read(queries.FORMULATION_COUNT, causal=causal)
+
+    configs = [call["config"] for call in client.driver.calls]  # type: ignore[union-attr]
+    assert "bookmarks" not in configs[0]
+    assert "bookmarks" not in configs[1]
+    assert configs[2]["bookmarks"].raw_values == {"FB:2"}
+    assert CausalContext.from_token(causal.token()).bookmarks.raw_values == {"FB:2"}
+
+
+def test_batch_writes_join_bookmarks_of_every_batch():
+    client = build_client([])
+    causal = CausalContext(["FB:start"])
+
+    client.execute_write_batch("UNWIND $rows AS row CREATE (:Test)", [{}, {}], batch_size=1, concurrency=1, causal=causal)
+
+    assert all(call["config"]["bookmarks"].raw_values == {"FB:start"} for call in client.driver.calls)  # type: ignore[union-attr]
+    assert causal.bookmarks.raw_values == {"FB:1", "FB:2"}  # type: ignore[union-attr]
+
+
+def test_bookmark_tokens_round_trip_and_reject_garbage():
+    causal = CausalContext(["FB:a", "FB:b"])
+
+    assert CausalContext.from_token(causal.token()).bookmarks.raw_values == {"FB:a", "FB:b"}  # type: ignore[union-attr]
+    assert not CausalContext.from_token("")
+    assert CausalContext().token() == ""
+    with pytest.raises(ValueError):
+        CausalContext.from_token("bm90LWpzb24")
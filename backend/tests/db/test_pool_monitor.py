@@ -0,0 +1,248 @@
+import asyncio
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.db.neo4j_client import Neo4jClient  # type: ignore[import]
+from app.db.pool_monitor import (  # type: ignore[import]
+    POOL_ACQUISITION_TIMEOUTS,
+    AsyncPoolMonitor,
+    PoolAcquisitionTimeout,
+    PoolMonitor,
+    PoolSizeController,
+)
+
+
+def test_slot_tracks_in_use_and_available():
+    monitor = PoolMonitor(3, client="test-usage")
+
+    with monitor.slot():
+        with monitor.slot():
+            snapshot = monitor.snapshot()
+            assert snapshot["in_use"] == 2
+            assert snapshot["available"] == 1
+
+    snapshot = monitor.snapshot()
+    assert snapshot["in_use"] == 0
+    assert snapshot["acquisitions"] == 2
+    assert monitor.window()["peak_in_use"] == 2
+    # Both callers found a free slot, so neither waited
+    assert monitor.window()["peak_waiting"] == 0
+
+
+def test_slot_times_out_when_pool_is_exhausted():
+    monitor = PoolMonitor(1, 0.05, client="test-timeout")
+    before = POOL_ACQUISITION_TIMEOUTS.value("test-timeout")
+
+    with monitor.slot():
+        with pytest.raises(PoolAcquisitionTimeout):
+            with monitor.slot():
+                pass
+
+    assert POOL_ACQUISITION_TIMEOUTS.value("test-timeout") == before + 1
+    assert monitor.snapshot()["timeouts"] == 1
+    assert monitor.snapshot()["waiting"] == 0
+
+
+def test_waiter_is_admitted_when_slot_frees():
+    monitor = PoolMonitor(1, 2, client="test-handoff")
+    acquired = threading.Event()
+
+    def worker():
+        with monitor.slot():
+            acquired.set()
+
+    with monitor.slot():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(0.05)
+    thread.join(2)
+
+    assert acquired.is_set()
+    assert monitor.window()["peak_waiting"] == 1
+
+
+def test_raising_limit_admits_waiters():
+    monitor = PoolMonitor(2, 2, client="test-resize")
+    monitor.set_limit(1)
+    acquired = threading.Event()
+
+    def worker():
+        with monitor.slot():
+            acquired.set()
+
+    with monitor.slot():
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(0.05)
+        monitor.set_limit(2)
+        assert acquired.wait(2)
+    thread.join(2)
+
+    assert monitor.set_limit(10) == 2
+
+
+def test_async_monitor_hands_slots_to_waiters_in_order():
+    async def scenario():
+        monitor = AsyncPoolMonitor(1, 1, client="test-async")
+        order = []
+
+        async def worker(name):
+            async with monitor.slot():
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(worker("a"), worker("b"), worker("c"))
+        return monitor, order
+
+    monitor, order = asyncio.run(scenario())
+
+    assert order == ["a", "b", "c"]
+    assert monitor.snapshot()["in_use"] == 0
+    assert monitor.snapshot()["acquisitions"] == 3
+
+
+def test_async_monitor_times_out():
+    async def scenario():
+        monitor = AsyncPoolMonitor(1, 0.05, client="test-async-timeout")
+        async with monitor.slot():
+            with pytest.raises(PoolAcquisitionTimeout):
+                async with monitor.slot():
+                    pass
+        # The slot is usable again after the timed-out waiter gave up
+        async with monitor.slot():
+            pass
+        return monitor
+
+    monitor = asyncio.run(scenario())
+
+    assert monitor.snapshot()["timeouts"] == 1
+    assert monitor.snapshot()["in_use"] == 0
+
+
+def _window(**overrides):
+    window = {"acquisitions": 100, "timeouts": 0, "waits": [0.0] * 100, "peak_in_use": 8, "peak_waiting": 0}
+    window.update(overrides)
+    return window
+
+
+def test_controller_grows_pool_on_slow_waits():
+    monitor = PoolMonitor(40, client="test-grow")
+    monitor.set_limit(16)
+    controller = PoolSizeController(monitor, min_size=4, target_wait_seconds=0.05)
+
+    recommendation = controller.recommend(_window(waits=[0.2] * 100, peak_in_use=16, peak_waiting=6))
+
+    assert recommendation.recommended == 22
+    assert recommendation.reason == "wait p95 above target"
+
+
+def test_controller_grows_on_timeouts_but_not_past_max():
+    monitor = PoolMonitor(18, client="test-grow-cap")
+    monitor.set_limit(16)
+    controller = PoolSizeController(monitor)
+
+    recommendation = controller.recommend(_window(timeouts=3, peak_in_use=16))
+
+    assert recommendation.recommended == 18
+    assert recommendation.reason == "acquisition timeouts"
+
+
+def test_controller_shrinks_idle_pool_with_headroom():
+    monitor = PoolMonitor(40, client="test-shrink")
+    controller = PoolSizeController(monitor, min_size=4)
+
+    assert controller.recommend(_window(peak_in_use=8)).recommended == 30
+    assert controller.recommend(_window(peak_in_use=1)).recommended == 30
+
+    monitor.set_limit(12)
+    assert controller.recommend(_window(peak_in_use=5)).recommended == 9
+    monitor.set_limit(5)
+    assert controller.recommend(_window(peak_in_use=1)).recommended == 4
+
+
+def test_controller_keeps_size_without_traffic():
+    monitor = PoolMonitor(10, client="test-steady")
+    controller = PoolSizeController(monitor)
+
+    recommendation = controller.recommend(_window(acquisitions=0, waits=[], peak_in_use=0))
+
+    assert recommendation.recommended == 10
+    assert recommendation.reason == "within target"
+
+
+def test_adjust_applies_recommendation_and_resets_window():
+    monitor = PoolMonitor(40, client="test-adjust")
+    controller = PoolSizeController(monitor, min_size=4)
+    for _ in range(10):
+        with monitor.slot():
+            pass
+
+    recommendation = controller.adjust()
+
+    assert recommendation.recommended == 30
+    assert monitor.limit == 30
+    assert monitor.window()["acquisitions"] == 0
+
+    assert controller.adjust(apply=False).recommended == 30
+
+
+def test_snapshot_reads_driver_connections():
+    monitor = PoolMonitor(5, client="test-driver")
+    pool = SimpleNamespace(
+        connections={
+            "a": deque([SimpleNamespace(in_use=True), SimpleNamespace(in_use=False)]),
+            "b": deque([SimpleNamespace(in_use=True)]),
+        }
+    )
+    monitor.attach_driver(SimpleNamespace(_pool=pool))
+
+    assert monitor.snapshot()["connections"] == {"open": 3, "in_use": 2, "idle": 1}
+
+    monitor.attach_driver(object())
+    assert "connections" not in monitor.snapshot()
+
+
+class _FakeSession:
+    def __init__(self, monitor):
+        self.monitor = monitor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters):
+        assert self.monitor.snapshot()["in_use"] == 1
+        return []
+
+    def last_bookmarks(self):
+        return None
+
+
+def test_client_sessions_hold_a_pool_slot():
+    client = Neo4jClient(
+        "bolt://example",
+        "user",
+        "pass",
+        max_connection_pool_size=7,
+        connection_acquisition_timeout_seconds=3,
+    )
+    client.driver = SimpleNamespace(session=lambda **config: _FakeSession(client.pool_monitor))
+
+    assert client.execute_query("RETURN 1") == []
+
+    stats = client.pool_stats()
+    assert stats["max_size"] == 7
+    assert stats["in_use"] == 0
+    assert stats["acquisitions"] == 1
+    assert client.pool_monitor.acquisition_timeout == 3
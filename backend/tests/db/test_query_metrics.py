@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.metrics import MetricsRegistry  # type: ignore[import]
+from app.db import query_metrics  # type: ignore[import]
+from app.db.query_metrics import (  # type: ignore[import]
+    ADHOC_OVERFLOW_LABEL,
+    QUERY_DURATION,
+    QUERY_ERRORS,
+    QUERY_ROWS,
+    QueryObservation,
+    query_label,
+    total_db_hits,
+)
+from app.db.query_registry import NamedQuery  # type: ignore[import]
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("query",), buckets=(0.1, 1.0))
+    calls = registry.counter("demo_total", "Demo calls.", ("query",))
+
+    latency.observe("q", value=0.05)
+    latency.observe("q", value=0.5)
+    latency.observe("q", value=3.0)
+    calls.inc("q", amount=2)
+
+    text = registry.render()
+
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{query="q",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{query="q",le="1"} 2' in text
+    assert 'demo_seconds_bucket{query="q",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{query="q"} 3' in text
+    assert 'demo_total{query="q"} 2' in text
+
+
+def test_registry_rejects_conflicting_metric_shapes():
+    registry = MetricsRegistry()
+    first = registry.counter("demo_total", "Demo.", ("query",))
+
+    assert registry.counter("demo_total", "Demo.", ("query",)) is first
+    with pytest.raises(ValueError):
+        registry.histogram("demo_total", "Demo.", ("query",))
+    with pytest.raises(ValueError):
+        first.inc()
+
+
+def test_labels_use_query_name_or_stable_cypher_hash():
+    named = NamedQuery("formulation.get", "MATCH (f) RETURN f")
+
+    assert query_label(named.cypher, named) == "formulation.get"
+    assert query_label("MATCH (n)\n  RETURN n") == query_label("MATCH (n) RETURN n")
+    assert query_label("MATCH (n) RETURN n").startswith("adhoc:")
+
+
+def test_adhoc_labels_are_capped(monkeypatch):
+    monkeypatch.setattr(query_metrics, "MAX_ADHOC_LABELS", 2)
+    monkeypatch.setattr(query_metrics, "_adhoc_labels", set())
+
+    first = query_label("MATCH (a) RETURN a")
+    second = query_label("MATCH (b) RETURN b")
+
+    assert query_label("MATCH (c) RETURN c") == ADHOC_OVERFLOW_LABEL
+    assert query_label("MATCH (a) RETURN a") == first != ADHOC_OVERFLOW_LABEL
+    assert second.startswith("adhoc:") and second != ADHOC_OVERFLOW_LABEL
+
+
+def test_total_db_hits_walks_the_profile_tree():
+    plan = {"dbHits": 2, "children": [{"dbHits": 5, "children": []}, {"dbHits": 1, "children": [{"dbHits": 3}]}]}
+
+    assert total_db_hits(plan) == 11
+    assert total_db_hits(None) == 0
+
+
+def test_observation_records_rows_and_errors():
+    named = NamedQuery("test.observation", "MATCH (n) RETURN n")
+    before = QUERY_DURATION.snapshot("test.observation", "read")["count"]
+
+    with QueryObservation(named.cypher, named, "read") as observation:
+        observation.record_rows([{"n": 1}, {"n": 2}])
+    with pytest.raises(KeyError):
+        with QueryObservation(named.cypher, named, "read"):
+            raise KeyError("boom")
+
+    assert QUERY_DURATION.snapshot("test.observation", "read")["count"] == before + 2
+    assert QUERY_ROWS.value("test.observation") >= 2
+    assert QUERY_ERRORS.value("test.observation", "KeyError") >= 1
+
+
+def test_profile_prefix_only_when_sampled():
+    sampled = QueryObservation("MATCH (n) RETURN n", None, "read", profile_sample_rate=1.0)
+    skipped = QueryObservation("EXPLAIN MATCH (n) RETURN n", None, "read", profile_sample_rate=1.0)
+
+    assert sampled.statement == "PROFILE MATCH (n) RETURN n"
+    assert skipped.statement == "EXPLAIN MATCH (n) RETURN n"
@@ -0,0 +1,100 @@
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+from neo4j.exceptions import ClientError
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.db import queries  # type: ignore[import]
+from app.db.query_registry import (  # type: ignore[import]
+    WRITE,
+    NamedQuery,
+    QueryRegistry,
+    registry,
+    warm_query_plans,
+)
+
+
+class StubNeo4jClient:
+    def __init__(self, failing: Optional[str] = None) -> None:
+        self.failing = failing
+        self.reads: List[str] = []
+        self.writes: List[str] = []
+
+    def execute_read(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        self._check(query)
+        self.reads.append(query)
+        return []
+
+    def execute_write(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        self._check(query)
+        self.writes.append(query)
+        return {}
+
+    def _check(self, query: str) -> None:
+        if self.failing and self.failing in query:
+            raise ClientError("Neo.ClientError.Schema.IndexNotFound", "index missing")
+
+
+def test_validate_reports_missing_and_unexpected_parameters():
+    query = NamedQuery("test.lookup", "MATCH (n {id: $id}) RETURN n", parameters=("id",))
+
+    with pytest.raises(ValueError, match="missing id"):
+        query.validate({})
+    with pytest.raises(ValueError, match="unexpected extra"):
+        query.validate({"id": 1, "extra": 2})
+    assert query.validate({"id": 1}) == {"id": 1}
+
+
+def test_optional_parameters_may_be_omitted():
+    query = NamedQuery("test.search", "RETURN $term", parameters=("term",), optional_parameters=("limit",))
+
+    assert query.validate({"term": "x"}) == {"term": "x"}
+    assert query.validate({"term": "x", "limit": 5}) == {"term": "x", "limit": 5}
+
+
+def test_registry_resolves_names_and_rejects_conflicting_definitions():
+    local = QueryRegistry()
+    defined = local.define("test.count", "MATCH (n) RETURN count(n) AS total")
+
+    assert local.resolve("test.count") is defined
+    assert local.resolve(defined) is defined
+    assert local.resolve("MATCH (n) RETURN n") is None
+    with pytest.raises(ValueError, match="already registered"):
+        local.define("test.count", "RETURN 1")
+
+
+def test_catalogue_declares_every_parameter_it_uses():
+    for query in registry:
+        declared = set(query.parameters) | set(query.optional_parameters)
+        for name in declared:
+            assert f"${name}" in query.cypher, f"{query.name} declares unused parameter {name}"
+
+    assert queries.FDC_UPSERT_FOOD.access_mode == WRITE
+    assert registry.get("formulation.get") is queries.FORMULATION_GET
+
+
+def test_catalogue_avoids_the_property_exists_function_removed_in_neo4j_5():
+    for query in registry:
+        assert not re.search(r"\bexists\(\s*\w+\.", query.cypher), f"{query.name} uses exists(); use IS NOT NULL"
+
+
+def test_warm_query_plans_explains_each_query_and_reports_failures():
+    local = QueryRegistry()
+    local.define("test.read", "MATCH (n:Food) RETURN n")
+    local.define("test.write", "CREATE (n:Food)", access_mode=WRITE)
+    local.define("test.fulltext", "CALL db.index.fulltext.queryNodes('missing', 'x')")
+    local.define("test.skipped", "RETURN 1", warmup=False)
+    client = StubNeo4jClient(failing="fulltext")
+
+    report = warm_query_plans(client, local)
+
+    assert report["warmed"] == ["test.read", "test.write"]
+    assert list(report["failed"]) == ["test.fulltext"]
+    assert client.reads == ["EXPLAIN MATCH (n:Food) RETURN n"]
+    assert client.writes == ["EXPLAIN CREATE (n:Food)"]
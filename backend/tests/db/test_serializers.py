@@ -0,0 +1,84 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from neo4j.graph import Graph, Node
+from neo4j.time import Date as GraphDate, Duration as GraphDuration
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.db.serializers import register_converter, serialize_record, serialize_value  # type: ignore[import]
+
+
+def _food_and_nutrient():
+    graph = Graph()
+    food = Node(graph, "4:x:1", 1, ["Food"], {"fdcId": 123, "updatedAt": GraphDate(2024, 1, 2)})
+    nutrient = Node(graph, "4:x:2", 2, ["Nutrient"], {"nutrientId": 1003, "nutrientName": "Protein"})
+    rel = graph.relationship_type("CONTAINS_NUTRIENT")(graph, "5:x:1", 1, {"value": Decimal("1.5")})
+    rel._start_node = food
+    rel._end_node = nutrient
+    return food, rel, nutrient
+
+
+def test_serialize_graph_entities():
+    food, rel, nutrient = _food_and_nutrient()
+
+    record = serialize_record({"f": food, "r": rel, "n": nutrient})
+
+    assert record["f"] == {
+        "id": "4:x:1",
+        "labels": ["Food"],
+        "properties": {"fdcId": 123, "updatedAt": "2024-01-02"},
+    }
+    assert record["r"] == {
+        "id": "5:x:1",
+        "type": "CONTAINS_NUTRIENT",
+        "start": "4:x:1",
+        "end": "4:x:2",
+        "properties": {"value": 1.5},
+    }
+
+
+def test_json_safe_containers_are_returned_unchanged():
+    payload = {"name": "Sugar", "tags": ["sweet", "dry"], "nested": {"value": 1.0}}
+
+    assert serialize_value(payload) is payload
+
+
+def test_containers_are_copied_only_when_something_changes():
+    original = {"when": datetime(2024, 5, 1, 8, 0), "tags": ("a", "b"), "plain": [1, 2]}
+
+    converted = serialize_value(original)
+
+    assert converted == {"when": "2024-05-01T08:00:00", "tags": ["a", "b"], "plain": [1, 2]}
+    assert converted is not original
+    assert converted["plain"] is original["plain"]
+    assert isinstance(original["when"], datetime)
+
+
+def test_subclasses_resolve_through_their_base_type():
+    class Stamp(datetime):
+        pass
+
+    assert serialize_value(OrderedDict(a=Decimal("2"))) == {"a": 2.0}
+    assert serialize_value(Stamp(2024, 1, 1)) == "2024-01-01T00:00:00"
+
+
+def test_durations_keep_their_list_form():
+    assert serialize_value(GraphDuration(days=1, seconds=5)) == [0, 1, 5, 0]
+    assert serialize_value({"elapsed": GraphDuration(months=2)}) == {"elapsed": [2, 0, 0, 0]}
+
+
+def test_register_converter_overrides_cached_resolution():
+    class Money(Decimal):
+        pass
+
+    assert serialize_value(Money("1.25")) == 1.25
+
+    register_converter(Money, str)
+
+    assert serialize_value(Money("1.25")) == "1.25"
@@ -89,6 +89,7 @@ def test_ingest_structured_source_persists_chunks_to_neo4j(tmp_path: Path) -> No
     class StubNeo4jClient:
         def __init__(self) -> None:
             self.write_params: Dict[str, Any] | None = None
+            self.linked: List[str] = []
 
         def execute_query(self, query: str, parameters: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
             return [
@@ -102,12 +103,24 @@ def test_ingest_structured_source_persists_chunks_to_neo4j(tmp_path: Path) -> No
                 }
             ]
 
-        def execute_write(self, query: str, parameters: Dict[str, Any] | None = None) -> Dict[str, int]:
-            self.write_params = parameters or {}
+        def execute_write(self, query: Any, parameters: Dict[str, Any] | None = None) -> Dict[str, int]:
+            if query.name == "graphrag.link_chunks":
+                self.linked = list(parameters["chunk_ids"])
+                return {"relationships_created": len(self.linked)}
             return {
                 "nodes_created": 1,
-                "relationships_created": 1,
-                "properties_set": 4,
+                "relationships_created": 0,
+                "properties_set": 2,
+            }
+
+        def execute_write_batch(
+            self, query: Any, rows: List[Dict[str, Any]], *, parameters: Dict[str, Any] | None = None, **_: Any
+        ) -> Dict[str, int]:
+            self.write_params = {**(parameters or {}), "chunks": rows}
+            return {
+                "nodes_created": len(rows),
+                "relationships_created": 0,
+                "properties_set": 2 * len(rows),
             }
 
     manifest = {
@@ -144,7 +157,7 @@ def test_ingest_structured_source_persists_chunks_to_neo4j(tmp_path: Path) -> No
     result = results[0]
     assert result.chunk_count == 1
     assert result.neo4j_summary == {
-        "nodes_created": 1,
+        "nodes_created": 2,
         "relationships_created": 1,
         "properties_set": 4,
     }
@@ -154,6 +167,8 @@ def test_ingest_structured_source_persists_chunks_to_neo4j(tmp_path: Path) -> No
     chunks_payload = stub_client.write_params["chunks"]
     assert len(chunks_payload) == 1
     assert chunks_payload[0]["chunk_id"].startswith("formulations::")
+    # The source edges are created once, after every chunk batch
+    assert stub_client.linked == [chunks_payload[0]["chunk_id"]]
 
 
 def test_ingest_structured_source_generates_embeddings(tmp_path: Path) -> None:
@@ -165,13 +180,16 @@ def test_ingest_structured_source_generates_embeddings(tmp_path: Path) -> None:
                 }
             ]
 
-        def execute_write(self, query: str, parameters: Dict[str, Any] | None = None) -> Dict[str, int]:
+        def execute_write(self, query: Any, parameters: Dict[str, Any] | None = None) -> Dict[str, int]:
             return {
                 "nodes_created": 1,
                 "relationships_created": 1,
                 "properties_set": 4,
             }
 
+        def execute_write_batch(self, query: Any, rows: List[Dict[str, Any]], **_: Any) -> Dict[str, int]:
+            return {"nodes_created": len(rows), "relationships_created": len(rows), "properties_set": len(rows)}
+
     class StubEmbeddingClient:
         def __init__(self) -> None:
             self.batches: List[Sequence[str]] = []
@@ -15,8 +15,8 @@ class FakeNeo4jClient:
         self.responses = list(responses)
         self.executed = []
 
-    def execute_query(self, query, parameters=None):
-        self.executed.append((query, parameters or {}))
+    def execute_read(self, query, parameters=None):
+        self.executed.append((getattr(query, "cypher", query), parameters or {}))
         if not self.responses:
             pytest.fail("No prepared response available for query execution")
         return self.responses.pop(0)
@@ -0,0 +1,184 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from neo4j.exceptions import ClientError
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.food_resolution import FoodMatchCache, FoodResolver, fulltext_query  # type: ignore[import]
+from app.services.formulation_pipeline import FormulationEventBus  # type: ignore[import]
+from app.services.nutrient_profiles import FOODS_INGESTED_EVENT  # type: ignore[import]
+from app.services.nutrition_service import NutritionCalculationService  # type: ignore[import]
+
+FOODS = {
+    "salt, table": 2001,
+    "sugars, granulated": 2002,
+    "cocoa, dry powder, unsweetened": 2003,
+    "cocoa butter": 2004,
+}
+NUTRIENTS = {
+    2001: [("Sodium, Na", 38758, "mg")],
+    2002: [("Energy", 387, "kcal"), ("Carbohydrate, by difference", 99.98, "g")],
+    2003: [("Energy", 228, "kcal"), ("Protein", 19.6, "g")],
+    2004: [("Energy", 884, "kcal"), ("Total lipid (fat)", 100, "g")],
+}
+
+
+class FallbackGraph:
+    """A formulation without DERIVED_FROM links, so labels need the name fallback."""
+
+    def __init__(
+        self,
+        *,
+        fulltext: bool = True,
+        fulltext_error: str = "There is no such fulltext schema index: food_description_fulltext",
+    ) -> None:
+        self.fulltext = fulltext
+        self.fulltext_error = fulltext_error
+        self.reads: List[Dict[str, Any]] = []
+
+    async def execute_read(self, query, parameters=None):
+        self.reads.append({"name": query.name, "parameters": parameters or {}})
+        if query.name == "nutrition.formulation_nutrients":
+            return [{"formulation_id": "choc", "formulation_name": "Hot Chocolate", "ingredients": []}]
+        if query.name == "nutrition.formulation_header":
+            return [{"id": "choc", "name": "Hot Chocolate"}]
+        if query.name == "nutrition.formulation_ingredients":
+            return [
+                {"ingredient_name": "Sugar", "percentage": 60.0, "food_fdc_id": 2002},
+                {"ingredient_name": "Cocoa", "percentage": 30.0, "food_fdc_id": None},
+                {"ingredient_name": "Cocoa  Butter", "percentage": 9.5, "food_fdc_id": None},
+                {"ingredient_name": "Salt", "percentage": 0.5, "food_fdc_id": None},
+            ]
+        if query.name == "nutrition.resolve_foods":
+            if not self.fulltext:
+                raise ClientError(self.fulltext_error)
+            return self._resolve(parameters["searches"])
+        if query.name == "nutrition.resolve_foods_scan":
+            return self._resolve(parameters["searches"])
+        if query.name == "nutrition.foods_nutrients":
+            return [
+                {"fdc_id": fdc_id, "matched_food": "", "nutrient_name": name, "amount": amount, "unit": unit}
+                for fdc_id in parameters["fdc_ids"]
+                for name, amount, unit in NUTRIENTS[fdc_id]
+            ]
+        raise AssertionError(f"unexpected query {query.name}")
+
+    @staticmethod
+    def _resolve(searches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        rows = []
+        for search in searches:
+            candidates = sorted((desc for desc in FOODS if search["name"] in desc), key=len)
+            if candidates:
+                rows.append({"ingredient_name": search["name"], "fdc_id": FOODS[candidates[0]], "description": candidates[0]})
+        return rows
+
+    def names(self) -> List[str]:
+        return [read["name"] for read in self.reads]
+
+
+def test_fulltext_query_keeps_only_lowercased_words():
+    assert fulltext_query("Cocoa Butter (deodorized)") == '"cocoa butter deodorized"^2 OR (cocoa AND butter AND deodorized)'
+    assert fulltext_query("Salt AND pepper") == '"salt and pepper"^2 OR (salt AND and AND pepper)'
+    assert fulltext_query("+-*?") is None
+
+
+def test_fallback_resolves_every_ingredient_in_one_query_and_caches_the_matches():
+    graph = FallbackGraph()
+    service = NutritionCalculationService(graph, foods=FoodResolver(graph, FoodMatchCache()))
+
+    async def scenario():
+        first = await service.calculate_nutrition_label("choc", 20.0, "g", None)
+        reads = graph.names()
+        searches = graph.reads[3]["parameters"]["searches"]
+        graph.reads.clear()
+        second = await service.calculate_nutrition_label("choc", 20.0, "g", None)
+        return first, reads, searches, graph.names(), second
+
+    first, reads, searches, repeat_reads, second = asyncio.run(scenario())
+
+    assert reads == [
+        "nutrition.formulation_nutrients",
+        "nutrition.formulation_header",
+        "nutrition.formulation_ingredients",
+        "nutrition.resolve_foods",
+        "nutrition.foods_nutrients",
+    ]
+    assert [search["name"] for search in searches] == ["cocoa", "cocoa butter", "salt"]
+    assert "nutrition.resolve_foods" not in repeat_reads
+    assert second == first
+    assert first.sodium.amount == round(38758 * 0.005 * 0.2, 0)
+    # "Cocoa" and "Cocoa  Butter" both resolve to the shortest matching food, cocoa butter
+    assert first.total_fat.amount == round(100 * (0.30 + 0.095) * 0.2, 1)
+
+
+def test_missing_fulltext_index_falls_back_to_a_batched_scan():
+    graph = FallbackGraph(fulltext=False)
+    resolver = FoodResolver(graph)
+
+    async def scenario():
+        first = await resolver.resolve(["Cocoa", "Salt", "Unobtainium"])
+        second = await resolver.resolve(["Cocoa Butter"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert graph.names() == ["nutrition.resolve_foods", "nutrition.resolve_foods_scan", "nutrition.resolve_foods_scan"]
+    assert graph.reads[1]["parameters"] == {"searches": [{"name": "cocoa"}, {"name": "salt"}, {"name": "unobtainium"}]}
+    assert {name: match.fdc_id if match else None for name, match in first.items()} == {
+        "Cocoa": 2004,
+        "Salt": 2001,
+        "Unobtainium": None,
+    }
+    assert second["Cocoa Butter"].fdc_id == 2004
+
+
+def test_cached_misses_are_forgotten_when_foods_are_ingested():
+    graph = FallbackGraph()
+    cache = FoodMatchCache()
+    resolver = FoodResolver(graph, cache)
+    bus = FormulationEventBus()
+
+    async def scenario():
+        await cache.attach(bus)
+        await resolver.resolve(["Unobtainium", "Salt"])
+        await resolver.resolve(["unobtainium", "SALT"])
+        cached_reads = len(graph.reads)
+        await bus.publish(FOODS_INGESTED_EVENT, {"fdc_ids": [9999]})
+        await resolver.resolve(["Unobtainium"])
+        return cached_reads
+
+    cached_reads = asyncio.run(scenario())
+
+    assert cached_reads == 1
+    assert graph.names() == ["nutrition.resolve_foods", "nutrition.resolve_foods"]
+
+
+def test_index_still_populating_is_retried_after_the_backoff():
+    graph = FallbackGraph(fulltext=False, fulltext_error="Index `food_description_fulltext` is not online")
+    resolver = FoodResolver(graph, fulltext_retry_seconds=0.0)
+
+    async def scenario():
+        await resolver.resolve(["Cocoa"])
+        graph.fulltext = True
+        return await resolver.resolve(["Salt"])
+
+    second = asyncio.run(scenario())
+
+    assert graph.names() == ["nutrition.resolve_foods", "nutrition.resolve_foods_scan", "nutrition.resolve_foods"]
+    assert second["Salt"].fdc_id == 2001
+
+
+def test_other_client_errors_are_not_mistaken_for_a_missing_index():
+    graph = FallbackGraph(fulltext=False, fulltext_error="Invalid input 'AND': expected a term")
+    resolver = FoodResolver(graph)
+
+    with pytest.raises(ClientError):
+        asyncio.run(resolver.resolve(["Cocoa"]))
+
+    assert graph.names() == ["nutrition.resolve_foods"]
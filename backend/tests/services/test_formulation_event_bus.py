@@ -0,0 +1,133 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.formulation_pipeline import FormulationEventBus  # type: ignore[import]
+
+
+def _queued_bus(**kwargs) -> FormulationEventBus:
+    options = {"workers": 2, "handler_timeout": 0.2, "max_attempts": 2, "retry_backoff": 0.0}
+    options.update(kwargs)
+    return FormulationEventBus(**options)
+
+
+def test_publish_returns_before_slow_handlers_finish():
+    bus = _queued_bus(handler_timeout=1.0)
+    finished: List[str] = []
+
+    async def slow(event):
+        await asyncio.sleep(0.2)
+        finished.append(event.payload["id"])
+
+    async def scenario():
+        await bus.subscribe("formulation.created", slow)
+        started = time.perf_counter()
+        await bus.publish("formulation.created", {"id": "f1"})
+        publish_seconds = time.perf_counter() - started
+        pending = list(finished)
+        await bus.stop()
+        return publish_seconds, pending
+
+    publish_seconds, pending = asyncio.run(scenario())
+
+    assert publish_seconds < 0.1
+    assert pending == []
+    assert finished == ["f1"]
+
+
+def test_listeners_of_one_event_run_concurrently():
+    bus = _queued_bus(handler_timeout=1.0)
+
+    async def sleeper(event):
+        await asyncio.sleep(0.2)
+
+    async def scenario():
+        for _ in range(4):
+            await bus.subscribe("formulation.updated", sleeper)
+        await bus.publish("formulation.updated", {"id": "f1"})
+        started = time.perf_counter()
+        await bus.drain()
+        elapsed = time.perf_counter() - started
+        await bus.stop()
+        return elapsed
+
+    assert asyncio.run(scenario()) < 0.6
+
+
+def test_failing_handler_is_retried_then_dead_lettered_without_affecting_others():
+    bus = _queued_bus()
+    attempts: List[int] = []
+    delivered: List[str] = []
+
+    def broken(event):
+        attempts.append(1)
+        raise ValueError("handler bug")
+
+    async def hangs(event):
+        await asyncio.sleep(5)
+
+    async def healthy(event):
+        delivered.append(event.payload["id"])
+
+    async def scenario():
+        for handler in (broken, hangs, healthy):
+            await bus.subscribe("formulation.deleted", handler)
+        await bus.publish("formulation.deleted", {"id": "f9"})
+        await bus.drain()
+        await bus.stop()
+
+    asyncio.run(scenario())
+
+    assert delivered == ["f9"]
+    assert len(attempts) == 2
+    letters = {letter.listener: letter for letter in bus.dead_letters()}
+    assert set(letters) == {"broken", "hangs"}
+    assert letters["broken"].error == "ValueError: handler bug"
+    assert letters["hangs"].error == "timed out"
+    assert letters["hangs"].attempts == 2
+
+
+def test_full_queue_makes_publishers_wait_for_space():
+    bus = _queued_bus(workers=1, max_queue=1, handler_timeout=1.0)
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def blocked(event):
+            await gate.wait()
+
+        await bus.subscribe("formulation.created", blocked)
+        await bus.publish("formulation.created", {"id": "a"})
+        await asyncio.sleep(0.01)
+        await bus.publish("formulation.created", {"id": "b"})
+        third = asyncio.ensure_future(bus.publish("formulation.created", {"id": "c"}))
+        await asyncio.sleep(0.05)
+        waiting = not third.done()
+        gate.set()
+        await third
+        await bus.stop()
+        return waiting
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_inline_bus_still_raises_handler_failures():
+    bus = FormulationEventBus()
+
+    def broken(event):
+        raise ValueError("handler bug")
+
+    async def scenario():
+        await bus.subscribe("formulation.created", broken)
+        await bus.publish("formulation.created", {"id": "f1"})
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
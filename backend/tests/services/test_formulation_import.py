@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.formulation_import import import_formulations, iter_csv, iter_lines  # type: ignore[import]
+from app.services.formulation_pipeline import (  # type: ignore[import]
+    FormulationDependencyError,
+    FormulationEventBus,
+    FormulationPipelineService,
+)
+
+
+class BatchRecorder:
+    """Neo4j stand-in that records each create batch and can fail on demand."""
+
+    def __init__(self, fail_on_batch: int = 0) -> None:
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.fail_on_batch = fail_on_batch
+
+    def execute_query(self, query, parameters=None, *, causal=None):
+        assert query.name == "formulation.create_batch"
+        if self.fail_on_batch and len(self.batches) + 1 == self.fail_on_batch:
+            raise FormulationDependencyError("Neo4j unavailable")
+        self.batches.append(parameters["formulations"])
+        return [{"id": row["id"]} for row in parameters["formulations"]]
+
+
+async def _chunks(payload: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(payload), size):
+        yield payload[start : start + size]
+
+
+def _jsonl(count: int) -> bytes:
+    water = [{"name": "Water", "percentage": 100.0}]
+    return "\n".join(json.dumps({"name": f"Row {index}", "ingredients": water}) for index in range(count)).encode()
+
+
+def _import(store: BatchRecorder, payload: bytes, **kwargs: Any):
+    events: List[Dict[str, Any]] = []
+    bus = FormulationEventBus()
+
+    async def record(event):
+        events.append(event.payload)
+
+    pipeline = FormulationPipelineService(store, event_bus=bus, max_retries=0)
+
+    async def runner():
+        await bus.subscribe("formulation.created", record)
+        return await import_formulations(pipeline, _chunks(payload, 7), fmt="jsonl", **kwargs)
+
+    try:
+        return asyncio.run(runner()), events
+    finally:
+        pipeline.shutdown()
+
+
+def test_lines_split_across_chunks_and_multibyte_characters():
+    payload = "first\r\nsecond é line\nlast".encode()
+
+    async def collect():
+        return [line async for line in iter_lines(_chunks(payload, 3))]
+
+    assert asyncio.run(collect()) == [(1, "first"), (2, "second é line"), (3, "last")]
+
+
+def test_each_batch_is_one_write_and_one_event():
+    store = BatchRecorder()
+
+    summary, events = _import(store, _jsonl(5), batch_size=2)
+
+    assert [len(batch) for batch in store.batches] == [2, 2, 1]
+    assert summary.created == 5 and summary.batches == 3
+    assert [len(event["ids"]) for event in events] == [2, 2, 1]
+    assert summary.ids == [row["id"] for batch in store.batches for row in batch]
+    assert summary.rows_per_second > 0
+
+
+def test_failed_batch_aborts_and_keeps_earlier_batches():
+    store = BatchRecorder(fail_on_batch=2)
+
+    summary, events = _import(store, _jsonl(6), batch_size=2)
+
+    assert summary.created == 2
+    assert summary.failed == 2
+    assert [error.line for error in summary.errors] == [3, 4]
+    assert summary.aborted == "Neo4j unavailable"
+    assert len(events) == 1
+
+
+def test_row_limit_stops_the_import():
+    summary, _ = _import(BatchRecorder(), _jsonl(5), batch_size=10, max_rows=3)
+
+    assert summary.created == 3
+    assert summary.aborted == "Import exceeds 3 rows"
+
+
+def test_quoted_csv_fields_may_span_lines():
+    payload = (
+        'name,description,ingredient,percentage\n'
+        '"Lemonade","Tart,\nthen ""sweet""",Water,90\n'
+        '\n'
+        'Lemonade,,Lemon,10\n'
+        'Broken,"never closed,Water,100\n'
+    ).encode()
+
+    async def collect():
+        return [row async for row in iter_csv(iter_lines(_chunks(payload, 5)))]
+
+    rows = asyncio.run(collect())
+
+    assert [(line, error) for line, _, error in rows] == [(2, None), (6, "Unterminated quoted field")]
+    lemonade = rows[0][1]
+    assert lemonade["description"] == 'Tart,\nthen "sweet"'
+    assert [ingredient["name"] for ingredient in lemonade["ingredients"]] == ["Water", "Lemon"]
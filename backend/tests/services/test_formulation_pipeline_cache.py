@@ -0,0 +1,186 @@
+import asyncio
+import dataclasses
+import sys
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.models.schemas import FormulationResponse  # type: ignore[import]
+from app.services import formulation_pipeline  # type: ignore[import]
+from app.services.formulation_pipeline import (  # type: ignore[import]
+    FormulationPipelineCache,
+    FormulationPipelineService,
+)
+
+
+def _formulation(formulation_id: str, name: str = "Cola") -> FormulationResponse:
+    return FormulationResponse(
+        id=formulation_id,
+        name=name,
+        description=None,
+        status="draft",
+        ingredients=[],
+        total_percentage=0.0,
+        created_at="2025-11-10T00:00:00",
+    )
+
+
+def test_hit_returns_stored_model_without_copying():
+    cache = FormulationPipelineCache(ttl_seconds=60, max_entries=4)
+    model = _formulation("f1")
+
+    async def scenario():
+        await cache.set(("get", "f1"), model)
+        return await cache.get(("get", "f1")), await cache.get(("get", "missing"))
+
+    hit, miss = asyncio.run(scenario())
+
+    assert hit is model
+    assert miss is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["bytes"] == len(model.model_dump_json().encode("utf-8"))
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FormulationPipelineCache(ttl_seconds=60, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", _formulation("a"))
+        await cache.set("b", _formulation("b"))
+        await cache.get("a")
+        await cache.set("c", _formulation("c"))
+        return [await cache.get(key) is not None for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_byte_bound_evicts_and_skips_oversized_values():
+    one_entry = len(_formulation("a").model_dump_json().encode("utf-8"))
+    cache = FormulationPipelineCache(ttl_seconds=60, max_entries=10, max_bytes=one_entry * 2)
+
+    async def scenario():
+        await cache.set("a", _formulation("a"))
+        await cache.set("b", _formulation("b"))
+        await cache.set("c", _formulation("c"))
+        oversized = await cache.set("big", _formulation("big", name="x" * one_entry * 2))
+        return oversized, [await cache.get(key) is not None for key in ("a", "b", "c", "big")]
+
+    oversized, present = asyncio.run(scenario())
+
+    assert oversized is None
+    assert present == [False, True, True, False]
+    assert cache.stats()["bytes"] <= one_entry * 2
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(formulation_pipeline.time, "monotonic", lambda: clock[0])
+    cache = FormulationPipelineCache(ttl_seconds=5, max_entries=4)
+
+    async def scenario():
+        await cache.set("a", _formulation("a"))
+        clock[0] += 6
+        return await cache.get("a")
+
+    assert asyncio.run(scenario()) is None
+    stats = cache.stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_stale_window_keeps_expired_entries_for_revalidation(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(formulation_pipeline.time, "monotonic", lambda: clock[0])
+    cache = FormulationPipelineCache(ttl_seconds=5, max_entries=4, stale_seconds=10)
+
+    async def scenario():
+        await cache.set("a", _formulation("a"))
+        clock[0] += 6
+        within = await cache.get("a"), cache.stale("a")
+        clock[0] += 10
+        beyond = await cache.get("a"), cache.stale("a")
+        return within, beyond
+
+    (miss, stale), (late_miss, gone) = asyncio.run(scenario())
+
+    assert miss is None and stale.id == "a"
+    assert late_miss is None and gone is None
+    assert cache.stats()["entries"] == 0
+
+
+class SlowFormulations:
+    """Neo4j stand-in whose reads take long enough for callers to pile up."""
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.name = "Cola"
+
+    def execute_read(self, query, parameters=None, *, causal=None):
+        self.reads += 1
+        threading.Event().wait(0.05)
+        record = _formulation(parameters["id"], name=self.name).model_dump()
+        return [{"f": record, "ingredients": []}]
+
+
+def test_concurrent_misses_share_one_fetch():
+    store = SlowFormulations()
+    service = FormulationPipelineService(store, cache=FormulationPipelineCache(ttl_seconds=60))
+
+    async def scenario():
+        return await asyncio.gather(*(service.get("f1") for _ in range(10)))
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        service.shutdown()
+
+    assert store.reads == 1
+    assert {result.id for result in results} == {"f1"}
+
+
+def test_expired_entry_is_served_while_one_refresh_runs():
+    store = SlowFormulations()
+    cache = FormulationPipelineCache(ttl_seconds=60, stale_seconds=30)
+    service = FormulationPipelineService(store, cache=cache)
+
+    async def scenario():
+        await service.get("f1")
+        key = service._get_key("f1")
+        cache._store[key] = dataclasses.replace(cache._store[key], expires_at=time.monotonic() - 1)
+        store.name = "Cola Zero"
+        served = [await service.get("f1") for _ in range(5)]
+        while service._get_flights.in_flight(key):
+            await asyncio.sleep(0.01)
+        return served, await service.get("f1")
+
+    try:
+        served, refreshed = asyncio.run(scenario())
+    finally:
+        service.shutdown()
+
+    assert {formulation.name for formulation in served} == {"Cola"}
+    assert refreshed.name == "Cola Zero"
+    assert store.reads == 2
+
+
+def test_invalidate_releases_bytes():
+    cache = FormulationPipelineCache(ttl_seconds=60, max_entries=4)
+
+    async def scenario():
+        await cache.set(("get", "a"), _formulation("a"))
+        await cache.set(("list", 0, 50), {"formulations": [], "total_count": 0})
+        await cache.invalidate(lambda key: key[0] == "get")
+        remaining = cache.stats()["bytes"]
+        await cache.invalidate()
+        return remaining
+
+    remaining = asyncio.run(scenario())
+
+    assert remaining == len(b'{"formulations":[],"total_count":0}')
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,260 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from pydantic import ValidationError
+
+from app.models.schemas import FormulationCreate, FormulationUpdate  # type: ignore[import]
+from app.services.formulation_pipeline import (  # type: ignore[import]
+    FormulationPipelineCache,
+    FormulationPipelineService,
+    decode_list_cursor,
+    encode_list_cursor,
+)
+
+
+def _row_key(row: Dict[str, Any]) -> tuple:
+    return (row.get("updated_at") or row["created_at"], row["id"])
+
+
+class InMemoryFormulations:
+    """Neo4j stand-in that serves the named formulation queries from a dict."""
+
+    def __init__(self, count: int) -> None:
+        self.rows: Dict[str, Dict[str, Any]] = {
+            f"f{index}": {
+                "id": f"f{index}",
+                "name": f"Formulation {index}",
+                "status": "draft",
+                "created_at": f"2025-01-01T00:00:{index:02d}",
+            }
+            for index in range(count)
+        }
+        self.reads: List[str] = []
+
+    def _record(self, formulation_id: str) -> Dict[str, Any]:
+        return {"f": dict(self.rows[formulation_id]), "ingredients": []}
+
+    def execute_read(self, query, parameters=None, *, causal=None):
+        self.reads.append(query.name)
+        if query.name == "formulation.count":
+            return [{"total": len(self.rows)}]
+        if query.name == "formulation.get":
+            return [self._record(parameters["id"])] if parameters["id"] in self.rows else []
+        ordered = sorted(self.rows.values(), key=_row_key, reverse=True)
+        if query.name == "formulation.list_after":
+            after = (parameters["after_ts"], parameters["after_id"])
+            window = [row for row in ordered if _row_key(row) < after][: parameters["limit"]]
+        else:
+            window = ordered[parameters["skip"] : parameters["skip"] + parameters["limit"]]
+        return [self._record(row["id"]) for row in window]
+
+    def execute_query(self, query, parameters=None, *, causal=None):
+        if query.name == "formulation.create":
+            self.rows[parameters["id"]] = {
+                key: parameters[key] for key in ("id", "name", "description", "status", "created_at")
+            }
+            return [self._record(parameters["id"])]
+        if parameters["id"] not in self.rows:
+            return []
+        self.rows[parameters["id"]].update(parameters["fields"], updated_at=parameters["updated_at"])
+        return [self._record(parameters["id"])]
+
+    def execute_write(self, query, parameters=None, *, causal=None):
+        self.rows.pop(parameters["id"], None)
+        return []
+
+
+@pytest.fixture(name="store")
+def _store_fixture() -> InMemoryFormulations:
+    # Newest first: page 0 = f9 f8 f7, page 1 = f6 f5 f4, page 2 = f3 f2 f1, page 3 = f0
+    return InMemoryFormulations(10)
+
+
+def _run(store: InMemoryFormulations, scenario) -> Any:
+    pipeline = FormulationPipelineService(store, cache=FormulationPipelineCache(ttl_seconds=60, max_entries=256))
+
+    async def runner():
+        for skip in (0, 3, 6, 9):
+            await pipeline.list(skip=skip, limit=3)
+        store.reads.clear()
+        return await scenario(pipeline)
+
+    try:
+        return asyncio.run(runner())
+    finally:
+        pipeline.shutdown()
+
+
+async def _page_ids(pipeline: FormulationPipelineService, skip: int) -> List[str]:
+    page = await pipeline.list(skip=skip, limit=3)
+    return [formulation.id for formulation in page.formulations]
+
+
+def test_update_only_drops_pages_up_to_the_touched_row(store):
+    async def scenario(pipeline):
+        await pipeline.update("f5", FormulationUpdate(name="Renamed"))
+        store.reads.clear()
+        later = [await _page_ids(pipeline, 6), await _page_ids(pipeline, 9)]
+        untouched_reads = list(store.reads)
+        earlier = [await _page_ids(pipeline, 0), await _page_ids(pipeline, 3)]
+        return later, untouched_reads, earlier
+
+    later, untouched_reads, earlier = _run(store, scenario)
+
+    assert later == [["f3", "f2", "f1"], ["f0"]]
+    assert untouched_reads == []
+    assert earlier == [["f5", "f9", "f8"], ["f7", "f6", "f4"]]
+    # The cached total survives updates, so only the pages are re-read
+    assert store.reads == ["formulation.list"] * 2
+
+
+def test_update_of_the_first_row_keeps_every_page(store):
+    async def scenario(pipeline):
+        await pipeline.update("f9", FormulationUpdate(name="Renamed"))
+        store.reads.clear()
+        first = await pipeline.list(skip=0, limit=3)
+        fetched = await pipeline.get("f9")
+        return first, fetched
+
+    first, fetched = _run(store, scenario)
+
+    assert [formulation.name for formulation in first.formulations][0] == "Renamed"
+    assert fetched.name == "Renamed"
+    assert store.reads == []
+
+
+def test_update_keeps_other_formulations_cached(store):
+    async def scenario(pipeline):
+        await pipeline.update("f5", FormulationUpdate(name="Renamed"))
+        store.reads.clear()
+        return await pipeline.get("f2"), await pipeline.get("f5")
+
+    other, touched = _run(store, scenario)
+
+    assert other.id == "f2"
+    assert touched.name == "Renamed"
+    assert store.reads == []
+
+
+def test_delete_keeps_earlier_pages_and_adjusts_the_cached_count(store):
+    async def scenario(pipeline):
+        await pipeline.delete("f5")
+        store.reads.clear()
+        first = await pipeline.list(skip=0, limit=3)
+        first_reads = list(store.reads)
+        second = await _page_ids(pipeline, 3)
+        return first, first_reads, second
+
+    first, first_reads, second = _run(store, scenario)
+
+    assert [formulation.id for formulation in first.formulations] == ["f9", "f8", "f7"]
+    assert first.total_count == 9
+    assert first_reads == []
+    assert second == ["f6", "f4", "f3"]
+
+
+def test_create_invalidates_every_page(store, monkeypatch):
+    monkeypatch.setattr("app.services.formulation_pipeline.check_percentages", lambda ingredients: 0.0)
+
+    async def scenario(pipeline):
+        created = await pipeline.create(FormulationCreate(name="New", ingredients=[]))
+        store.reads.clear()
+        return created, await _page_ids(pipeline, 9)
+
+    created, last_page = _run(store, scenario)
+
+    assert created.id in store.rows
+    assert last_page == ["f1", "f0"]
+    assert store.reads == ["formulation.list"]
+
+
+def test_cached_formulations_cannot_be_modified(store):
+    async def scenario(pipeline):
+        page = await pipeline.list(skip=0, limit=3)
+        return page.formulations[0], await pipeline.get(page.formulations[0].id)
+
+    listed, fetched = _run(store, scenario)
+
+    assert listed is fetched
+    with pytest.raises(ValidationError):
+        listed.name = "Changed"
+    assert fetched.name == "Formulation 9"
+
+
+def test_cursor_pages_walk_the_whole_list(store):
+    async def scenario(pipeline):
+        seen: List[str] = []
+        page = await pipeline.list(limit=4)
+        seen.extend(formulation.id for formulation in page.formulations)
+        while page.next_cursor:
+            page = await pipeline.list(limit=4, cursor=page.next_cursor)
+            seen.extend(formulation.id for formulation in page.formulations)
+        return seen
+
+    assert _run(store, scenario) == [f"f{index}" for index in range(9, -1, -1)]
+    assert store.reads == ["formulation.list"] + ["formulation.list_after"] * 2
+
+
+def test_cursor_page_survives_writes_to_other_rows(store, monkeypatch):
+    monkeypatch.setattr("app.services.formulation_pipeline.check_percentages", lambda ingredients: 0.0)
+    cursor = encode_list_cursor("2025-01-01T00:00:07", "f7")
+
+    async def scenario(pipeline):
+        await pipeline.list(limit=3, cursor=cursor)
+        await pipeline.create(FormulationCreate(name="New", ingredients=[]))
+        await pipeline.update("f2", FormulationUpdate(name="Moved"))
+        await pipeline.update("f8", FormulationUpdate(name="Before the cursor"))
+        store.reads.clear()
+        kept = await pipeline.list(limit=3, cursor=cursor)
+        kept_reads = list(store.reads)
+        await pipeline.update("f5", FormulationUpdate(name="On the page"))
+        refreshed = await pipeline.list(limit=3, cursor=cursor)
+        return kept, kept_reads, refreshed
+
+    kept, kept_reads, refreshed = _run(store, scenario)
+
+    assert [formulation.id for formulation in kept.formulations] == ["f6", "f5", "f4"]
+    assert kept.total_count == 11
+    assert kept_reads == []
+    assert [formulation.id for formulation in refreshed.formulations] == ["f6", "f4", "f3"]
+
+
+def test_cursor_round_trip_and_malformed_tokens():
+    assert decode_list_cursor(encode_list_cursor("2025-01-01T00:00:00", "f1")) == ("2025-01-01T00:00:00", "f1")
+    assert decode_list_cursor(None) is None
+    for token in ("not a cursor!", encode_list_cursor("", "f1"), "WzFd"):
+        with pytest.raises(ValueError):
+            decode_list_cursor(token)
+
+
+def test_next_cursor_uses_the_stored_sort_key(store):
+    # Backfilled rows hold toString() of the temporal, not the serialized created_at
+    store.rows["f7"]["sort_ts"] = "2025-01-01T00:00:07Z"
+
+    async def scenario(pipeline):
+        return await pipeline.list(skip=0, limit=3)
+
+    page = _run(store, scenario)
+
+    assert decode_list_cursor(page.next_cursor) == ("2025-01-01T00:00:07Z", "f7")
+
+
+def test_cached_pages_are_bounded_by_the_stored_sort_keys(store):
+    for row in store.rows.values():
+        row["sort_ts"] = row["created_at"] + "Z"
+
+    async def scenario(pipeline):
+        return {page.skip: page.sort_keys for page in pipeline._list_pages.values()}
+
+    bounds = _run(store, scenario)
+
+    assert bounds[0] == ("2025-01-01T00:00:09Z", "2025-01-01T00:00:08Z", "2025-01-01T00:00:07Z")
+    assert bounds[9] == ("2025-01-01T00:00:00Z",)
@@ -1,5 +1,7 @@
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Sequence
 
@@ -24,7 +26,8 @@ class StubNeo4jClient:
         self.calls: List[Dict[str, Any]] = []
         self.chunk_content = chunk_content
 
-    def execute_query(self, query: str, parameters: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+    def execute_read(self, query: Any, parameters: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+        query = " ".join(getattr(query, "cypher", query).split())
         self.calls.append({"query": query, "parameters": parameters or {}})
 
         if "db.index.vector.queryNodes" in query:
@@ -56,7 +59,7 @@ class StubNeo4jClient:
                 }
             ]
 
-        if query.strip().startswith("MATCH (n)\n        WHERE n.id IN $entity_ids"):
+        if query.startswith("MATCH (n) WHERE n.id IN $entity_ids"):
             return [
                 {
                     "n": {
@@ -145,6 +148,41 @@ def test_retrieve_uses_cache_when_available() -> None:
     assert result_second.chunks[0].chunk_id == result_first.chunks[0].chunk_id
 
 
+class GatedEmbeddingClient(StubEmbeddingClient):
+    """Blocks the first embedding until the test has queued every caller."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def embed_texts(self, texts: Sequence[str]) -> Sequence[Sequence[float]]:
+        self.release.wait(5)
+        return super().embed_texts(texts)
+
+
+def test_concurrent_misses_share_one_retrieval() -> None:
+    embedding_client = GatedEmbeddingClient()
+    service = GraphRAGRetrievalService(
+        neo4j_client=StubNeo4jClient(),
+        embedding_client=embedding_client,
+        chunk_index_name="knowledge_chunks",
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(service.retrieve, "recommended salt levels") for _ in range(4)]
+        while not service._in_flight._calls:
+            threading.Event().wait(0.001)
+        # Give the remaining callers time to join the flight
+        threading.Event().wait(0.05)
+        embedding_client.release.set()
+        results = [future.result() for future in futures]
+
+    assert len(embedding_client.requests) == 1
+    assert {result.chunks[0].chunk_id for result in results} == {"formulations::0001"}
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 4
+
+
 def test_retrieve_cache_respects_ttl_expiry() -> None:
     embedding_client = StubEmbeddingClient()
     service = GraphRAGRetrievalService(
@@ -0,0 +1,128 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.nutrient_aggregation import (  # type: ignore[import]
+    aggregate_nutrients_batch,
+    aggregate_nutrients_loop,
+    parse_nutrient,
+    weighted_rows,
+)
+from app.services.nutrition_service import NutritionCalculationService, NutritionLabelRequest  # type: ignore[import]
+
+NUTRIENTS = [
+    ("Energy", "kcal"),
+    ("Total lipid (fat)", "g"),
+    ("Fatty acids, total saturated", "g"),
+    ("Sodium, Na", "mg"),
+    ("Carbohydrate, by difference", "g"),
+    ("Sugars, total including NLEA", "g"),
+    ("Protein", "g"),
+    ("Calcium, Ca", "mg"),
+    ("Vitamin C, total ascorbic acid", "mg"),
+    ("Energy", "kJ"),
+]
+
+
+def _ingredients(count: int, seed: int = 3) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    ingredients = []
+    for index in range(count):
+        rows = []
+        for name, unit in rng.sample(NUTRIENTS, rng.randint(0, len(NUTRIENTS))):
+            amount = round(rng.uniform(0, 500), 3)
+            style = rng.randint(0, 2)
+            if style == 0:
+                rows.append({"nutrient_name": name, "amount": amount, "unit": unit, "per100g": True})
+            elif style == 1:
+                rows.append({"nutrient": {"name": name, "unitName": unit}, "amount": amount})
+            else:
+                rows.append({"nutrientName": name, "value": str(amount), "unitName": unit})
+        ingredients.append({"name": f"Ingredient {index}", "percentage": rng.uniform(0, 20), "nutrients": rows})
+    return ingredients
+
+
+def test_parse_nutrient_accepts_every_row_shape_and_skips_bad_rows():
+    assert parse_nutrient({"nutrient_name": "Protein", "amount": 3, "unit": "g"}) == ("Protein", 3.0, "g")
+    assert parse_nutrient({"nutrient_info": {"nutrientName": "Iron, Fe", "value": "1.5"}}) == ("Iron, Fe", 1.5, "g")
+    assert parse_nutrient({"name": "Fiber", "amount": None}) == ("Fiber", 0.0, "g")
+    assert parse_nutrient({"name": "Fiber", "amount": "n/a"}) is None
+    assert parse_nutrient({"amount": 2}) is None
+    assert parse_nutrient("Protein") is None
+
+
+def test_repeated_nutrient_rows_are_summed_and_empty_ingredients_ignored():
+    ingredients = [
+        {"name": "Salt", "percentage": 50, "nutrients": [{"name": "Sodium, Na", "amount": 10, "unit": "mg"}] * 2},
+        {"name": "Water", "percentage": 50, "nutrients": []},
+        {"name": "Broken", "percentage": None, "nutrients": [{"name": "Sodium, Na", "amount": 4, "unit": "mg"}]},
+    ]
+
+    keys, terms = weighted_rows(ingredients)
+
+    assert keys == ["Sodium, Na|mg"]
+    assert terms == [(0, 5.0), (0, 5.0), (0, 0.0)]
+    assert aggregate_nutrients_batch([ingredients], [(0, 100.0)]) == [{"Sodium, Na|mg": 10.0}]
+    assert aggregate_nutrients_loop(ingredients, 100.0) == {"Sodium, Na|mg": 10.0}
+
+
+def test_batch_matches_the_loop_exactly_for_every_request():
+    groups = [_ingredients(12, seed=1), [], _ingredients(5, seed=2), _ingredients(30, seed=4)]
+    requests = [(3, 30.0), (0, 100.0), (1, 50.0), (2, 12.5), (0, 250.0), (3, 33.3)]
+
+    labels = aggregate_nutrients_batch(groups, requests)
+
+    assert len(labels) == len(requests)
+    for (index, serving_size), label in zip(requests, labels):
+        expected = aggregate_nutrients_loop(groups[index], serving_size)
+        assert list(label) == list(expected)
+        assert label == expected
+
+
+def test_batch_parses_each_group_once(monkeypatch):
+    from app.services import nutrient_aggregation  # type: ignore[import]
+
+    parsed: List[int] = []
+    original = nutrient_aggregation.weighted_rows
+
+    def counting(ingredients, nutrients=None):
+        parsed.append(len(ingredients))
+        return original(ingredients, nutrients)
+
+    monkeypatch.setattr(nutrient_aggregation, "weighted_rows", counting)
+    groups = [_ingredients(4, seed=1), _ingredients(6, seed=2)]
+
+    aggregate_nutrients_batch(groups, [(0, 30.0), (1, 30.0), (0, 100.0), (0, 250.0), (1, 12.5)])
+
+    assert parsed == [4, 6]
+
+
+class _FormulationClient:
+    def __init__(self, ingredients: List[Dict[str, Any]]) -> None:
+        self.ingredients = ingredients
+
+    async def execute_read(self, query, parameters=None):
+        return [{"formulation_id": "f1", "formulation_name": "Blend", "ingredients": self.ingredients}]
+
+
+def test_single_and_batch_labels_are_identical():
+    service = NutritionCalculationService(_FormulationClient(_ingredients(40, seed=8)))
+
+    async def labels():
+        single = await service.calculate_nutrition_label("f1", 250.0, "g", 4.0)
+        batch = [
+            result
+            async for result in service.calculate_nutrition_labels([NutritionLabelRequest("f1", 250.0, "g", 4.0)])
+        ]
+        return single, batch[0].facts
+
+    single, batched = asyncio.run(labels())
+
+    assert single == batched
+    assert single.calories > 0
@@ -0,0 +1,196 @@
+import asyncio
+import copy
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.formulation_pipeline import FormulationEventBus  # type: ignore[import]
+from app.services.nutrient_profiles import FOODS_INGESTED_EVENT, NutrientProfileStore  # type: ignore[import]
+from app.services.nutrition_service import NutritionCalculationService  # type: ignore[import]
+
+
+def _ingredient(name: str, percentage: float, fdc_id: int, energy: float, protein: float) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "percentage": percentage,
+        "food_fdc_id": fdc_id,
+        "nutrients": [
+            {"nutrient_name": "Energy", "amount": energy, "unit": "kcal", "per100g": True, "fdc_id": fdc_id},
+            {"nutrient_name": "Protein", "amount": protein, "unit": "g", "per100g": True, "fdc_id": fdc_id},
+        ],
+    }
+
+
+class FakeGraph:
+    """Serves the nutrient queries from a mutable dict and records each read."""
+
+    def __init__(self) -> None:
+        self.formulations: Dict[str, Dict[str, Any]] = {
+            "bar": {
+                "formulation_id": "bar",
+                "formulation_name": "Oat Bar",
+                "ingredients": [_ingredient("Oats", 70.0, 1001, 389, 16.9), _ingredient("Honey", 30.0, 1002, 304, 0.3)],
+            },
+            "shake": {
+                "formulation_id": "shake",
+                "formulation_name": "Whey Shake",
+                "ingredients": [_ingredient("Whey", 25.0, 1003, 352, 80.0), _ingredient("Honey", 5.0, 1002, 304, 0.3)],
+            },
+        }
+        self.reads: List[str] = []
+
+    async def execute_read(self, query, parameters=None):
+        self.reads.append(query.name)
+        if query.name == "nutrition.formulations_nutrients":
+            ids = parameters["formulation_ids"]
+            return [copy.deepcopy(self.formulations[fid]) for fid in ids if fid in self.formulations]
+        if query.name == "nutrition.formulation_nutrients":
+            record = self.formulations.get(parameters["formulation_id"])
+            return [copy.deepcopy(record)] if record else []
+        return []
+
+
+def test_labels_from_stored_profiles_match_live_labels_and_skip_the_graph():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+    live = NutritionCalculationService(graph)
+    cached = NutritionCalculationService(graph, store)
+
+    async def scenario():
+        expected = [await live.calculate_nutrition_label("bar", size, "g", None) for size in (30.0, 55.0, 250.0)]
+        graph.reads.clear()
+        actual = [await cached.calculate_nutrition_label("bar", size, "g", None) for size in (30.0, 55.0, 250.0)]
+        return expected, actual
+
+    expected, actual = asyncio.run(scenario())
+
+    assert actual == expected
+    assert graph.reads == ["nutrition.formulations_nutrients"]
+    assert len(store) == 1
+
+
+def test_concurrent_misses_load_a_profile_once():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+
+    async def scenario():
+        return await asyncio.gather(*(store.get("bar") for _ in range(10)))
+
+    profiles = asyncio.run(scenario())
+
+    assert graph.reads == ["nutrition.formulations_nutrients"]
+    assert all(profile is profiles[0] for profile in profiles)
+
+
+def test_formulation_events_recompute_stored_profiles_and_drop_deleted_ones():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+    bus = FormulationEventBus()
+
+    async def scenario():
+        await store.attach(bus)
+        before = (await store.get("bar")).per_100g["Protein|g"]
+        graph.formulations["bar"]["ingredients"][0]["percentage"] = 90.0
+        graph.formulations["bar"]["ingredients"][1]["percentage"] = 10.0
+        await bus.publish("formulation.updated", {"id": "bar"})
+        graph.reads.clear()
+        after = (await store.get("bar")).per_100g["Protein|g"]
+        reads_after_update = list(graph.reads)
+        # Never stored, so nothing to recompute
+        await bus.publish("formulation.created", {"id": "new", "ids": ["new"]})
+        reads_after_create = list(graph.reads)
+        await bus.publish("formulation.deleted", {"id": "bar"})
+        return before, after, reads_after_update, reads_after_create
+
+    before, after, reads_after_update, reads_after_create = asyncio.run(scenario())
+
+    assert before == 16.9 * 0.7 + 0.3 * 0.3
+    assert after == 16.9 * 0.9 + 0.3 * 0.1
+    assert reads_after_update == []
+    assert reads_after_create == []
+    assert store.peek("bar") is None
+
+
+def test_food_reingest_recomputes_only_formulations_using_that_food():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+    bus = FormulationEventBus()
+
+    async def scenario():
+        await store.attach(bus)
+        await store.refresh(["bar", "shake"])
+        shake = store.peek("shake")
+        for ingredient in graph.formulations["bar"]["ingredients"]:
+            if ingredient["food_fdc_id"] == 1001:
+                ingredient["nutrients"][1]["amount"] = 13.2
+        graph.reads.clear()
+        await bus.publish(FOODS_INGESTED_EVENT, {"fdc_ids": [1001]})
+        return shake, list(graph.reads)
+
+    shake, reads = asyncio.run(scenario())
+
+    assert reads == ["nutrition.formulations_nutrients"]
+    assert store.formulations_using([1002]) == {"bar", "shake"}
+    assert store.peek("bar").per_100g["Protein|g"] == 13.2 * 0.7 + 0.3 * 0.3
+    assert store.peek("shake") is shake
+
+
+def test_invalidation_during_a_load_keeps_the_stale_result_out():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+    original = graph.execute_read
+
+    async def slow_read(query, parameters=None):
+        rows = await original(query, parameters)
+        await asyncio.sleep(0.01)
+        return rows
+
+    graph.execute_read = slow_read  # type: ignore[method-assign]
+
+    async def scenario():
+        load = asyncio.ensure_future(store.get("bar"))
+        await asyncio.sleep(0.002)
+        store.invalidate("bar")
+        return await load
+
+    profile = asyncio.run(scenario())
+
+    assert profile is not None
+    assert store.peek("bar") is None
+    assert store._versions == {} and store._loading == {}
+
+
+def test_events_for_formulations_without_a_profile_leave_no_state_behind():
+    graph = FakeGraph()
+    store = NutrientProfileStore(graph)
+    bus = FormulationEventBus()
+
+    async def scenario():
+        await store.attach(bus)
+        await store.get("bar")
+        for index in range(50):
+            await bus.publish("formulation.updated", {"id": f"other-{index}"})
+        await bus.publish("formulation.updated", {"id": "bar"})
+
+    asyncio.run(scenario())
+
+    assert store._versions == {} and store._loading == {}
+    assert store.peek("bar") is not None
+
+
+def test_label_without_graph_nutrients_queries_them_once():
+    graph = FakeGraph()
+    graph.formulations["bare"] = {"formulation_id": "bare", "formulation_name": "Bare", "ingredients": []}
+    service = NutritionCalculationService(graph, NutrientProfileStore(graph))
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.calculate_nutrition_label("bare", 30.0, "g", None))
+
+    assert graph.reads.count("nutrition.formulations_nutrients") == 1
+    assert "nutrition.formulation_nutrients" not in graph.reads
@@ -0,0 +1,139 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.formulation_pipeline import FormulationEventBus  # type: ignore[import]
+from app.services.nutrient_profiles import FOODS_INGESTED_EVENT  # type: ignore[import]
+from app.services.nutrient_registry import LABEL_FIELDS, NutrientRegistry  # type: ignore[import]
+from app.services.nutrition_service import NutritionCalculationService  # type: ignore[import]
+
+
+class CatalogGraph:
+    """Serves ``nutrition.nutrient_catalog`` from a mutable list."""
+
+    def __init__(self) -> None:
+        self.nutrients = [{"number": "203", "name": "Protein", "unit": "G"}]
+        self.reads = 0
+
+    async def execute_read(self, query, parameters=None):
+        assert query.name == "nutrition.nutrient_catalog"
+        self.reads += 1
+        return list(self.nutrients)
+
+
+def _label(registry: NutrientRegistry, aggregated):
+    return dict(zip(LABEL_FIELDS, registry.label_values(aggregated)))
+
+
+def test_foundation_food_names_and_units_resolve_by_number():
+    label = _label(
+        NutrientRegistry(),
+        {
+            "Energy (Atwater General Factors)|KCAL": 380.0,
+            "Total Sugars|G": 12.0,
+            "Sodium, Na|G": 0.4,
+            "Vitamin D (D2 + D3), International Units|IU": 40.0,
+            "Fatty acids, total monounsaturated|G": 7.0,
+        },
+    )
+
+    assert label["calories"] == 380.0
+    assert label["total_sugars"] == 12.0
+    assert label["sodium"] == pytest.approx(400.0)
+    assert label["vitamin_d"] == pytest.approx(1.0)
+    assert label["total_fat"] == 0.0
+
+
+def test_kcal_energy_wins_over_kj_and_kj_alone_is_converted():
+    registry = NutrientRegistry()
+
+    both = _label(registry, {"Energy|kJ": 1590.0, "Energy|KCAL": 380.0})
+    kj_only = _label(registry, {"Energy|kJ": 418.4})
+
+    assert both["calories"] == 380.0
+    assert kj_only["calories"] == pytest.approx(100.0)
+
+
+def test_plain_names_without_numbers_still_fill_their_lines():
+    label = _label(NutrientRegistry(), {"Calories|kcal": 250.0, "Sodium|mg": 120.0, "Calcium|": 30.0})
+
+    assert label["calories"] == 250.0
+    assert label["sodium"] == 120.0
+    assert label["calcium"] == 30.0
+
+
+def test_graph_catalog_adds_names_and_reloads_after_an_ingest():
+    graph = CatalogGraph()
+    registry = NutrientRegistry(())
+    bus = FormulationEventBus()
+
+    async def scenario():
+        await registry.load(graph)
+        await registry.attach(bus, graph)
+        before = _label(registry, {"Potassium, K|MG": 350.0, "Protein|G": 3.0})
+        graph.nutrients.append({"number": "306", "name": "Potassium, K", "unit": "MG"})
+        await bus.publish(FOODS_INGESTED_EVENT, {"fdc_ids": [1001]})
+        after = _label(registry, {"Potassium, K|MG": 350.0, "Protein|G": 3.0})
+        return before, after
+
+    before, after = asyncio.run(scenario())
+
+    assert graph.reads == 2
+    assert (before["protein"], before["potassium"]) == (3.0, 0.0)
+    assert (after["protein"], after["potassium"]) == (3.0, 350.0)
+
+
+def test_labels_use_the_registry_passed_to_the_service():
+    service = NutritionCalculationService(object(), nutrients=NutrientRegistry((("307", "Salt sodium", "mg"),)))
+
+    facts = service._build_nutrition_facts("f", "F", {"Salt sodium|mg": 200.0, "Sodium, Na|mg": 999.0}, 100.0, "g", None)
+
+    assert facts.sodium.amount == 200.0
+
+
+class MixedSourceGraph:
+    """One SR Legacy and one Foundation ingredient, which report energy and sugars under different numbers."""
+
+    async def execute_read(self, query, parameters=None):
+        assert query.name == "nutrition.formulation_nutrients"
+        return [
+            {
+                "formulation_id": "mix",
+                "formulation_name": "Mix",
+                "ingredients": [
+                    {
+                        "name": "Legacy",
+                        "percentage": 50.0,
+                        "nutrients": [
+                            {"nutrient_name": "Energy", "amount": 400.0, "unit": "KCAL"},
+                            {"nutrient_name": "Energy", "amount": 1674.0, "unit": "kJ"},
+                            {"nutrient_name": "Sugars, total including NLEA", "amount": 10.0, "unit": "G"},
+                        ],
+                    },
+                    {
+                        "name": "Foundation",
+                        "percentage": 50.0,
+                        "nutrients": [
+                            {"nutrient_name": "Energy (Atwater General Factors)", "amount": 200.0, "unit": "KCAL"},
+                            {"nutrient_name": "Sugars, Total", "amount": 4.0, "unit": "G"},
+                        ],
+                    },
+                ],
+            }
+        ]
+
+
+def test_each_ingredient_contributes_its_own_best_number_to_a_line():
+    service = NutritionCalculationService(MixedSourceGraph())
+
+    facts = asyncio.run(service.calculate_nutrition_label("mix", 100.0, "g", None))
+
+    assert facts.calories == 300.0
+    assert facts.total_sugars.amount == 7.0
+    assert not any(nutrient.name.startswith("label:") for nutrient in facts.additional_nutrients)
@@ -57,37 +57,44 @@ def _build_write_set():
     )
 
 
-def test_persistence_service_retries_transient_errors(monkeypatch):
-    # eliminate actual sleeping for faster tests
-    monkeypatch.setattr("time.sleep", lambda _: None)
-
+def test_persistence_service_delegates_to_managed_write():
     client = DummyNeo4jClient([
-        TransientError("Neo.TransientError.Transaction.DeadlockDetected", "deadlock"),
         {"nodes_created": 2, "relationships_created": 1, "properties_set": 5},
     ])
-    service = OrchestrationPersistenceService(client, max_retries=2, backoff_seconds=0.1)
+    service = OrchestrationPersistenceService(client)
 
     summary = service.persist_run(_build_write_set())
 
     assert summary.run_id == "test-run"
     assert summary.nodes_created == 2
-    assert client.calls == 2
-
+    assert client.calls == 1
 
-def test_persistence_service_raises_when_retries_exhausted(monkeypatch):
-    monkeypatch.setattr("time.sleep", lambda _: None)
 
+def test_persistence_service_propagates_errors_after_driver_retries():
+    # Retries happen inside the driver's managed transaction; whatever escapes
+    # execute_write is final and must not be retried again here.
     client = DummyNeo4jClient([
         ServiceUnavailable("unavailable"),
-        ServiceUnavailable("still unavailable"),
-        ServiceUnavailable("nope"),
+        {"nodes_created": 2, "relationships_created": 1, "properties_set": 5},
     ])
-    service = OrchestrationPersistenceService(client, max_retries=2, backoff_seconds=0.1)
+    service = OrchestrationPersistenceService(client)
 
     with pytest.raises(ServiceUnavailable):
         service.persist_run(_build_write_set())
 
-    assert client.calls == 3
+    assert client.calls == 1
+
+
+def test_persistence_service_reraises_neo4j_errors():
+    client = DummyNeo4jClient([
+        TransientError("Neo.TransientError.Transaction.DeadlockDetected", "deadlock"),
+    ])
+    service = OrchestrationPersistenceService(client)
+
+    with pytest.raises(TransientError):
+        service.persist_run(_build_write_set())
+
+    assert client.calls == 1
 
 
 def test_snapshot_parameters_are_neo4j_safe():